@@ -1,5 +1,6 @@
 """ESB application package."""
 
+import math
 import os
 from datetime import datetime, timezone
 
@@ -8,6 +9,8 @@ from flask import Flask, flash, redirect, render_template, request, session, url
 from esb.config import config
 from esb.extensions import csrf, db, login_manager, migrate
 from esb.services.repair_service import CLOSED_STATUSES
+from esb.services.upload_service import UploadRequest
+from esb.utils.exceptions import RenderPoolBusy
 from esb.utils.filters import register_filters
 from esb.views import register_blueprints
 
@@ -33,6 +36,8 @@ def create_app(config_name='default'):
 
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    # Spool uploaded files into UPLOAD_PATH, hashing them as they arrive.
+    app.request_class = UploadRequest
 
     # Normalize UPLOAD_PATH to absolute so file serving is not sensitive to
     # the process working directory (which can differ between dev and Docker).
@@ -46,6 +51,7 @@ def create_app(config_name='default'):
     if _qr_template_config_path:
         from esb.services import qr_service
         app.config['QR_TEMPLATE'] = qr_service.load_template_config(_qr_template_config_path)
+        qr_service.preload_template_artwork(app.config['QR_TEMPLATE'])
     else:
         app.config['QR_TEMPLATE'] = None
 
@@ -118,6 +124,11 @@ def create_app(config_name='default'):
     def internal_error(e):
         return render_template('errors/500.html'), 500
 
+    @app.errorhandler(RenderPoolBusy)
+    def render_pool_busy(e):
+        retry_after = max(1, math.ceil(e.retry_after))
+        return render_template('errors/503.html', retry_after=retry_after), 503, {'Retry-After': str(retry_after)}
+
     # Health / index route
     @app.route('/')
     def index():
@@ -163,13 +174,122 @@ def _register_cli(app):
     @worker.command('run')
     @click.option('--poll-interval', default=30, type=int,
                   help='Seconds between polling cycles (default: 30)')
-    def worker_run(poll_interval):
+    @click.option('--async', 'use_async', is_flag=True,
+                  help='Deliver Slack messages concurrently on an asyncio event loop')
+    @click.option('--concurrency', default=None, type=click.IntRange(min=1),
+                  help='Deliveries in flight with --async (default: WORKER_ASYNC_CONCURRENCY)')
+    def worker_run(poll_interval, use_async, concurrency):
         """Run the background notification worker."""
+        if use_async:
+            from esb.services import async_worker
+
+            click.echo(f'Starting async notification worker (poll interval: {poll_interval}s)')
+            try:
+                async_worker.run_async_worker(poll_interval=poll_interval, concurrency=concurrency)
+            except RuntimeError as e:
+                raise click.ClickException(str(e)) from e
+            return
+
         from esb.services import notification_service
 
         click.echo(f'Starting notification worker (poll interval: {poll_interval}s)')
         notification_service.run_worker_loop(poll_interval=poll_interval)
 
+    def _failed_filter_options(fn):
+        """Shared filter options for the `worker failed` commands."""
+        date_formats = ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S']
+        options = [
+            click.option('--type', 'notification_type', default=None,
+                         help='Only this notification type (e.g. slack_message)'),
+            click.option('--target', default=None, help='Only this target (e.g. #woodshop)'),
+            click.option('--since', type=click.DateTime(date_formats), default=None,
+                         help='Only rows created at or after this UTC time'),
+            click.option('--until', type=click.DateTime(date_formats), default=None,
+                         help='Only rows created before this UTC time'),
+            click.option('--error', 'error_contains', default=None,
+                         help='Only rows whose error message contains this text'),
+        ]
+        for option in reversed(options):
+            fn = option(fn)
+        return fn
+
+    @worker.group('failed')
+    def worker_failed():
+        """Inspect and recover permanently failed notifications."""
+        pass
+
+    @worker_failed.command('list')
+    @_failed_filter_options
+    @click.option('--limit', default=50, type=click.IntRange(min=1),
+                  help='Maximum rows to show, newest first (default: 50)')
+    def worker_failed_list(limit, **filters):
+        """List failed notifications matching the filters."""
+        from esb.services import notification_service
+
+        total = notification_service.count_failed_notifications(**filters)
+        rows = notification_service.list_failed_notifications(limit=limit, **filters)
+        for n in rows:
+            error = (n.error_message or '').splitlines()[0][:80] if n.error_message else ''
+            click.echo(
+                f'{n.id:>8}  {n.created_at:%Y-%m-%d %H:%M:%S}  {n.notification_type:<16} '
+                f'{n.target:<20} retries={n.retry_count}  {error}'
+            )
+        click.echo(f'{total} failed notification(s) match; showing {len(rows)}.')
+
+    @worker_failed.command('requeue')
+    @_failed_filter_options
+    @click.option('--batch-size', default=1000, type=click.IntRange(min=1),
+                  help='Rows updated per transaction (default: 1000)')
+    def worker_failed_requeue(batch_size, **filters):
+        """Return matching failed notifications to the queue with a fresh retry budget."""
+        from esb.services import notification_service
+
+        total = notification_service.count_failed_notifications(**filters)
+        if not total:
+            click.echo('No failed notifications match.')
+            return
+        with click.progressbar(length=total, label='Requeueing') as bar:
+            requeued = notification_service.requeue_failed_notifications(
+                batch_size=batch_size, progress=bar.update, **filters,
+            )
+        click.echo(f'Requeued {requeued} notification(s).')
+
+    @worker_failed.command('purge')
+    @_failed_filter_options
+    @click.option('--batch-size', default=1000, type=click.IntRange(min=1),
+                  help='Rows deleted per transaction (default: 1000)')
+    @click.option('--yes', is_flag=True, help='Do not ask for confirmation')
+    def worker_failed_purge(batch_size, yes, **filters):
+        """Delete matching failed notifications."""
+        from esb.services import notification_service
+
+        total = notification_service.count_failed_notifications(**filters)
+        if not total:
+            click.echo('No failed notifications match.')
+            return
+        if not yes:
+            click.confirm(f'Delete {total} failed notification(s)?', abort=True)
+        with click.progressbar(length=total, label='Purging') as bar:
+            purged = notification_service.purge_failed_notifications(
+                batch_size=batch_size, progress=bar.update, **filters,
+            )
+        click.echo(f'Purged {purged} notification(s).')
+
+    @app.cli.group()
+    def uploads():
+        """Uploaded file commands."""
+        pass
+
+    @uploads.command('variants')
+    @click.option('--rebuild', is_flag=True,
+                  help='Also queue photos and videos whose variants were already built')
+    def uploads_variants(rebuild):
+        """Queue resized variants for photos and videos uploaded before they existed."""
+        from esb.services import image_variant_service
+
+        queued = image_variant_service.queue_missing_variants(rebuild=rebuild)
+        click.echo(f'Queued {queued} image variant job(s) for the worker.')
+
     @app.cli.command('seed-admin')
     @click.argument('username')
     @click.argument('email')
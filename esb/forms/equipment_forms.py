@@ -8,6 +8,7 @@ from wtforms import (
     DecimalField,
     IntegerField,
     SelectField,
+    SelectMultipleField,
     StringField,
     SubmitField,
     TextAreaField,
@@ -16,6 +17,7 @@ from wtforms.validators import URL, DataRequired, Length, NumberRange, Optional
 
 from esb.models.document import DOCUMENT_CATEGORIES
 from esb.services.qr_service import DEFAULT_DEVICE_KEY, QR_DEVICE_PRESETS, QR_SIZE_PRESETS
+from esb.services.qr_sheet_service import SHEET_LAYOUTS
 
 FORM_DOCUMENT_CATEGORIES = [('', '-- Select Category --')] + DOCUMENT_CATEGORIES
 
@@ -145,6 +147,15 @@ class QRGenerateForm(FlaskForm):
     wifi_info = SelectField('WiFi Info', default='none')
     include_name = BooleanField('Include equipment name above QR', default=False)
     include_url = BooleanField('Include URL below QR', default=False)
+    output_format = SelectField(
+        'File format',
+        choices=[
+            ('png', 'PNG image (for the selected printer)'),
+            ('svg', 'SVG vector (any resolution)'),
+            ('pdf', 'PDF vector (any resolution)'),
+        ],
+        default='png',
+    )
     submit = SubmitField('Download QR Code')
 
     def __init__(self, *args, wifi_choices=None, **kwargs):
@@ -154,3 +165,41 @@ class QRGenerateForm(FlaskForm):
         # not None (which would fail SelectField validation).
         if self.wifi_info.data is None:
             self.wifi_info.data = 'none'
+        # Likewise for forms posted before the format select existed.
+        if self.output_format.data is None:
+            self.output_format.data = 'png'
+
+
+class QRSheetForm(FlaskForm):
+    """Form for a batch QR label sheet.
+
+    Labels the selected equipment, or every active item in the chosen area
+    (all areas when area is 0) when none is selected.
+    """
+
+    area = SelectField('Area', coerce=int, default=0)
+    equipment = SelectMultipleField('Equipment', coerce=int, validators=[Optional()])
+    layout = SelectField(
+        'Sheet layout',
+        choices=[(layout.key, layout.label) for layout in SHEET_LAYOUTS],
+        validators=[DataRequired()],
+        default=SHEET_LAYOUTS[0].key,
+    )
+    device = SelectField(
+        'Printer / device',
+        choices=[(p.key, p.label) for p in QR_DEVICE_PRESETS],
+        validators=[DataRequired()],
+        default=DEFAULT_DEVICE_KEY,
+    )
+    wifi_info = SelectField('WiFi Info', default='none')
+    include_name = BooleanField('Include equipment name above QR', default=True)
+    include_url = BooleanField('Include URL below QR', default=False)
+    submit = SubmitField('Generate Sheet')
+
+    def __init__(self, *args, area_choices=None, equipment_choices=None, wifi_choices=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.area.choices = [(0, 'All areas')] + (area_choices or [])
+        self.equipment.choices = equipment_choices or []
+        self.wifi_info.choices = wifi_choices or [('none', 'None')]
+        if self.wifi_info.data is None:
+            self.wifi_info.data = 'none'
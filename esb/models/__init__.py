@@ -12,10 +12,11 @@ from esb.models.external_link import ExternalLink
 from esb.models.pending_notification import PendingNotification
 from esb.models.repair_record import RepairRecord
 from esb.models.repair_timeline_entry import RepairTimelineEntry
+from esb.models.single_flight_lock import SingleFlightLock
 from esb.models.user import User
 
 __all__ = [
     'AppConfig', 'Area', 'AuditLog', 'Document', 'Equipment',
     'ExternalLink', 'PendingNotification', 'RepairRecord',
-    'RepairTimelineEntry', 'User',
+    'RepairTimelineEntry', 'SingleFlightLock', 'User',
 ]
@@ -25,6 +25,13 @@ class Document(db.Model):
     stored_filename = db.Column(db.String(255), nullable=False)
     content_type = db.Column(db.String(100), nullable=False)
     size_bytes = db.Column(db.Integer, nullable=False)
+    # Digest of the content, naming its blob under UPLOAD_PATH/blobs/. None
+    # for files uploaded before uploads were content-addressed.
+    sha256 = db.Column(db.String(64), nullable=True)
+    # Resized copies built by the worker (see image_variant_service), e.g.
+    # {"widths": [320, 640]}. None until built; empty widths if the file
+    # could not be decoded.
+    variants = db.Column(db.JSON(none_as_null=True), nullable=True)
     category = db.Column(db.String(50), nullable=True)
     parent_type = db.Column(db.String(50), nullable=False)
     parent_id = db.Column(db.Integer, nullable=False, index=True)
@@ -37,5 +44,20 @@ class Document(db.Model):
         db.Index('ix_documents_parent', 'parent_type', 'parent_id'),
     )
 
+    @property
+    def variant_widths(self) -> list[int]:
+        """Widths of the built variants, smallest first (empty if none)."""
+        return sorted((self.variants or {}).get('widths', []))
+
+    def variant_filename(self, width: int, fmt: str) -> str:
+        """Path of a variant relative to the document's directory.
+
+        Args:
+            width: One of variant_widths.
+            fmt: 'webp' or 'jpeg'.
+        """
+        stem = self.stored_filename.rsplit('.', 1)[0]
+        return f'variants/{stem}-{width}.{"jpg" if fmt == "jpeg" else fmt}'
+
     def __repr__(self):
         return f'<Document {self.original_filename!r}>'
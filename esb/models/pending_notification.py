@@ -4,17 +4,35 @@ from datetime import UTC, datetime
 
 from esb.extensions import db
 
+# Delivery priority lanes; lower values are served first. Safety-risk reports
+# and static page pushes go in the high lane so a backlog of routine updates
+# cannot delay them.
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+NOTIFICATION_PRIORITIES = (PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_LOW)
+
 
 class PendingNotification(db.Model):
     """Queue table for outbound notifications and static page pushes."""
 
     __tablename__ = 'pending_notifications'
+    __table_args__ = (
+        # Serves the worker's ready-row poll: status filter, per-lane ordering.
+        db.Index('ix_pending_notifications_ready', 'status', 'priority', 'next_retry_at', 'created_at'),
+        # Serves the /metrics pending count/oldest aggregate and the worker's
+        # retention prune, both of which filter on status and range on created_at.
+        db.Index('ix_pending_notifications_status_created', 'status', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     notification_type = db.Column(db.String(50), nullable=False, index=True)
     target = db.Column(db.String(255), nullable=False)
     payload = db.Column(db.JSON, nullable=True)
-    status = db.Column(db.String(20), nullable=False, default='pending', index=True)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    priority = db.Column(
+        db.Integer, nullable=False, default=PRIORITY_NORMAL, server_default=str(PRIORITY_NORMAL),
+    )
     created_at = db.Column(
         db.DateTime, nullable=False,
         default=lambda: datetime.now(UTC),
@@ -23,6 +41,16 @@ class PendingNotification(db.Model):
     retry_count = db.Column(db.Integer, nullable=False, default=0)
     delivered_at = db.Column(db.DateTime, nullable=True)
     error_message = db.Column(db.Text, nullable=True)
+    # Set on a fan-out child (e.g. the #oops cross-post of a slack_message):
+    # the row it was queued alongside. Children are delivered and retried
+    # independently of their parent.
+    parent_id = db.Column(
+        db.Integer,
+        db.ForeignKey('pending_notifications.id', ondelete='SET NULL'),
+        nullable=True, index=True,
+    )
+
+    parent = db.relationship('PendingNotification', remote_side=[id])
 
     def __repr__(self):
         return f'<PendingNotification {self.id} type={self.notification_type!r} status={self.status!r}>'
@@ -0,0 +1,33 @@
+"""SingleFlightLock model: cross-process lease for work that must not overlap."""
+
+from datetime import UTC, datetime
+
+from esb.extensions import db
+
+
+class SingleFlightLock(db.Model):
+    """Named lease with generation counters.
+
+    ``holder`` and ``expires_at`` describe the current lease (NULL holder
+    means free). ``generation`` is bumped each time a holder starts the work
+    and ``completed_generation`` records the last generation that finished,
+    so a waiter can tell whether a run that started after its request has
+    already done the work for it.
+    """
+
+    __tablename__ = 'single_flight_locks'
+
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False, index=True)
+    holder = db.Column(db.String(100), nullable=True)
+    expires_at = db.Column(db.DateTime, nullable=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+    completed_generation = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime, nullable=False,
+        default=lambda: datetime.now(UTC),
+        onupdate=lambda: datetime.now(UTC),
+    )
+
+    def __repr__(self):
+        return f'<SingleFlightLock {self.name!r} holder={self.holder!r}>'
@@ -19,6 +19,11 @@ class User(UserMixin, db.Model):
     password_hash = db.Column(db.String(256), nullable=False)
     role = db.Column(db.String(20), nullable=False, default='technician')
     slack_handle = db.Column(db.String(80), nullable=True)
+    # Cached Slack member ID (U...) resolved from email, so mention rendering
+    # and Slack->ESB user mapping don't need a Slack API round trip each time.
+    # Refreshed lazily by user_service once slack_user_id_resolved_at ages out.
+    slack_user_id = db.Column(db.String(32), nullable=True, index=True)
+    slack_user_id_resolved_at = db.Column(db.DateTime, nullable=True)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(
         db.DateTime, nullable=False, default=lambda: datetime.now(UTC)
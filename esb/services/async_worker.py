@@ -0,0 +1,433 @@
+"""asyncio notification worker mode (``flask worker run --async``).
+
+Drains the same queue as notification_service.run_worker_loop() with the same
+priority, retry, deferral and metrics semantics, but delivers Slack messages
+concurrently through one AsyncWebClient sharing a single aiohttp session,
+instead of blocking on one Slack call at a time.
+
+The event loop never touches the SQLAlchemy session. Database work runs on a
+single dedicated thread, each call in its own short app context, and only at
+the claim (poll) and complete (delivered/deferred/failed) boundaries plus the
+cached Slack member ID lookup. Non-Slack notifications (static page pushes)
+are synchronous and slow, so they run through process_notification() on a
+second thread that does not hold up claims and completions.
+
+Slack messages are grouped by channel lane. Each lane takes its tokens in
+queue order before its deliveries claim a concurrency slot, so a burst to one
+channel waits without holding slots that other channels' messages need.
+"""
+
+import asyncio
+import logging
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from esb.extensions import db
+from esb.models.pending_notification import PendingNotification
+from esb.services import notification_service, worker_metrics
+from esb.utils.exceptions import RateLimited
+from esb.utils.rate_limit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Rows claimed per poll. Larger than the sync worker's batch because the whole
+# batch is in flight at once, bounded by the concurrency limit.
+ASYNC_BATCH_SIZE = 500
+
+# Notification types delivered on the event loop; others use their sync handler.
+_SLACK_TYPES = {'slack_message', 'slack_crosspost'}
+
+
+@dataclass(frozen=True)
+class _Job:
+    """Plain copy of a claimed row, safe to use off the DB thread."""
+
+    id: int
+    notification_type: str
+    target: str
+    payload: dict | None
+
+
+class AsyncNotificationWorker:
+    """Concurrent notification worker driven by an asyncio event loop.
+
+    Args:
+        app: The Flask app (DB calls push their own app contexts on the DB
+            thread).
+        client: An AsyncWebClient, or None when SLACK_BOT_TOKEN is unset
+            (Slack deliveries then fail and retry like the sync worker's).
+        concurrency: Maximum deliveries in flight at once.
+        poll_interval: Idle ceiling in seconds, as for run_worker_loop().
+        batch_size: Rows claimed per poll.
+    """
+
+    def __init__(self, app, client, concurrency: int, poll_interval: int = 30,
+                 batch_size: int = ASYNC_BATCH_SIZE):
+        self.app = app
+        self.client = client
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='esb-worker-db')
+        self._blocking_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='esb-worker-push')
+        self._stop = asyncio.Event()
+        with app.app_context():
+            self._limiter = notification_service._get_rate_limiter()
+            self._heartbeat_path = Path(app.config['WORKER_HEARTBEAT_PATH'])
+
+    def stop(self) -> None:
+        """Ask run() to exit once in-flight deliveries finish."""
+        self._stop.set()
+
+    def close(self) -> None:
+        """Release the executor threads."""
+        self._db_executor.shutdown(wait=True)
+        self._blocking_executor.shutdown(wait=True)
+
+    def _call_in_app_context(self, fn, *args):
+        with self.app.app_context():
+            return fn(*args)
+
+    async def _db(self, fn, *args):
+        """Run ``fn(*args)`` on the DB thread inside a fresh app context."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, self._call_in_app_context, fn, *args)
+
+    async def _blocking(self, fn, *args):
+        """Run a slow synchronous handler on the blocking-handler thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._blocking_executor, self._call_in_app_context, fn, *args)
+
+    # -- one iteration -------------------------------------------------------
+
+    async def run_once(self) -> int:
+        """Claim one batch, deliver it concurrently, and record the outcomes.
+
+        Returns:
+            The number of notifications claimed.
+        """
+        jobs = await self._db(_claim_batch, self.batch_size)
+        notification_service._write_heartbeat(self._heartbeat_path)
+        if jobs:
+            logger.info('Processing %d pending notification(s)', len(jobs))
+            lanes: dict[str, list[_Job]] = {}
+            others = []
+            for job in jobs:
+                if job.notification_type in _SLACK_TYPES and self.client is not None:
+                    lanes.setdefault(RateLimiter.lane('chat.postMessage', job.target), []).append(job)
+                else:
+                    others.append(job)
+            await asyncio.gather(
+                *(self._run_job(job) for job in others),
+                *(self._drain_lane(lane, lane_jobs) for lane, lane_jobs in lanes.items()),
+            )
+        return len(jobs)
+
+    async def _drain_lane(self, lane: str, jobs: list[_Job]) -> None:
+        """Deliver one channel lane's jobs, taking each token before a slot.
+
+        Tokens are taken in queue order. Jobs still without a token
+        CHANNEL_MAX_TOKEN_WAIT seconds into the batch (or on a lane paused
+        for longer by a 429) are deferred, each to its projected turn on the
+        lane, so later polls pick up a lane's worth at a time instead of
+        deferring the whole backlog again.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + notification_service.CHANNEL_MAX_TOKEN_WAIT
+        deliveries = []
+        for i, job in enumerate(jobs):
+            wait = await self._acquire(lane, max(0.0, deadline - loop.time()))
+            if wait:
+                interval = self._limiter.token_interval(lane)
+                deliveries.extend(
+                    self._complete(late, 0.0, RateLimited(lane, wait + k * interval))
+                    for k, late in enumerate(jobs[i:])
+                )
+                break
+            deliveries.append(asyncio.ensure_future(self._run_job(job)))
+        await asyncio.gather(*deliveries)
+
+    async def _run_job(self, job: _Job) -> None:
+        async with self._semaphore:
+            logger.info(
+                'Processing notification %d (type=%s, target=%s)',
+                job.id, job.notification_type, job.target,
+            )
+            started = worker_metrics.clock()
+            error = None
+            try:
+                if job.notification_type in _SLACK_TYPES:
+                    await self._deliver_slack_message(job)
+                else:
+                    await self._blocking(_process_by_id, job.id)
+            except Exception as e:
+                error = e
+            duration = worker_metrics.clock() - started
+        await self._complete(job, duration, error)
+
+    async def _complete(self, job: _Job, duration: float, error: Exception | None) -> None:
+        """Record a job's outcome on the DB thread."""
+        try:
+            await self._db(_complete, job.id, job.notification_type, duration, error)
+        except Exception:
+            # The row stays pending and is claimed again on a later poll.
+            logger.error('Failed to record outcome of notification %d', job.id, exc_info=True)
+        notification_service._write_heartbeat(self._heartbeat_path)
+
+    # -- Slack delivery ------------------------------------------------------
+
+    async def _acquire(self, lane: str, max_wait: float) -> float:
+        """Take a token on ``lane``, awaiting up to ``max_wait`` seconds.
+
+        Returns:
+            0.0 when a token was taken, otherwise the remaining wait.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        while True:
+            wait = self._limiter.try_acquire(lane)
+            if wait == 0.0 or loop.time() + wait > deadline:
+                return wait
+            await asyncio.sleep(wait)
+
+    async def _deliver_slack_message(self, job: _Job) -> None:
+        """Async counterpart of notification_service._deliver_slack_message().
+
+        The caller (_drain_lane()) has already taken the channel's token.
+        """
+        if self.client is None:
+            raise RuntimeError(
+                'SLACK_BOT_TOKEN not configured -- cannot deliver Slack messages'
+            )
+        lane = RateLimiter.lane('chat.postMessage', job.target)
+        payload = dict(job.payload or {})
+
+        if payload.get('assignee_username'):
+            if payload.get('assignee_has_slack') and payload.get('assignee_email'):
+                try:
+                    slack_user_id = await self._resolve_assignee_slack_id(payload['assignee_email'])
+                    payload['assignee_display'] = f'<@{slack_user_id}>'
+                except Exception:
+                    logger.info(
+                        'Assignee Slack lookup failed for notification=%d, '
+                        'falling back to username', job.id, exc_info=True,
+                    )
+                    payload['assignee_display'] = payload['assignee_username']
+            else:
+                payload['assignee_display'] = payload['assignee_username']
+
+        text, blocks = notification_service._format_slack_message(payload)
+
+        await self._post_message(lane, job.target, text, blocks)
+        logger.info('Slack message delivered to %s (notification=%d)', job.target, job.id)
+
+    async def _post_message(self, lane: str, channel: str, text: str, blocks) -> None:
+        """Call chat.postMessage, pausing ``lane`` and raising RateLimited on a 429."""
+        try:
+            await self.client.chat_postMessage(channel=channel, text=text, blocks=blocks)
+        except Exception as e:
+            retry_after = notification_service._retry_after_seconds(e)
+            if retry_after is None:
+                raise
+            self._limiter.pause(lane, retry_after)
+            raise RateLimited(lane, retry_after) from e
+
+    async def _resolve_assignee_slack_id(self, email: str) -> str:
+        """Async counterpart of notification_service._resolve_assignee_slack_id()."""
+        user_id, cached = await self._db(_cached_slack_user_id, email)
+        if cached:
+            return cached
+
+        lane = RateLimiter.lane('users.lookupByEmail')
+        wait = self._limiter.try_acquire(lane)
+        if wait:
+            raise RateLimited(lane, wait)
+        try:
+            result = await self.client.users_lookupByEmail(email=email)
+        except Exception as e:
+            retry_after = notification_service._retry_after_seconds(e)
+            if retry_after is not None:
+                self._limiter.pause(lane, retry_after)
+            elif user_id is not None and worker_metrics.slack_error_code(e) == 'users_not_found':
+                await self._db(_store_slack_user_id, user_id, None)
+            raise
+        slack_user_id = result['user']['id']
+        if user_id is not None:
+            await self._db(_store_slack_user_id, user_id, slack_user_id)
+        return slack_user_id
+
+    # -- main loop -----------------------------------------------------------
+
+    async def _wait_for_work(self, wakeup_sock, timeout: float) -> bool:
+        """Await up to ``timeout`` seconds for a wake-up datagram or stop().
+
+        Returns True when woken by a datagram (drained, like the sync
+        worker's, so a burst of enqueues produces a single extra poll).
+        """
+        loop = asyncio.get_running_loop()
+        waiters = [asyncio.ensure_future(self._stop.wait())]
+        if wakeup_sock is not None:
+            waiters.append(asyncio.ensure_future(loop.sock_recv(wakeup_sock, 64)))
+        done, pending = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in pending:
+            waiter.cancel()
+        if wakeup_sock is None or waiters[-1] not in done:
+            return False
+        while True:
+            try:
+                wakeup_sock.recv(64)
+            except BlockingIOError:
+                return True
+
+    async def run(self) -> None:
+        """Poll and deliver until stop() is called or SIGTERM/SIGINT arrives."""
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, self._handle_signal, signum)
+
+        wakeup_path = self.app.config.get('WORKER_WAKEUP_SOCKET', '')
+        wakeup_sock = notification_service._open_wakeup_socket(wakeup_path) if wakeup_path else None
+        if wakeup_sock is None:
+            max_idle_sleep = self.poll_interval
+        else:
+            wakeup_sock.setblocking(False)
+            max_idle_sleep = max(self.poll_interval, self.app.config.get('WORKER_MAX_IDLE_INTERVAL', 60))
+        idle_sleep = max_idle_sleep
+
+        notification_service._write_heartbeat(self._heartbeat_path)
+        logger.info(
+            'Async worker started, polling at most every %d seconds (heartbeat=%s, wakeup=%s)',
+            max_idle_sleep, self._heartbeat_path, wakeup_path if wakeup_sock is not None else 'disabled',
+        )
+
+        consecutive_poll_failures = 0
+        next_prune_at = datetime.now(UTC)
+        try:
+            while not self._stop.is_set():
+                try:
+                    claimed = await self.run_once()
+                    consecutive_poll_failures = 0
+                    next_prune_at = await self._db(notification_service._finish_iteration, next_prune_at)
+                    sleep_for, idle_sleep = await self._db(
+                        notification_service._next_sleep, claimed, idle_sleep, max_idle_sleep, self.batch_size,
+                    )
+                except Exception:
+                    consecutive_poll_failures += 1
+                    backoff = min(self.poll_interval * (2 ** consecutive_poll_failures), 300)
+                    logger.error(
+                        'Error in worker polling loop (failure #%d, backoff %ds)',
+                        consecutive_poll_failures, backoff, exc_info=True,
+                    )
+                    sleep_for = backoff
+                if sleep_for > 0 and await self._wait_for_work(wakeup_sock, sleep_for):
+                    logger.debug('Worker woken by enqueue signal')
+        finally:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                loop.remove_signal_handler(signum)
+            if wakeup_sock is not None:
+                wakeup_sock.close()
+                try:
+                    os.unlink(wakeup_path)
+                except OSError:
+                    pass
+        logger.info('Worker shut down cleanly')
+
+    def _handle_signal(self, signum) -> None:
+        logger.info('Received signal %s, shutting down gracefully...', signum)
+        self.stop()
+
+
+# -- DB-thread helpers (each runs inside its own app context) ----------------
+
+def _claim_batch(batch_size: int) -> list[_Job]:
+    """Fetch ready rows and copy them out of the session."""
+    jobs = [
+        _Job(n.id, n.notification_type, n.target, n.payload)
+        for n in notification_service.get_pending_notifications(batch_size)
+    ]
+    # End the read transaction so the next poll sees a fresh snapshot.
+    db.session.rollback()
+    return jobs
+
+
+def _process_by_id(notification_id: int) -> None:
+    notification = db.session.get(PendingNotification, notification_id)
+    notification_service.process_notification(notification)
+
+
+def _complete(notification_id: int, notification_type: str, duration: float,
+              error: Exception | None) -> None:
+    """Record a delivery attempt's outcome, as the sync worker loop does."""
+    if error is not None:
+        notification_service._record_failed_attempt(notification_id, notification_type, duration, error)
+        return
+    try:
+        delivered = notification_service.mark_delivered(notification_id)
+    except Exception as e:
+        db.session.rollback()
+        notification_service._record_failed_attempt(notification_id, notification_type, duration, e)
+        return
+    logger.info('Notification %d delivered successfully', notification_id)
+    notification_service._record_delivered_attempt(delivered, duration)
+
+
+def _cached_slack_user_id(email: str) -> tuple[int | None, str | None]:
+    """Return (user_id, fresh cached Slack member ID) for the ESB user with ``email``."""
+    from esb.models.user import User
+    from esb.services import user_service
+
+    user = db.session.execute(db.select(User).filter_by(email=email)).scalars().first()
+    if user is None:
+        return None, None
+    return user.id, user_service.get_cached_slack_user_id(user)
+
+
+def _store_slack_user_id(user_id: int, slack_user_id: str | None) -> None:
+    from esb.models.user import User
+    from esb.services import user_service
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        user_service.cache_slack_user_id(user, slack_user_id)
+
+
+def run_async_worker(poll_interval: int = 30, concurrency: int | None = None) -> None:
+    """Run the asyncio worker until SIGTERM/SIGINT.
+
+    Args:
+        poll_interval: Idle ceiling in seconds, as for run_worker_loop().
+        concurrency: Maximum deliveries in flight (default
+            WORKER_ASYNC_CONCURRENCY).
+
+    Raises:
+        RuntimeError: if aiohttp (required by AsyncWebClient) is not installed.
+    """
+    from flask import current_app
+
+    try:
+        import aiohttp
+        from slack_sdk.web.async_client import AsyncWebClient
+    except ImportError as e:
+        raise RuntimeError('The async worker requires aiohttp (pip install aiohttp)') from e
+
+    app = current_app._get_current_object()
+    if concurrency is None:
+        concurrency = app.config.get('WORKER_ASYNC_CONCURRENCY', 50)
+    token = app.config.get('SLACK_BOT_TOKEN', '')
+
+    async def _main():
+        # One pooled aiohttp session for every Slack call; the connector limit
+        # matches the concurrency so in-flight deliveries never queue on it.
+        async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency)) as session:
+            client = AsyncWebClient(token=token, timeout=15, session=session) if token else None
+            worker = AsyncNotificationWorker(app, client, concurrency, poll_interval)
+            try:
+                await worker.run()
+            finally:
+                worker.close()
+
+    asyncio.run(_main())
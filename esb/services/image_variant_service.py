@@ -0,0 +1,186 @@
+"""Responsive variants of uploaded photos, built by the background worker.
+
+Phone photos are often 4-12 MB, yet pages show them as thumbnails. After a
+photo is uploaded, save_upload() queues an ``image_variants`` job on the
+notification queue. The worker writes downscaled WebP and JPEG copies at
+VARIANT_WIDTHS into a ``variants/`` folder beside the original and records the
+widths on the Document (Document.variants), for templates to offer as a
+srcset. Videos get the same variants of a frame, used as the poster, when
+ffmpeg is installed. Until a photo's job has run, pages show the original.
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from esb.extensions import db
+from esb.models.document import Document
+from esb.models.pending_notification import PendingNotification
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TYPE = 'image_variants'
+
+# Widths (px) of the variants. Only widths below the original's are built;
+# an original narrower than all of them gets a single full-width variant.
+VARIANT_WIDTHS = (320, 640, 1280)
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+IMAGE_EXTENSIONS = {'jpg', 'jpeg', 'png', 'gif', 'webp'}
+VIDEO_EXTENSIONS = {'mp4', 'mov', 'avi', 'webm'}
+_PHOTO_PARENT_TYPES = {'equipment_photo', 'repair_photo'}
+
+# Seconds ffmpeg may take to extract a video's poster frame.
+FFMPEG_TIMEOUT = 60
+
+
+def queue_variants(doc: Document) -> PendingNotification | None:
+    """Queue a variants job for an uploaded photo or video.
+
+    Returns:
+        The queued job, or None if the document is not a photo or video.
+    """
+    from esb.services import notification_service
+
+    if doc.parent_type not in _PHOTO_PARENT_TYPES:
+        return None
+    if _extension(doc) not in IMAGE_EXTENSIONS | VIDEO_EXTENSIONS:
+        return None
+    return notification_service.queue_notification(
+        NOTIFICATION_TYPE,
+        target=doc.stored_filename,
+        payload={'document_id': doc.id},
+    )
+
+
+def queue_missing_variants(*, rebuild: bool = False) -> int:
+    """Queue variants jobs for photos and videos that have none.
+
+    Args:
+        rebuild: Also queue documents whose variants were already built (or
+            could not be, e.g. videos uploaded before ffmpeg was installed).
+
+    Returns:
+        The number of jobs queued.
+    """
+    query = db.select(Document).where(Document.parent_type.in_(_PHOTO_PARENT_TYPES)).order_by(Document.id)
+    if not rebuild:
+        query = query.where(Document.variants.is_(None))
+    return sum(queue_variants(doc) is not None for doc in db.session.execute(query).scalars())
+
+
+def build_variants(notification: PendingNotification) -> list[int]:
+    """Write the variants for the job's document and record them on it.
+
+    A file that cannot be decoded (or a video without ffmpeg) is recorded as
+    having no variants rather than retried.
+
+    Returns:
+        The widths built.
+
+    Raises:
+        OSError: if the variants cannot be written (the worker will retry).
+    """
+    from esb.services import upload_service
+
+    doc = db.session.get(Document, (notification.payload or {}).get('document_id'))
+    if doc is None:
+        logger.info('Image variants skipped: document deleted (notification=%d)', notification.id)
+        return []
+    directory = upload_service.document_dir(doc)
+    source = os.path.join(directory, doc.stored_filename)  # noqa: PTH118
+
+    with tempfile.TemporaryDirectory(prefix='esb-variants-') as workdir:
+        if _extension(doc) in VIDEO_EXTENSIONS:
+            image = _video_frame(source, workdir)
+        else:
+            image = _open_image(source)
+        widths = [] if image is None else _write_variants(image, directory, doc)
+
+    doc.variants = {'widths': widths}
+    db.session.commit()
+    logger.info('Image variants built (document=%d, widths=%s)', doc.id, widths)
+    return widths
+
+
+def _extension(doc: Document) -> str:
+    return os.path.splitext(doc.stored_filename)[1].lower().lstrip('.')  # noqa: PTH122
+
+
+def _open_image(path: str) -> Image.Image | None:
+    """Decode an image at no more than about twice the largest variant's size."""
+    try:
+        image = Image.open(path)
+        # JPEGs decode at 1/2, 1/4 or 1/8 scale when that still covers the
+        # largest variant, which is most of the cost for a phone photo.
+        image.draft('RGB', (max(VARIANT_WIDTHS), max(VARIANT_WIDTHS)))
+        image.load()
+        return image
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        logger.warning('Image variants skipped: cannot decode %s (%s)', path, e)
+        return None
+
+
+def _video_frame(path: str, workdir: str) -> Image.Image | None:
+    """Extract a frame one second in (or the first, for shorter clips) with ffmpeg."""
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg is None:
+        logger.info('Video poster skipped: ffmpeg is not installed (%s)', path)
+        return None
+    frame = os.path.join(workdir, 'frame.png')  # noqa: PTH118
+    for offset in ('1', '0'):
+        try:
+            result = subprocess.run(
+                [ffmpeg, '-v', 'error', '-y', '-ss', offset, '-i', path, '-frames:v', '1', frame],
+                capture_output=True, timeout=FFMPEG_TIMEOUT, check=False,
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning('Video poster skipped: ffmpeg timed out on %s', path)
+            return None
+        if result.returncode == 0 and os.path.exists(frame):  # noqa: PTH110
+            return _open_image(frame)
+    logger.warning('Video poster skipped: ffmpeg could not read %s: %s', path, result.stderr.decode(errors='replace'))
+    return None
+
+
+def _write_variants(image: Image.Image, directory: str, doc: Document) -> list[int]:
+    """Write WebP and JPEG copies of ``image`` at each variant width."""
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if image.has_transparency_data else 'RGB')
+    widths = [w for w in VARIANT_WIDTHS if w < image.width] or [image.width]
+    os.makedirs(os.path.join(directory, 'variants'), exist_ok=True)  # noqa: PTH103, PTH118
+    # Largest first, each resized from the previous: cheaper than resizing the
+    # original every time, at no visible cost at these ratios.
+    for width in sorted(widths, reverse=True):
+        height = max(1, round(image.height * width / image.width))
+        if width != image.width:
+            image = image.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        # Saved without the original's EXIF, which may include GPS location.
+        _save(image, os.path.join(directory, doc.variant_filename(width, 'webp')),  # noqa: PTH118
+              'WEBP', quality=WEBP_QUALITY, method=4)
+        _save(_flatten(image), os.path.join(directory, doc.variant_filename(width, 'jpeg')),  # noqa: PTH118
+              'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return sorted(widths)
+
+
+def _flatten(image: Image.Image) -> Image.Image:
+    """Composite transparency onto white, for JPEG."""
+    if image.mode != 'RGBA':
+        return image
+    flat = Image.new('RGB', image.size, 'white')
+    flat.paste(image, mask=image.getchannel('A'))
+    return flat
+
+
+def _save(image: Image.Image, path: str, fmt: str, **params) -> None:
+    """Save atomically, so a page never links a half-written variant."""
+    partial = f'{path}.tmp'
+    image.save(partial, format=fmt, **params)
+    os.replace(partial, path)
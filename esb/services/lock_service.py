@@ -0,0 +1,159 @@
+"""Cross-process single-flight execution backed by a lock row.
+
+``run_single_flight(name, fn)`` guarantees that at most one process runs the
+work named ``name`` at a time. A caller that finds a run in flight waits for
+it; if that run (or a later one) *started after* the caller asked, its result
+already reflects the caller's changes and the caller returns without running
+``fn`` itself. Otherwise one waiter takes the lock and runs again on behalf
+of all of them.
+
+The lock is a ``single_flight_locks`` row rather than a MariaDB ``GET_LOCK``
+so it works on every supported database (including SQLite in tests) and does
+not pin a pooled connection for the length of the run. A holder that dies
+without releasing is recovered once its lease expires.
+"""
+
+import logging
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+
+from esb.extensions import db
+from esb.models.single_flight_lock import SingleFlightLock
+from esb.utils.exceptions import LockTimeout
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks while another process holds the lock.
+POLL_INTERVAL = 0.5
+
+
+def _ensure_row(name: str) -> None:
+    """Create the lock row on first use; a concurrent insert is fine."""
+    exists = db.session.execute(
+        select(SingleFlightLock.id).where(SingleFlightLock.name == name)
+    ).scalar_one_or_none()
+    if exists is not None:
+        return
+    db.session.add(SingleFlightLock(name=name, generation=0, completed_generation=0))
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+
+
+def _try_acquire(name: str, holder: str, lease_seconds: float) -> int | None:
+    """Take the lease if it is free or expired.
+
+    Returns:
+        The generation this holder is running, or None if the lock is held.
+    """
+    now = datetime.now(UTC)
+    result = db.session.execute(
+        update(SingleFlightLock)
+        .where(SingleFlightLock.name == name)
+        .where(or_(SingleFlightLock.holder.is_(None), SingleFlightLock.expires_at < now))
+        .values(
+            holder=holder,
+            expires_at=now + timedelta(seconds=lease_seconds),
+            generation=SingleFlightLock.generation + 1,
+            updated_at=now,
+        )
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        return None
+    generation = db.session.execute(
+        select(SingleFlightLock.generation).where(SingleFlightLock.name == name)
+    ).scalar_one()
+    db.session.commit()
+    return generation
+
+
+def _release(name: str, holder: str, completed_generation: int | None) -> None:
+    """Release the lease, recording ``completed_generation`` if the run succeeded."""
+    values: dict = {'holder': None, 'expires_at': None, 'updated_at': datetime.now(UTC)}
+    if completed_generation is not None:
+        values['completed_generation'] = completed_generation
+    db.session.rollback()  # discard anything fn() left uncommitted
+    db.session.execute(
+        update(SingleFlightLock)
+        .where(SingleFlightLock.name == name)
+        .where(SingleFlightLock.holder == holder)
+        .values(**values)
+    )
+    db.session.commit()
+
+
+def _read_state(name: str) -> tuple[int, int]:
+    """Return (generation, completed_generation) from a fresh transaction."""
+    row = db.session.execute(
+        select(SingleFlightLock.generation, SingleFlightLock.completed_generation)
+        .where(SingleFlightLock.name == name)
+    ).one()
+    # End the read transaction so the next poll sees other processes' commits
+    # under REPEATABLE READ.
+    db.session.commit()
+    return row.generation, row.completed_generation
+
+
+def run_single_flight(
+    name: str,
+    fn: Callable[[], None],
+    *,
+    lease_seconds: float = 300,
+    wait_timeout: float | None = None,
+) -> bool:
+    """Run ``fn`` unless a concurrent run that started after this call covers it.
+
+    Commits the current session (lock bookkeeping is committed as it goes),
+    so call it outside any unit of work that must stay open.
+
+    Args:
+        name: Lock name; callers doing the same work must share it.
+        fn: The work. Exceptions propagate after the lock is released, and a
+            failed run never satisfies waiters.
+        lease_seconds: How long a holder may keep the lock before another
+            process may assume it died. Must exceed fn's worst-case runtime.
+        wait_timeout: Maximum seconds to wait for other holders; defaults to
+            ``lease_seconds``.
+
+    Returns:
+        True if this call ran ``fn``; False if a concurrent run served it.
+
+    Raises:
+        LockTimeout: if the lock stayed held for longer than wait_timeout.
+    """
+    if wait_timeout is None:
+        wait_timeout = lease_seconds
+    holder = uuid.uuid4().hex
+    _ensure_row(name)
+
+    generation = _try_acquire(name, holder, lease_seconds)
+    if generation is None:
+        # The run in flight (generation ``requested``) started before this
+        # call, so only a later generation is guaranteed to include our change.
+        requested, _ = _read_state(name)
+        deadline = time.monotonic() + wait_timeout
+        logger.info('Waiting for in-flight %s run (generation %d)', name, requested)
+        while generation is None:
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f'Timed out after {wait_timeout:.0f}s waiting for {name} lock')
+            time.sleep(POLL_INTERVAL)
+            _, completed = _read_state(name)
+            if completed > requested:
+                logger.info('%s generation %d completed by another process; sharing it', name, completed)
+                return False
+            generation = _try_acquire(name, holder, lease_seconds)
+
+    try:
+        fn()
+    except BaseException:
+        _release(name, holder, None)
+        raise
+    _release(name, holder, generation)
+    return True
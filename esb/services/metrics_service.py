@@ -13,17 +13,41 @@ or a Slack outage:
   the worker has never run or the underlying query fails.
 - ``esb_socket_mode_enabled`` / ``esb_socket_mode_connected`` — Slack Socket
   Mode intent and binding state. Always emitted.
+- ``esb_slack_rate_limit_paused_until_timestamp_seconds`` /
+  ``esb_slack_rate_limit_tokens`` / ``esb_slack_rate_limited_total`` — per-lane
+  state of the worker's Slack rate limiter, labelled by ``lane``. Published by
+  the worker to ``AppConfig`` once a lane is used; omitted until then.
+- ``esb_notification_delivery_latency_seconds`` /
+  ``esb_notification_delivery_duration_seconds`` — histograms of
+  enqueue-to-delivery latency and per-attempt handler time, labelled by
+  ``type``. ``esb_notification_deliveries_total`` counts attempts by ``type``
+  and ``outcome``; ``esb_slack_api_errors_total`` counts Slack errors by
+  ``error`` code; ``esb_notifications_pruned_total`` counts retention deletes
+  by ``status``. Cumulative since worker start, published by the worker to
+  ``AppConfig``; omitted until the worker has attempted a delivery or prune.
+- ``esb_worker_resident_memory_bytes`` / ``esb_worker_gc_objects`` /
+  ``esb_worker_session_objects`` — the worker's RSS, GC-tracked object count,
+  and ORM identity-map size at the end of a poll cycle, sampled about once a
+  minute. Flat lines mean the worker is not leaking; omitted until sampled.
+- ``esb_qr_render_queue_depth`` / ``esb_qr_render_in_flight`` /
+  ``esb_qr_render_capacity`` — the QR render pool's waiting renders, accepted
+  renders and admission limit; ``esb_qr_render_duration_seconds`` /
+  ``esb_qr_render_latency_seconds`` — histograms of render time in the pool
+  process and of submit-to-result time; ``esb_qr_renders_total`` counts pool
+  renders by ``outcome``. Per app process (the pool lives in it, not the
+  database); omitted until the process has used its pool.
 
 Alert rules belong in Prometheus, not here. Example::
 
     time() - esb_oldest_pending_notification_timestamp_seconds > 300
 """
 
+import json
 import logging
 from datetime import UTC, datetime
 
 from prometheus_client import CollectorRegistry, generate_latest
-from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
 from prometheus_client.exposition import CONTENT_TYPE_LATEST
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
@@ -191,6 +215,225 @@ class _WorkerStatusCollector:
         )
 
 
+class _SlackRateLimitCollector:
+    """Custom collector for the worker's Slack rate-limit lanes.
+
+    The limiter lives in the worker process, so the worker publishes a JSON
+    snapshot to ``AppConfig`` after iterations that changed a lane; this
+    collector re-exposes it. A missing row, a failed query, or an unparsable
+    value omits the metrics rather than failing the scrape.
+    """
+
+    def collect(self):
+        from esb.services.notification_service import RATE_LIMIT_STATE_KEY
+
+        try:
+            row = db.session.execute(
+                select(AppConfig).where(AppConfig.key == RATE_LIMIT_STATE_KEY)
+            ).scalar_one_or_none()
+        except SQLAlchemyError:
+            db.session.rollback()
+            logger.warning('Failed to query Slack rate-limit state from AppConfig', exc_info=True)
+            return
+        if row is None:
+            return
+        try:
+            state = json.loads(row.value)
+            lanes = sorted(state.items())
+        except (ValueError, TypeError, AttributeError):
+            logger.warning('Failed to parse Slack rate-limit state value=%r', row.value, exc_info=True)
+            return
+
+        paused = GaugeMetricFamily(
+            'esb_slack_rate_limit_paused_until_timestamp_seconds',
+            'Unix timestamp (seconds) until which the worker holds calls on this '
+            'Slack lane after a 429 Retry-After. In the past once the pause ends.',
+            labels=['lane'],
+        )
+        tokens = GaugeMetricFamily(
+            'esb_slack_rate_limit_tokens',
+            'Tokens left in the lane bucket as of the last published snapshot. '
+            'Omitted for lanes without a configured rate.',
+            labels=['lane'],
+        )
+        limited = CounterMetricFamily(
+            'esb_slack_rate_limited',
+            'HTTP 429 responses received on this Slack lane since worker start.',
+            labels=['lane'],
+        )
+        for lane, lane_state in lanes:
+            paused.add_metric([lane], lane_state.get('paused_until', 0))
+            if lane_state.get('tokens') is not None:
+                tokens.add_metric([lane], lane_state['tokens'])
+            limited.add_metric([lane], lane_state.get('rate_limited_total', 0))
+        yield paused
+        yield tokens
+        yield limited
+
+
+class _WorkerDeliveryCollector:
+    """Custom collector for the worker's delivery histograms and counters.
+
+    Like the rate-limit lanes, these are accumulated in the worker process
+    and published as one JSON ``AppConfig`` row, so a scrape costs a single
+    primary-key read. A missing row, a failed query, or an unparsable value
+    omits the metrics rather than failing the scrape.
+    """
+
+    def collect(self):
+        from esb.services.worker_metrics import WORKER_METRICS_KEY
+
+        try:
+            row = db.session.execute(
+                select(AppConfig).where(AppConfig.key == WORKER_METRICS_KEY)
+            ).scalar_one_or_none()
+        except SQLAlchemyError:
+            db.session.rollback()
+            logger.warning('Failed to query worker delivery metrics from AppConfig', exc_info=True)
+            return
+        if row is None:
+            return
+        try:
+            state = json.loads(row.value)
+            families = [
+                self._histogram(
+                    'esb_notification_delivery_latency_seconds',
+                    'Seconds from enqueue (created_at) to delivery (delivered_at).',
+                    state['latency'],
+                ),
+                self._histogram(
+                    'esb_notification_delivery_duration_seconds',
+                    'Seconds spent in the delivery handler per attempt, any outcome.',
+                    state['duration'],
+                ),
+            ]
+            deliveries = CounterMetricFamily(
+                'esb_notification_deliveries',
+                'Delivery attempts since worker start by type and outcome '
+                '(delivered, failed, permanently_failed, deferred).',
+                labels=['type', 'outcome'],
+            )
+            for notification_type, outcomes in sorted(state['outcomes'].items()):
+                for outcome, count in sorted(outcomes.items()):
+                    deliveries.add_metric([notification_type, outcome], count)
+            errors = CounterMetricFamily(
+                'esb_slack_api_errors',
+                'Slack Web API error responses seen by the worker since start, '
+                'by Slack error code.',
+                labels=['error'],
+            )
+            for code, count in sorted(state['slack_errors'].items()):
+                errors.add_metric([code], count)
+            pruned = CounterMetricFamily(
+                'esb_notifications_pruned',
+                'Delivered / failed queue rows deleted by the worker retention '
+                'prune since worker start, by status.',
+                labels=['status'],
+            )
+            # .get(): snapshots published by an older worker lack this key.
+            for status, count in sorted(state.get('pruned', {}).items()):
+                pruned.add_metric([status], count)
+            pushes = self._static_push_metrics(state.get('static_pushes', []))
+            process = self._process_gauges(state.get('process', {}))
+        except (ValueError, TypeError, KeyError, AttributeError):
+            logger.warning('Failed to parse worker delivery metrics value=%r', row.value, exc_info=True)
+            return
+        yield from families
+        yield deliveries
+        yield errors
+        yield pruned
+        yield from pushes
+        yield from process
+
+    @staticmethod
+    def _static_push_metrics(destinations: list) -> list:
+        pushes = CounterMetricFamily(
+            'esb_static_page_pushes',
+            'Static page pushes by the worker since start, per destination and '
+            'outcome (ok, failed).',
+            labels=['method', 'target', 'outcome'],
+        )
+        last_success = GaugeMetricFamily(
+            'esb_static_page_last_success_timestamp_seconds',
+            'Unix time of the last successful static page push to each destination.',
+            labels=['method', 'target'],
+        )
+        for entry in sorted(destinations, key=lambda d: (d['method'], d['target'])):
+            labels = [entry['method'], entry['target']]
+            pushes.add_metric([*labels, 'ok'], entry['ok'])
+            pushes.add_metric([*labels, 'failed'], entry['failed'])
+            if entry['last_success'] is not None:
+                last_success.add_metric(labels, entry['last_success'])
+        return [pushes, last_success]
+
+    @staticmethod
+    def _process_gauges(process: dict) -> list[GaugeMetricFamily]:
+        gauges = []
+        for key, name, documentation in (
+            ('rss_bytes', 'esb_worker_resident_memory_bytes',
+             'Resident set size of the worker process at its last sample.'),
+            ('gc_objects', 'esb_worker_gc_objects',
+             'Objects tracked by the worker\'s garbage collector at its last sample.'),
+            ('session_objects', 'esb_worker_session_objects',
+             'ORM objects in the worker\'s session at the end of the sampled poll cycle.'),
+        ):
+            # None: not measurable on this platform (e.g. no /proc).
+            if process.get(key) is not None:
+                gauge = GaugeMetricFamily(name, documentation)
+                gauge.add_metric([], process[key])
+                gauges.append(gauge)
+        return gauges
+
+    @staticmethod
+    def _histogram(name: str, documentation: str, series: dict) -> HistogramMetricFamily:
+        family = HistogramMetricFamily(name, documentation, labels=['type'])
+        for notification_type, hist in sorted(series.items()):
+            family.add_metric(
+                [notification_type],
+                buckets=[(bound, count) for bound, count in hist['buckets']],
+                sum_value=hist['sum'],
+            )
+        return family
+
+
+class _QRRenderPoolCollector:
+    """Custom collector for this process's QR render pool (see qr_render_pool).
+
+    Reads the pool's in-memory counters, so a scrape costs no database
+    access. Emits nothing until the process has created its pool.
+    """
+
+    def collect(self):
+        from flask import current_app
+
+        pool = current_app.extensions.get('esb_qr_render_pool')
+        if pool is None:
+            return
+        stats = pool.stats()
+        for name, documentation, key in (
+            ('esb_qr_render_queue_depth', 'QR renders waiting for a free render process.', 'queued'),
+            ('esb_qr_render_in_flight', 'QR renders accepted by the pool and not yet finished.', 'in_flight'),
+            ('esb_qr_render_capacity', 'Accepted renders above which QR requests get HTTP 503.', 'capacity'),
+        ):
+            yield GaugeMetricFamily(name, documentation, value=stats[key])
+        for name, documentation, key in (
+            ('esb_qr_render_duration_seconds', 'Seconds a QR render took in its render process.', 'duration'),
+            ('esb_qr_render_latency_seconds', 'Seconds from submitting a QR render to its result.', 'latency'),
+        ):
+            family = HistogramMetricFamily(name, documentation)
+            family.add_metric([], buckets=stats[key]['buckets'], sum_value=stats[key]['sum'])
+            yield family
+        renders = CounterMetricFamily(
+            'esb_qr_renders',
+            'QR renders by the pool by outcome (ok, invalid, error, timeout, rejected). '
+            'A timed-out render is also counted when it finishes.',
+            labels=['outcome'],
+        )
+        for outcome, count in sorted(stats['outcomes'].items()):
+            renders.add_metric([outcome], count)
+        yield renders
+
+
 def render_metrics() -> tuple[bytes, str]:
     """Render the Prometheus exposition payload and content-type.
 
@@ -203,4 +446,7 @@ def render_metrics() -> tuple[bytes, str]:
     # for correctness, but pinning it makes intent unambiguous.
     registry.register(_PendingNotificationsCollector())
     registry.register(_WorkerStatusCollector())
+    registry.register(_SlackRateLimitCollector())
+    registry.register(_WorkerDeliveryCollector())
+    registry.register(_QRRenderPoolCollector())
     return generate_latest(registry), CONTENT_TYPE_LATEST
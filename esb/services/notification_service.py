@@ -1,19 +1,29 @@
 """Notification queue management and background worker."""
 
 import logging
+import os
 import signal
+import socket
 import time
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 from sqlalchemy.exc import SQLAlchemyError
 
 from esb.extensions import db
 from esb.models.app_config import AppConfig
-from esb.models.pending_notification import PendingNotification
-from esb.utils.exceptions import ValidationError
+from esb.models.pending_notification import (
+    NOTIFICATION_PRIORITIES,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    PendingNotification,
+)
+from esb.services import worker_metrics
+from esb.utils.exceptions import RateLimited, ValidationError
 from esb.utils.logging import log_mutation
+from esb.utils.rate_limit import RateLimiter
 
 logger = logging.getLogger(__name__)
 
@@ -37,11 +47,57 @@ BACKOFF_SCHEDULE = [30, 60, 120, 300, 900, 3600]
 MAX_RETRIES = 10
 
 # Valid notification types accepted by the queue
-VALID_NOTIFICATION_TYPES = {'slack_message', 'static_page_push'}
+VALID_NOTIFICATION_TYPES = {'slack_message', 'static_page_push', 'qr_sheet', 'image_variants'}
 
 # Default batch size for polling queries
 DEFAULT_BATCH_SIZE = 100
 
+# Weighted round-robin shares per priority lane within a poll batch. Each
+# round takes up to this many rows from each lane (high lane first), so the
+# high lane dominates under load but lower lanes still make progress.
+PRIORITY_WEIGHTS = {PRIORITY_HIGH: 6, PRIORITY_NORMAL: 3, PRIORITY_LOW: 1}
+
+# Routine Slack events that can wait behind reports and status changes.
+_LOW_PRIORITY_EVENTS = {'eta_updated', 'assignee_changed'}
+
+# Slack Web API pacing per method: (tokens per second, burst capacity).
+# chat.postMessage is limited per channel (about one message per second with
+# short bursts), so its lanes are keyed by channel. users.lookupByEmail is a
+# workspace-wide Tier 3 method (~50/min).
+SLACK_RATE_LIMITS = {
+    'chat.postMessage': (1.0, 3),
+    'users.lookupByEmail': (50 / 60, 5),
+}
+
+# Longest a delivery waits in-process for a token on its channel lane before
+# being deferred back to the queue. Waiting paces a burst to one channel
+# without a defer/re-claim round trip (a commit and a mutation log line) per
+# message; a longer Retry-After pause still defers.
+CHANNEL_MAX_TOKEN_WAIT = 10
+
+# Pause applied when Slack returns HTTP 429 without a usable Retry-After.
+DEFAULT_RETRY_AFTER = 30
+
+# AppConfig key holding the worker's rate-limit lane state for /metrics.
+RATE_LIMIT_STATE_KEY = 'slack_rate_limit_state'
+
+# Shortest sleep the adaptive scheduler uses right after delivering work. Idle
+# sleeps double from here up to the loop's idle ceiling, so follow-up rows
+# (e.g. the static page push queued alongside a Slack message) are picked up
+# quickly while an idle worker settles back to its normal cadence.
+MIN_IDLE_SLEEP = 1
+
+# Retention pruning of delivered / permanently failed rows. The worker runs a
+# prune at most once per PRUNE_INTERVAL, deleting PRUNE_BATCH_SIZE rows per
+# transaction and at most PRUNE_MAX_BATCHES per run, so a large backlog is
+# worked off over several runs without holding locks or starving deliveries.
+PRUNE_INTERVAL = timedelta(hours=1)
+PRUNE_BATCH_SIZE = 500
+PRUNE_MAX_BATCHES = 20
+
+# Rows per transaction for the dead-letter requeue/purge commands.
+DEAD_LETTER_BATCH_SIZE = 1000
+
 
 def _write_heartbeat(path: Path) -> None:
     """Touch the worker heartbeat file. Logged-but-swallowed on OSError so a
@@ -77,41 +133,251 @@ def _record_iteration_timestamp() -> None:
         logger.warning('Failed to update worker last-iteration timestamp', exc_info=True)
 
 
+def _get_rate_limiter() -> RateLimiter:
+    """Return the app's Slack RateLimiter, creating it on first use.
+
+    Stored on app.extensions so bucket state lives as long as the worker
+    process's app, and each test app starts with full buckets.
+    """
+    from flask import current_app
+
+    limiter = current_app.extensions.get('esb_slack_rate_limiter')
+    if limiter is None:
+        limiter = RateLimiter(SLACK_RATE_LIMITS)
+        current_app.extensions['esb_slack_rate_limiter'] = limiter
+    return limiter
+
+
+def _retry_after_seconds(error: Exception) -> float | None:
+    """Return the Retry-After delay if ``error`` is a Slack HTTP 429, else None."""
+    response = getattr(error, 'response', None)
+    if getattr(response, 'status_code', None) != 429:
+        return None
+    headers = getattr(response, 'headers', None) or {}
+    value = next(
+        (v for k, v in headers.items() if str(k).lower() == 'retry-after'), None,
+    )
+    try:
+        return max(1.0, float(value))
+    except (TypeError, ValueError):
+        return float(DEFAULT_RETRY_AFTER)
+
+
+def _record_rate_limit_state() -> None:
+    """Persist the rate limiter's lane state to AppConfig for /metrics.
+
+    Only writes when a token was taken or a lane paused since the last write,
+    or a bucket was still refilling then, so an idle worker adds no DB
+    traffic. At most one write per worker iteration. Errors are rolled back
+    and logged, mirroring _record_iteration_timestamp().
+    """
+    import json
+
+    limiter = _get_rate_limiter()
+    if not limiter.dirty:
+        return
+    if worker_metrics.publish_state(RATE_LIMIT_STATE_KEY, json.dumps(limiter.snapshot())):
+        limiter.dirty = False
+
+
+def _failure_outcome(notification: PendingNotification | None) -> str:
+    """Classify a mark_failed() result for the delivery outcome counter."""
+    if notification is not None and notification.status == 'failed':
+        return 'permanently_failed'
+    return 'failed'
+
+
+def _wake_worker() -> None:
+    """Nudge the worker to poll now via its UNIX datagram wake-up socket.
+
+    Best-effort and non-blocking: when WORKER_WAKEUP_SOCKET is unset, the
+    worker is not running, or the socket buffer is full, the worker still
+    picks the row up on its next scheduled poll.
+    """
+    from flask import current_app
+
+    path = current_app.config.get('WORKER_WAKEUP_SOCKET', '')
+    if not path:
+        return
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.sendto(b'\x01', path)
+    except OSError:
+        logger.debug('Worker wake-up via %s failed', path, exc_info=True)
+
+
+def _open_wakeup_socket(path: str) -> socket.socket | None:
+    """Bind the worker's wake-up datagram socket, replacing a stale one.
+
+    Returns None (and logs a warning) if the socket cannot be bound; the
+    worker then falls back to timed polling only.
+    """
+    try:
+        if os.path.exists(path):
+            os.unlink(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(path)
+        # The web app may run as a different user in a shared volume.
+        os.chmod(path, 0o666)
+        return sock
+    except OSError:
+        logger.warning(
+            'Failed to bind worker wake-up socket at %s; falling back to '
+            'timed polling', path, exc_info=True,
+        )
+        return None
+
+
+def _wait_for_work(wakeup_sock: socket.socket | None, timeout: float) -> bool:
+    """Sleep up to ``timeout`` seconds, returning early on a wake-up datagram.
+
+    Returns True when woken by a datagram. All pending datagrams are drained
+    so a burst of enqueues produces a single extra poll.
+    """
+    if wakeup_sock is None:
+        time.sleep(timeout)
+        return False
+    wakeup_sock.settimeout(timeout)
+    try:
+        wakeup_sock.recv(64)
+    except (TimeoutError, BlockingIOError):
+        return False
+    wakeup_sock.setblocking(False)
+    while True:
+        try:
+            wakeup_sock.recv(64)
+        except BlockingIOError:
+            return True
+
+
+def get_next_retry_at() -> datetime | None:
+    """Return the earliest next_retry_at among pending notifications.
+
+    May be in the past: a retry that fell due after the batch was claimed is
+    returned as is, and _compute_sleep() turns it into a zero sleep so the
+    worker polls again immediately. None when no retry is scheduled.
+    """
+    return db.session.execute(
+        select(db.func.min(PendingNotification.next_retry_at))
+        .where(PendingNotification.status == 'pending')
+        .where(PendingNotification.next_retry_at.is_not(None))
+    ).scalar_one_or_none()
+
+
+def _compute_sleep(idle_sleep: float, next_retry_at: datetime | None) -> float:
+    """Seconds to sleep: the idle interval, cut short by the next due retry."""
+    if next_retry_at is None:
+        return idle_sleep
+    if next_retry_at.tzinfo is None:
+        next_retry_at = next_retry_at.replace(tzinfo=UTC)
+    until_due = (next_retry_at - datetime.now(UTC)).total_seconds()
+    return max(0.0, min(idle_sleep, until_due))
+
+
+def default_priority(notification_type: str, payload: dict | None) -> int:
+    """Pick the priority lane for a notification.
+
+    Static page pushes and anything flagged ``has_safety_risk`` are high
+    priority; ETA and assignee updates and image variants are low; everything
+    else is normal.
+    """
+    payload = payload or {}
+    if notification_type == 'static_page_push' or payload.get('has_safety_risk'):
+        return PRIORITY_HIGH
+    if notification_type == 'image_variants':
+        return PRIORITY_LOW
+    if payload.get('event_type') in _LOW_PRIORITY_EVENTS:
+        return PRIORITY_LOW
+    return PRIORITY_NORMAL
+
+
+def _crosspost_channel(notification_type: str, target: str) -> str | None:
+    """Return the channel a slack_message fans out to, or None.
+
+    Area messages are cross-posted to SLACK_OOPS_CHANNEL for shop-wide
+    visibility; messages already aimed at that channel or #general are not.
+    """
+    from flask import current_app
+
+    if notification_type != 'slack_message':
+        return None
+    oops_channel = current_app.config.get('SLACK_OOPS_CHANNEL', '#oops')
+    if target in (oops_channel, '#general'):
+        return None
+    return oops_channel
+
+
 def queue_notification(
     notification_type: str,
     target: str,
     payload: dict | None = None,
+    priority: int | None = None,
 ) -> PendingNotification:
     """Insert a notification into the queue for background delivery.
 
+    A slack_message to an area channel also queues a ``slack_crosspost``
+    child row for SLACK_OOPS_CHANNEL in the same transaction. Each row is
+    delivered and retried on its own schedule, so a failed cross-post never
+    re-posts the area message and vice versa.
+
     Args:
-        notification_type: Type of notification ('slack_message', 'static_page_push').
+        notification_type: Type of notification ('slack_message', 'static_page_push', 'qr_sheet',
+            'image_variants').
         target: Delivery target (Slack channel name, push destination).
         payload: JSON-serializable data for the notification.
+        priority: Priority lane override; derived via default_priority() when None.
 
     Returns:
-        The created PendingNotification.
+        The created PendingNotification (the parent, when fanned out).
     """
     if notification_type not in VALID_NOTIFICATION_TYPES:
         raise ValidationError(
             f'Invalid notification_type: {notification_type!r}. '
             f'Must be one of: {", ".join(sorted(VALID_NOTIFICATION_TYPES))}'
         )
+    if priority is None:
+        priority = default_priority(notification_type, payload)
+    elif priority not in NOTIFICATION_PRIORITIES:
+        raise ValidationError(
+            f'Invalid priority: {priority!r}. '
+            f'Must be one of: {", ".join(str(p) for p in NOTIFICATION_PRIORITIES)}'
+        )
 
     notification = PendingNotification(
         notification_type=notification_type,
         target=target,
         payload=payload,
         status='pending',
+        priority=priority,
     )
     db.session.add(notification)
+    crosspost = None
+    crosspost_channel = _crosspost_channel(notification_type, target)
+    if crosspost_channel is not None:
+        crosspost = PendingNotification(
+            notification_type='slack_crosspost',
+            target=crosspost_channel,
+            payload=payload,
+            status='pending',
+            priority=priority,
+            parent=notification,
+        )
+        db.session.add(crosspost)
     db.session.commit()
 
-    log_mutation('notification.queued', 'system', {
+    mutation = {
         'id': notification.id,
         'type': notification_type,
         'target': target,
-    })
+        'priority': priority,
+    }
+    if crosspost is not None:
+        mutation['crosspost_id'] = crosspost.id
+        mutation['crosspost_target'] = crosspost.target
+    log_mutation('notification.queued', 'system', mutation)
+
+    _wake_worker()
 
     return notification
 
@@ -122,21 +388,44 @@ def get_pending_notifications(batch_size: int = DEFAULT_BATCH_SIZE) -> list[Pend
     Returns notifications where status is 'pending' and either
     next_retry_at is NULL (first attempt) or next_retry_at <= now.
 
+    Rows are served by weighted round-robin across priority lanes (see
+    PRIORITY_WEIGHTS): each lane is ordered by created_at, and each round
+    takes up to that lane's weight in rows, high lane first. A single query
+    ranks rows within their lane with ROW_NUMBER(), so the poll stays one
+    round-trip.
+
     Args:
         batch_size: Maximum number of notifications to return per poll cycle.
     """
     now = datetime.now(UTC)
+    lane_rank = db.func.row_number().over(
+        partition_by=PendingNotification.priority,
+        order_by=(PendingNotification.created_at.asc(), PendingNotification.id.asc()),
+    )
+    ranked = (
+        select(
+            PendingNotification.id.label('id'),
+            PendingNotification.priority.label('priority'),
+            lane_rank.label('lane_rank'),
+        )
+        .where(PendingNotification.status == 'pending')
+        .where(
+            db.or_(
+                PendingNotification.next_retry_at.is_(None),
+                PendingNotification.next_retry_at <= now,
+            )
+        )
+        .subquery()
+    )
+    # Integer-typed operands make // render as integer division on each
+    # backend (plain / on SQLite, FLOOR(... / ...) on MariaDB).
+    weight = db.type_coerce(db.case(PRIORITY_WEIGHTS, value=ranked.c.priority, else_=1), db.Integer)
+    rotation = (db.type_coerce(ranked.c.lane_rank, db.Integer) - 1) // weight
     return list(
         db.session.execute(
-            db.select(PendingNotification)
-            .filter_by(status='pending')
-            .filter(
-                db.or_(
-                    PendingNotification.next_retry_at.is_(None),
-                    PendingNotification.next_retry_at <= now,
-                )
-            )
-            .order_by(PendingNotification.created_at.asc())
+            select(PendingNotification)
+            .join(ranked, ranked.c.id == PendingNotification.id)
+            .order_by(rotation, ranked.c.priority, ranked.c.lane_rank)
             .limit(batch_size)
         ).scalars().all()
     )
@@ -160,6 +449,29 @@ def mark_delivered(notification_id: int) -> PendingNotification:
     return notification
 
 
+def defer_notification(notification_id: int, delay_seconds: float, reason: str) -> PendingNotification:
+    """Reschedule a pending notification without counting a retry.
+
+    Used when delivery is held back by a rate limit rather than failing, so
+    a burst or a Slack-side throttle cannot push rows toward MAX_RETRIES.
+    """
+    notification = db.session.get(PendingNotification, notification_id)
+    if notification is None:
+        raise ValidationError(f'Notification {notification_id} not found')
+    notification.next_retry_at = datetime.now(UTC) + timedelta(seconds=delay_seconds)
+    db.session.commit()
+
+    log_mutation('notification.deferred', 'system', {
+        'id': notification.id,
+        'type': notification.notification_type,
+        'target': notification.target,
+        'reason': reason,
+        'next_retry_at': notification.next_retry_at.isoformat(),
+    })
+
+    return notification
+
+
 def mark_failed(notification_id: int, error_message: str) -> PendingNotification:
     """Mark a notification delivery as failed with exponential backoff.
 
@@ -207,6 +519,247 @@ def mark_failed(notification_id: int, error_message: str) -> PendingNotification
     return notification
 
 
+def prune_notifications(
+    retention_days: int,
+    failed_retention_days: int,
+    batch_size: int = PRUNE_BATCH_SIZE,
+    max_batches: int = PRUNE_MAX_BATCHES,
+) -> dict[str, int]:
+    """Delete delivered and permanently failed notifications past retention.
+
+    Rows are selected oldest-first by created_at and deleted in batches of
+    ``batch_size``, each committed separately, so no single transaction
+    holds many row locks. Delivery outcomes remain in the mutation log.
+
+    Args:
+        retention_days: Age in days after which delivered rows are deleted;
+            0 or less keeps them.
+        failed_retention_days: Same, for rows with status 'failed'.
+        batch_size: Rows deleted per transaction.
+        max_batches: Cap on transactions for this call; remaining rows are
+            left for the next run.
+
+    Returns:
+        Dict mapping status to the number of rows deleted (statuses with no
+        deletions are omitted).
+    """
+    now = datetime.now(UTC)
+    pruned: dict[str, int] = {}
+    batches = 0
+    for status, days in (('delivered', retention_days), ('failed', failed_retention_days)):
+        if days <= 0:
+            continue
+        cutoff = now - timedelta(days=days)
+        while batches < max_batches:
+            ids = db.session.execute(
+                select(PendingNotification.id)
+                .where(PendingNotification.status == status)
+                .where(PendingNotification.created_at < cutoff)
+                .order_by(PendingNotification.created_at)
+                .limit(batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            db.session.execute(
+                delete(PendingNotification).where(PendingNotification.id.in_(ids))
+            )
+            db.session.commit()
+            batches += 1
+            pruned[status] = pruned.get(status, 0) + len(ids)
+            if len(ids) < batch_size:
+                break
+
+    if pruned:
+        log_mutation('notification.pruned', 'system', {
+            'pruned': pruned,
+            'retention_days': retention_days,
+            'failed_retention_days': failed_retention_days,
+        })
+    return pruned
+
+
+def _failed_filters(
+    notification_type: str | None = None,
+    target: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    error_contains: str | None = None,
+) -> list:
+    """Build WHERE clauses selecting permanently failed rows.
+
+    ``since``/``until`` bound created_at (inclusive/exclusive); naive values
+    are treated as UTC. ``error_contains`` is a literal substring match.
+    """
+    clauses = [PendingNotification.status == 'failed']
+    if notification_type:
+        clauses.append(PendingNotification.notification_type == notification_type)
+    if target:
+        clauses.append(PendingNotification.target == target)
+    if since is not None:
+        clauses.append(PendingNotification.created_at >= _as_utc(since))
+    if until is not None:
+        clauses.append(PendingNotification.created_at < _as_utc(until))
+    if error_contains:
+        clauses.append(PendingNotification.error_message.contains(error_contains, autoescape=True))
+    return clauses
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def count_failed_notifications(**filters) -> int:
+    """Count permanently failed notifications matching ``filters``.
+
+    Args:
+        **filters: notification_type, target, since, until, error_contains
+            (see _failed_filters()).
+    """
+    return db.session.execute(
+        select(db.func.count(PendingNotification.id)).where(*_failed_filters(**filters))
+    ).scalar_one()
+
+
+def list_failed_notifications(limit: int = 50, **filters) -> list[PendingNotification]:
+    """Return up to ``limit`` matching failed notifications, newest first."""
+    return list(db.session.execute(
+        select(PendingNotification)
+        .where(*_failed_filters(**filters))
+        .order_by(PendingNotification.created_at.desc(), PendingNotification.id.desc())
+        .limit(limit)
+    ).scalars())
+
+
+def _apply_to_failed_in_batches(statement_for, batch_size: int, progress, filters: dict) -> int:
+    """Run a set-based statement over matching failed rows, one id batch per commit.
+
+    Each batch selects the next ``batch_size`` matching ids and applies
+    ``statement_for(ids)``, which must take the rows out of status 'failed'
+    so the next select advances.
+    """
+    clauses = _failed_filters(**filters)
+    total = 0
+    while True:
+        ids = db.session.execute(
+            select(PendingNotification.id)
+            .where(*clauses)
+            .order_by(PendingNotification.id)
+            .limit(batch_size)
+        ).scalars().all()
+        if not ids:
+            break
+        db.session.execute(statement_for(ids), execution_options={'synchronize_session': False})
+        db.session.commit()
+        total += len(ids)
+        if progress is not None:
+            progress(len(ids))
+        if len(ids) < batch_size:
+            break
+    return total
+
+
+def _filters_for_log(filters: dict) -> dict:
+    return {
+        key: value.isoformat() if isinstance(value, datetime) else value
+        for key, value in filters.items() if value is not None
+    }
+
+
+def requeue_failed_notifications(
+    batch_size: int = DEAD_LETTER_BATCH_SIZE, progress=None, **filters,
+) -> int:
+    """Return matching failed notifications to the queue with a fresh retry budget.
+
+    Rows are reset to status 'pending' with retry_count 0 and no
+    next_retry_at, so the worker picks them up on its next poll. Updates are
+    set-based, ``batch_size`` rows per transaction.
+
+    Args:
+        batch_size: Rows updated per transaction.
+        progress: Optional callable invoked with each batch's row count.
+        **filters: notification_type, target, since, until, error_contains.
+
+    Returns:
+        Number of notifications requeued.
+    """
+    total = _apply_to_failed_in_batches(
+        lambda ids: update(PendingNotification)
+        .where(PendingNotification.id.in_(ids))
+        .values(status='pending', retry_count=0, next_retry_at=None, error_message=None),
+        batch_size, progress, filters,
+    )
+    if total:
+        log_mutation('notification.requeued', 'system', {
+            'count': total,
+            'filters': _filters_for_log(filters),
+        })
+        _wake_worker()
+    return total
+
+
+def purge_failed_notifications(
+    batch_size: int = DEAD_LETTER_BATCH_SIZE, progress=None, **filters,
+) -> int:
+    """Delete matching failed notifications in set-based batches.
+
+    Args:
+        batch_size: Rows deleted per transaction.
+        progress: Optional callable invoked with each batch's row count.
+        **filters: notification_type, target, since, until, error_contains.
+
+    Returns:
+        Number of notifications deleted.
+    """
+    total = _apply_to_failed_in_batches(
+        lambda ids: delete(PendingNotification).where(PendingNotification.id.in_(ids)),
+        batch_size, progress, filters,
+    )
+    if total:
+        log_mutation('notification.purged', 'system', {
+            'count': total,
+            'filters': _filters_for_log(filters),
+        })
+    return total
+
+
+def _run_retention_prune() -> None:
+    """Run prune_notifications() with the app's retention settings.
+
+    Called from the worker loop. Database errors are rolled back and logged;
+    the next scheduled run retries.
+    """
+    from flask import current_app
+
+    try:
+        pruned = prune_notifications(
+            current_app.config.get('NOTIFICATION_RETENTION_DAYS', 30),
+            current_app.config.get('FAILED_NOTIFICATION_RETENTION_DAYS', 90),
+        )
+    except SQLAlchemyError:
+        db.session.rollback()
+        logger.warning('Failed to prune old notifications', exc_info=True)
+        return
+    stats = worker_metrics.get_worker_metrics()
+    for status, count in pruned.items():
+        stats.record_pruned(status, count)
+    if pruned:
+        logger.info('Pruned old notifications: %s', pruned)
+
+
+def _sweep_upload_spool() -> None:
+    """Delete upload spool files left by interrupted requests.
+
+    Called from the worker loop alongside the retention prune. Filesystem
+    errors are logged; the next scheduled run retries.
+    """
+    from esb.services import upload_service
+
+    try:
+        upload_service.sweep_incoming()
+    except OSError:
+        logger.warning('Failed to sweep the upload spool directory', exc_info=True)
+
+
 def process_notification(notification: PendingNotification) -> None:
     """Dispatch a notification to the appropriate delivery handler.
 
@@ -218,7 +771,10 @@ def process_notification(notification: PendingNotification) -> None:
     """
     handlers = {
         'slack_message': _deliver_slack_message,
+        'slack_crosspost': _deliver_slack_message,
         'static_page_push': _deliver_static_page_push,
+        'qr_sheet': _deliver_qr_sheet,
+        'image_variants': _deliver_image_variants,
     }
 
     handler = handlers.get(notification.notification_type)
@@ -231,11 +787,18 @@ def process_notification(notification: PendingNotification) -> None:
 def _deliver_slack_message(notification: PendingNotification) -> None:
     """Deliver a Slack message notification via WebClient.
 
-    Posts the message to the notification's target channel and also to
-    the configured #oops channel (for visibility).
+    Posts the message to the notification's target channel only; the #oops
+    cross-post is its own ``slack_crosspost`` row (see queue_notification()).
+
+    The post is paced by the app's RateLimiter. The channel's token is taken
+    up front, waiting up to CHANNEL_MAX_TOKEN_WAIT seconds for one, so a
+    paused lane defers the notification before any other Slack call is made.
 
     Raises:
         RuntimeError: if SLACK_BOT_TOKEN is not configured.
+        RateLimited: if the primary channel's lane is paused (or still out of
+            tokens after CHANNEL_MAX_TOKEN_WAIT) or Slack answered 429
+            (worker defers without counting a retry).
         slack_sdk.errors.SlackApiError: on Slack API errors (worker will retry).
     """
     from flask import current_app
@@ -251,6 +814,11 @@ def _deliver_slack_message(notification: PendingNotification) -> None:
     # timeout caps each Slack HTTP call so a hung connection cannot wedge the
     # worker loop indefinitely.
     client = WebClient(token=token, timeout=15)
+    limiter = _get_rate_limiter()
+    lane = RateLimiter.lane('chat.postMessage', notification.target)
+    wait = limiter.acquire(lane, CHANNEL_MAX_TOKEN_WAIT)
+    if wait:
+        raise RateLimited(lane, wait)
     # Copy the payload: notification.payload aliases the ORM db.JSON attribute,
     # and the assignee_display we add below must not mutate the persisted model.
     payload = dict(notification.payload or {})
@@ -261,8 +829,7 @@ def _deliver_slack_message(notification: PendingNotification) -> None:
     if payload.get('assignee_username'):
         if payload.get('assignee_has_slack') and payload.get('assignee_email'):
             try:
-                result = client.users_lookupByEmail(email=payload['assignee_email'])
-                slack_user_id = result['user']['id']
+                slack_user_id = _resolve_assignee_slack_id(client, limiter, payload['assignee_email'])
                 payload['assignee_display'] = f'<@{slack_user_id}>'
             except Exception:
                 # Any Slack API error / missing id degrades to the plain
@@ -278,36 +845,64 @@ def _deliver_slack_message(notification: PendingNotification) -> None:
 
     text, blocks = _format_slack_message(payload)
 
-    # Post to primary target channel (area-specific or #general)
-    client.chat_postMessage(
-        channel=notification.target,
-        text=text,
-        blocks=blocks,
-    )
+    _post_message(client, limiter, lane, notification.target, text, blocks)
     logger.info(
         'Slack message delivered to %s (notification=%d)',
         notification.target, notification.id,
     )
 
-    # Post to #oops for cross-area visibility
-    oops_channel = current_app.config.get('SLACK_OOPS_CHANNEL', '#oops')
-    if notification.target not in (oops_channel, '#general'):
-        try:
-            client.chat_postMessage(
-                channel=oops_channel,
-                text=text,
-                blocks=blocks,
-            )
-            logger.info(
-                'Slack message also delivered to %s (notification=%d)',
-                oops_channel, notification.id,
-            )
-        except Exception:
-            logger.warning(
-                'Failed to post to %s (notification=%d), primary delivery succeeded',
-                oops_channel, notification.id,
-                exc_info=True,
-            )
+
+def _post_message(client, limiter: RateLimiter, lane: str, channel: str, text: str, blocks) -> None:
+    """Call chat.postMessage, pausing ``lane`` and raising RateLimited on a 429.
+
+    The caller must already hold a token for ``lane``.
+    """
+    try:
+        client.chat_postMessage(channel=channel, text=text, blocks=blocks)
+    except Exception as e:
+        retry_after = _retry_after_seconds(e)
+        if retry_after is None:
+            raise
+        limiter.pause(lane, retry_after)
+        raise RateLimited(lane, retry_after) from e
+
+
+def _resolve_assignee_slack_id(client, limiter: RateLimiter, email: str) -> str:
+    """Resolve an assignee's Slack member ID, preferring the cached value on User.
+
+    Falls back to a direct users.lookupByEmail when no ESB account matches the
+    queued email (e.g. the user was removed after the notification was queued).
+    Lookups are paced on the users.lookupByEmail lane; a 429 pauses that lane.
+
+    Raises:
+        Exception: any lookup failure (including RateLimited); the caller
+            degrades to the username.
+    """
+    from esb.models.user import User
+    from esb.services import user_service
+
+    user = db.session.execute(
+        db.select(User).filter_by(email=email)
+    ).scalars().first()
+    if user is not None:
+        cached = user_service.get_cached_slack_user_id(user)
+        if cached:
+            return cached
+
+    lane = RateLimiter.lane('users.lookupByEmail')
+    wait = limiter.try_acquire(lane)
+    if wait:
+        raise RateLimited(lane, wait)
+    try:
+        if user is not None:
+            return user_service.resolve_slack_user_id(client, user)
+        result = client.users_lookupByEmail(email=email)
+        return result['user']['id']
+    except Exception as e:
+        retry_after = _retry_after_seconds(e)
+        if retry_after is not None:
+            limiter.pause(lane, retry_after)
+        raise
 
 
 def _format_slack_message(payload: dict) -> tuple[str, list | None]:
@@ -422,18 +1017,195 @@ def _deliver_static_page_push(notification: PendingNotification) -> None:
         'Static page push triggered (notification=%d, payload=%s)',
         notification.id, notification.payload,
     )
-    static_page_service.generate_and_push()
+    if not static_page_service.generate_and_push():
+        logger.info(
+            'Static page already refreshed by a concurrent push (notification=%d)', notification.id,
+        )
+
+
+def _deliver_qr_sheet(notification: PendingNotification) -> None:
+    """Build a batch QR label sheet PDF.
+
+    Called by the background worker when processing a qr_sheet notification.
+    Delegates to qr_sheet_service, which records progress on the row as it goes.
+
+    Raises:
+        RuntimeError, ValueError, OSError: if the sheet cannot be built (worker will retry).
+    """
+    from esb.services import qr_sheet_service
+
+    path = qr_sheet_service.build_sheet(notification)
+    logger.info('QR sheet built (notification=%d, path=%s)', notification.id, path)
+
+
+def _deliver_image_variants(notification: PendingNotification) -> None:
+    """Build the resized variants of an uploaded photo or video.
+
+    Called by the background worker when processing an image_variants
+    notification. Delegates to image_variant_service.
+
+    Raises:
+        OSError: if the variants cannot be written (worker will retry).
+    """
+    from esb.services import image_variant_service
+
+    image_variant_service.build_variants(notification)
+
+
+def _record_delivered_attempt(delivered: PendingNotification, duration: float) -> None:
+    """Record a successful delivery's outcome, handler duration and latency."""
+    stats = worker_metrics.get_worker_metrics()
+    stats.record_attempt(delivered.notification_type, 'delivered', duration)
+    stats.record_latency(delivered.notification_type, delivered.created_at, delivered.delivered_at)
+
+
+def _record_failed_attempt(
+    notification_id: int, notification_type: str, duration: float, error: Exception,
+) -> None:
+    """Settle a delivery attempt that raised.
+
+    RateLimited defers the row without counting a retry; anything else goes
+    through mark_failed()'s backoff. Also records the attempt's metrics.
+    """
+    stats = worker_metrics.get_worker_metrics()
+    if isinstance(error, RateLimited):
+        defer_notification(notification_id, error.retry_after, str(error))
+        stats.record_attempt(notification_type, 'deferred', duration)
+        stats.record_slack_error(error)
+        logger.info('Notification %d deferred: %s', notification_id, error)
+        return
+    failed = mark_failed(notification_id, str(error))
+    stats.record_attempt(notification_type, _failure_outcome(failed), duration)
+    if isinstance(error, NotImplementedError):
+        logger.warning('Notification %d: %s', notification_id, error)
+        return
+    stats.record_slack_error(error)
+    logger.error(
+        'Notification %d delivery failed: %s', notification_id, error,
+        exc_info=error,
+    )
+
+
+def _finish_iteration(next_prune_at: datetime) -> datetime:
+    """Per-iteration bookkeeping after a batch has been processed.
+
+    Records the iteration timestamp, runs the retention prune when due,
+    samples process memory, and publishes rate-limit state and delivery
+    stats for /metrics.
+
+    Args:
+        next_prune_at: When the next retention prune is due.
+
+    Returns:
+        The (possibly advanced) next prune time.
+    """
+    # Called AFTER the batch, not before. The helpers' commit() with
+    # Flask-SQLAlchemy's default expire_on_commit=True would otherwise
+    # expire every loaded PendingNotification ORM instance, forcing a
+    # per-row refresh SELECT on the next attribute access inside the
+    # worker's for-loop. Placing it post-batch also gives more meaningful
+    # "successful iteration" semantics: ESBWorkerStalled fires when an
+    # iteration didn't complete, not just when a poll succeeded but
+    # processing stalled.
+    #
+    # Defensive wrapper. The helper already catches SQLAlchemyError;
+    # the only thing it can raise is a programming bug. Don't let that
+    # abort the loop — log loudly and continue.
+    try:
+        _record_iteration_timestamp()
+    except Exception:
+        # CRITICAL: roll back the session before continuing. The
+        # helper does db.session.add(AppConfig(...)) BEFORE
+        # db.session.commit(). A non-SQLAlchemyError exception
+        # (programming bug) raised between those two lines leaves an
+        # unflushed AppConfig insert pending in the session. Without
+        # this rollback, a subsequent commit in the next iteration
+        # could commit that half-baked row as a side effect.
+        # The rollback itself is wrapped: if it raises, we do NOT
+        # want the exception to escalate into the outer poll-failure
+        # except-clause and trigger exponential backoff. The
+        # defensive wrapper's whole purpose is to absorb helper bugs.
+        try:
+            db.session.rollback()
+        except Exception:
+            logger.error(
+                'BUG: rollback after _record_iteration_timestamp '
+                'failure ALSO raised — session may be wedged',
+                exc_info=True,
+            )
+        logger.error(
+            'BUG: _record_iteration_timestamp raised unexpectedly '
+            '— iteration metric will be stale',
+            exc_info=True,
+        )
+
+    # Retention runs at most hourly, before publishing so the pruned
+    # counts reach /metrics in the same iteration.
+    if datetime.now(UTC) >= next_prune_at:
+        _run_retention_prune()
+        _sweep_upload_spool()
+        next_prune_at = datetime.now(UTC) + PRUNE_INTERVAL
+
+    # Periodic memory sample. The identity-map size shows how many ORM
+    # objects this cycle's session accumulated before the caller discards it.
+    worker_metrics.get_worker_metrics().sample_process(len(db.session.identity_map))
+
+    # Publish rate-limit lane state and delivery stats for /metrics;
+    # each is a no-op unless it changed since the last write.
+    _record_rate_limit_state()
+    worker_metrics.publish_worker_metrics()
+
+    return next_prune_at
+
+
+def _release_session() -> None:
+    """Close the worker's scoped session; logged, never raised."""
+    try:
+        db.session.remove()
+    except Exception:
+        logger.warning('Failed to close worker session', exc_info=True)
+
+
+def _next_sleep(
+    batch_len: int, idle_sleep: float, max_idle_sleep: float, batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[float, float]:
+    """Adaptive scheduling: how long to sleep after a batch of ``batch_len``.
+
+    Returns:
+        Tuple of (sleep_for, next idle_sleep). sleep_for is 0 after a full
+        batch, MIN_IDLE_SLEEP after a partial one, and the current idle_sleep
+        (which then doubles up to max_idle_sleep) after an empty poll; never
+        past the earliest pending next_retry_at.
+    """
+    if batch_len:
+        idle_sleep = MIN_IDLE_SLEEP
+        sleep_for = 0 if batch_len >= batch_size else idle_sleep
+    else:
+        sleep_for = idle_sleep
+        idle_sleep = min(idle_sleep * 2, max_idle_sleep)
+    if sleep_for:
+        sleep_for = _compute_sleep(sleep_for, get_next_retry_at())
+    return sleep_for, idle_sleep
 
 
 def run_worker_loop(poll_interval: int = 30) -> None:
     """Main worker polling loop.
 
-    Polls the pending_notifications table every `poll_interval` seconds
-    and processes each ready notification. Handles errors gracefully by
-    marking failed notifications for retry.
+    Polls the pending_notifications table and processes each ready
+    notification. Handles errors gracefully by marking failed notifications
+    for retry.
+
+    Sleeps between polls are adaptive: right after delivering work the loop
+    polls again after MIN_IDLE_SLEEP, doubling while idle up to the idle
+    ceiling, and never sleeps past the earliest pending next_retry_at. A full
+    batch is followed immediately by another poll. When WORKER_WAKEUP_SOCKET
+    is configured, queue_notification() wakes the loop within a moment of a
+    new enqueue, so the idle ceiling can be raised to WORKER_MAX_IDLE_INTERVAL
+    without adding delivery latency.
 
     Args:
-        poll_interval: Seconds between polling cycles (default 30).
+        poll_interval: Idle ceiling in seconds without a wake-up socket
+            (default 30); the floor for the ceiling when one is configured.
     """
     from flask import current_app
 
@@ -449,6 +1221,14 @@ def run_worker_loop(poll_interval: int = 30) -> None:
 
     heartbeat_path = Path(current_app.config['WORKER_HEARTBEAT_PATH'])
 
+    wakeup_path = current_app.config.get('WORKER_WAKEUP_SOCKET', '')
+    wakeup_sock = _open_wakeup_socket(wakeup_path) if wakeup_path else None
+    if wakeup_sock is None:
+        max_idle_sleep = poll_interval
+    else:
+        max_idle_sleep = max(poll_interval, current_app.config.get('WORKER_MAX_IDLE_INTERVAL', 60))
+    idle_sleep = max_idle_sleep
+
     # Write an initial heartbeat so the file exists for the Docker healthcheck
     # before the first iteration completes. After this, the heartbeat is
     # refreshed at every point of forward progress: after the DB poll returns,
@@ -461,11 +1241,12 @@ def run_worker_loop(poll_interval: int = 30) -> None:
     _write_heartbeat(heartbeat_path)
 
     logger.info(
-        'Worker started, polling every %d seconds (heartbeat=%s)',
-        poll_interval, heartbeat_path,
+        'Worker started, polling at most every %d seconds (heartbeat=%s, wakeup=%s)',
+        max_idle_sleep, heartbeat_path, wakeup_path if wakeup_sock is not None else 'disabled',
     )
 
     consecutive_poll_failures = 0
+    next_prune_at = datetime.now(UTC)
 
     while not _shutdown:
         try:
@@ -480,67 +1261,33 @@ def run_worker_loop(poll_interval: int = 30) -> None:
             for notification in notifications:
                 if _shutdown:
                     break
+                notification_type = notification.notification_type
+                started = worker_metrics.clock()
                 try:
                     logger.info(
                         'Processing notification %d (type=%s, target=%s)',
-                        notification.id, notification.notification_type, notification.target,
+                        notification.id, notification_type, notification.target,
                     )
                     process_notification(notification)
-                    mark_delivered(notification.id)
+                    duration = worker_metrics.clock() - started
+                    delivered = mark_delivered(notification.id)
                     logger.info('Notification %d delivered successfully', notification.id)
-                except NotImplementedError as e:
-                    mark_failed(notification.id, str(e))
-                    logger.warning('Notification %d: %s', notification.id, e)
                 except Exception as e:
-                    mark_failed(notification.id, str(e))
-                    logger.error(
-                        'Notification %d delivery failed: %s', notification.id, e,
-                        exc_info=True,
+                    _record_failed_attempt(
+                        notification.id, notification_type, worker_metrics.clock() - started, e,
                     )
+                else:
+                    # Outside the try: a delivered row must never be marked
+                    # failed because recording its stats went wrong.
+                    _record_delivered_attempt(delivered, duration)
                 # Refresh after each notification regardless of outcome -- a
                 # long but progressing batch of slow Slack calls must not be
                 # mistaken for a hang.
                 _write_heartbeat(heartbeat_path)
 
-            # Record the iteration timestamp AFTER the for-loop, not before.
-            # The helper's commit() with Flask-SQLAlchemy's default
-            # expire_on_commit=True would otherwise expire every loaded
-            # PendingNotification ORM instance, forcing a per-row refresh
-            # SELECT on the next attribute access inside the for-loop. Placing
-            # it post-loop also gives more meaningful "successful iteration"
-            # semantics: ESBWorkerStalled fires when an iteration didn't
-            # complete, not just when a poll succeeded but processing stalled.
-            #
-            # Defensive wrapper. The helper already catches SQLAlchemyError;
-            # the only thing it can raise is a programming bug. Don't let that
-            # abort the loop — log loudly and continue.
-            try:
-                _record_iteration_timestamp()
-            except Exception:
-                # CRITICAL: roll back the session before continuing. The
-                # helper does db.session.add(AppConfig(...)) BEFORE
-                # db.session.commit(). A non-SQLAlchemyError exception
-                # (programming bug) raised between those two lines leaves an
-                # unflushed AppConfig insert pending in the session. Without
-                # this rollback, a subsequent commit in the next iteration
-                # could commit that half-baked row as a side effect.
-                # The rollback itself is wrapped: if it raises, we do NOT
-                # want the exception to escalate into the outer poll-failure
-                # except-clause and trigger exponential backoff. The
-                # defensive wrapper's whole purpose is to absorb helper bugs.
-                try:
-                    db.session.rollback()
-                except Exception:
-                    logger.error(
-                        'BUG: rollback after _record_iteration_timestamp '
-                        'failure ALSO raised — session may be wedged',
-                        exc_info=True,
-                    )
-                logger.error(
-                    'BUG: _record_iteration_timestamp raised unexpectedly '
-                    '— iteration metric will be stale',
-                    exc_info=True,
-                )
+            next_prune_at = _finish_iteration(next_prune_at)
+
+            sleep_for, idle_sleep = _next_sleep(len(notifications), idle_sleep, max_idle_sleep)
 
         except Exception:
             consecutive_poll_failures += 1
@@ -552,8 +1299,21 @@ def run_worker_loop(poll_interval: int = 30) -> None:
             if not _shutdown:
                 time.sleep(backoff)
                 continue
-
-        if not _shutdown:
-            time.sleep(poll_interval)
+        finally:
+            # Discard this cycle's session (and every ORM object it loaded)
+            # before sleeping, so a long-running worker starts each poll
+            # with an empty identity map instead of accumulating state.
+            _release_session()
+
+        if not _shutdown and sleep_for > 0:
+            if _wait_for_work(wakeup_sock, sleep_for):
+                logger.debug('Worker woken by enqueue signal')
+
+    if wakeup_sock is not None:
+        wakeup_sock.close()
+        try:
+            os.unlink(wakeup_path)
+        except OSError:
+            pass
 
     logger.info('Worker shut down cleanly')
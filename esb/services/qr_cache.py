@@ -0,0 +1,175 @@
+"""Content-addressed cache for rendered QR PNGs.
+
+Two tiers, both keyed by a hash of every render input (see
+qr_service.render_cache_key()):
+
+- a per-process in-memory LRU bounded by QR_CACHE_MEMORY_MB, which serves
+  repeat previews while a user toggles checkboxes on the QR page;
+- a disk directory (QR_CACHE_DIR, default UPLOAD_PATH/qr-cache) bounded by
+  QR_CACHE_DISK_MB and shared by every app process, which serves reprints
+  across restarts. Cached files are served back as-is, so the directory must
+  be writable only by the app: it is created owner-only, and the default is
+  never in a shared location such as the system temp directory. Least-recently
+  used files are evicted by mtime, which a hit refreshes.
+
+Keys change whenever an input does (including template artwork and font
+files), so entries never need invalidating; stale ones simply age out.
+Either tier is disabled by setting its size to 0. Disk errors are logged and
+treated as misses — the cache never fails a render.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Fraction of QR_CACHE_DISK_MB the disk tier shrinks to when it evicts, so a
+# full cache does not rescan the directory on every write.
+DISK_EVICT_TO = 0.8
+
+
+class QRRenderCache:
+    """Memory LRU in front of a size-capped disk directory."""
+
+    def __init__(self, memory_bytes: int, disk_dir: str, disk_bytes: int):
+        self.memory_bytes = memory_bytes
+        self.disk_dir = disk_dir
+        self.disk_bytes = disk_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_used = 0
+        # Bytes on disk; None until the directory is first scanned.
+        self._disk_used: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached PNG for ``key``, or None on a miss."""
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        data = self._disk_get(key)
+        if data is not None:
+            self._memory_put(key, data)
+        return data
+
+    def put(self, key: str, data: bytes, *, persist: bool = True) -> None:
+        """Cache ``data`` under ``key``.
+
+        Args:
+            persist: False keeps the entry in memory only (used for renders
+                that print the WiFi password).
+        """
+        self._memory_put(key, data)
+        if persist:
+            self._disk_put(key, data)
+
+    def _memory_put(self, key: str, data: bytes) -> None:
+        if len(data) > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_used -= len(previous)
+            self._memory[key] = data
+            self._memory_used += len(data)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f'{key}.png')  # noqa: PTH118
+
+    def _disk_get(self, key: str) -> bytes | None:
+        if self.disk_bytes <= 0:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:  # noqa: PTH123
+                data = f.read()
+            os.utime(path)  # mark as recently used for eviction
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning('QR cache read failed for %s', path, exc_info=True)
+            return None
+        return data
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        if self.disk_bytes <= 0 or len(data) > self.disk_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(self.disk_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            logger.warning('QR cache write failed for %s', path, exc_info=True)
+            return
+        with self._lock:
+            if self._disk_used is not None:
+                self._disk_used += len(data)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete least-recently-used files once the directory exceeds its cap.
+
+        Other processes write to the same directory, so the running total is
+        only an estimate; it is re-measured by each scan.
+        """
+        with self._lock:
+            if self._disk_used is not None and self._disk_used <= self.disk_bytes:
+                return
+        entries = []
+        try:
+            with os.scandir(self.disk_dir) as it:
+                for entry in it:
+                    if entry.name.endswith('.png'):
+                        st = entry.stat()
+                        entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            logger.warning('QR cache scan of %s failed', self.disk_dir, exc_info=True)
+            return
+        used = sum(size for _, size, _ in entries)
+        if used > self.disk_bytes:
+            target = self.disk_bytes * DISK_EVICT_TO
+            for _, size, path in sorted(entries):
+                if used <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # evicted concurrently by another process
+                except OSError:
+                    logger.warning('QR cache eviction of %s failed', path, exc_info=True)
+                    continue
+                used -= size
+        with self._lock:
+            self._disk_used = used
+
+
+def get_qr_cache() -> QRRenderCache:
+    """Return the app's QRRenderCache, creating it from config on first use."""
+    cache = current_app.extensions.get('esb_qr_cache')
+    if cache is None:
+        disk_dir = current_app.config.get('QR_CACHE_DIR') or os.path.join(  # noqa: PTH118
+            current_app.config['UPLOAD_PATH'], 'qr-cache',
+        )
+        cache = QRRenderCache(
+            memory_bytes=int(current_app.config.get('QR_CACHE_MEMORY_MB', 32)) * 1024 * 1024,
+            disk_dir=disk_dir,
+            disk_bytes=int(current_app.config.get('QR_CACHE_DISK_MB', 256)) * 1024 * 1024,
+        )
+        current_app.extensions['esb_qr_cache'] = cache
+    return cache
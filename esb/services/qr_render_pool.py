@@ -0,0 +1,245 @@
+"""Process pool for QR renders requested by web requests.
+
+Pillow resizing and PNG encoding hold the GIL, so a large render on a gunicorn
+thread stalls every other request in that process. Renders for requests are
+therefore run in a small pool of separate processes, bounded so a burst of
+large downloads is turned away (RenderPoolBusy, served as HTTP 503 with
+Retry-After) instead of queueing without limit.
+
+The pool only serves request threads: the background worker and CLI render in
+their own process (qr_sheet_service runs its own pool for sheets). The render
+cache stays in the web process — only cache misses reach the pool.
+
+Set QR_RENDER_WORKERS to 0 to render on the request thread instead.
+"""
+
+import functools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+from flask import current_app, has_request_context
+
+from esb.services.worker_metrics import Histogram
+from esb.utils.exceptions import RenderPoolBusy
+
+logger = logging.getLogger(__name__)
+
+# Seconds a client is asked to wait (Retry-After) when the pool is saturated.
+RETRY_AFTER_SECONDS = 5
+
+# Render-time buckets (seconds): a 2" sticker at 300 dpi is ~0.05 s, a letter
+# page at 600 dpi several seconds.
+RENDER_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+clock = time.perf_counter
+
+_create_lock = threading.Lock()
+
+
+class _Equipment(NamedTuple):
+    """The equipment fields a render reads, as a picklable stand-in for the model."""
+
+    id: int
+    name: str
+
+
+class QRRenderPool:
+    """A bounded ProcessPoolExecutor for qr_service._render_qr_png().
+
+    At most ``workers + queue_size`` renders are accepted at once; further
+    renders raise RenderPoolBusy without waiting. A caller waits at most
+    ``timeout`` seconds for its render; a render that is still running then
+    keeps its slot until it finishes, and its result is still delivered to
+    ``on_result`` (so a retry is served from the render cache).
+    """
+
+    def __init__(self, *, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.capacity = workers + max(0, queue_size)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self.in_flight = 0
+        self.outcomes: dict[str, int] = {}
+        self.duration = Histogram(RENDER_BUCKETS)
+        self.latency = Histogram(RENDER_BUCKETS)
+
+    def render(self, equipment, preset, *, on_result=None, **options) -> bytes:
+        """Render on the pool and return the PNG bytes.
+
+        Args:
+            on_result: Called with the PNG bytes once the render succeeds, from
+                a pool thread — also when the caller has already timed out.
+            **options: As for qr_service._render_qr_png().
+
+        Raises:
+            RenderPoolBusy: if the pool is full or the render timed out.
+            ValueError: as qr_service.render_qr_png().
+            RuntimeError: if the render process died.
+        """
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self._count('rejected')
+                raise RenderPoolBusy(RETRY_AFTER_SECONDS)
+            self.in_flight += 1
+            executor = self._get_executor()
+        submitted = clock()
+        try:
+            future = executor.submit(
+                _render_in_process, _Equipment(equipment.id, equipment.name), preset, options,
+            )
+        except BrokenProcessPool as e:
+            self._release()
+            self._discard(executor)
+            raise RuntimeError('QR render pool is broken') from e
+        future.add_done_callback(functools.partial(self._finished, executor, submitted, on_result))
+        try:
+            png, _seconds = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._count('timeout')
+            raise RenderPoolBusy(RETRY_AFTER_SECONDS) from None
+        except BrokenProcessPool as e:
+            raise RuntimeError('QR render process died') from e
+        return png
+
+    def stats(self) -> dict:
+        """Snapshot for the metrics endpoint."""
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'capacity': self.capacity,
+                'in_flight': self.in_flight,
+                'queued': max(0, self.in_flight - self.workers),
+                'outcomes': dict(self.outcomes),
+                'duration': self.duration.to_dict(),
+                'latency': self.latency.to_dict(),
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn, not fork: gunicorn threads and the Slack Socket Mode
+            # client may hold locks a forked child would inherit.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                # Renders here are cache misses and skip the cache, so the
+                # processes need no config: fonts come from the static folder.
+                initializer=init_render_process,
+            )
+        return self._executor
+
+    def _finished(self, executor, submitted: float, on_result, future) -> None:
+        self._release()
+        error = None if future.cancelled() else future.exception()
+        if future.cancelled() or error is not None:
+            if isinstance(error, BrokenProcessPool):
+                self._discard(executor)
+            with self._lock:
+                # A layout that does not fit is the caller's input, not a pool failure.
+                self._count('invalid' if isinstance(error, ValueError) else 'error')
+            return
+        png, seconds = future.result()
+        with self._lock:
+            self._count('ok')
+            self.duration.observe(seconds)
+            self.latency.observe(clock() - submitted)
+        if on_result is not None:
+            try:
+                on_result(png)
+            except Exception:
+                logger.warning('QR render result callback failed', exc_info=True)
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _discard(self, executor) -> None:
+        """Drop a broken executor so the next render starts a fresh pool."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _count(self, outcome: str) -> None:
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+
+def get_render_pool() -> QRRenderPool | None:
+    """Return the app's render pool for the current request, or None to render inline.
+
+    None outside a request (worker, CLI, pool processes) and when
+    QR_RENDER_WORKERS is 0.
+    """
+    if not has_request_context():
+        return None
+    workers = int(current_app.config.get('QR_RENDER_WORKERS', 0))
+    if workers <= 0:
+        return None
+    pool = current_app.extensions.get('esb_qr_render_pool')
+    if pool is None:
+        with _create_lock:
+            pool = current_app.extensions.get('esb_qr_render_pool')
+            if pool is None:
+                pool = QRRenderPool(
+                    workers=workers,
+                    queue_size=int(current_app.config.get('QR_RENDER_QUEUE_SIZE', 4)),
+                    timeout=float(current_app.config.get('QR_RENDER_TIMEOUT', 30)),
+                )
+                current_app.extensions['esb_qr_render_pool'] = pool
+    return pool
+
+
+def render_process_config() -> dict:
+    """Config for pool processes that render through qr_service.render_qr_png().
+
+    Those renders use the render cache (qr_sheet_service's sheet pool does),
+    so they need its settings and the UPLOAD_PATH its default directory is in.
+    """
+    config = {
+        key: value for key, value in current_app.config.items()
+        if key.startswith('QR_CACHE_')
+    }
+    config['UPLOAD_PATH'] = current_app.config['UPLOAD_PATH']
+    return config
+
+
+# The pool process's app context, pushed once by init_render_process().
+_process_app_context = None
+
+
+def init_render_process(config: dict | None = None) -> None:
+    """Give a pool process an app context for qr_service.
+
+    A bare Flask app rooted at the esb package serves the same static folder
+    (fonts) without the database, blueprints and extensions a full
+    create_app() sets up. ``config`` is only needed for renders that use the
+    render cache (see render_process_config()).
+    """
+    global _process_app_context
+    from flask import Flask
+
+    app = Flask('esb')
+    app.config.update(config or {})
+    _process_app_context = app.app_context()
+    _process_app_context.push()
+
+
+def _render_in_process(equipment: _Equipment, preset, options: dict) -> tuple[bytes, float]:
+    from esb.services import qr_service
+
+    started = clock()
+    png = qr_service._render_qr_png(equipment, preset, **options)
+    return png, clock() - started
@@ -3,14 +3,19 @@
 Renders QR codes as in-memory PNG bytes — either the plain layout (QR with
 optional equipment-name text above and URL text below on a white canvas) or,
 when a QR_TEMPLATE_CONFIG_PATH template is configured, composited into branded
-template artwork. No disk caching — generated on demand per request.
+template artwork. Renders are cached by a hash of their inputs in a memory
+LRU and a shared disk directory (see qr_cache). The same layout can also be
+drawn as SVG or PDF (render_qr_vector(), see qr_vector).
 """
 
+import hashlib
 import io
 import json
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from functools import lru_cache
+from functools import lru_cache, partial
 
 import qrcode
 from flask import current_app
@@ -18,6 +23,10 @@ from PIL import Image, ImageDraw, ImageFont
 
 _MIN_FONT_PT = 8
 
+# Memoized text fits (see _fit_text). A layout reuses a handful of text boxes
+# per preset and dpi, so this holds the fits for thousands of distinct names.
+_FIT_MEMO_ENTRIES = 4096
+
 # Absolute floor for template text shrinking (px). The bbox ink-height loop may
 # shrink below the 8 pt dpi-scaled _fit_text floor; below this, render nothing.
 _HARD_MIN_TEXT_PX = 4
@@ -72,6 +81,22 @@ DEFAULT_DEVICE_KEY = 'laser_300'
 # ≈ 134 MP). Cap total pixels to avoid OOM; this is a deliberate, adjustable default.
 MAX_CANVAS_PX = 50_000_000
 
+# Resolution of on-screen previews. The layout is proportional to the canvas,
+# so a preview at this dpi matches the printed label at a fraction of the
+# pixels (a 2" sticker is 300 px instead of 2400 px at 1200 dpi).
+PREVIEW_DPI = 150
+
+# Memory budget (bytes, RGB) for scaled template artwork kept between renders.
+# A 2"×2" sticker at 600 dpi is ~4 MB, a letter page at 300 dpi ~25 MB.
+TEMPLATE_ART_CACHE_BYTES = 96 * 1024 * 1024
+
+# Formats render_qr_vector() produces. Vector labels are laid out on a grid of
+# VECTOR_LAYOUT_DPI pixels per inch (module, text and bbox positions are
+# rounded to it) and then scaled to the physical size, so the file is the same
+# whichever printer it is sent to.
+VECTOR_FORMATS = ('svg', 'pdf')
+VECTOR_LAYOUT_DPI = 600
+
 
 @dataclass(frozen=True)
 class QRTemplate:
@@ -249,8 +274,8 @@ def _qr_to_image(qr, qr_px: int) -> Image.Image:
     )
 
 
-def _warn_if_marginal(equipment, preset, module_px: int) -> None:
-    if module_px < 5:
+def _warn_if_marginal(equipment, preset, module_px: int, warn: bool = True) -> None:
+    if warn and module_px < 5:
         current_app.logger.warning(
             'QR for equipment %s at preset %s has %d px modules (<5); '
             'scannability may be marginal',
@@ -262,6 +287,166 @@ def _pt_to_px(pt: int, dpi: int) -> int:
     return int(pt * dpi / 72 + 0.5)
 
 
+def canvas_size(preset: QRSizePreset, dpi: int) -> tuple[int, int]:
+    """Return the (width, height) in px of ``preset`` printed at ``dpi``.
+
+    Raises:
+        ValueError: if dpi is not positive or the canvas exceeds MAX_CANVAS_PX.
+    """
+    if dpi <= 0:
+        raise ValueError(f'dpi must be positive, got {dpi}.')
+    canvas_w_px = _px(preset.width_in, dpi)
+    canvas_h_px = _px(preset.height_in, dpi)
+    if canvas_w_px * canvas_h_px > MAX_CANVAS_PX:
+        raise ValueError(
+            f'{preset.label} at {dpi} dpi is too large to render — '
+            'choose a lower-resolution printer or a smaller size.'
+        )
+    return canvas_w_px, canvas_h_px
+
+
+def render_qr_preview_png(equipment, preset: QRSizePreset, *, dpi: int, zoom: bool = False, **options) -> bytes:
+    """Render an on-screen preview of the label ``render_qr_png`` would print.
+
+    Renders the same layout at min(dpi, PREVIEW_DPI) unless ``zoom`` asks for
+    the printer's own pixels. Anything the full-resolution render would reject
+    is rejected here too: the canvas-size guard is checked at the printer's
+    dpi, and a layout that does not fit at the preview dpi (fewer pixels per
+    QR module) is retried at the printer's dpi before being reported.
+
+    Args:
+        dpi: The selected printer's resolution.
+        zoom: Render at ``dpi`` for a pixel-accurate view.
+        **options: As for render_qr_png().
+
+    Raises:
+        ValueError: as render_qr_png() at ``dpi``.
+    """
+    canvas_size(preset, dpi)
+    preview_dpi = dpi if zoom else min(dpi, PREVIEW_DPI)
+    if preview_dpi == dpi:
+        return render_qr_png(equipment, preset, dpi=dpi, **options)
+    try:
+        return render_qr_png(equipment, preset, dpi=preview_dpi, warn=False, **options)
+    except ValueError:
+        return render_qr_png(equipment, preset, dpi=dpi, **options)
+
+
+def render_qr_vector(
+    equipment,
+    preset: QRSizePreset,
+    *,
+    fmt: str,
+    include_name: bool = False,
+    include_url: bool = False,
+    base_url: str,
+    wifi_info: str = 'none',
+    wifi_ssid: str = '',
+    wifi_password: str = '',
+    template: QRTemplate | None = None,
+) -> bytes:
+    """Render the label render_qr_png() would print as SVG or PDF bytes.
+
+    Uses the same layout as the PNG, drawn as resolution-independent shapes:
+    QR modules as rectangles and text as glyph outlines (requires fonttools).
+    Template artwork is embedded as an image at its own resolution. Vector
+    output is not cached — serializing the recorded shapes is cheap.
+
+    Raises:
+        ValueError: if ``fmt`` is not in VECTOR_FORMATS, or the content does
+            not fit the preset (as render_qr_png()).
+        RuntimeError: if fonttools is not installed.
+    """
+    from esb.services.qr_vector import VectorSurface
+
+    if fmt not in VECTOR_FORMATS:
+        raise ValueError(f'Unknown vector format: {fmt!r}')
+    surface = VectorSurface(
+        _px(preset.width_in, VECTOR_LAYOUT_DPI), _px(preset.height_in, VECTOR_LAYOUT_DPI),
+    )
+    _draw_label(
+        surface, equipment, preset,
+        dpi=VECTOR_LAYOUT_DPI,
+        include_name=include_name,
+        include_url=include_url,
+        base_url=base_url,
+        wifi_info=wifi_info,
+        wifi_ssid=wifi_ssid,
+        wifi_password=wifi_password,
+        template=template,
+        warn=False,
+    )
+    if fmt == 'svg':
+        return surface.to_svg(preset.width_in, preset.height_in)
+    return surface.to_pdf(preset.width_in, preset.height_in)
+
+
+def _file_signature(path: str) -> tuple | None:
+    """(path, mtime_ns, size) of a file whose content affects renders; None if absent."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=1)
+def _renderer_version() -> str:
+    """Identify the rendering code, so a deploy that changes it misses the disk cache."""
+    from importlib.metadata import version
+
+    with open(__file__, 'rb') as f:  # noqa: PTH123
+        source_digest = hashlib.sha256(f.read()).hexdigest()
+    return f'{source_digest}:pillow-{version("pillow")}:qrcode-{version("qrcode")}'
+
+
+def render_cache_key(
+    equipment,
+    preset: QRSizePreset,
+    *,
+    dpi: int,
+    include_name: bool,
+    include_url: bool,
+    base_url: str,
+    wifi_info: str,
+    wifi_ssid: str,
+    wifi_password: str,
+    template: QRTemplate | None,
+) -> str:
+    """Return the content address of a render: a hash of everything it depends on.
+
+    Covers the encoded URL, equipment name, physical size, dpi, include flags,
+    the WiFi rows actually printed, the renderer version, and the path, mtime
+    and size of the template image and every font the render may load, so
+    replacing artwork or a font on disk yields a new key.
+    """
+    if template is not None:
+        wifi_rows = []
+        files = [_file_signature(template.image_path), _file_signature(template.font_path)]
+        layout = [template.qr_bbox, template.name_bbox, template.url_bbox]
+    else:
+        wifi_rows = _wifi_row_texts(wifi_info, wifi_ssid, wifi_password)
+        fonts_dir = os.path.join(current_app.static_folder, 'fonts')  # noqa: PTH118
+        files = [
+            _file_signature(os.path.join(fonts_dir, 'DejaVuSans-Bold.ttf')),  # noqa: PTH118
+            _file_signature(os.path.join(fonts_dir, 'NotoEmoji-Bold.ttf')),  # noqa: PTH118
+        ]
+        layout = None
+    inputs = [
+        _renderer_version(),
+        f'{base_url}/public/equipment/{equipment.id}',
+        equipment.name,
+        [preset.width_in, preset.height_in],
+        dpi,
+        include_name,
+        include_url,
+        wifi_rows,
+        layout,
+        files,
+    ]
+    return hashlib.sha256(json.dumps(inputs).encode('utf-8')).hexdigest()
+
+
 def render_qr_png(
     equipment,
     preset: QRSizePreset,
@@ -274,6 +459,7 @@ def render_qr_png(
     wifi_ssid: str = '',
     wifi_password: str = '',
     template: QRTemplate | None = None,
+    warn: bool = True,
 ) -> bytes:
     """Render a QR code PNG for an equipment item and return the bytes.
 
@@ -283,29 +469,134 @@ def render_qr_png(
     When `template` is given, the QR and text are composited into the template
     artwork and all `wifi_*` args are ignored (WiFi info is unsupported with
     templates — bake it into the artwork).
+
+    Results are served from the render cache when an identical render (see
+    render_cache_key()) was made before. Renders that print the WiFi password
+    are cached in memory only, never written to disk. Cache misses during a
+    request are rendered on the QR render pool (see qr_render_pool).
+
+    `warn=False` suppresses the marginal-scannability warning, for renders
+    below the printer's resolution (previews).
+
+    Raises:
+        ValueError: if the content does not fit the preset at this dpi.
+        RenderPoolBusy: if the render pool is saturated or the render timed out.
     """
-    if dpi <= 0:
-        raise ValueError(f'dpi must be positive, got {dpi}.')
-    canvas_w_px = _px(preset.width_in, dpi)
-    canvas_h_px = _px(preset.height_in, dpi)
+    from esb.services import qr_cache, qr_render_pool
 
-    if canvas_w_px * canvas_h_px > MAX_CANVAS_PX:
-        raise ValueError(
-            f'{preset.label} at {dpi} dpi is too large to render — '
-            'choose a lower-resolution printer or a smaller size.'
-        )
+    options = dict(
+        dpi=dpi, include_name=include_name, include_url=include_url, base_url=base_url,
+        wifi_info=wifi_info, wifi_ssid=wifi_ssid, wifi_password=wifi_password, template=template,
+    )
+    key = render_cache_key(equipment, preset, **options)
+    cache = qr_cache.get_qr_cache()
+    png = cache.get(key)
+    if png is not None:
+        return png
+    prints_password = template is None and wifi_info == 'password' and bool(wifi_password)
+    pool = qr_render_pool.get_render_pool()
+    if pool is None:
+        png = _render_qr_png(equipment, preset, warn=warn, **options)
+        cache.put(key, png, persist=not prints_password)
+        return png
+    # The pool caches the result itself — also when this request has timed
+    # out, so the client's retry is served from the cache.
+    return pool.render(
+        equipment, preset, warn=warn,
+        on_result=partial(cache.put, key, persist=not prints_password),
+        **options,
+    )
+
+
+def _render_qr_png(
+    equipment,
+    preset: QRSizePreset,
+    *,
+    dpi: int = 300,
+    include_name: bool = False,
+    include_url: bool = False,
+    base_url: str,
+    wifi_info: str = 'none',
+    wifi_ssid: str = '',
+    wifi_password: str = '',
+    template: QRTemplate | None = None,
+    warn: bool = True,
+) -> bytes:
+    """Render without the cache; arguments as for render_qr_png()."""
+    canvas = Image.new('RGB', canvas_size(preset, dpi), 'white')
+    _draw_label(
+        _RasterSurface(canvas), equipment, preset,
+        dpi=dpi,
+        include_name=include_name,
+        include_url=include_url,
+        base_url=base_url,
+        wifi_info=wifi_info,
+        wifi_ssid=wifi_ssid,
+        wifi_password=wifi_password,
+        template=template,
+        warn=warn,
+    )
+    buf = io.BytesIO()
+    canvas.save(buf, format='PNG', dpi=(dpi, dpi))
+    return buf.getvalue()
+
+
+class _RasterSurface:
+    """Drawing target for _draw_label() that paints onto a Pillow image.
+
+    The vector formats supply the same methods (qr_vector.VectorSurface), so
+    one layout drives every output format. Coordinates are canvas pixels.
+    """
+
+    def __init__(self, image: Image.Image):
+        self.image = image
+        self.width, self.height = image.size
+
+    def fill_white(self, box: tuple[int, int, int, int]) -> None:
+        # Paste's box is exclusive like the bbox convention (ImageDraw.rectangle
+        # endpoints are inclusive and would fill one extra row/column).
+        self.image.paste((255, 255, 255), box)
+
+    def draw_qr(self, qr, x: int, y: int, module_px: int) -> None:
+        native = len(qr.get_matrix())
+        self.image.paste(_qr_to_image(qr, module_px * native), (x, y))
+
+    def draw_artwork(self, signature: tuple, source: Image.Image, box: tuple[int, int, int, int]) -> None:
+        x, y, w, h = box
+        self.image.paste(_template_art.scaled(signature, source, (w, h)), (x, y))
+
+    def draw_text(self, xy: tuple[int, int], text: str, font: ImageFont.FreeTypeFont) -> None:
+        ImageDraw.Draw(self.image).text(xy, text, fill='black', font=font)
+
+
+def _as_surface(canvas):
+    """Accept a Pillow image wherever a drawing surface is expected."""
+    return _RasterSurface(canvas) if isinstance(canvas, Image.Image) else canvas
+
+
+def _measure(text: str, font: ImageFont.FreeTypeFont) -> tuple[int, int, int, int]:
+    """Pillow's ink bbox of ``text`` drawn at the origin (independent of the surface)."""
+    return ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), text, font=font)
+
+
+def _draw_label(
+    surface, equipment, preset, *, dpi, include_name, include_url, base_url,
+    wifi_info, wifi_ssid, wifi_password, template, warn,
+) -> None:
+    """Lay out and draw a label onto ``surface``, whose size is the canvas size."""
+    canvas_w_px, canvas_h_px = surface.width, surface.height
 
     if template is not None:
-        return _render_template_png(
-            equipment, preset,
+        _draw_template_label(
+            surface, equipment, preset,
             dpi=dpi,
+            warn=warn,
             include_name=include_name,
             include_url=include_url,
             base_url=base_url,
             template=template,
-            canvas_w_px=canvas_w_px,
-            canvas_h_px=canvas_h_px,
         )
+        return
 
     wifi_rows = _wifi_row_texts(wifi_info, wifi_ssid, wifi_password)
     num_wifi_rows = len(wifi_rows)
@@ -353,17 +644,14 @@ def render_qr_png(
     module_px = avail // native
     qr_px = module_px * native
 
-    _warn_if_marginal(equipment, preset, module_px)
+    _warn_if_marginal(equipment, preset, module_px, warn)
 
-    qr_img = _qr_to_image(qr, qr_px)
-
-    canvas = Image.new('RGB', (canvas_w_px, canvas_h_px), 'white')
     paste_x = (canvas_w_px - qr_px) // 2
     paste_y = (
         reserved_wifi + reserved_top
         + ((canvas_h_px - reserved_wifi - reserved_top - reserved_bottom) - qr_px) // 2
     )
-    canvas.paste(qr_img, (paste_x, paste_y))
+    surface.draw_qr(qr, paste_x, paste_y, module_px)
 
     drawable_w = canvas_w_px - 2 * margin
     max_text_width = min(int(qr_px * 1.2), drawable_w)
@@ -373,33 +661,29 @@ def render_qr_png(
         row_top = i * wifi_row_height
         if row_info['type'] == 'header':
             _draw_wifi_header_row(
-                canvas, row_top=row_top, row_height=wifi_row_height,
+                surface, row_top=row_top, row_height=wifi_row_height,
                 max_width_px=wifi_max_text_width, dpi=dpi,
             )
         else:
             _draw_text_row(
-                canvas, row_info['text'],
+                surface, row_info['text'],
                 row_top=row_top, row_height=wifi_row_height,
-                max_width_px=wifi_max_text_width, dpi=dpi,
+                max_width_px=wifi_max_text_width, dpi=dpi, memo=not row_info.get('secret'),
             )
 
     if include_name:
         _draw_text_row(
-            canvas, equipment.name,
+            surface, equipment.name,
             row_top=reserved_wifi, row_height=reserved_top, max_width_px=max_text_width, dpi=dpi,
         )
     if include_url:
         _draw_text_row(
-            canvas, qr_url,
+            surface, qr_url,
             row_top=canvas_h_px - reserved_bottom,
             row_height=reserved_bottom,
             max_width_px=max_text_width, dpi=dpi,
         )
 
-    buf = io.BytesIO()
-    canvas.save(buf, format='PNG', dpi=(dpi, dpi))
-    return buf.getvalue()
-
 
 def _open_template_rgb(image_path: str) -> Image.Image:
     """Open a template image normalized to RGB, flattening alpha onto white.
@@ -425,19 +709,87 @@ def _open_template_rgb(image_path: str) -> Image.Image:
         ) from exc
 
 
-def _render_template_png(
-    equipment, preset, *, dpi, include_name, include_url, base_url, template,
-    canvas_w_px, canvas_h_px,
-) -> bytes:
+class _TemplateArtCache:
+    """Flattened template artwork and its LANCZOS-scaled variants.
+
+    Decoding, flattening and resizing a high-resolution template dominates a
+    template render, yet the result only depends on the image file and the
+    output size. The flattened source is kept per image path; scaled variants
+    are kept in an LRU bounded by ``max_bytes``. Entries are keyed by the
+    file's (path, mtime_ns, size), so artwork replaced on disk is reloaded on
+    the next render. Cached images are shared between threads and must only
+    be read (paste from them, never draw on them).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._sources: dict[str, tuple[tuple, Image.Image]] = {}
+        self._scaled: OrderedDict[tuple, Image.Image] = OrderedDict()
+        self._scaled_bytes = 0
+        self._lock = threading.Lock()
+
+    def source(self, image_path: str) -> tuple[tuple, Image.Image]:
+        """Return (file signature, flattened RGB image) for ``image_path``."""
+        st = os.stat(image_path)
+        signature = (image_path, st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._sources.get(image_path)
+            if cached is not None and cached[0] == signature:
+                return cached
+        img = _open_template_rgb(image_path)
+        with self._lock:
+            self._sources[image_path] = (signature, img)
+            # Variants of the replaced artwork can never be hit again.
+            for key in [k for k in self._scaled if k[0][0] == image_path and k[0] != signature]:
+                self._scaled_bytes -= _rgb_bytes(self._scaled.pop(key))
+        return signature, img
+
+    def scaled(self, signature: tuple, img: Image.Image, size: tuple[int, int]) -> Image.Image:
+        """Return ``img`` (identified by ``signature``) resized to ``size``."""
+        key = (signature, size)
+        with self._lock:
+            cached = self._scaled.get(key)
+            if cached is not None:
+                self._scaled.move_to_end(key)
+                return cached
+        resized = img.resize(size, Image.LANCZOS)
+        nbytes = _rgb_bytes(resized)
+        if nbytes > self.max_bytes:
+            return resized
+        with self._lock:
+            if key not in self._scaled:
+                self._scaled[key] = resized
+                self._scaled_bytes += nbytes
+            while self._scaled_bytes > self.max_bytes:
+                _, evicted = self._scaled.popitem(last=False)
+                self._scaled_bytes -= _rgb_bytes(evicted)
+        return resized
+
+
+def _rgb_bytes(img: Image.Image) -> int:
+    return img.width * img.height * 3
+
+
+_template_art = _TemplateArtCache(TEMPLATE_ART_CACHE_BYTES)
+
+
+def preload_template_artwork(template: QRTemplate) -> None:
+    """Decode and flatten the template image now rather than on the first render."""
+    _template_art.source(template.image_path)
+
+
+def _draw_template_label(
+    surface, equipment, preset, *, dpi, include_name, include_url, base_url, template, warn=True,
+) -> None:
     """Render the QR (and optional name/URL text) into a branded template.
 
     Render order keeps the QR crisp: scale the template to the output size
-    FIRST (LANCZOS), map bboxes by the same factor, white-fill enabled bboxes
+    FIRST (LANCZOS, cached per output size in _template_art), map bboxes by the same factor, white-fill enabled bboxes
     (replacing any mock-up placeholder artwork), then draw the QR at integer
     module size with NEAREST and fit text into the scaled bboxes. The QR is
     never resampled after drawing — modules stay pure black/white.
     """
-    tpl = _open_template_rgb(template.image_path)
+    signature, tpl = _template_art.source(template.image_path)
     if tpl.size != (template.image_w, template.image_h):
         # The bboxes were validated against the startup dimensions; resizing a
         # dimension-changed replacement to the stale targets would silently
@@ -447,15 +799,13 @@ def _render_template_png(
             f'({tpl.size[0]}×{tpl.size[1]} vs validated '
             f'{template.image_w}×{template.image_h}) — restart the app.'
         )
+    canvas_w_px, canvas_h_px = surface.width, surface.height
     s = min(canvas_w_px / template.image_w, canvas_h_px / template.image_h)
     scaled_w = max(1, round(template.image_w * s))
     scaled_h = max(1, round(template.image_h * s))
-    tpl = tpl.resize((scaled_w, scaled_h), Image.LANCZOS)
-
-    canvas = Image.new('RGB', (canvas_w_px, canvas_h_px), 'white')
     off_x = (canvas_w_px - scaled_w) // 2
     off_y = (canvas_h_px - scaled_h) // 2
-    canvas.paste(tpl, (off_x, off_y))
+    surface.draw_artwork(signature, tpl, (off_x, off_y, scaled_w, scaled_h))
 
     def scale_bbox(bbox):
         x0, y0, x1, y1 = bbox
@@ -464,12 +814,10 @@ def _render_template_png(
             off_x + round(x1 * s), off_y + round(y1 * s),
         )
 
-    # White-fill via paste — its box is exclusive like the bbox convention
-    # (ImageDraw.rectangle endpoints are inclusive and would fill one extra
-    # row/column). The fill replaces any placeholder artwork and guarantees
-    # QR contrast and a clean margin regardless of the artwork.
+    # The white fill replaces any placeholder artwork and guarantees QR
+    # contrast and a clean margin regardless of the artwork.
     qr_box = scale_bbox(template.qr_bbox)
-    canvas.paste((255, 255, 255), qr_box)
+    surface.fill_white(qr_box)
 
     qr_url = f'{base_url}/public/equipment/{equipment.id}'
     qr, native = _build_qr(qr_url)
@@ -481,26 +829,23 @@ def _render_template_png(
             'QR template box is too small at this size/resolution — '
             'choose a larger size or higher-resolution printer.'
         )
-    _warn_if_marginal(equipment, preset, module_px)
+    _warn_if_marginal(equipment, preset, module_px, warn)
     qr_px = module_px * native
-    qr_img = _qr_to_image(qr, qr_px)
-    canvas.paste(qr_img, (
+    surface.draw_qr(
+        qr,
         qr_box[0] + (qr_box_w - qr_px) // 2,
         qr_box[1] + (qr_box_h - qr_px) // 2,
-    ))
+        module_px,
+    )
 
     if include_name:
         name_box = scale_bbox(template.name_bbox)
-        canvas.paste((255, 255, 255), name_box)
-        _draw_text_in_bbox(canvas, equipment.name, name_box, template.font_path, dpi=dpi)
+        surface.fill_white(name_box)
+        _draw_text_in_bbox(surface, equipment.name, name_box, template.font_path, dpi=dpi)
     if include_url and template.url_bbox is not None:
         url_box = scale_bbox(template.url_bbox)
-        canvas.paste((255, 255, 255), url_box)
-        _draw_text_in_bbox(canvas, qr_url, url_box, template.font_path, dpi=dpi)
-
-    buf = io.BytesIO()
-    canvas.save(buf, format='PNG', dpi=(dpi, dpi))
-    return buf.getvalue()
+        surface.fill_white(url_box)
+        _draw_text_in_bbox(surface, qr_url, url_box, template.font_path, dpi=dpi)
 
 
 def _draw_text_in_bbox(canvas, text, bbox, font_path, *, dpi: int = 300):
@@ -514,58 +859,55 @@ def _draw_text_in_bbox(canvas, text, bbox, font_path, *, dpi: int = 300):
     until both fit. If nothing fits at the hard minimum, render nothing (the
     bbox stays white-filled and blank).
     """
+    surface = _as_surface(canvas)
     x0, y0, x1, y1 = bbox
     box_w = x1 - x0
     box_h = y1 - y0
     if box_w <= 0 or box_h <= 0:
         return
-    scratch = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    fit = _fit_text_in_box(text, box_w, box_h, font_path, dpi)
+    if fit is None:
+        current_app.logger.warning(
+            'QR template: text %r does not fit bbox %s even at the %d px hard '
+            'minimum; leaving the box blank', text, bbox, _HARD_MIN_TEXT_PX,
+        )
+        return
+    size_px, rendered = fit
+    font = _load_font(font_path, size_px)
+
+    left, top, right, bottom = _measure(rendered, font)
+    width = right - left
+    height = bottom - top
+    x = x0 + (box_w - width) // 2 - left
+    y = y0 + (box_h - height) // 2 - top
+    surface.draw_text((x, y), rendered, font)
 
-    def width_at(t, f):
-        left, _, right, _ = scratch.textbbox((0, 0), t, font=f)
-        return right - left
 
+@lru_cache(maxsize=_FIT_MEMO_ENTRIES)
+def _fit_text_in_box(text, box_w, box_h, font_path, dpi) -> tuple[int, str] | None:
+    """(size_px, rendered_text) for _draw_text_in_bbox(); None if nothing fits."""
     # Starting size only — even when _fit_text gives up ('' at its floor),
     # the loop below keeps shrinking beneath that floor.
-    font, _ = _fit_text(
-        text, max_width_px=box_w, max_height_px=box_h, font_path=font_path, dpi=dpi,
-    )
-    size_px = font.size
-    fits = False
-    rendered = ''
+    size_px, _ = _fit_text_size(text, box_w, box_h, font_path, dpi)
     while size_px >= _HARD_MIN_TEXT_PX:
         font = _load_font(font_path, size_px)
         # Re-ellipsize at every size — a smaller font fits more characters
         # than the prefix chosen at a larger one.
-        rendered = _ellipsize(text, font, box_w, width_at)
+        rendered = _ellipsize(text, font, box_w)
         if rendered == '':
             # Even the ellipsis is too wide — shrink proportionally to the
             # ellipsis overshoot (guaranteed to decrease).
-            ellipsis_w = width_at('…', font)
+            ellipsis_w = _ink_width('…', font)
             size_px = min(size_px - 1, int(size_px * box_w / ellipsis_w))
             continue
-        left, top, right, bottom = scratch.textbbox((0, 0), rendered, font=font)
+        _left, top, _right, bottom = _measure(rendered, font)
         ink_h = bottom - top
         if ink_h <= box_h:
-            fits = True
-            break
+            return size_px, rendered
         # Proportional shrink (guaranteed to decrease) — ink overshoot is
         # typically small (~1.26× worst observed), so this converges fast.
         size_px = min(size_px - 1, int(size_px * box_h / ink_h))
-    if not fits:
-        current_app.logger.warning(
-            'QR template: text %r does not fit bbox %s even at the %d px hard '
-            'minimum; leaving the box blank', text, bbox, _HARD_MIN_TEXT_PX,
-        )
-        return
-
-    draw = ImageDraw.Draw(canvas)
-    left, top, right, bottom = draw.textbbox((0, 0), rendered, font=font)
-    width = right - left
-    height = bottom - top
-    x = x0 + (box_w - width) // 2 - left
-    y = y0 + (box_h - height) // 2 - top
-    draw.text((x, y), rendered, fill='black', font=font)
+    return None
 
 
 def _wifi_row_texts(wifi_info, wifi_ssid, wifi_password):
@@ -574,7 +916,8 @@ def _wifi_row_texts(wifi_info, wifi_ssid, wifi_password):
     Defensive: only renders known wifi_info values ('header', 'ssid', 'password').
     Any other value (including 'none', None, or garbage) renders nothing.
     Also requires non-empty SSID for 'ssid'/'password' and non-empty password
-    for 'password'; degrades silently if requirements unmet.
+    for 'password'; degrades silently if requirements unmet. The password row
+    is marked ``secret`` so its fit is not memoized.
     """
     if wifi_info not in ('header', 'ssid', 'password'):
         return []
@@ -582,11 +925,11 @@ def _wifi_row_texts(wifi_info, wifi_ssid, wifi_password):
     if wifi_info in ('ssid', 'password') and wifi_ssid:
         rows.append({'type': 'text', 'text': f'Network: {wifi_ssid}'})
     if wifi_info == 'password' and wifi_ssid and wifi_password:
-        rows.append({'type': 'text', 'text': f'Password: {wifi_password}'})
+        rows.append({'type': 'text', 'text': f'Password: {wifi_password}', 'secret': True})
     return rows
 
 
-def _draw_wifi_header_row(canvas, *, row_top, row_height, max_width_px, dpi: int = 300):
+def _draw_wifi_header_row(surface, *, row_top, row_height, max_width_px, dpi: int = 300):
     """Draw the WiFi emoji + 'Must be on WiFi' text centered in a row."""
     text_font_path = os.path.join(current_app.static_folder, 'fonts', 'DejaVuSans-Bold.ttf')  # noqa: PTH118
     emoji_font_path = os.path.join(current_app.static_folder, 'fonts', 'NotoEmoji-Bold.ttf')  # noqa: PTH118
@@ -596,7 +939,7 @@ def _draw_wifi_header_row(canvas, *, row_top, row_height, max_width_px, dpi: int
             'QR WiFi emoji font missing at %s — falling back to text-only header.',
             emoji_font_path,
         )
-        _draw_text_row(canvas, label, row_top=row_top, row_height=row_height, max_width_px=max_width_px, dpi=dpi)
+        _draw_text_row(surface, label, row_top=row_top, row_height=row_height, max_width_px=max_width_px, dpi=dpi)
         return
     gap = max(4, row_height // 10)
 
@@ -609,19 +952,18 @@ def _draw_wifi_header_row(canvas, *, row_top, row_height, max_width_px, dpi: int
 
     emoji_size_px = text_font.size
     emoji_font = _load_font(emoji_font_path, emoji_size_px)
-    draw = ImageDraw.Draw(canvas)
 
     emoji_char = '\U0001f6dc'
-    e_left, e_top, e_right, e_bottom = draw.textbbox((0, 0), emoji_char, font=emoji_font)
+    e_left, e_top, e_right, e_bottom = _measure(emoji_char, emoji_font)
     emoji_w = e_right - e_left
     emoji_h = e_bottom - e_top
 
-    t_left, t_top, t_right, t_bottom = draw.textbbox((0, 0), rendered, font=text_font)
+    t_left, t_top, t_right, t_bottom = _measure(rendered, text_font)
     text_w = t_right - t_left
     text_h = t_bottom - t_top
 
     if emoji_w + gap >= max_width_px:
-        _draw_text_row(canvas, label, row_top=row_top, row_height=row_height, max_width_px=max_width_px, dpi=dpi)
+        _draw_text_row(surface, label, row_top=row_top, row_height=row_height, max_width_px=max_width_px, dpi=dpi)
         return
 
     total_w = emoji_w + gap + text_w
@@ -631,23 +973,23 @@ def _draw_wifi_header_row(canvas, *, row_top, row_height, max_width_px, dpi: int
             max_height_px=row_height, font_path=text_font_path, dpi=dpi,
         )
         if rendered == '':
-            _draw_text_row(canvas, label, row_top=row_top, row_height=row_height, max_width_px=max_width_px, dpi=dpi)
+            _draw_text_row(surface, label, row_top=row_top, row_height=row_height, max_width_px=max_width_px, dpi=dpi)
             return
-        t_left, t_top, t_right, t_bottom = draw.textbbox((0, 0), rendered, font=text_font)
+        t_left, t_top, t_right, t_bottom = _measure(rendered, text_font)
         text_w = t_right - t_left
         text_h = t_bottom - t_top
         total_w = emoji_w + gap + text_w
 
-    group_x = (canvas.width - total_w) // 2
+    group_x = (surface.width - total_w) // 2
     emoji_y = row_top + (row_height - emoji_h) // 2 - e_top
     text_y = row_top + (row_height - text_h) // 2 - t_top
 
-    draw.text((group_x - e_left, emoji_y), emoji_char, fill='black', font=emoji_font)
-    draw.text((group_x + emoji_w + gap - t_left, text_y), rendered, fill='black', font=text_font)
+    surface.draw_text((group_x - e_left, emoji_y), emoji_char, emoji_font)
+    surface.draw_text((group_x + emoji_w + gap - t_left, text_y), rendered, text_font)
 
 
-def _draw_text_row(canvas, text, *, row_top, row_height, max_width_px, dpi: int = 300):
-    """Draw centered text in a horizontal row region of the canvas."""
+def _draw_text_row(surface, text, *, row_top, row_height, max_width_px, dpi: int = 300, memo: bool = True):
+    """Draw centered text in a horizontal row region of the surface."""
     font_path = os.path.join(current_app.static_folder, 'fonts', 'DejaVuSans-Bold.ttf')  # noqa: PTH118
     if not os.path.isfile(font_path):
         raise RuntimeError(
@@ -660,59 +1002,127 @@ def _draw_text_row(canvas, text, *, row_top, row_height, max_width_px, dpi: int
         max_height_px=row_height,
         font_path=font_path,
         dpi=dpi,
+        memo=memo,
     )
     if rendered == '':
         return
-    draw = ImageDraw.Draw(canvas)
-    (left, top, right, bottom) = draw.textbbox((0, 0), rendered, font=font)
+    (left, top, right, bottom) = _measure(rendered, font)
     width = right - left
     height = bottom - top
-    x = (canvas.width - width) // 2 - left
+    x = (surface.width - width) // 2 - left
     y = row_top + (row_height - height) // 2 - top
-    draw.text((x, y), rendered, fill='black', font=font)
+    surface.draw_text((x, y), rendered, font)
 
 
-def _fit_text(text, *, max_width_px, max_height_px, font_path, dpi: int = 300):
+def _fit_text(text, *, max_width_px, max_height_px, font_path, dpi: int = 300, memo: bool = True):
     """Return (font, rendered_text) fitting within max_width_px at ≤ max_height_px.
 
-    Shrinks font toward the 8 pt floor; if still too wide at the floor,
-    truncates with an ellipsis (binary-search); if even ellipsis alone
-    doesn't fit, returns the min-size font and an empty string.
+    Picks the largest font size up to max_height_px at which the text fits,
+    down to the 8 pt floor; if still too wide at the floor, truncates with an
+    ellipsis; if even ellipsis alone doesn't fit, returns the min-size font
+    and an empty string. Results are memoized (see _fit_text_size) unless
+    ``memo`` is false, as for a WiFi password, which must not stay in a
+    process-wide cache.
     """
+    fit = _fit_text_size if memo else _fit_text_size.__wrapped__
+    size_px, rendered = fit(text, max_width_px, max_height_px, font_path, dpi)
+    return _load_font(font_path, size_px), rendered
+
+
+@lru_cache(maxsize=_FIT_MEMO_ENTRIES)
+def _fit_text_size(text, max_width_px, max_height_px, font_path, dpi) -> tuple[int, str]:
+    """(size_px, rendered_text) for _fit_text()."""
     min_px = _pt_to_px(_MIN_FONT_PT, dpi)
-    size_px = max_height_px
-    step = max(1, int(max_height_px * 0.05))
-    scratch = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+    size_px = _largest_fitting_size(text, font_path, min_px, max_height_px, max_width_px)
+    if size_px is not None:
+        return size_px, text
+    return min_px, _ellipsize(text, _load_font(font_path, min_px), max_width_px)
 
-    def width_at(t, font):
-        left, _, right, _ = scratch.textbbox((0, 0), t, font=font)
-        return right - left
 
-    while size_px >= min_px:
-        font = _load_font(font_path, size_px)
-        if width_at(text, font) <= max_width_px:
-            return font, text
-        size_px -= step
+@lru_cache(maxsize=256)
+def _glyph_advances(font_path: str, size_px: int) -> dict[str, float]:
+    """Per-character advance widths (px) of a font size, filled in on first use."""
+    return {}
+
+
+def _estimate_widths(text, font) -> list[float]:
+    """Running widths of text's prefixes, from cached glyph advances.
+
+    Entry i estimates the width of text[:i]. The sum of advances differs from
+    Pillow's measurement only by kerning and rounding (a few px), so callers
+    search on the estimate and confirm the answer with _ink_width().
+    """
+    advances = _glyph_advances(font.path, font.size)
+    widths = [0.0]
+    for ch in text:
+        advance = advances.get(ch)
+        if advance is None:
+            advance = advances[ch] = font.getlength(ch)
+        widths.append(widths[-1] + advance)
+    return widths
+
 
-    font = _load_font(font_path, min_px)
-    return font, _ellipsize(text, font, max_width_px, width_at)
+def _ink_width(text, font) -> int:
+    left, _, right, _ = _measure(text, font)
+    return right - left
 
 
-def _ellipsize(text, font, max_width_px, width_at):
+def _largest_fitting_size(text, font_path, min_px, max_px, max_width_px) -> int | None:
+    """Largest size in [min_px, max_px] at which text is at most max_width_px wide.
+
+    Binary-searches the size on estimated widths, then steps by single sizes
+    on measured widths until the answer is exact. None if nothing fits.
+    """
+    if max_px < min_px:
+        return None
+
+    def estimate(size_px):
+        return _estimate_widths(text, _load_font(font_path, size_px))[-1]
+
+    def fits(size_px):
+        return _ink_width(text, _load_font(font_path, size_px)) <= max_width_px
+
+    lo, hi = min_px, max_px
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate(mid) <= max_width_px:
+            lo = mid
+        else:
+            hi = mid - 1
+    size_px = lo
+    if fits(size_px):
+        while size_px < max_px and fits(size_px + 1):
+            size_px += 1
+        return size_px
+    while size_px > min_px:
+        size_px -= 1
+        if fits(size_px):
+            return size_px
+    return None
+
+
+def _ellipsize(text, font, max_width_px):
     """Return text fitted to max_width_px at this font.
 
-    Unchanged if it fits; otherwise the largest '…'-suffixed prefix
-    (binary search); '' if even the ellipsis alone is too wide.
+    Unchanged if it fits; otherwise the longest '…'-suffixed prefix (binary
+    search on estimated widths, confirmed by measurement); '' if even the
+    ellipsis alone is too wide.
     """
-    if width_at(text, font) <= max_width_px:
+    if _ink_width(text, font) <= max_width_px:
         return text
-    if width_at('…', font) > max_width_px:
+    if _ink_width('…', font) > max_width_px:
         return ''
+    widths = _estimate_widths(text, font)
+    ellipsis_w = _estimate_widths('…', font)[-1]
     lo, hi = 0, len(text)
     while lo < hi:
         mid = (lo + hi + 1) // 2
-        if width_at(text[:mid] + '…', font) <= max_width_px:
+        if widths[mid] + ellipsis_w <= max_width_px:
             lo = mid
         else:
             hi = mid - 1
+    while lo > 0 and _ink_width(text[:lo] + '…', font) > max_width_px:
+        lo -= 1
+    while lo + 1 < len(text) and _ink_width(text[:lo + 1] + '…', font) <= max_width_px:
+        lo += 1
     return text[:lo] + '…' if lo > 0 else '…'
@@ -0,0 +1,331 @@
+"""Batch QR label sheets: many equipment labels laid out on printable pages.
+
+A sheet is requested from the web app and built by the background worker as
+a ``qr_sheet`` job on the notification queue, so a large batch never ties up a
+gunicorn thread. The worker renders the labels with qr_service.render_qr_png()
+across a process pool (QR_SHEET_WORKERS processes), pastes them into page
+images in the layout's grid, and appends each page to a PDF under
+UPLOAD_PATH/qr_sheets/. Progress is written to the job's payload after every
+page, for the status page to poll.
+"""
+
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+from flask import current_app
+from PIL import Image
+
+from esb.extensions import db
+from esb.models.equipment import Equipment
+from esb.models.pending_notification import PendingNotification
+from esb.services import config_service, qr_render_pool, qr_service
+from esb.utils.exceptions import ValidationError
+from esb.utils.logging import log_mutation
+from esb.utils.text import get_normalized_base_url
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_TYPE = 'qr_sheet'
+
+# Most labels one sheet job may hold (ten pages of Avery 5160).
+MAX_SHEET_LABELS = 1000
+
+# Finished PDFs older than this are deleted when the next sheet is built.
+SHEET_RETENTION = timedelta(days=1)
+
+# Labels handed to each pool process at a time.
+_POOL_CHUNKSIZE = 4
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """A page of identical labels in a regular grid (all dimensions in inches)."""
+
+    key: str
+    label: str
+    columns: int
+    rows: int
+    label_w_in: float
+    label_h_in: float
+    left_in: float
+    top_in: float
+    pitch_x_in: float
+    pitch_y_in: float
+    page_w_in: float = 8.5
+    page_h_in: float = 11.0
+
+    @property
+    def per_page(self) -> int:
+        return self.columns * self.rows
+
+
+SHEET_LAYOUTS: tuple[SheetLayout, ...] = (
+    SheetLayout('avery_5160', 'Avery 5160 — 30 per page (2⅝″×1″)', 3, 10, 2.625, 1.0, 0.1875, 0.5, 2.75, 1.0),
+    SheetLayout('avery_5163', 'Avery 5163 — 10 per page (4″×2″)', 2, 5, 4.0, 2.0, 0.15625, 0.5, 4.1875, 2.0),
+    SheetLayout('grid_1_5', '1.5″ square stickers — 30 per page', 5, 6, 1.5, 1.5, 0.25, 0.6875, 1.625, 1.625),
+    SheetLayout('grid_2', '2″ square stickers — 12 per page', 3, 4, 2.0, 2.0, 0.75, 0.75, 2.5, 2.5),
+)
+SHEET_LAYOUTS_BY_KEY: dict[str, SheetLayout] = {layout.key: layout for layout in SHEET_LAYOUTS}
+
+
+@dataclass(frozen=True)
+class _Label:
+    """The equipment fields a label render reads, picklable for the pool."""
+
+    id: int
+    name: str
+
+
+def _label_preset(layout: SheetLayout) -> qr_service.QRSizePreset:
+    return qr_service.QRSizePreset(layout.key, layout.label, layout.label_w_in, layout.label_h_in)
+
+
+def _page_preset(layout: SheetLayout) -> qr_service.QRSizePreset:
+    return qr_service.QRSizePreset(f'{layout.key}_page', layout.label, layout.page_w_in, layout.page_h_in)
+
+
+def queue_sheet(
+    equipment_ids: list[int],
+    layout_key: str,
+    device_key: str,
+    *,
+    include_name: bool,
+    include_url: bool,
+    wifi_info: str,
+    username: str,
+) -> PendingNotification:
+    """Queue a sheet job for the worker.
+
+    Args:
+        equipment_ids: Equipment to label, in print order; duplicates are
+            dropped.
+        layout_key: A SHEET_LAYOUTS key.
+        device_key: A qr_service.QR_DEVICE_PRESETS key (sets the dpi).
+        wifi_info: 'none', 'header', 'ssid' or 'password'; the SSID and
+            password are read from config when the sheet is built, never
+            stored in the job.
+
+    Returns:
+        The queued job (a PendingNotification).
+
+    Raises:
+        ValidationError: if no equipment is given, too many are, or the
+            layout/device is unknown or too large to render.
+    """
+    from esb.services import notification_service
+
+    ids = list(dict.fromkeys(equipment_ids))
+    if not ids:
+        raise ValidationError('Select at least one piece of equipment.')
+    if len(ids) > MAX_SHEET_LABELS:
+        raise ValidationError(f'A sheet can hold at most {MAX_SHEET_LABELS} labels, got {len(ids)}.')
+    layout = SHEET_LAYOUTS_BY_KEY.get(layout_key)
+    if layout is None:
+        raise ValidationError(f'Unknown sheet layout: {layout_key!r}')
+    device = qr_service.QR_DEVICES_BY_KEY.get(device_key)
+    if device is None:
+        raise ValidationError(f'Unknown printer: {device_key!r}')
+    if wifi_info not in ('none', 'header', 'ssid', 'password'):
+        raise ValidationError(f'Unknown WiFi option: {wifi_info!r}')
+    try:
+        # Rejected here rather than failing (and retrying) in the worker.
+        qr_service.canvas_size(_page_preset(layout), device.dpi)
+    except ValueError as exc:
+        raise ValidationError(str(exc)) from exc
+
+    job = notification_service.queue_notification(
+        NOTIFICATION_TYPE,
+        target=layout.key,
+        payload={
+            'equipment_ids': ids,
+            'layout': layout.key,
+            'device': device.key,
+            'include_name': include_name,
+            'include_url': include_url,
+            'wifi_info': wifi_info,
+            'requested_by': username,
+            'total': len(ids),
+            'done': 0,
+        },
+    )
+    log_mutation('qr_sheet.queued', username, {
+        'job_id': job.id,
+        'layout': layout.key,
+        'device': device.key,
+        'labels': len(ids),
+    })
+    return job
+
+
+def get_sheet_job(job_id: int) -> PendingNotification:
+    """Return the sheet job with this id.
+
+    Raises:
+        ValidationError: if there is no such sheet job.
+    """
+    job = db.session.get(PendingNotification, job_id)
+    if job is None or job.notification_type != NOTIFICATION_TYPE:
+        raise ValidationError(f'QR sheet job {job_id} not found')
+    return job
+
+
+def sheet_dir() -> str:
+    return os.path.join(current_app.config['UPLOAD_PATH'], 'qr_sheets')  # noqa: PTH118
+
+
+def sheet_path(job_id: int) -> str:
+    """Filesystem path of the finished PDF for ``job_id`` (which may not exist yet)."""
+    return os.path.join(sheet_dir(), f'{job_id}.pdf')  # noqa: PTH118
+
+
+def build_sheet(job: PendingNotification) -> str:
+    """Render every label of ``job`` and write the sheet PDF.
+
+    Equipment archived or deleted since the job was queued is skipped.
+
+    Returns:
+        The path of the written PDF.
+
+    Raises:
+        RuntimeError: if ESB_BASE_URL is invalid (the worker retries).
+        ValueError, OSError: if a label cannot be rendered or written.
+    """
+    payload = dict(job.payload or {})
+    layout = SHEET_LAYOUTS_BY_KEY[payload['layout']]
+    dpi = qr_service.QR_DEVICES_BY_KEY[payload['device']].dpi
+    try:
+        base_url = get_normalized_base_url(current_app.config.get('ESB_BASE_URL', ''))
+    except ValueError as exc:
+        raise RuntimeError(str(exc)) from exc
+
+    ids = payload['equipment_ids']
+    rows = db.session.execute(
+        db.select(Equipment.id, Equipment.name)
+        .where(Equipment.id.in_(ids), Equipment.is_archived.is_(False))
+    ).all()
+    names = {row.id: row.name for row in rows}
+    labels = [_Label(equipment_id, names[equipment_id]) for equipment_id in ids if equipment_id in names]
+
+    template = current_app.config.get('QR_TEMPLATE')
+    wifi_info = payload.get('wifi_info', 'none')
+    wifi_ssid = wifi_password = ''
+    if template is None and wifi_info != 'none':
+        wifi_ssid = config_service.get_config('wifi_ssid', '')
+        wifi_password = config_service.get_config('wifi_password', '')
+    options = dict(
+        dpi=dpi,
+        include_name=bool(payload.get('include_name')),
+        include_url=bool(payload.get('include_url')),
+        base_url=base_url,
+        wifi_info='none' if template is not None else wifi_info,
+        wifi_ssid=wifi_ssid,
+        wifi_password=wifi_password,
+        template=template,
+    )
+
+    os.makedirs(sheet_dir(), exist_ok=True)
+    _prune_old_sheets()
+    path = sheet_path(job.id)
+    tmp_path = f'{path}.tmp'
+    preset = _label_preset(layout)
+    page = None
+    pages = 0
+    try:
+        for index, png in enumerate(_render_labels(labels, preset, options)):
+            slot = index % layout.per_page
+            if slot == 0:
+                page = Image.new('RGB', qr_service.canvas_size(_page_preset(layout), dpi), 'white')
+            _paste_label(page, png, layout, slot, dpi)
+            if slot == layout.per_page - 1 or index == len(labels) - 1:
+                _append_page(tmp_path, page, dpi, first=pages == 0)
+                pages += 1
+                _record_progress(job, index + 1, len(labels))
+        if pages == 0:
+            # Everything was archived since the job was queued: a blank page.
+            _append_page(tmp_path, Image.new('RGB', (1, 1), 'white'), dpi, first=True)
+            pages = 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):  # noqa: PTH110
+            os.unlink(tmp_path)
+        raise
+
+    log_mutation('qr_sheet.generated', 'system', {
+        'job_id': job.id,
+        'layout': layout.key,
+        'labels': len(labels),
+        'skipped': len(ids) - len(labels),
+        'pages': pages,
+    })
+    return path
+
+
+def _render_labels(labels: list[_Label], preset, options: dict):
+    """Yield each label's PNG bytes in order, on a process pool when configured.
+
+    QR_SHEET_WORKERS=1 renders in this process; 0 uses one process per CPU.
+    """
+    workers = int(current_app.config.get('QR_SHEET_WORKERS', 0)) or os.cpu_count() or 1
+    workers = min(workers, len(labels))
+    if workers <= 1:
+        for label in labels:
+            yield qr_service.render_qr_png(label, preset, warn=False, **options)
+        return
+    # spawn, not fork: the worker process runs threads (DB, Slack clients)
+    # that a forked child could inherit mid-lock.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=qr_render_pool.init_render_process,
+        initargs=(qr_render_pool.render_process_config(),),
+    ) as pool:
+        yield from pool.map(
+            _render_label,
+            labels,
+            [preset] * len(labels),
+            [options] * len(labels),
+            chunksize=_POOL_CHUNKSIZE,
+        )
+
+
+def _render_label(label: _Label, preset, options: dict) -> bytes:
+    return qr_service.render_qr_png(label, preset, warn=False, **options)
+
+
+def _paste_label(page: Image.Image, png: bytes, layout: SheetLayout, slot: int, dpi: int) -> None:
+    row, column = divmod(slot, layout.columns)
+    x = round((layout.left_in + column * layout.pitch_x_in) * dpi)
+    y = round((layout.top_in + row * layout.pitch_y_in) * dpi)
+    with Image.open(io.BytesIO(png)) as label:
+        page.paste(label.convert('RGB'), (x, y))
+
+
+def _append_page(path: str, page: Image.Image, dpi: int, *, first: bool) -> None:
+    """Write ``page`` as the next PDF page; only one page is held in memory.
+
+    Pages are JPEG-encoded by Pillow's PDF writer; full quality and no chroma
+    subsampling keep QR module edges sharp.
+    """
+    page.save(path, 'PDF', resolution=dpi, append=not first, quality=95, subsampling=0)
+
+
+def _record_progress(job: PendingNotification, done: int, total: int) -> None:
+    job.payload = {**job.payload, 'done': done, 'total': total}
+    db.session.commit()
+
+
+def _prune_old_sheets() -> None:
+    """Delete finished PDFs past SHEET_RETENTION; failures are logged, not raised."""
+    cutoff = (datetime.now(UTC) - SHEET_RETENTION).timestamp()
+    try:
+        with os.scandir(sheet_dir()) as it:
+            for entry in it:
+                if entry.name.endswith('.pdf') and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+    except OSError:
+        logger.warning('Pruning old QR sheets in %s failed', sheet_dir(), exc_info=True)
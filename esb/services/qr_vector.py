@@ -0,0 +1,305 @@
+"""Vector (SVG and PDF) output for QR labels.
+
+``VectorSurface`` is the vector counterpart of qr_service's raster surface:
+qr_service lays a label out once and draws it onto either. Instead of pixels
+it records drawing operations in layout-pixel coordinates, which the
+serializers scale to the label's physical size — so the output is sharp at
+any printer resolution and far smaller than a 1200 dpi PNG.
+
+QR modules become filled rectangles (one per horizontal run of dark modules),
+text becomes glyph outlines read from the same TrueType files the raster path
+uses (no fonts are embedded, so every viewer renders the same shapes), and
+template artwork is embedded once as an image.
+"""
+
+import base64
+import io
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+
+from PIL import Image
+
+_BLACK = '#000000'
+_WHITE = '#ffffff'
+
+# Encoded template artwork, keyed by (template art signature, format). Templates
+# change rarely and there is normally one, so a handful of entries is plenty.
+_ARTWORK_CACHE_ENTRIES = 4
+_artwork_lock = threading.Lock()
+_artwork_cache: OrderedDict = OrderedDict()
+
+# fontTools glyph sets decompile lazily and are not safe to share across threads.
+_glyph_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _ttfont(font_path: str):
+    """Return (TTFont, glyph set, cmap, unitsPerEm) for a TrueType/OpenType file."""
+    try:
+        from fontTools.ttLib import TTFont
+    except ImportError as e:
+        raise RuntimeError(
+            'fonttools is required for SVG and PDF QR output. Install it with: pip install fonttools'
+        ) from e
+    font = TTFont(font_path, lazy=True)
+    return font, font.getGlyphSet(), font.getBestCmap(), font['head'].unitsPerEm
+
+
+@lru_cache(maxsize=4096)
+def _glyph(font_path: str, char: str) -> tuple[tuple, float]:
+    """Return (outline commands in font units, advance width in font units) for ``char``."""
+    from fontTools.pens.basePen import BasePen
+
+    class _RecordingPen(BasePen):
+        def __init__(self, glyph_set):
+            super().__init__(glyph_set)
+            self.commands = []
+
+        def _moveTo(self, pt):
+            self.commands.append(('M', *pt))
+
+        def _lineTo(self, pt):
+            self.commands.append(('L', *pt))
+
+        def _curveToOne(self, pt1, pt2, pt3):
+            self.commands.append(('C', *pt1, *pt2, *pt3))
+
+        def _qCurveToOne(self, pt1, pt2):
+            # Quadratic to cubic: the control points lie 2/3 of the way
+            # from each end point towards the quadratic control point.
+            x0, y0 = self._getCurrentPoint()
+            self.commands.append((
+                'C',
+                x0 + 2 / 3 * (pt1[0] - x0), y0 + 2 / 3 * (pt1[1] - y0),
+                pt2[0] + 2 / 3 * (pt1[0] - pt2[0]), pt2[1] + 2 / 3 * (pt1[1] - pt2[1]),
+                *pt2,
+            ))
+
+        def _closePath(self):
+            self.commands.append(('Z',))
+
+    _font, glyph_set, cmap, _upem = _ttfont(font_path)
+    with _glyph_lock:
+        name = cmap.get(ord(char), '.notdef')
+        glyph = glyph_set[name]
+        pen = _RecordingPen(glyph_set)
+        glyph.draw(pen)
+        return tuple(pen.commands), glyph.width
+
+
+class VectorSurface:
+    """Drawing surface that records a label as vector operations.
+
+    Implements the methods qr_service's layout code draws with (``fill_white``,
+    ``draw_qr``, ``draw_artwork``, ``draw_text``) over a ``width`` × ``height``
+    layout-pixel canvas, then serializes with ``to_svg()`` / ``to_pdf()``.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        # Each op is ('fill', color, crisp, subpaths) or ('image', signature, source, box).
+        # Subpaths are lists of ('M'|'L', x, y), ('C', x1, y1, x2, y2, x, y) and ('Z',).
+        self._ops: list[tuple] = []
+
+    def _fill(self, color: str, subpaths: list, *, crisp: bool = False) -> None:
+        if not subpaths:
+            return
+        last = self._ops[-1] if self._ops else None
+        if last is not None and last[0] == 'fill' and last[1] == color and last[2] == crisp:
+            last[3].extend(subpaths)
+        else:
+            self._ops.append(('fill', color, crisp, list(subpaths)))
+
+    @staticmethod
+    def _rect(x0, y0, x1, y1) -> list:
+        return [('M', x0, y0), ('L', x1, y0), ('L', x1, y1), ('L', x0, y1), ('Z',)]
+
+    def fill_white(self, box: tuple[int, int, int, int]) -> None:
+        self._fill(_WHITE, [self._rect(*box)], crisp=True)
+
+    def draw_qr(self, qr, x: int, y: int, module_px: int) -> None:
+        matrix = qr.get_matrix()
+        size = len(matrix) * module_px
+        # The quiet zone is part of the symbol: paint it white over any artwork.
+        subpaths = []
+        for r, row in enumerate(matrix):
+            c = 0
+            while c < len(row):
+                if not row[c]:
+                    c += 1
+                    continue
+                start = c
+                while c < len(row) and row[c]:
+                    c += 1
+                subpaths.append(self._rect(
+                    x + start * module_px, y + r * module_px,
+                    x + c * module_px, y + (r + 1) * module_px,
+                ))
+        self._fill(_WHITE, [self._rect(x, y, x + size, y + size)], crisp=True)
+        self._fill(_BLACK, subpaths, crisp=True)
+
+    def draw_artwork(self, signature: tuple, source: Image.Image, box: tuple[int, int, int, int]) -> None:
+        self._ops.append(('image', signature, source, box))
+
+    def draw_text(self, xy: tuple[int, int], text: str, font) -> None:
+        """Draw ``text`` as Pillow would at ``xy`` (left/ascender anchor) with ``font``.
+
+        Glyph advances come from the font's horizontal metrics, scaled so the
+        run matches Pillow's measured length (and thus the layout's centering).
+        """
+        font_path = font.path
+        _font, _glyph_set, _cmap, upem = _ttfont(font_path)
+        scale = font.size / upem
+        glyphs = [_glyph(font_path, ch) for ch in text]
+        natural = sum(advance for _commands, advance in glyphs) * scale
+        stretch = font.getlength(text) / natural if natural else 1.0
+
+        pen_x = float(xy[0])
+        baseline = xy[1] + font.getmetrics()[0]
+        subpaths = []
+        for commands, advance in glyphs:
+            current = []
+            for cmd in commands:
+                if cmd[0] == 'Z':
+                    current.append(cmd)
+                    subpaths.append(current)
+                    current = []
+                    continue
+                if cmd[0] == 'M' and current:
+                    subpaths.append(current)
+                    current = []
+                pts = cmd[1:]
+                mapped = []
+                for i in range(0, len(pts), 2):
+                    mapped.extend((pen_x + pts[i] * scale, baseline - pts[i + 1] * scale))
+                current.append((cmd[0], *mapped))
+            if current:
+                subpaths.append(current)
+            pen_x += advance * scale * stretch
+        self._fill(_BLACK, subpaths)
+
+    # -- serialization ---------------------------------------------------
+
+    def to_svg(self, width_in: float, height_in: float) -> bytes:
+        """Serialize as an SVG document ``width_in`` × ``height_in`` inches."""
+        parts = [
+            '<?xml version="1.0" encoding="UTF-8"?>\n',
+            f'<svg xmlns="http://www.w3.org/2000/svg" version="1.1" '
+            f'width="{_num(width_in, 4)}in" height="{_num(height_in, 4)}in" '
+            f'viewBox="0 0 {self.width} {self.height}">\n',
+            f'<rect width="{self.width}" height="{self.height}" fill="{_WHITE}"/>\n',
+        ]
+        for op in self._ops:
+            if op[0] == 'image':
+                _kind, signature, source, (x, y, w, h) = op
+                data = _encoded_artwork(signature, source, 'png')
+                parts.append(
+                    f'<image x="{x}" y="{y}" width="{w}" height="{h}" preserveAspectRatio="none" '
+                    f'href="data:image/png;base64,{base64.b64encode(data).decode("ascii")}"/>\n'
+                )
+                continue
+            _kind, color, crisp, subpaths = op
+            d = ''.join(_svg_command(cmd) for subpath in subpaths for cmd in subpath)
+            extra = ' shape-rendering="crispEdges"' if crisp else ''
+            parts.append(f'<path fill="{color}"{extra} d="{d}"/>\n')
+        parts.append('</svg>\n')
+        return ''.join(parts).encode('utf-8')
+
+    def to_pdf(self, width_in: float, height_in: float) -> bytes:
+        """Serialize as a single-page PDF ``width_in`` × ``height_in`` inches."""
+        page_w = width_in * 72
+        page_h = height_in * 72
+        k = page_w / self.width
+        # Flip into layout pixels: origin top-left, y down, 1 unit = 1 layout px.
+        content = [f'{_num(k, 6)} 0 0 {_num(-k, 6)} 0 {_num(page_h, 4)} cm']
+        images = []
+        for op in self._ops:
+            if op[0] == 'image':
+                _kind, signature, source, (x, y, w, h) = op
+                name = f'Im{len(images)}'
+                images.append((name, _encoded_artwork(signature, source, 'pdf'), source.size))
+                content.append(f'q {w} 0 0 {-h} {x} {y + h} cm /{name} Do Q')
+                continue
+            _kind, color, _crisp, subpaths = op
+            gray = '0' if color == _BLACK else '1'
+            content.append(f'{gray} g')
+            content.extend(_pdf_command(cmd) for subpath in subpaths for cmd in subpath)
+            content.append('f')
+        stream = zlib.compress('\n'.join(content).encode('ascii'))
+
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+            None,  # page, filled in once the image object numbers are known
+            b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream',
+        ]
+        xobjects = []
+        for name, data, (img_w, img_h) in images:
+            objects.append(
+                b'<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceRGB '
+                b'/BitsPerComponent 8 /Filter /FlateDecode /Length %d >>\nstream\n'
+                % (img_w, img_h, len(data)) + data + b'\nendstream'
+            )
+            xobjects.append(f'/{name} {len(objects)} 0 R')
+        resources = f'/XObject << {" ".join(xobjects)} >>' if xobjects else ''
+        objects[2] = (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_num(page_w, 4)} {_num(page_h, 4)}] '
+            f'/Resources << {resources} >> /Contents 4 0 R >>'
+        ).encode('ascii')
+
+        out = io.BytesIO()
+        out.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(out.tell())
+            out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+        xref = out.tell()
+        out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            out.write(b'%010d 00000 n \n' % offset)
+        out.write(
+            b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+        )
+        return out.getvalue()
+
+
+def _num(value: float, places: int = 2) -> str:
+    text = f'{value:.{places}f}'.rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+
+def _svg_command(cmd: tuple) -> str:
+    if cmd[0] == 'Z':
+        return 'Z'
+    return cmd[0] + ' '.join(_num(v) for v in cmd[1:])
+
+
+def _pdf_command(cmd: tuple) -> str:
+    if cmd[0] == 'Z':
+        return 'h'
+    operator = {'M': 'm', 'L': 'l', 'C': 'c'}[cmd[0]]
+    return ' '.join(_num(v) for v in cmd[1:]) + ' ' + operator
+
+
+def _encoded_artwork(signature: tuple, source: Image.Image, fmt: str) -> bytes:
+    """PNG bytes (SVG) or Flate-compressed RGB samples (PDF) of template artwork."""
+    key = (signature, fmt)
+    with _artwork_lock:
+        data = _artwork_cache.get(key)
+        if data is not None:
+            _artwork_cache.move_to_end(key)
+            return data
+    if fmt == 'png':
+        buf = io.BytesIO()
+        source.save(buf, format='PNG')
+        data = buf.getvalue()
+    else:
+        data = zlib.compress(source.convert('RGB').tobytes())
+    with _artwork_lock:
+        _artwork_cache[key] = data
+        while len(_artwork_cache) > _ARTWORK_CACHE_ENTRIES:
+            _artwork_cache.popitem(last=False)
+    return data
@@ -1,15 +1,44 @@
 """Static status page generation and push service."""
 
+import gzip
+import hashlib
+import json
 import logging
 import os
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
 
-from flask import current_app, render_template
+from flask import current_app
+from markupsafe import escape
 
 from esb.utils.logging import log_mutation
 
 logger = logging.getLogger(__name__)
 
+# Single-flight lock shared by every process that renders the page. The lease
+# must outlast a slow render plus upload and CloudFront invalidation; a holder
+# that crashes blocks other pushes for at most this long.
+STATIC_PAGE_LOCK = 'static_page'
+STATIC_PAGE_LOCK_LEASE = 300
+
+CONTENT_TYPE = 'text/html; charset=utf-8'
+CACHE_CONTROL = 'no-cache, no-store, must-revalidate'
+
+# Accepted STATIC_PAGE_CONTENT_ENCODING values.
+CONTENT_ENCODINGS = ('gzip', 'br', 'none')
+
+# Precompressed copies written next to index.html by the local method, for
+# nginx gzip_static / brotli_static.
+LOCAL_SIDECARS = {'gzip': '.gz', 'br': '.br'}
+
+PUSH_METHODS = ('local', 's3', 'gcs')
+
+# Guards lazy creation of the cached storage clients: boto3's default
+# session is not safe to create clients from concurrently.
+_client_lock = threading.Lock()
+
 
 def _compute_generated_at() -> tuple[str, int]:
     """Compute the generation timestamp string and year in the system's local timezone.
@@ -35,11 +64,27 @@ def _compute_generated_at() -> tuple[str, int]:
     return (dt.strftime('%Y-%m-%d %H:%M:%S ') + tzname, dt.year)
 
 
+def _template(name: str):
+    """Return the compiled Jinja template ``name``, cached per app.
+
+    The static page templates are compiled once per process and rendered
+    with Template.render() directly, skipping render_template()'s
+    context processors and signals (the page uses neither). Templates
+    are reloaded on change only when TEMPLATES_AUTO_RELOAD is on (debug).
+    """
+    cache = current_app.extensions.setdefault('esb_static_templates', {})
+    template = cache.get(name)
+    if template is None or (current_app.jinja_env.auto_reload and not template.is_up_to_date):
+        template = cache[name] = current_app.jinja_env.get_template(name)
+    return template
+
+
 def generate() -> str:
     """Render the static status page with current equipment status data.
 
-    Uses status_service.get_area_status_dashboard() for data and renders
-    the public/static_page.html Jinja2 template within the Flask app context.
+    Uses status_service.get_status_snapshot(), which reads plain column
+    values rather than ORM instances, and renders the public/static_page.html
+    Jinja2 template within the Flask app context.
 
     Returns:
         Rendered HTML string (self-contained, no external dependencies).
@@ -47,10 +92,9 @@ def generate() -> str:
     from esb.models.repair_record import REPAIR_SEVERITIES
     from esb.services import status_service
 
-    areas = status_service.get_area_status_dashboard()
+    areas = status_service.get_status_snapshot()
     generated_at, generated_year = _compute_generated_at()
-    return render_template(
-        'public/static_page.html',
+    return _template('public/static_page.html').render(
         areas=areas,
         generated_at=generated_at,
         generated_year=generated_year,
@@ -58,67 +102,254 @@ def generate() -> str:
     )
 
 
-def push(html_content: str) -> None:
-    """Push the rendered static page to the configured destination.
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress ``data`` for the given Content-Encoding.
 
-    Dispatches to _push_local(), _push_s3(), or _push_gcs() based on
-    STATIC_PAGE_PUSH_METHOD config value. For the s3 backend, when the
-    CLOUDFRONT_DISTRIBUTION_ID config is set, a CloudFront invalidation
-    is issued for the uploaded key after each successful upload.
+    Output is deterministic (gzip mtime is zeroed), so unchanged pages
+    produce byte-identical uploads.
 
     Args:
-        html_content: The rendered HTML string to push.
+        data: Raw bytes.
+        encoding: 'gzip' or 'br'.
+
+    Raises:
+        RuntimeError: if encoding is 'br' and the brotli package is missing,
+            or the encoding is unknown.
+    """
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        try:
+            import brotli
+        except ImportError as e:
+            raise RuntimeError('brotli is required for br encoding. Install it with: pip install brotli') from e
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+    raise RuntimeError(f'Unknown content encoding: {encoding!r}')
+
+
+def _content_encoding() -> str:
+    """Return the configured STATIC_PAGE_CONTENT_ENCODING, validated."""
+    encoding = current_app.config.get('STATIC_PAGE_CONTENT_ENCODING', 'gzip')
+    if encoding not in CONTENT_ENCODINGS:
+        raise RuntimeError(
+            f'Unknown STATIC_PAGE_CONTENT_ENCODING: {encoding!r} '
+            f'(expected one of {", ".join(CONTENT_ENCODINGS)})'
+        )
+    return encoding
+
+
+def _storage_client(service: str):
+    """Return this process's client for 's3', 'cloudfront' or 'gcs'.
+
+    Created on first use and kept on app.extensions, so credential
+    resolution and connection setup happen once per worker process rather
+    than on every push. The clients are thread-safe.
 
     Raises:
-        RuntimeError: if push method is unknown, target is empty, or push fails.
+        ImportError: if the client library is not installed.
     """
-    method = current_app.config.get('STATIC_PAGE_PUSH_METHOD', 'local')
+    clients = current_app.extensions.setdefault('esb_storage_clients', {})
+    client = clients.get(service)
+    if client is None:
+        with _client_lock:
+            client = clients.get(service)
+            if client is None:
+                if service == 'gcs':
+                    from google.cloud import storage
+                    client = storage.Client()
+                else:
+                    import boto3
+                    client = boto3.client(service)
+                clients[service] = client
+    return client
+
+
+def _destinations() -> list[tuple[str, str]]:
+    """Return the configured (method, target) pairs.
+
+    STATIC_PAGE_PUSH_METHOD may list several comma-separated methods; each
+    takes the target at the same position in STATIC_PAGE_PUSH_TARGET.
+
+    Raises:
+        RuntimeError: if the target is empty, a method is unknown, or the
+            two lists differ in length.
+    """
+    methods = [m.strip() for m in current_app.config.get('STATIC_PAGE_PUSH_METHOD', 'local').split(',')]
     target = current_app.config.get('STATIC_PAGE_PUSH_TARGET', '')
 
     if not target:
         raise RuntimeError('STATIC_PAGE_PUSH_TARGET is not configured')
+    for method in methods:
+        if method not in PUSH_METHODS:
+            raise RuntimeError(f'Unknown STATIC_PAGE_PUSH_METHOD: {method!r}')
+    targets = [t.strip() for t in target.split(',')] if len(methods) > 1 else [target]
+    if len(targets) != len(methods):
+        raise RuntimeError(
+            f'STATIC_PAGE_PUSH_TARGET must list one target per STATIC_PAGE_PUSH_METHOD entry '
+            f'({len(methods)} methods, {len(targets)} targets)'
+        )
+    return list(zip(methods, targets))
 
-    invalidation_id: str | None = None
-    if method == 'local':
-        _push_local(html_content, target)
-    elif method == 's3':
-        invalidation_id = _push_s3(html_content, target)
-    elif method == 'gcs':
-        _push_gcs(html_content, target)
-    else:
-        raise RuntimeError(f'Unknown STATIC_PAGE_PUSH_METHOD: {method!r}')
 
-    mutation_data: dict = {'method': method, 'target': target}
-    if invalidation_id:
-        mutation_data['cloudfront_invalidation_id'] = invalidation_id
-    log_mutation('static_page.pushed', 'system', mutation_data)
+def _push_each(destinations: list[tuple[str, str]], push_one) -> None:
+    """Call ``push_one(method, target)`` for every destination.
+
+    Several destinations are pushed concurrently, each on its own thread with
+    its own app context. Every destination is attempted; each outcome is
+    counted in the worker metrics and failures are logged as
+    ``static_page.push_failed``.
 
-    logger.info('Static page pushed via %s to %s', method, target)
+    Raises:
+        RuntimeError: naming the failed destinations, if any failed. With a
+            single destination its own exception propagates unchanged.
+    """
+    from esb.services import worker_metrics
+
+    stats = worker_metrics.get_worker_metrics()
+    if len(destinations) == 1:
+        method, target = destinations[0]
+        try:
+            push_one(method, target)
+        except Exception:
+            stats.record_static_push(method, target, ok=False)
+            raise
+        stats.record_static_push(method, target, ok=True)
+        return
+
+    app = current_app._get_current_object()
+
+    def run(method: str, target: str) -> None:
+        with app.app_context():
+            push_one(method, target)
+
+    with ThreadPoolExecutor(max_workers=len(destinations), thread_name_prefix='static-push') as pool:
+        futures = [(method, target, pool.submit(run, method, target)) for method, target in destinations]
+
+    failures = []
+    for method, target, future in futures:
+        error = future.exception()
+        stats.record_static_push(method, target, ok=error is None)
+        if error is not None:
+            failures.append((method, target, error))
+            log_mutation('static_page.push_failed', 'system', {
+                'method': method, 'target': target, 'error': str(error),
+            })
+            logger.error('Static page push via %s to %s failed', method, target, exc_info=error)
+    if failures:
+        summary = '; '.join(f'{method} {target}: {error}' for method, target, error in failures)
+        raise RuntimeError(
+            f'Static page push failed for {len(failures)} of {len(destinations)} destinations: {summary}'
+        ) from failures[0][2]
 
 
-def _push_local(html_content: str, target_path: str) -> None:
+def push(html_content: str) -> None:
+    """Push the rendered static page to the configured destinations.
+
+    Dispatches to _push_local(), _push_s3(), or _push_gcs() based on
+    STATIC_PAGE_PUSH_METHOD config value. For the s3 backend, when the
+    CLOUDFRONT_DISTRIBUTION_ID config is set, a CloudFront invalidation
+    is issued for the uploaded key after each successful upload. Several
+    comma-separated methods are pushed concurrently (see _push_each()).
+
+    The page is compressed once per push according to
+    STATIC_PAGE_CONTENT_ENCODING: s3 and gcs upload the compressed body with
+    a matching Content-Encoding, and local writes precompressed sidecars.
+
+    Args:
+        html_content: The rendered HTML string to push.
+
+    Raises:
+        RuntimeError: if push method or encoding is unknown, target is
+            empty, or push fails.
+    """
+    destinations = _destinations()
+    encoding = _content_encoding()
+    body = html_content.encode('utf-8')
+    content_encoding = None if encoding == 'none' else encoding
+    payload = body
+    if content_encoding and any(method != 'local' for method, _ in destinations):
+        payload = compress(body, encoding)
+
+    def push_one(method: str, target: str) -> None:
+        invalidation_id: str | None = None
+        if method == 'local':
+            _push_local(body, target, encoding)
+            uploaded = len(body)
+        else:
+            if method == 's3':
+                invalidation_id = _push_s3(payload, content_encoding, target)
+            else:
+                _push_gcs(payload, content_encoding, target)
+            uploaded = len(payload)
+
+        mutation_data: dict = {
+            'method': method, 'target': target, 'encoding': encoding,
+            'bytes': len(body), 'uploaded_bytes': uploaded,
+        }
+        if invalidation_id:
+            mutation_data['cloudfront_invalidation_id'] = invalidation_id
+        log_mutation('static_page.pushed', 'system', mutation_data)
+
+        logger.info('Static page pushed via %s to %s', method, target)
+
+    _push_each(destinations, push_one)
+
+
+def _push_local(body: bytes, target_path: str, encoding: str) -> None:
     """Write the static page HTML to a local directory.
 
-    Writes to {target_path}/index.html, creating the directory if needed.
+    Writes {target_path}/index.html, creating the directory if needed, plus
+    index.html.gz and index.html.br sidecars for nginx gzip_static /
+    brotli_static. With encoding 'none' no sidecars are written and stale
+    ones are removed so nginx cannot serve an old page. The .br sidecar is
+    skipped when brotli is not installed and encoding is not 'br'. Each file
+    is written to a temporary name and renamed into place, sidecars first.
 
     Args:
-        html_content: Rendered HTML string.
+        body: UTF-8 encoded HTML.
         target_path: Directory path to write to.
+        encoding: The configured STATIC_PAGE_CONTENT_ENCODING.
 
     Raises:
         RuntimeError: if file write fails.
     """
     try:
-        os.makedirs(target_path, exist_ok=True)
-        output_path = os.path.join(target_path, 'index.html')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        logger.info('Static page written to %s', output_path)
+        _write_local_file(target_path, 'index.html', body, encoding)
     except OSError as e:
         raise RuntimeError(f'Failed to write static page to {target_path}: {e}') from e
 
 
-def _push_s3(html_content: str, target: str) -> str | None:
+def _write_local_file(directory: str, name: str, body: bytes, encoding: str) -> None:
+    """Write ``directory/name`` and its precompressed sidecars (see _push_local)."""
+    output_path = os.path.join(directory, name)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    for sidecar_encoding, suffix in LOCAL_SIDECARS.items():
+        sidecar_path = output_path + suffix
+        if encoding == 'none':
+            if os.path.exists(sidecar_path):
+                os.remove(sidecar_path)
+            continue
+        try:
+            compressed = compress(body, sidecar_encoding)
+        except RuntimeError:
+            if sidecar_encoding == encoding:
+                raise
+            logger.debug('brotli not installed; skipping %s', sidecar_path)
+            continue
+        _write_atomic(sidecar_path, compressed)
+    _write_atomic(output_path, body)
+    logger.info('Static page written to %s', output_path)
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write ``data`` to ``path`` via a temporary file and rename."""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def _push_s3(body: bytes, content_encoding: str | None, target: str) -> str | None:
     """Upload the static page HTML to an S3 bucket.
 
     Target format: "bucket-name/optional/key/path" (key defaults to index.html
@@ -129,7 +360,8 @@ def _push_s3(html_content: str, target: str) -> str | None:
     short-circuiting because the bucket already holds the new bytes.
 
     Args:
-        html_content: Rendered HTML string.
+        body: HTML bytes, already compressed if content_encoding is set.
+        content_encoding: Content-Encoding metadata for the object, or None.
         target: S3 target in format "bucket/key".
 
     Returns:
@@ -140,7 +372,6 @@ def _push_s3(html_content: str, target: str) -> str | None:
             upload fails, or the CloudFront invalidation fails.
     """
     try:
-        import boto3
         from botocore.exceptions import ClientError, NoCredentialsError
     except ImportError as e:
         raise RuntimeError('boto3 is required for S3 push method. Install it with: pip install boto3') from e
@@ -153,13 +384,15 @@ def _push_s3(html_content: str, target: str) -> str | None:
     key = parts[1] if len(parts) > 1 and parts[1] else 'index.html'
 
     try:
-        s3 = boto3.client('s3')
+        extra = {'ContentEncoding': content_encoding} if content_encoding else {}
+        s3 = _storage_client('s3')
         s3.put_object(
             Bucket=bucket,
             Key=key,
-            Body=html_content.encode('utf-8'),
-            ContentType='text/html; charset=utf-8',
-            CacheControl='no-cache, no-store, must-revalidate',
+            Body=body,
+            ContentType=CONTENT_TYPE,
+            CacheControl=CACHE_CONTROL,
+            **extra,
         )
         logger.info('Static page uploaded to s3://%s/%s', bucket, key)
     except NoCredentialsError as e:
@@ -171,16 +404,16 @@ def _push_s3(html_content: str, target: str) -> str | None:
 
     distribution_id = current_app.config.get('CLOUDFRONT_DISTRIBUTION_ID', '')
     if distribution_id:
-        return _create_cloudfront_invalidation(distribution_id, key)
+        return _create_cloudfront_invalidation(distribution_id, [key])
     return None
 
 
-def _create_cloudfront_invalidation(distribution_id: str, key: str) -> str:
-    """Create a CloudFront invalidation for the given object key.
+def _create_cloudfront_invalidation(distribution_id: str, keys: list[str]) -> str:
+    """Create one CloudFront invalidation for the given object keys.
 
     Args:
         distribution_id: CloudFront distribution ID.
-        key: S3 object key. The invalidation path is `/` + URL-encoded key
+        keys: S3 object keys. Each invalidation path is `/` + URL-encoded key
             (so keys with spaces or special characters invalidate the path
             CloudFront actually serves).
 
@@ -194,23 +427,22 @@ def _create_cloudfront_invalidation(distribution_id: str, key: str) -> str:
     import uuid
     from urllib.parse import quote
 
-    import boto3
     from botocore.exceptions import ClientError, NoCredentialsError
 
-    path = '/' + quote(key.lstrip('/'), safe='/')
+    paths = ['/' + quote(key.lstrip('/'), safe='/') for key in keys]
     try:
-        cf = boto3.client('cloudfront')
+        cf = _storage_client('cloudfront')
         response = cf.create_invalidation(
             DistributionId=distribution_id,
             InvalidationBatch={
-                'Paths': {'Quantity': 1, 'Items': [path]},
+                'Paths': {'Quantity': len(paths), 'Items': paths},
                 'CallerReference': f'esb-{uuid.uuid4()}',
             },
         )
         invalidation_id = response['Invalidation']['Id']
         logger.info(
-            'Created CloudFront invalidation %s for distribution %s path %s',
-            invalidation_id, distribution_id, path,
+            'Created CloudFront invalidation %s for distribution %s paths %s',
+            invalidation_id, distribution_id, ', '.join(paths),
         )
         return invalidation_id
     except NoCredentialsError as e:
@@ -221,14 +453,16 @@ def _create_cloudfront_invalidation(distribution_id: str, key: str) -> str:
         raise RuntimeError(f'CloudFront invalidation failed ({error_code}): {error_msg}') from e
 
 
-def _push_gcs(html_content: str, target: str) -> None:
+def _push_gcs(body: bytes, content_encoding: str | None, target: str) -> None:
     """Upload the static page HTML to a Google Cloud Storage bucket.
 
     Target format: "bucket-name/optional/key/path" (key defaults to index.html
-    if target ends with / or has no key component).
+    if target ends with / or has no key component). A gzip-encoded object is
+    transcoded by GCS for clients that do not accept gzip.
 
     Args:
-        html_content: Rendered HTML string.
+        body: HTML bytes, already compressed if content_encoding is set.
+        content_encoding: Content-Encoding metadata for the object, or None.
         target: GCS target in format "bucket/key".
 
     Raises:
@@ -237,7 +471,6 @@ def _push_gcs(html_content: str, target: str) -> None:
     try:
         from google.api_core.exceptions import GoogleAPIError
         from google.auth.exceptions import DefaultCredentialsError
-        from google.cloud import storage
     except ImportError as e:
         raise RuntimeError(
             'google-cloud-storage is required for GCS push method. Install it with: pip install google-cloud-storage'
@@ -251,11 +484,12 @@ def _push_gcs(html_content: str, target: str) -> None:
     key = parts[1] if len(parts) > 1 and parts[1] else 'index.html'
 
     try:
-        client = storage.Client()
-        bucket_obj = client.bucket(bucket)
+        bucket_obj = _storage_client('gcs').bucket(bucket)
         blob = bucket_obj.blob(key)
-        blob.cache_control = 'no-cache, no-store, must-revalidate'
-        blob.upload_from_string(html_content, content_type='text/html; charset=utf-8')
+        blob.cache_control = CACHE_CONTROL
+        if content_encoding:
+            blob.content_encoding = content_encoding
+        blob.upload_from_string(body, content_type=CONTENT_TYPE)
         logger.info('Static page uploaded to gs://%s/%s', bucket, key)
     except DefaultCredentialsError as e:
         raise RuntimeError('Google Cloud credentials not configured for GCS push') from e
@@ -263,10 +497,390 @@ def _push_gcs(html_content: str, target: str) -> None:
         raise RuntimeError(f'GCS upload failed: {e}') from e
 
 
-def generate_and_push() -> None:
-    """Generate the static status page and push it to the configured destination.
+# ---------------------------------------------------------------------------
+# Multi-file site mode (STATIC_PAGE_MODE=site)
+# ---------------------------------------------------------------------------
+
+# Rendered in place of the timestamp while hashing, so a file's digest
+# changes only when its content does.
+_TIMESTAMP_PLACEHOLDER = '@@ESB_GENERATED_AT@@'
 
-    Convenience function used by the notification worker handler.
+# Per-destination record of the digests last uploaded, stored alongside the
+# site so a wiped or new destination gets a full upload.
+SITE_MANIFEST_KEY = 'esb-manifest.json'
+JSON_CONTENT_TYPE = 'application/json'
+
+
+@dataclass(frozen=True)
+class SiteFile:
+    """One file of the multi-file static site.
+
+    Attributes:
+        key: Path relative to the site root, e.g. 'areas/woodshop.html'.
+        body: Final content, with the generation timestamp filled in.
+        content_type: Content-Type to upload with.
+        digest: SHA-256 of the content with the timestamp masked.
+    """
+
+    key: str
+    body: bytes
+    content_type: str
+    digest: str
+
+
+def _area_slug(area, used: set[str]) -> str:
+    from esb.utils.text import slugify_filename
+
+    slug = slugify_filename(area.name).lower()
+    if slug in used:
+        slug = f'{slug}-{area.id}'
+    used.add(slug)
+    return slug
+
+
+def _html_file(key: str, template: str, generated_at: str, **context) -> SiteFile:
+    html = _template(template).render(generated_at=_TIMESTAMP_PLACEHOLDER, **context)
+    return SiteFile(
+        key=key,
+        body=html.replace(_TIMESTAMP_PLACEHOLDER, str(escape(generated_at))).encode('utf-8'),
+        content_type=CONTENT_TYPE,
+        digest=hashlib.sha256(html.encode('utf-8')).hexdigest(),
+    )
+
+
+def _status_feed(area_pages: list[dict]) -> SiteFile:
+    """Build status.json: every area's equipment with its status and open repairs."""
+    areas = []
+    for page in area_pages:
+        area = page['area']
+        areas.append({
+            'name': area.name,
+            'page': page['path'],
+            'equipment': [
+                {
+                    'id': item.id,
+                    'name': item.name,
+                    'color': item.color,
+                    'label': item.label,
+                    'severity': item.severity,
+                    'eta': item.eta.isoformat() if item.eta else None,
+                    'open_repairs': [
+                        {
+                            'status': rec.status,
+                            'severity': rec.severity,
+                            'description': rec.description,
+                            'eta': rec.eta.isoformat() if rec.eta else None,
+                        }
+                        for rec in item.open_records
+                    ],
+                }
+                for item in area.equipment
+            ],
+        })
+    digest = hashlib.sha256(json.dumps(areas, sort_keys=True).encode('utf-8')).hexdigest()
+    feed = {'generated_at': datetime.now(UTC).isoformat(timespec='seconds'), 'areas': areas}
+    return SiteFile(
+        key='status.json',
+        body=json.dumps(feed, indent=2).encode('utf-8'),
+        content_type=JSON_CONTENT_TYPE,
+        digest=digest,
+    )
+
+
+def generate_site() -> list[SiteFile]:
+    """Render the multi-file status site.
+
+    Produces index.html (links to each area), areas/<slug>.html per
+    non-archived area, and status.json. Status appears only on the area
+    pages and the feed, so an equipment change alters one area page and
+    status.json; the index changes only when areas or their equipment
+    counts do.
+
+    Returns:
+        The site files, index first.
+    """
+    from esb.models.repair_record import REPAIR_SEVERITIES
+    from esb.services import status_service
+
+    snapshot = status_service.get_status_snapshot()
+    generated_at, generated_year = _compute_generated_at()
+    used: set[str] = set()
+    area_pages = [
+        {
+            'area': area,
+            'path': f'areas/{_area_slug(area, used)}.html',
+            'equipment_count': len(area.equipment),
+        }
+        for area in snapshot
+    ]
+    context = {'generated_year': generated_year, 'repair_severities': REPAIR_SEVERITIES}
+    files = [_html_file('index.html', 'public/static_site_index.html', generated_at,
+                        area_pages=area_pages, **context)]
+    for page in area_pages:
+        files.append(_html_file(page['path'], 'public/static_site_area.html', generated_at,
+                                area=page['area'], **context))
+    files.append(_status_feed(area_pages))
+    return files
+
+
+def _split_target(target: str, label: str) -> tuple[str, str]:
+    """Split "bucket/optional/prefix" into (bucket, prefix ending in '/' or '')."""
+    bucket, _, prefix = target.partition('/')
+    if not bucket:
+        raise RuntimeError(f'Invalid {label} target {target!r}: bucket name is empty')
+    prefix = prefix.strip('/')
+    return bucket, f'{prefix}/' if prefix else ''
+
+
+def _parse_manifest(raw: bytes) -> dict[str, str]:
+    """Return the manifest's {key: digest}; anything unreadable means 'upload all'."""
+    try:
+        files = json.loads(raw)['files']
+    except (ValueError, TypeError, KeyError):
+        logger.warning('Ignoring unreadable static site manifest')
+        return {}
+    return files if isinstance(files, dict) else {}
+
+
+class _LocalSite:
+    """Site destination in a local directory."""
+
+    def __init__(self, target: str):
+        self.directory = target
+
+    def read_manifest(self) -> dict[str, str]:
+        try:
+            with open(os.path.join(self.directory, SITE_MANIFEST_KEY), 'rb') as f:
+                return _parse_manifest(f.read())
+        except FileNotFoundError:
+            return {}
+        except OSError as e:
+            raise RuntimeError(f'Failed to read static site manifest in {self.directory}: {e}') from e
+
+    def put(self, key: str, body: bytes, content_type: str, encoding: str) -> int:
+        try:
+            _write_local_file(self.directory, key, body, encoding)
+        except OSError as e:
+            raise RuntimeError(f'Failed to write static page to {self.directory}: {e}') from e
+        return len(body)
+
+    def delete(self, key: str) -> None:
+        path = os.path.join(self.directory, key)
+        for name in (path, *(path + suffix for suffix in LOCAL_SIDECARS.values())):
+            try:
+                os.remove(name)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                raise RuntimeError(f'Failed to remove {name}: {e}') from e
+
+    def invalidate(self, keys: list[str]) -> str | None:
+        return None
+
+
+class _S3Site:
+    """Site destination under an S3 bucket prefix, optionally behind CloudFront."""
+
+    def __init__(self, target: str):
+        try:
+            from botocore.exceptions import ClientError, NoCredentialsError
+        except ImportError as e:
+            raise RuntimeError('boto3 is required for S3 push method. Install it with: pip install boto3') from e
+        self._errors = (ClientError, NoCredentialsError)
+        self.bucket, self.prefix = _split_target(target, 'S3')
+        self.s3 = _storage_client('s3')
+
+    def _raise(self, e: Exception, action: str):
+        if isinstance(e, self._errors[1]):  # NoCredentialsError
+            raise RuntimeError('AWS credentials not configured for S3 push') from e
+        error = e.response['Error']
+        raise RuntimeError(f'S3 {action} failed ({error["Code"]}): {error["Message"]}') from e
+
+    def read_manifest(self) -> dict[str, str]:
+        try:
+            response = self.s3.get_object(Bucket=self.bucket, Key=self.prefix + SITE_MANIFEST_KEY)
+            return _parse_manifest(response['Body'].read())
+        except self._errors as e:
+            if getattr(e, 'response', {}).get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return {}
+            self._raise(e, 'manifest read')
+
+    def put(self, key: str, body: bytes, content_type: str, encoding: str) -> int:
+        extra = {}
+        if encoding != 'none':
+            body = compress(body, encoding)
+            extra['ContentEncoding'] = encoding
+        try:
+            self.s3.put_object(
+                Bucket=self.bucket, Key=self.prefix + key, Body=body,
+                ContentType=content_type, CacheControl=CACHE_CONTROL, **extra,
+            )
+        except self._errors as e:
+            self._raise(e, 'upload')
+        logger.info('Static site file uploaded to s3://%s/%s%s', self.bucket, self.prefix, key)
+        return len(body)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.s3.delete_object(Bucket=self.bucket, Key=self.prefix + key)
+        except self._errors as e:
+            self._raise(e, 'delete')
+
+    def invalidate(self, keys: list[str]) -> str | None:
+        distribution_id = current_app.config.get('CLOUDFRONT_DISTRIBUTION_ID', '')
+        if not distribution_id:
+            return None
+        paths = [self.prefix + key for key in keys]
+        if 'index.html' in keys:
+            # CloudFront also serves the index at its directory path.
+            paths.append(self.prefix)
+        return _create_cloudfront_invalidation(distribution_id, paths)
+
+
+class _GCSSite:
+    """Site destination under a Google Cloud Storage bucket prefix."""
+
+    def __init__(self, target: str):
+        try:
+            from google.api_core.exceptions import GoogleAPIError, NotFound
+            from google.auth.exceptions import DefaultCredentialsError
+        except ImportError as e:
+            raise RuntimeError(
+                'google-cloud-storage is required for GCS push method. '
+                'Install it with: pip install google-cloud-storage'
+            ) from e
+        self._not_found = NotFound
+        self._errors = (GoogleAPIError, DefaultCredentialsError)
+        bucket, self.prefix = _split_target(target, 'GCS')
+        try:
+            self.bucket = _storage_client('gcs').bucket(bucket)
+        except DefaultCredentialsError as e:
+            raise RuntimeError('Google Cloud credentials not configured for GCS push') from e
+
+    def read_manifest(self) -> dict[str, str]:
+        try:
+            return _parse_manifest(self.bucket.blob(self.prefix + SITE_MANIFEST_KEY).download_as_bytes())
+        except self._not_found:
+            return {}
+        except self._errors as e:
+            raise RuntimeError(f'GCS manifest read failed: {e}') from e
+
+    def put(self, key: str, body: bytes, content_type: str, encoding: str) -> int:
+        blob = self.bucket.blob(self.prefix + key)
+        blob.cache_control = CACHE_CONTROL
+        if encoding != 'none':
+            body = compress(body, encoding)
+            blob.content_encoding = encoding
+        try:
+            blob.upload_from_string(body, content_type=content_type)
+        except self._errors as e:
+            raise RuntimeError(f'GCS upload failed: {e}') from e
+        logger.info('Static site file uploaded to gs://%s/%s%s', self.bucket.name, self.prefix, key)
+        return len(body)
+
+    def delete(self, key: str) -> None:
+        try:
+            self.bucket.blob(self.prefix + key).delete()
+        except self._not_found:
+            pass
+        except self._errors as e:
+            raise RuntimeError(f'GCS delete failed: {e}') from e
+
+    def invalidate(self, keys: list[str]) -> str | None:
+        return None
+
+
+_SITE_DESTINATIONS = {'local': _LocalSite, 's3': _S3Site, 'gcs': _GCSSite}
+
+
+def push_site(files: list[SiteFile]) -> None:
+    """Upload the site files whose digest changed since the last push.
+
+    Reads the destination's manifest, uploads new or changed files, deletes
+    files that are no longer generated (e.g. an archived area's page), then
+    writes the new manifest. The manifest is written last, so a failed push
+    is retried in full. With CloudFront configured, only the uploaded and
+    deleted keys are invalidated.
+
+    STATIC_PAGE_PUSH_TARGET is the site root: a directory for local, or
+    "bucket/optional/prefix" for s3 and gcs. Each destination keeps its own
+    manifest, so several destinations (pushed concurrently, see
+    _push_each()) are diffed independently.
+
+    Args:
+        files: Output of generate_site().
+
+    Raises:
+        RuntimeError: if push method or encoding is unknown, target is
+            empty, or any read, upload or delete fails.
     """
-    html = generate()
-    push(html)
+    destinations = _destinations()
+    encoding = _content_encoding()
+    current = {f.key: f.digest for f in files}
+
+    def push_one(method: str, target: str) -> None:
+        destination = _SITE_DESTINATIONS[method](target)
+        previous = destination.read_manifest()
+        changed = [f for f in files if previous.get(f.key) != f.digest]
+        removed = sorted(set(previous) - set(current))
+
+        uploaded_bytes = 0
+        for site_file in changed:
+            uploaded_bytes += destination.put(site_file.key, site_file.body, site_file.content_type, encoding)
+        for key in removed:
+            destination.delete(key)
+        invalidation_id = None
+        if changed or removed:
+            manifest = json.dumps({'files': current}, indent=2, sort_keys=True).encode('utf-8')
+            destination.put(SITE_MANIFEST_KEY, manifest, JSON_CONTENT_TYPE, 'none')
+            invalidation_id = destination.invalidate([f.key for f in changed] + removed)
+
+        mutation_data: dict = {
+            'method': method, 'target': target, 'mode': 'site', 'encoding': encoding,
+            'uploaded': [f.key for f in changed], 'deleted': removed,
+            'unchanged': len(files) - len(changed), 'uploaded_bytes': uploaded_bytes,
+        }
+        if invalidation_id:
+            mutation_data['cloudfront_invalidation_id'] = invalidation_id
+        log_mutation('static_page.pushed', 'system', mutation_data)
+
+        logger.info(
+            'Static site pushed via %s to %s (%d uploaded, %d deleted, %d unchanged)',
+            method, target, len(changed), len(removed), len(files) - len(changed),
+        )
+
+    _push_each(destinations, push_one)
+
+
+def generate_and_push() -> bool:
+    """Generate the static status page and push it to the configured destinations.
+
+    Convenience function used by the notification worker handler. With
+    STATIC_PAGE_MODE=site, publishes the multi-file site incrementally
+    (generate_site() / push_site()) instead of the single page. Runs under
+    the ``static_page`` single-flight lock, so concurrent callers (several
+    workers, or a worker and a manual push) never race on the upload: a
+    caller that arrives while a render is in flight waits for it, and skips
+    its own render when one that started after its request has finished.
+
+    Returns:
+        True if this call rendered and pushed the page; False if a
+        concurrent run already published an up-to-date page.
+
+    Raises:
+        RuntimeError: if STATIC_PAGE_MODE is unknown, or generation or push fails.
+        LockTimeout: if another process held the lock past the lease.
+    """
+    from esb.services import lock_service
+
+    mode = current_app.config.get('STATIC_PAGE_MODE', 'single')
+    if mode == 'site':
+        def work():
+            push_site(generate_site())
+    elif mode == 'single':
+        def work():
+            push(generate())
+    else:
+        raise RuntimeError(f'Unknown STATIC_PAGE_MODE: {mode!r}')
+
+    return lock_service.run_single_flight(STATIC_PAGE_LOCK, work, lease_seconds=STATIC_PAGE_LOCK_LEASE)
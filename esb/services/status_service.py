@@ -4,12 +4,16 @@ Single source of truth for computing equipment operational status
 from open repair records.
 """
 
+from dataclasses import dataclass
+from datetime import date, datetime
+
 from sqlalchemy.orm import joinedload
 
 from esb.extensions import db
 from esb.models.area import Area
 from esb.models.equipment import Equipment
 from esb.models.repair_record import RepairRecord
+from esb.models.user import User
 from esb.services.repair_service import CLOSED_STATUSES
 from esb.utils.exceptions import AreaArchived, AreaNotFound, EquipmentNotFound
 
@@ -23,6 +27,44 @@ _SEVERITY_STATUS = {
 _NOT_SURE_PRIORITY = _SEVERITY_STATUS['Not Sure'][2]
 
 
+@dataclass(frozen=True, slots=True)
+class RepairSnapshot:
+    """Column values of one open repair record, detached from the session."""
+
+    status: str
+    severity: str | None
+    description: str
+    eta: date | None
+    created_at: datetime
+    assignee_name: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class EquipmentSnapshot:
+    """One equipment item with its derived status and open repairs.
+
+    ``open_records`` is in display order (severity priority, then age), as
+    for ``get_area_status_dashboard()``.
+    """
+
+    id: int
+    name: str
+    color: str
+    label: str
+    severity: str | None
+    eta: date | None
+    open_records: tuple[RepairSnapshot, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class AreaSnapshot:
+    """One non-archived area with its non-archived equipment."""
+
+    id: int
+    name: str
+    equipment: tuple[EquipmentSnapshot, ...]
+
+
 def _open_records_sort_key(rec):
     """Sort key for open repair records.
 
@@ -87,13 +129,21 @@ def _find_highest_severity_record(records: list):
     return best_record
 
 
+def _assignee_name(record) -> str | None:
+    """Return the record's assignee username; snapshots carry it as a column."""
+    if isinstance(record, RepairSnapshot):
+        return record.assignee_name
+    return record.assignee.username if record.assignee else None
+
+
 def _derive_status_from_records(records: list) -> dict:
     """Derive equipment status from a list of open repair records.
 
     Single source of truth for status derivation logic (AC #2).
 
     Args:
-        records: List of open RepairRecord instances for one equipment item.
+        records: List of open RepairRecord (or RepairSnapshot) instances for
+            one equipment item.
             Callers must pass records ordered by ``created_at`` ascending so
             the tie-break rule below is deterministic; ``_get_open_records()``
             and the dashboard prefetch queries already do this.
@@ -127,7 +177,7 @@ def _derive_status_from_records(records: list) -> dict:
             'issue_description': anchor.description,
             'severity': None,
             'eta': anchor.eta,
-            'assignee_name': anchor.assignee.username if anchor.assignee else None,
+            'assignee_name': _assignee_name(anchor),
         }
 
     color, label, _ = _SEVERITY_STATUS[best_record.severity]
@@ -137,7 +187,7 @@ def _derive_status_from_records(records: list) -> dict:
         'issue_description': best_record.description,
         'severity': best_record.severity,
         'eta': best_record.eta,
-        'assignee_name': best_record.assignee.username if best_record.assignee else None,
+        'assignee_name': _assignee_name(best_record),
     }
 
 
@@ -285,6 +335,70 @@ def get_area_status_dashboard() -> list[dict]:
     return result
 
 
+def get_status_snapshot() -> tuple[AreaSnapshot, ...]:
+    """Get the same data as get_area_status_dashboard() as immutable values.
+
+    Built from three column-only queries (areas, equipment, open repairs
+    joined to the assignee's username) without loading ORM instances, so no
+    attribute access during rendering can reach the database, and nothing is
+    added to the session's identity map. Used by the static page, which runs
+    in the long-lived worker.
+
+    Returns:
+        Areas in dashboard order (sort_order, name), each with equipment by
+        name.
+    """
+    areas = db.session.execute(
+        db.select(Area.id, Area.name)
+        .filter(Area.is_archived.is_(False))
+        .order_by(Area.sort_order, Area.name)
+    ).all()
+
+    equipment_by_area: dict[int, list] = {}
+    for row in db.session.execute(
+        db.select(Equipment.id, Equipment.name, Equipment.area_id)
+        .filter(Equipment.is_archived.is_(False))
+        .order_by(Equipment.name)
+    ):
+        equipment_by_area.setdefault(row.area_id, []).append(row)
+
+    # Same (created_at, id) ASC order as the dashboard prefetch, which the
+    # status derivation's oldest-wins tie-break relies on.
+    records_by_equipment: dict[int, list[RepairSnapshot]] = {}
+    for row in db.session.execute(
+        db.select(
+            RepairRecord.equipment_id, RepairRecord.status, RepairRecord.severity,
+            RepairRecord.description, RepairRecord.eta, RepairRecord.created_at,
+            User.username,
+        )
+        .join(Equipment, RepairRecord.equipment_id == Equipment.id)
+        .outerjoin(User, RepairRecord.assignee_id == User.id)
+        .filter(
+            Equipment.is_archived.is_(False),
+            RepairRecord.status.notin_(CLOSED_STATUSES),
+        )
+        .order_by(RepairRecord.created_at, RepairRecord.id)
+    ):
+        records_by_equipment.setdefault(row.equipment_id, []).append(RepairSnapshot(
+            status=row.status, severity=row.severity, description=row.description,
+            eta=row.eta, created_at=row.created_at, assignee_name=row.username,
+        ))
+
+    result = []
+    for area in areas:
+        equipment = []
+        for equip in equipment_by_area.get(area.id, []):
+            records = records_by_equipment.get(equip.id, [])
+            status = _derive_status_from_records(records)
+            equipment.append(EquipmentSnapshot(
+                id=equip.id, name=equip.name, color=status['color'], label=status['label'],
+                severity=status['severity'], eta=status['eta'],
+                open_records=tuple(sorted(records, key=_open_records_sort_key)),
+            ))
+        result.append(AreaSnapshot(id=area.id, name=area.name, equipment=tuple(equipment)))
+    return tuple(result)
+
+
 def get_single_area_status_dashboard(area_id: int) -> dict:
     """Get a single non-archived area's equipment with computed statuses.
 
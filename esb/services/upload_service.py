@@ -1,12 +1,25 @@
 """Upload service for file storage and Document record management.
 
 Handles all file I/O for uploads. Views never touch the filesystem directly.
+
+File contents are stored once per SHA-256 digest under UPLOAD_PATH/blobs/.
+Each Document's file (e.g. equipment/<id>/docs/<uuid>.pdf) is a hard link to
+its blob, so the serving routes read the usual per-parent paths while the
+same manual uploaded for five machines takes the disk space of one. The
+blob's link count is its reference count: deleting the last document that
+links to it deletes the blob.
 """
 
+import contextlib
+import hashlib
+import logging
 import os
+import shutil
+import tempfile
+import time
 import uuid
 
-from flask import current_app
+from flask import Request, current_app
 from werkzeug.utils import secure_filename
 
 from esb.extensions import db
@@ -14,6 +27,8 @@ from esb.models.document import Document
 from esb.utils.exceptions import ValidationError
 from esb.utils.logging import log_mutation
 
+logger = logging.getLogger(__name__)
+
 ALLOWED_DOC_EXTENSIONS = {
     'pdf', 'doc', 'docx', 'txt', 'rtf', 'odt', 'xls', 'xlsx', 'csv', 'ppt', 'pptx',
 }
@@ -37,6 +52,70 @@ _PARENT_TYPE_CONFIG = {
 }
 
 
+# Size of the reads when copying an upload stream into the upload directory.
+_CHUNK_BYTES = 1024 * 1024
+
+BLOB_SUBDIR = 'blobs'
+
+# Seconds after its last write that a spool file in blobs/.incoming is taken
+# to be left over from a killed or timed-out request. A request still
+# receiving its body keeps writing, so its spool file never gets this old.
+INCOMING_MAX_AGE = 3600
+
+
+class HashingFile:
+    """A temporary file in the upload directory that hashes what is written to it.
+
+    Bytes are hashed (SHA-256) and counted as they are written, so the digest
+    of a finished file is known without reading it back. The file is deleted
+    when closed; save_upload() links it into place before then.
+    """
+
+    def __init__(self, directory: str):
+        os.makedirs(directory, exist_ok=True)
+        self._file = tempfile.NamedTemporaryFile(dir=directory, prefix='upload-')
+        self.name = self._file.name
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self._sequential = True
+
+    def write(self, data) -> int:
+        if self._file.tell() != self.size:
+            self._sequential = False  # a rewrite the running digest cannot follow
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def intact(self) -> bool:
+        """True if the digest and size describe the file's whole content."""
+        self._file.flush()
+        return self._sequential and os.fstat(self._file.fileno()).st_size == self.size
+
+    def __iter__(self):
+        return iter(self._file)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+class UploadRequest(Request):
+    """Request class that spools uploaded files into the upload directory.
+
+    Werkzeug's default writes each uploaded file to the system temp directory
+    and save_upload() would then copy it again. Spooling into a HashingFile on
+    the upload volume hashes the file as it arrives (the body is already
+    capped at UPLOAD_MAX_SIZE_MB by MAX_CONTENT_LENGTH) and lets save_upload()
+    hard-link it into place without copying.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        try:
+            return HashingFile(_incoming_dir())
+        except OSError:
+            logger.warning('Cannot spool uploads into UPLOAD_PATH; using the temp directory', exc_info=True)
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+
+
 def save_upload(
     file,
     parent_type: str,
@@ -46,6 +125,9 @@ def save_upload(
 ) -> Document:
     """Save an uploaded file to disk and create a Document record.
 
+    The file is stored under its SHA-256 digest and linked into the parent's
+    directory; identical content already stored is linked, not written again.
+
     Args:
         file: Werkzeug FileStorage object from the form.
         parent_type: 'equipment_doc', 'equipment_photo', or 'repair_photo'.
@@ -77,23 +159,26 @@ def save_upload(
             f'Allowed types: {", ".join(sorted(config["allowed_extensions"]))}'
         )
 
-    file.seek(0, 2)
-    file_size = file.tell()
-    file.seek(0)
-
     max_bytes = current_app.config['UPLOAD_MAX_SIZE_MB'] * 1024 * 1024
-    if file_size > max_bytes:
-        raise ValidationError(
-            f'File exceeds maximum size of {current_app.config["UPLOAD_MAX_SIZE_MB"]} MB.'
-        )
-
-    stored_filename = f'{uuid.uuid4().hex}{os.path.splitext(original_filename)[1].lower()}'
-    subdir = config['subdir'].format(parent_id=parent_id)
-    upload_dir = os.path.join(current_app.config['UPLOAD_PATH'], subdir)
-    os.makedirs(upload_dir, exist_ok=True)
-
-    file_path = os.path.join(upload_dir, stored_filename)
-    file.save(file_path)
+    spool = _spool(file, max_bytes)
+    try:
+        if spool.size > max_bytes:
+            raise ValidationError(
+                f'File exceeds maximum size of {current_app.config["UPLOAD_MAX_SIZE_MB"]} MB.'
+            )
+        file_size = spool.size
+        sha256 = spool.sha256.hexdigest()
+
+        stored_filename = f'{uuid.uuid4().hex}{os.path.splitext(original_filename)[1].lower()}'
+        subdir = config['subdir'].format(parent_id=parent_id)
+        upload_dir = os.path.join(current_app.config['UPLOAD_PATH'], subdir)
+        os.makedirs(upload_dir, exist_ok=True)
+
+        file_path = os.path.join(upload_dir, stored_filename)
+        _store(spool, _blob_path(sha256), file_path)
+    finally:
+        if spool is not file.stream:
+            spool.close()
 
     content_type = file.content_type or 'application/octet-stream'
 
@@ -102,6 +187,7 @@ def save_upload(
         stored_filename=stored_filename,
         content_type=content_type,
         size_bytes=file_size,
+        sha256=sha256,
         category=category,
         parent_type=parent_type,
         parent_id=parent_id,
@@ -118,6 +204,9 @@ def save_upload(
         'parent_id': doc.parent_id,
     })
 
+    from esb.services import image_variant_service
+    image_variant_service.queue_variants(doc)
+
     return doc
 
 
@@ -147,14 +236,17 @@ def delete_upload(
     if parent_id is not None and doc.parent_id != parent_id:
         raise ValidationError(f'Document with id {document_id} not found')
 
-    config = _PARENT_TYPE_CONFIG.get(doc.parent_type)
-    if config:
-        subdir = config['subdir'].format(parent_id=doc.parent_id)
-        file_path = os.path.join(
-            current_app.config['UPLOAD_PATH'], subdir, doc.stored_filename
-        )
+    directory = document_dir(doc)
+    if directory:
+        file_path = os.path.join(directory, doc.stored_filename)
         if os.path.exists(file_path):
             os.remove(file_path)
+        for width in doc.variant_widths:
+            for fmt in ('webp', 'jpeg'):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(directory, doc.variant_filename(width, fmt)))
+    if doc.sha256:
+        _release_blob(doc.sha256)
 
     log_data = {
         'id': doc.id,
@@ -169,6 +261,14 @@ def delete_upload(
     log_mutation('document.deleted', deleted_by, log_data)
 
 
+def document_dir(doc: Document) -> str | None:
+    """Return the directory holding a document's file, or None for an unknown parent_type."""
+    config = _PARENT_TYPE_CONFIG.get(doc.parent_type)
+    if config is None:
+        return None
+    return os.path.join(current_app.config['UPLOAD_PATH'], config['subdir'].format(parent_id=doc.parent_id))
+
+
 def get_documents(parent_type: str, parent_id: int) -> list[Document]:
     """Get all documents for a parent entity, ordered by created_at desc."""
     return list(
@@ -178,3 +278,94 @@ def get_documents(parent_type: str, parent_id: int) -> list[Document]:
             .order_by(Document.created_at.desc())
         ).scalars().all()
     )
+
+
+def sweep_incoming(max_age: float = INCOMING_MAX_AGE) -> int:
+    """Delete spool files left in blobs/.incoming by interrupted uploads.
+
+    Called by the worker's hourly prune. Files written to in the last
+    ``max_age`` seconds belong to uploads in progress and are kept.
+
+    Returns:
+        The number of files deleted.
+
+    Raises:
+        OSError: if the directory cannot be listed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(_incoming_dir()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file(follow_symlinks=False) and entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            continue  # its request finished and removed it meanwhile
+    if removed:
+        logger.info('Removed %d stale upload spool file(s) from %s', removed, _incoming_dir())
+    return removed
+
+
+def _incoming_dir() -> str:
+    return os.path.join(current_app.config['UPLOAD_PATH'], BLOB_SUBDIR, '.incoming')
+
+
+def _blob_path(sha256: str) -> str:
+    return os.path.join(current_app.config['UPLOAD_PATH'], BLOB_SUBDIR, sha256[:2], sha256)
+
+
+def _spool(file, max_bytes: int) -> HashingFile:
+    """Return a HashingFile holding the upload's content.
+
+    Files spooled by UploadRequest are used as they are. Other streams are
+    copied in chunks, stopping once more than max_bytes have been read.
+    """
+    stream = file.stream
+    if isinstance(stream, HashingFile) and stream.intact():
+        return stream
+    spool = HashingFile(_incoming_dir())
+    try:
+        while chunk := stream.read(_CHUNK_BYTES):
+            spool.write(chunk)
+            if spool.size > max_bytes:
+                break
+        spool.flush()
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _store(spool: HashingFile, blob_path: str, file_path: str) -> None:
+    """Link the spooled file to its blob and the blob to file_path.
+
+    The spool becomes the blob unless one with the same digest exists. If
+    the blob's last other document is deleted in between (removing the
+    blob), the spool is linked again. Where the filesystem has no hard
+    links, the spool is copied to file_path instead, without deduplication.
+    """
+    os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+    try:
+        for _attempt in range(3):
+            with contextlib.suppress(FileExistsError):
+                os.link(spool.name, blob_path)
+            with contextlib.suppress(FileNotFoundError):
+                os.link(blob_path, file_path)
+                return
+    except OSError:
+        logger.warning('Cannot hard-link uploads in UPLOAD_PATH; storing a copy', exc_info=True)
+    shutil.copyfile(spool.name, file_path)
+
+
+def _release_blob(sha256: str) -> None:
+    """Delete the blob if no document file links to it any more."""
+    blob_path = _blob_path(sha256)
+    try:
+        if os.stat(blob_path).st_nlink <= 1:
+            os.remove(blob_path)
+    except FileNotFoundError:
+        pass
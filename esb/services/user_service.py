@@ -6,6 +6,7 @@ they never query models directly.
 
 import logging
 import secrets
+from datetime import UTC, datetime, timedelta
 
 from flask import current_app
 
@@ -27,6 +28,12 @@ except ImportError:
 
 VALID_ROLES = ('technician', 'staff')
 
+# How long a cached Slack member ID is trusted before the next lookup
+# re-resolves it from the user's email. Slack IDs are stable for the life of
+# an account; the TTL only bounds staleness after an account is deactivated
+# or an email is reassigned.
+SLACK_USER_ID_TTL = timedelta(days=7)
+
 
 def create_user(
     username: str,
@@ -227,6 +234,11 @@ def update_slack_handle(user_id: int, slack_handle: str | None, updated_by: str)
 
     old_slack_handle = user.slack_handle
     user.slack_handle = normalized
+    if normalized != old_slack_handle:
+        # A changed handle may point at a different Slack account; drop the
+        # cached ID so the next delivery re-resolves it.
+        user.slack_user_id = None
+        user.slack_user_id_resolved_at = None
     db.session.commit()
 
     log_mutation('user.slack_handle_updated', updated_by, {
@@ -239,6 +251,76 @@ def update_slack_handle(user_id: int, slack_handle: str | None, updated_by: str)
     return user
 
 
+def get_cached_slack_user_id(user: User) -> str | None:
+    """Return the user's cached Slack member ID, or None if absent or stale."""
+    if not user.slack_user_id or user.slack_user_id_resolved_at is None:
+        return None
+    resolved_at = user.slack_user_id_resolved_at
+    if resolved_at.tzinfo is None:
+        resolved_at = resolved_at.replace(tzinfo=UTC)
+    if datetime.now(UTC) - resolved_at > SLACK_USER_ID_TTL:
+        return None
+    return user.slack_user_id
+
+
+def cache_slack_user_id(user: User, slack_user_id: str | None) -> None:
+    """Persist (or clear, when None) the user's resolved Slack member ID.
+
+    A Slack member ID maps to at most one ESB account, so any other user still
+    holding the same ID (e.g. after an email moved between accounts) has its
+    cached value cleared. Failures are logged and rolled back: the cache is an
+    optimization and must never break the caller.
+    """
+    try:
+        if slack_user_id is not None:
+            stale = db.session.execute(
+                db.select(User).filter(
+                    User.slack_user_id == slack_user_id, User.id != user.id,
+                )
+            ).scalars().all()
+            for other in stale:
+                other.slack_user_id = None
+                other.slack_user_id_resolved_at = None
+        user.slack_user_id = slack_user_id
+        user.slack_user_id_resolved_at = datetime.now(UTC) if slack_user_id else None
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        logger.warning('Failed to cache Slack user ID for user %s', user.username, exc_info=True)
+
+
+def resolve_slack_user_id(client, user: User) -> str:
+    """Return the user's Slack member ID, using the cached value when fresh.
+
+    On a cache miss (or expiry) this calls users.lookupByEmail and stores the
+    result. A ``users_not_found`` error clears the cached ID so a stale value
+    is not served again.
+
+    Args:
+        client: Slack WebClient instance.
+        user: The ESB user to resolve.
+
+    Raises:
+        slack_sdk.errors.SlackApiError, KeyError: on lookup failure; callers
+            decide how to degrade.
+    """
+    cached = get_cached_slack_user_id(user)
+    if cached:
+        return cached
+
+    try:
+        resp = client.users_lookupByEmail(email=user.email)
+    except Exception as e:
+        data = getattr(getattr(e, 'response', None), 'data', None)
+        error = data.get('error') if isinstance(data, dict) else None
+        if error == 'users_not_found' and user.slack_user_id:
+            cache_slack_user_id(user, None)
+        raise
+    slack_user_id = resp['user']['id']
+    cache_slack_user_id(user, slack_user_id)
+    return slack_user_id
+
+
 def _deliver_temp_password_via_slack(
     user: User, temp_password: str, *, action: str = 'created',
 ) -> bool:
@@ -263,13 +345,13 @@ def _deliver_temp_password_via_slack(
 
     try:
         # 8s per call (rather than 15s like the worker) because this path
-        # makes three sequential calls -- users_lookupByEmail,
-        # conversations_open, chat_postMessage -- and runs synchronously in a
+        # makes up to three sequential calls -- users_lookupByEmail (skipped
+        # when the Slack ID is cached), conversations_open, chat_postMessage --
+        # and runs synchronously in a
         # web request. 3 * 8s = 24s stays comfortably under gunicorn's default
         # 30s worker_timeout.
         client = WebClient(token=token, timeout=8)
-        resp = client.users_lookupByEmail(email=user.email)
-        slack_user_id = resp['user']['id']
+        slack_user_id = resolve_slack_user_id(client, user)
 
         resp = client.conversations_open(users=[slack_user_id])
         dm_channel_id = resp['channel']['id']
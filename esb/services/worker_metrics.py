@@ -0,0 +1,240 @@
+"""Delivery statistics for the background notification worker.
+
+The worker container has no HTTP server, so it accumulates histograms and
+counters in-process and publishes a JSON snapshot to ``AppConfig`` after any
+iteration that changed them. ``metrics_service`` re-exposes the snapshot on
+the app's ``/metrics`` endpoint; one cheap primary-key read per scrape.
+
+Counters are cumulative since worker start, so a worker restart shows up in
+Prometheus as an ordinary counter reset.
+"""
+
+import bisect
+import gc
+import json
+import logging
+import os
+import time
+from datetime import UTC, datetime
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+
+from esb.extensions import db
+from esb.models.app_config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# AppConfig key holding the published snapshot.
+WORKER_METRICS_KEY = 'worker_delivery_metrics'
+
+# Enqueue-to-delivery latency buckets (seconds). Spans the wake-up fast path
+# (sub-second) through the backoff schedule's one-hour ceiling.
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300, 900, 3600)
+
+# Per-attempt handler duration buckets (seconds). Slack calls time out at 15s.
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 15, 30)
+
+# Minimum seconds between process memory samples. gc.get_objects() walks every
+# tracked object, so it is sampled periodically rather than every iteration.
+PROCESS_STATS_INTERVAL = 60
+
+# Monotonic clock for handler durations. Referenced here rather than through
+# notification_service.time so tests that patch the worker's sleep do not
+# also replace the clock.
+clock = time.perf_counter
+
+
+class Histogram:
+    """Fixed-bucket histogram with per-bucket (non-cumulative) counts."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        cumulative, buckets = 0, []
+        for bound, count in zip((*self.bounds, '+Inf'), self.counts):
+            cumulative += count
+            buckets.append([str(bound), cumulative])
+        return {'buckets': buckets, 'sum': self.sum, 'count': cumulative}
+
+
+class WorkerMetrics:
+    """Accumulates delivery, Slack error, prune, static push and process-memory statistics."""
+
+    def __init__(self):
+        self.started_at = datetime.now(UTC).timestamp()
+        self.latency: dict[str, Histogram] = {}
+        self.duration: dict[str, Histogram] = {}
+        self.outcomes: dict[str, dict[str, int]] = {}
+        self.slack_errors: dict[str, int] = {}
+        self.pruned: dict[str, int] = {}
+        self.static_pushes: dict[str, dict] = {}
+        self.process: dict[str, int | None] = {}
+        self._process_sampled_at: float | None = None
+        self.dirty = False
+
+    def record_attempt(self, notification_type: str, outcome: str, duration: float) -> None:
+        """Record one delivery attempt's outcome and handler duration.
+
+        Args:
+            notification_type: The notification's type.
+            outcome: 'delivered', 'failed', 'permanently_failed' or 'deferred'.
+            duration: Seconds spent in the delivery handler.
+        """
+        self.duration.setdefault(notification_type, Histogram(DURATION_BUCKETS)).observe(duration)
+        by_outcome = self.outcomes.setdefault(notification_type, {})
+        by_outcome[outcome] = by_outcome.get(outcome, 0) + 1
+        self.dirty = True
+
+    def record_latency(self, notification_type: str, created_at: datetime, delivered_at: datetime) -> None:
+        """Record enqueue-to-delivery latency (``delivered_at - created_at``)."""
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=UTC)
+        if delivered_at.tzinfo is None:
+            delivered_at = delivered_at.replace(tzinfo=UTC)
+        seconds = max(0.0, (delivered_at - created_at).total_seconds())
+        self.latency.setdefault(notification_type, Histogram(LATENCY_BUCKETS)).observe(seconds)
+        self.dirty = True
+
+    def record_slack_error(self, error: Exception) -> None:
+        """Count a Slack API error by its error code, if ``error`` carries one."""
+        code = slack_error_code(error)
+        if code is None:
+            return
+        self.slack_errors[code] = self.slack_errors.get(code, 0) + 1
+        self.dirty = True
+
+    def record_pruned(self, status: str, count: int) -> None:
+        """Count queue rows deleted by the retention prune, by status."""
+        self.pruned[status] = self.pruned.get(status, 0) + count
+        self.dirty = True
+
+    def record_static_push(self, method: str, target: str, ok: bool) -> None:
+        """Count one static page push to a destination and stamp its last success.
+
+        Args:
+            method: The destination's push method ('local', 's3' or 'gcs').
+            target: The destination's STATIC_PAGE_PUSH_TARGET entry.
+            ok: Whether the push to this destination succeeded.
+        """
+        entry = self.static_pushes.setdefault(
+            f'{method}:{target}',
+            {'method': method, 'target': target, 'ok': 0, 'failed': 0, 'last_success': None},
+        )
+        if ok:
+            entry['ok'] += 1
+            entry['last_success'] = datetime.now(UTC).timestamp()
+        else:
+            entry['failed'] += 1
+        self.dirty = True
+
+    def sample_process(self, session_objects: int, force: bool = False) -> None:
+        """Record RSS, GC-tracked object count and session identity-map size.
+
+        Sampled at most every PROCESS_STATS_INTERVAL seconds unless ``force``.
+
+        Args:
+            session_objects: Objects in the worker's SQLAlchemy identity map
+                at the end of the current iteration.
+        """
+        now = clock()
+        if (not force and self._process_sampled_at is not None
+                and now - self._process_sampled_at < PROCESS_STATS_INTERVAL):
+            return
+        self._process_sampled_at = now
+        self.process = {
+            'rss_bytes': current_rss_bytes(),
+            'gc_objects': len(gc.get_objects()),
+            'session_objects': session_objects,
+        }
+        self.dirty = True
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable view of all series."""
+        return {
+            'started_at': self.started_at,
+            'latency': {t: h.to_dict() for t, h in self.latency.items()},
+            'duration': {t: h.to_dict() for t, h in self.duration.items()},
+            'outcomes': self.outcomes,
+            'slack_errors': self.slack_errors,
+            'pruned': self.pruned,
+            'static_pushes': list(self.static_pushes.values()),
+            'process': self.process,
+        }
+
+
+def current_rss_bytes() -> int | None:
+    """Return this process's resident set size in bytes, or None if unknown.
+
+    Reads /proc/self/statm (Linux, as in the Docker image); returns None
+    elsewhere rather than substituting the peak RSS from getrusage().
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def slack_error_code(error: BaseException | None) -> str | None:
+    """Return the Slack ``error`` code from a SlackApiError or its cause chain."""
+    while error is not None:
+        data = getattr(getattr(error, 'response', None), 'data', None)
+        if isinstance(data, dict) and data.get('error'):
+            return str(data['error'])
+        error = error.__cause__
+    return None
+
+
+def get_worker_metrics() -> WorkerMetrics:
+    """Return the app's WorkerMetrics, creating it on first use."""
+    from flask import current_app
+
+    metrics = current_app.extensions.get('esb_worker_metrics')
+    if metrics is None:
+        metrics = WorkerMetrics()
+        current_app.extensions['esb_worker_metrics'] = metrics
+    return metrics
+
+
+def publish_state(key: str, value: str) -> bool:
+    """Upsert a worker-published AppConfig value for /metrics.
+
+    Worker telemetry bypasses config_service.set_config() deliberately: these
+    writes are frequent, machine-generated, and must not emit mutation logs.
+    Errors are rolled back and logged, never raised.
+
+    Returns:
+        True if the value was committed.
+    """
+    try:
+        row = db.session.execute(
+            select(AppConfig).where(AppConfig.key == key)
+        ).scalar_one_or_none()
+        if row is None:
+            db.session.add(AppConfig(key=key, value=value))
+        else:
+            row.value = value
+        db.session.commit()
+        return True
+    except SQLAlchemyError:
+        db.session.rollback()
+        logger.warning('Failed to publish worker state %s', key, exc_info=True)
+        return False
+
+
+def publish_worker_metrics() -> None:
+    """Publish the delivery metrics snapshot if it changed since the last write."""
+    metrics = get_worker_metrics()
+    if not metrics.dirty:
+        return
+    if publish_state(WORKER_METRICS_KEY, json.dumps(metrics.snapshot())):
+        metrics.dirty = False
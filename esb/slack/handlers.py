@@ -31,8 +31,9 @@ def _resolve_esb_user(client, slack_user_id):
     """Map a Slack user ID to an ESB User account.
 
     Strategy:
-    1. Call Slack API to get user's email from their profile
-    2. Look up ESB User by matching email
+    1. Match an active ESB User whose cached slack_user_id is still fresh
+    2. Otherwise call Slack API to get user's email from their profile
+    3. Look up ESB User by matching email and cache the Slack ID on it
 
     Args:
         client: Slack WebClient instance (provided by Bolt).
@@ -46,15 +47,25 @@ def _resolve_esb_user(client, slack_user_id):
     """
     from esb.extensions import db
     from esb.models.user import User
+    from esb.services import user_service
 
     try:
+        cached = db.session.execute(
+            db.select(User).filter_by(slack_user_id=slack_user_id, is_active=True)
+        ).scalars().first()
+        if cached is not None and user_service.get_cached_slack_user_id(cached):
+            return cached
+
         result = client.users_info(user=slack_user_id)
         email = result['user']['profile'].get('email')
         if not email:
             return None
-        return db.session.execute(
+        user = db.session.execute(
             db.select(User).filter_by(email=email, is_active=True)
         ).scalars().first()
+        if user is not None:
+            user_service.cache_slack_user_id(user, slack_user_id)
+        return user
     except Exception:
         logger.warning('Failed to resolve ESB user for Slack user %s', slack_user_id, exc_info=True)
         return None
@@ -243,6 +243,8 @@ document.addEventListener('DOMContentLoaded', function () {
   var img = document.getElementById('qr-preview');
   var errEl = document.getElementById('qr-preview-error');
   var base = form.getAttribute('data-preview-base');
+  var zoomEl = document.getElementById('qr-preview-zoom');
+  var frame = document.getElementById('qr-preview-frame');
   var timer = null;
   // Attach once so they persist across every debounced img.src reassignment.
   // A 400 (e.g. oversized canvas) degrades to a readable message, not a broken icon.
@@ -270,6 +272,15 @@ document.addEventListener('DOMContentLoaded', function () {
     if (wifiInfo) params.set('wifi_info', wifiInfo.value);
     if (incName) params.set('include_name', '1');
     if (incUrl) params.set('include_url', '1');
+    // Zoomed: show the full-resolution render 1:1 in a scrollable frame.
+    var zoom = zoomEl && zoomEl.checked;
+    if (zoom) params.set('zoom', '1');
+    img.classList.toggle('img-fluid', !zoom);
+    img.style.maxWidth = zoom ? 'none' : '400px';
+    if (frame) {
+      frame.style.overflow = zoom ? 'auto' : '';
+      frame.style.maxHeight = zoom ? '480px' : '';
+    }
     img.src = base + '?' + params.toString();
   }
   function schedule() {
@@ -278,4 +289,6 @@ document.addEventListener('DOMContentLoaded', function () {
     timer = setTimeout(update, 150);
   }
   form.addEventListener('change', schedule);
+  // The zoom switch sits outside the form so it is never posted with the download.
+  if (zoomEl) zoomEl.addEventListener('change', schedule);
 })();
@@ -34,3 +34,33 @@ class AreaArchived(AreaNotFound):
     Subclass of AreaNotFound so callers that don't need the distinction
     can catch the parent and treat both as 'unavailable'.
     """
+
+
+class RateLimited(ESBError):
+    """Raised when an outbound call is deferred by a rate limiter.
+
+    Carries the limiter lane and the number of seconds to wait before the
+    lane can accept another call, so callers can reschedule rather than
+    treat the deferral as a failure.
+    """
+
+    def __init__(self, lane: str, retry_after: float):
+        super().__init__(f'Rate limited on {lane}; retry after {retry_after:.1f}s')
+        self.lane = lane
+        self.retry_after = retry_after
+
+
+class LockTimeout(ESBError):
+    """Raised when waiting for another process's single-flight run times out."""
+
+
+class RenderPoolBusy(ESBError):
+    """Raised when a render cannot be served now: its pool is full or it timed out.
+
+    Carries the number of seconds the client should wait before retrying
+    (served as HTTP 503 with Retry-After).
+    """
+
+    def __init__(self, retry_after: float):
+        super().__init__(f'Renderer busy; retry after {retry_after:.0f}s')
+        self.retry_after = retry_after
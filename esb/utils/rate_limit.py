@@ -0,0 +1,163 @@
+"""Token-bucket rate limiting for outbound API calls.
+
+The notification worker paces Slack Web API calls through a RateLimiter keyed
+by "lane" (an API method, optionally scoped to a channel). Each lane is a
+token bucket; a lane can also be paused outright when the remote API answers
+HTTP 429 with a Retry-After header, so queued work waits out the limit instead
+of failing and burning retries.
+"""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+
+
+@dataclass
+class TokenBucket:
+    """A single lane's bucket. Times are on the limiter's monotonic clock."""
+
+    rate: float
+    capacity: float
+    tokens: float
+    updated_at: float
+    paused_until: float = 0.0
+    rate_limited_total: int = 0
+
+    def refill(self, now: float) -> None:
+        """Add tokens accrued since the last update, capped at capacity."""
+        elapsed = max(0.0, now - self.updated_at)
+        if math.isinf(self.rate):
+            # Unlimited lane (0 * inf would be NaN); only a pause can hold it.
+            self.tokens = self.capacity
+        else:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until one token is available (0.0 if available now)."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Per-lane token buckets with Retry-After pauses.
+
+    Args:
+        limits: Maps an API method name to ``(rate_per_second, burst_capacity)``.
+            Methods without an entry are not limited, though they can still be
+            paused by a 429.
+        clock: Monotonic time source (injectable for tests).
+        sleep: Sleep function used by acquire() (injectable for tests).
+    """
+
+    def __init__(self, limits: dict[str, tuple[float, float]], clock=time.monotonic, sleep=time.sleep):
+        self._limits = limits
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._changed = False
+        self._refilling = False
+
+    @property
+    def dirty(self) -> bool:
+        """True if lane state changed since the last snapshot() was published.
+
+        Set when a token is taken or a lane is paused, and kept set while the
+        last snapshot showed a bucket that has since been refilling.
+        """
+        return self._changed or self._refilling
+
+    @dirty.setter
+    def dirty(self, value: bool) -> None:
+        self._changed = value
+
+    @staticmethod
+    def lane(method: str, scope: str | None = None) -> str:
+        """Build a lane key, e.g. ``chat.postMessage:#woodshop``."""
+        return f'{method}:{scope}' if scope else method
+
+    def _bucket(self, lane: str, now: float) -> TokenBucket:
+        bucket = self._buckets.get(lane)
+        if bucket is None:
+            method = lane.split(':', 1)[0]
+            rate, capacity = self._limits.get(method, (float('inf'), float('inf')))
+            bucket = TokenBucket(rate=rate, capacity=capacity, tokens=capacity, updated_at=now)
+            self._buckets[lane] = bucket
+        return bucket
+
+    def try_acquire(self, lane: str) -> float:
+        """Take a token if one is available.
+
+        Returns:
+            0.0 when a token was taken, otherwise the seconds to wait before
+            retrying (the remaining pause, or the time to refill one token).
+        """
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(lane, now)
+            bucket.refill(now)
+            wait = bucket.wait_time(now)
+            if wait == 0.0:
+                bucket.tokens -= 1
+                self._changed = True
+            return wait
+
+    def acquire(self, lane: str, max_wait: float) -> float:
+        """Take a token, sleeping up to ``max_wait`` seconds for one.
+
+        Returns:
+            0.0 when a token was taken, otherwise the remaining wait (no token
+            is consumed in that case).
+        """
+        wait = self.try_acquire(lane)
+        if wait == 0.0 or wait > max_wait:
+            return wait
+        self._sleep(wait)
+        return self.try_acquire(lane)
+
+    def token_interval(self, lane: str) -> float:
+        """Seconds between tokens on ``lane`` at its steady rate (0.0 if unlimited)."""
+        rate, _ = self._limits.get(lane.split(':', 1)[0], (float('inf'), float('inf')))
+        return 0.0 if math.isinf(rate) else 1 / rate
+
+    def pause(self, lane: str, seconds: float) -> None:
+        """Pause a lane for ``seconds`` (from a Retry-After) and drain its tokens."""
+        with self._lock:
+            now = self._clock()
+            bucket = self._bucket(lane, now)
+            bucket.refill(now)
+            bucket.tokens = 0.0
+            bucket.paused_until = max(bucket.paused_until, now + seconds)
+            bucket.rate_limited_total += 1
+            self._changed = True
+
+    def snapshot(self) -> dict[str, dict]:
+        """Return JSON-serializable lane state with wall-clock pause deadlines.
+
+        Every lane used so far is included. Also records whether any bucket
+        is still below capacity, so ``dirty`` stays set until a snapshot shows
+        the refilled buckets.
+        """
+        with self._lock:
+            now = self._clock()
+            wall_now = time.time()
+            state = {}
+            refilling = False
+            for lane, bucket in self._buckets.items():
+                bucket.refill(now)
+                # Unlimited lanes have infinite capacity, which is not valid JSON.
+                finite = math.isfinite(bucket.capacity)
+                refilling = refilling or (finite and bucket.tokens < bucket.capacity)
+                state[lane] = {
+                    'tokens': bucket.tokens if finite else None,
+                    'capacity': bucket.capacity if finite else None,
+                    'paused_until': wall_now + max(0.0, bucket.paused_until - now),
+                    'rate_limited_total': bucket.rate_limited_total,
+                }
+            self._refilling = refilling
+            return state
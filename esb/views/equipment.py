@@ -25,8 +25,16 @@ from esb.forms.equipment_forms import (
     ExternalLinkForm,
     PhotoUploadForm,
     QRGenerateForm,
+    QRSheetForm,
+)
+from esb.services import (
+    config_service,
+    equipment_service,
+    qr_service,
+    qr_sheet_service,
+    repair_service,
+    upload_service,
 )
-from esb.services import config_service, equipment_service, qr_service, repair_service, upload_service
 from esb.utils.decorators import role_required
 from esb.utils.exceptions import ValidationError
 from esb.utils.text import get_normalized_base_url, slugify_filename
@@ -254,6 +262,8 @@ def _get_wifi_default(choices):
 
 _WIFI_CLAMP_ORDER = ['password', 'ssid', 'header']
 
+_QR_DOWNLOAD_MIMETYPES = {'png': 'image/png', 'svg': 'image/svg+xml', 'pdf': 'application/pdf'}
+
 
 def _clamp_wifi_info(wifi_info, choices):
     """Clamp wifi_info to the best available choice (graceful degradation).
@@ -345,18 +355,21 @@ def qr(id):
                 )
         preset = qr_service.QR_PRESETS_BY_KEY[form.size.data]
         device = qr_service.QR_DEVICES_BY_KEY[form.device.data]
+        output_format = form.output_format.data
+        render_options = dict(
+            include_name=form.include_name.data,
+            include_url=form.include_url.data,
+            base_url=base_url,
+            wifi_info=wifi_info,
+            wifi_ssid=wifi_config['wifi_ssid'],
+            wifi_password=wifi_config['wifi_password'],
+            template=template,
+        )
         try:
-            png_bytes = qr_service.render_qr_png(
-                eq, preset,
-                dpi=device.dpi,
-                include_name=form.include_name.data,
-                include_url=form.include_url.data,
-                base_url=base_url,
-                wifi_info=wifi_info,
-                wifi_ssid=wifi_config['wifi_ssid'],
-                wifi_password=wifi_config['wifi_password'],
-                template=template,
-            )
+            if output_format in qr_service.VECTOR_FORMATS:
+                file_bytes = qr_service.render_qr_vector(eq, preset, fmt=output_format, **render_options)
+            else:
+                file_bytes = qr_service.render_qr_png(eq, preset, dpi=device.dpi, **render_options)
         except ValueError as exc:
             flash(str(exc), 'danger')
             return _render_form_with_real_choices()
@@ -366,14 +379,18 @@ def qr(id):
             return _render_form_with_real_choices()
         current_app.logger.info(
             'QR downloaded: user=%s equipment_id=%s preset=%s device=%s '
-            'include_name=%s include_url=%s wifi_info=%s',
+            'include_name=%s include_url=%s wifi_info=%s format=%s',
             current_user.username, eq.id, preset.key, device.key,
-            form.include_name.data, form.include_url.data, wifi_info,
+            form.include_name.data, form.include_url.data, wifi_info, output_format,
         )
-        filename = f'qr-{eq.id}-{slugify_filename(eq.name)}-{device.key}.png'
+        if output_format in qr_service.VECTOR_FORMATS:
+            # Vector files do not depend on the printer, so its key stays out of the name.
+            filename = f'qr-{eq.id}-{slugify_filename(eq.name)}.{output_format}'
+        else:
+            filename = f'qr-{eq.id}-{slugify_filename(eq.name)}-{device.key}.png'
         return send_file(
-            io.BytesIO(png_bytes),
-            mimetype='image/png',
+            io.BytesIO(file_bytes),
+            mimetype=_QR_DOWNLOAD_MIMETYPES[output_format],
             as_attachment=True,
             download_name=filename,
         )
@@ -383,7 +400,11 @@ def qr(id):
 @equipment_bp.route('/<int:id>/qr/preview')
 @login_required
 def qr_preview(id):
-    """Inline PNG preview. Query params: size, device, include_name, include_url, wifi_info."""
+    """Inline PNG preview. Query params: size, device, include_name, include_url, wifi_info, zoom.
+
+    Rendered at screen resolution (qr_service.PREVIEW_DPI) unless zoom is set,
+    in which case it shows the printer's actual pixels.
+    """
     eq = _get_active_equipment_or_404(id)
     try:
         base_url = get_normalized_base_url(current_app.config.get('ESB_BASE_URL', ''))
@@ -400,6 +421,7 @@ def qr_preview(id):
         abort(400)
     include_name = request.args.get('include_name') in ('1', 'true', 'on')
     include_url = request.args.get('include_url') in ('1', 'true', 'on')
+    zoom = request.args.get('zoom') in ('1', 'true', 'on')
 
     template = current_app.config.get('QR_TEMPLATE')
     if template is not None:
@@ -421,9 +443,10 @@ def qr_preview(id):
             wifi_info = 'header'
 
     try:
-        png_bytes = qr_service.render_qr_png(
+        png_bytes = qr_service.render_qr_preview_png(
             eq, preset,
             dpi=device.dpi,
+            zoom=zoom,
             include_name=include_name,
             include_url=include_url,
             base_url=base_url,
@@ -442,6 +465,87 @@ def qr_preview(id):
     return response
 
 
+@equipment_bp.route('/qr/sheet', methods=['GET', 'POST'])
+@login_required
+def qr_sheet():
+    """Batch QR label sheet form; queues a background job and redirects to its status."""
+    try:
+        get_normalized_base_url(current_app.config.get('ESB_BASE_URL', ''))
+    except ValueError as exc:
+        flash(str(exc), 'danger')
+        return redirect(url_for('equipment.index'))
+
+    template = current_app.config.get('QR_TEMPLATE')
+    choices, _ = _build_wifi_choices()
+    if template is not None:
+        choices = [('none', 'None')]
+    form = QRSheetForm(
+        area_choices=[(a.id, a.name) for a in equipment_service.list_areas()],
+        equipment_choices=[(e.id, e.name) for e in equipment_service.list_equipment()],
+        wifi_choices=choices,
+    )
+    if request.method == 'GET':
+        form.area.data = request.args.get('area_id', 0, type=int)
+        form.wifi_info.data = _get_wifi_default(choices)
+
+    if form.validate_on_submit():
+        if form.equipment.data:
+            equipment_ids = form.equipment.data
+        else:
+            equipment_ids = [e.id for e in equipment_service.list_equipment(area_id=form.area.data or None)]
+        try:
+            job = qr_sheet_service.queue_sheet(
+                equipment_ids, form.layout.data, form.device.data,
+                include_name=form.include_name.data,
+                include_url=form.include_url.data and (template is None or template.url_bbox is not None),
+                wifi_info=form.wifi_info.data if template is None else 'none',
+                username=current_user.username,
+            )
+        except ValidationError as exc:
+            flash(str(exc), 'danger')
+        else:
+            return redirect(url_for('equipment.qr_sheet_status', job_id=job.id))
+    return render_template(
+        'equipment/qr_sheet.html', form=form,
+        template_active=template is not None,
+        template_has_url_bbox=template is not None and template.url_bbox is not None,
+    )
+
+
+def _get_sheet_job_or_404(job_id):
+    try:
+        return qr_sheet_service.get_sheet_job(job_id)
+    except ValidationError:
+        abort(404)
+
+
+@equipment_bp.route('/qr/sheets/<int:job_id>')
+@login_required
+def qr_sheet_status(job_id):
+    """Progress of a sheet job; refreshes itself until the PDF is ready."""
+    job = _get_sheet_job_or_404(job_id)
+    ready = job.status == 'delivered' and os.path.exists(qr_sheet_service.sheet_path(job.id))  # noqa: PTH110
+    return render_template(
+        'equipment/qr_sheet_status.html', job=job, ready=ready,
+        layout=qr_sheet_service.SHEET_LAYOUTS_BY_KEY.get((job.payload or {}).get('layout')),
+    )
+
+
+@equipment_bp.route('/qr/sheets/<int:job_id>/download')
+@login_required
+def qr_sheet_download(job_id):
+    """Download a finished sheet PDF."""
+    job = _get_sheet_job_or_404(job_id)
+    path = qr_sheet_service.sheet_path(job.id)
+    if job.status != 'delivered' or not os.path.exists(path):  # noqa: PTH110
+        abort(404)
+    layout = (job.payload or {}).get('layout', 'sheet')
+    return send_file(
+        path, mimetype='application/pdf', as_attachment=True,
+        download_name=f'qr-sheet-{job.id}-{layout}.pdf',
+    )
+
+
 def _can_edit_docs() -> bool:
     """Check if current user can edit equipment documentation.
 
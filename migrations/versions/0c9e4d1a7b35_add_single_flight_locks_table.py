@@ -0,0 +1,38 @@
+"""Add single_flight_locks table
+
+Revision ID: 0c9e4d1a7b35
+Revises: f17b3d9c8e42
+Create Date: 2026-10-19 16:20:04.118392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c9e4d1a7b35'
+down_revision = 'f17b3d9c8e42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('single_flight_locks',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=100), nullable=False),
+    sa.Column('holder', sa.String(length=100), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=True),
+    sa.Column('generation', sa.Integer(), nullable=False),
+    sa.Column('completed_generation', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('single_flight_locks', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_single_flight_locks_name'), ['name'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('single_flight_locks', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_single_flight_locks_name'))
+
+    op.drop_table('single_flight_locks')
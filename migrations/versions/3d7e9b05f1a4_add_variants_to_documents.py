@@ -0,0 +1,26 @@
+"""Add variants to documents for responsive photo variants
+
+Revision ID: 3d7e9b05f1a4
+Revises: 8a3f61c2d0b7
+Create Date: 2026-10-19 20:05:12.886140
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d7e9b05f1a4'
+down_revision = '8a3f61c2d0b7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('variants', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_column('variants')
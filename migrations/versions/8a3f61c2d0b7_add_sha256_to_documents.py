@@ -0,0 +1,26 @@
+"""Add sha256 to documents for content-addressed upload storage
+
+Revision ID: 8a3f61c2d0b7
+Revises: 0c9e4d1a7b35
+Create Date: 2026-10-19 18:41:27.503118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3f61c2d0b7'
+down_revision = '0c9e4d1a7b35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_column('sha256')
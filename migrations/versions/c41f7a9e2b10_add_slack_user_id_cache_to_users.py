@@ -0,0 +1,30 @@
+"""Add cached Slack user ID columns to users
+
+Revision ID: c41f7a9e2b10
+Revises: b2aa842a2c53
+Create Date: 2026-10-19 09:12:04.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41f7a9e2b10'
+down_revision = 'b2aa842a2c53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('slack_user_id', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('slack_user_id_resolved_at', sa.DateTime(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_slack_user_id'), ['slack_user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_slack_user_id'))
+        batch_op.drop_column('slack_user_id_resolved_at')
+        batch_op.drop_column('slack_user_id')
@@ -0,0 +1,32 @@
+"""Add priority to pending_notifications
+
+Revision ID: d83b5e1f6a27
+Revises: c41f7a9e2b10
+Create Date: 2026-10-19 10:41:37.502913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd83b5e1f6a27'
+down_revision = 'c41f7a9e2b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('priority', sa.Integer(), server_default='1', nullable=False))
+        batch_op.create_index(
+            'ix_pending_notifications_ready',
+            ['status', 'priority', 'next_retry_at', 'created_at'],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_pending_notifications_ready')
+        batch_op.drop_column('priority')
@@ -0,0 +1,32 @@
+"""Replace pending_notifications status index with (status, created_at)
+
+Revision ID: e5a0c7d2f914
+Revises: d83b5e1f6a27
+Create Date: 2026-10-19 13:12:08.114306
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a0c7d2f914'
+down_revision = 'd83b5e1f6a27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_pending_notifications_status_created',
+            ['status', 'created_at'],
+            unique=False,
+        )
+        # The composite index's leading column covers every status-only lookup.
+        batch_op.drop_index(batch_op.f('ix_pending_notifications_status'))
+
+
+def downgrade():
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_pending_notifications_status'), ['status'], unique=False)
+        batch_op.drop_index('ix_pending_notifications_status_created')
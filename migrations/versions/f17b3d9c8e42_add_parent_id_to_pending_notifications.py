@@ -0,0 +1,33 @@
+"""Add parent_id to pending_notifications for per-channel fan-out
+
+Revision ID: f17b3d9c8e42
+Revises: e5a0c7d2f914
+Create Date: 2026-10-19 14:02:51.730118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f17b3d9c8e42'
+down_revision = 'e5a0c7d2f914'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_pending_notifications_parent_id'), ['parent_id'], unique=False)
+        batch_op.create_foreign_key(
+            'fk_pending_notifications_parent_id', 'pending_notifications',
+            ['parent_id'], ['id'], ondelete='SET NULL',
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('pending_notifications', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_pending_notifications_parent_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_pending_notifications_parent_id'))
+        batch_op.drop_column('parent_id')
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+"""Time and memory-profile QR label renders across every size, device and layout.
+
+Renders qr_service.render_qr_png() (render cache off, on the calling thread)
+for each size preset × device preset × layout mode and reports per case:
+
+- ``ms``: best wall time of ``--repeat`` renders, after one warm-up render
+  (so fonts are loaded and template artwork is scaled, as in a running app);
+- ``peak_kib``: growth of the process's peak resident memory during one
+  render. Pillow allocates image memory outside Python's allocator, so
+  tracemalloc would miss it; the peak is reset through /proc/self/clear_refs
+  (Linux), and the script re-runs itself with a fixed glibc mmap threshold so
+  freed image buffers go back to the OS instead of being reused unseen by the
+  next render. Elsewhere the column is tracemalloc's peak instead (``mem`` in
+  the JSON says which);
+- ``png_kib``: size of the PNG.
+
+Layout modes: ``qr`` (code only), ``name``, ``name_url``, ``name_wifi``
+(with the SSID and password rows; they do not fit alongside both name and
+URL), ``template`` and ``template_name_url``. The template modes use
+QR_TEMPLATE_CONFIG_PATH if set, else the committed test template
+(tests/qr_code_template.png). Cases the app refuses (over
+qr_service.MAX_CANVAS_PX, such as letter at 1200 dpi, or a layout that does
+not fit) are recorded as skipped.
+
+``--output`` writes the results as JSON. ``--baseline`` compares against an
+earlier ``--output`` file and exits 1 if any case is slower or larger than
+the baseline by more than ``--threshold`` (and by at least ``--min-ms`` /
+``--min-kib``, so sub-millisecond jitter on small stickers is not a
+regression).
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_qr_render.py [--sizes sticker_2,letter]
+        [--devices laser_300] [--modes qr,template] [--repeat 3]
+        [--output qr-bench.json] [--baseline qr-bench-main.json --threshold 0.2]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime
+
+BASE_URL = 'https://esb.example.org'
+EQUIPMENT_NAME = 'SawStop Professional Cabinet Saw #2'
+
+# Layout options per mode; 'template' is replaced by the loaded QRTemplate.
+MODES = {
+    'qr': {},
+    'name': {'include_name': True},
+    'name_url': {'include_name': True, 'include_url': True},
+    'name_wifi': {'include_name': True, 'wifi_info': 'password'},
+    'template': {'template': True},
+    'template_name_url': {'template': True, 'include_name': True, 'include_url': True},
+}
+
+# Boxes of tests/qr_code_template.png, as in tests/conftest.py.
+TEST_TEMPLATE = {
+    'image': 'qr_code_template.png',
+    'font': 'Poppins-Bold.ttf',
+    'qr_bbox': [509, 949, 1011, 1451],
+    'name_bbox': [240, 540, 1259, 925],
+    'url_bbox': [140, 1490, 1359, 1675],
+}
+# Above this size glibc malloc() maps allocations directly, and unmaps them on
+# free(). Fixing it disables glibc's adaptive threshold (see measure()).
+MMAP_THRESHOLD = 128 * 1024
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests')  # noqa: PTH118, PTH120
+
+
+class Equipment:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+def reset_peak_rss() -> int | None:
+    """Reset the process's peak RSS to its current RSS and return it in KiB.
+
+    None where the kernel does not support it (non-Linux, or no /proc).
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return read_status_kib('VmHWM')
+    except OSError:
+        return None
+
+
+def read_status_kib(field: str) -> int | None:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(field + ':'):
+                return int(line.split()[1])
+    return None
+
+
+def measure(render, repeat: int) -> tuple[float, float, str, int]:
+    """Return (best ms, peak KiB, memory method, PNG bytes) for one case."""
+    png = render()  # warm-up
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    gc.collect()
+    baseline = reset_peak_rss()
+    if baseline is not None:
+        render()
+        return best, read_status_kib('VmHWM') - baseline, 'rss', len(png)
+    tracemalloc.start()
+    render()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1024, 'tracemalloc', len(png)
+
+
+def load_template(app, qr_service, workdir: str):
+    path = app.config.get('QR_TEMPLATE_CONFIG_PATH')
+    if not path:
+        config = dict(TEST_TEMPLATE)
+        for key in ('image', 'font'):
+            config[key] = os.path.join(TESTS_DIR, config[key])  # noqa: PTH118
+        path = os.path.join(workdir, 'qr_template.json')  # noqa: PTH118
+        with open(path, 'w') as f:
+            json.dump(config, f)
+    return qr_service.load_template_config(path)
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_ms: float, min_kib: float) -> list[str]:
+    """Return a line for each case that regressed against ``baseline``."""
+    regressions = []
+    for case, now in results.items():
+        before = baseline.get(case)
+        if before is None or now.get('skipped') or before.get('skipped'):
+            continue
+        fields = [('ms', min_ms, 'ms')]
+        if now['mem'] == before['mem']:  # RSS and tracemalloc peaks are not comparable
+            fields.append(('peak_kib', min_kib, 'KiB'))
+        for field, floor, unit in fields:
+            delta = now[field] - before[field]
+            if delta > floor and delta > before[field] * threshold:
+                regressions.append(
+                    f'{case}: {field} {before[field]:.1f} -> {now[field]:.1f} {unit} '
+                    f'(+{delta / max(before[field], 1e-9):.0%})'
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', help='Comma-separated size preset keys (default: all)')
+    parser.add_argument('--devices', help='Comma-separated device preset keys (default: all)')
+    parser.add_argument('--modes', help=f'Comma-separated layout modes (default: all of {",".join(MODES)})')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed renders per case')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--baseline', help='Fail on regressions against this earlier --output file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed relative growth of time or memory over the baseline')
+    parser.add_argument('--min-ms', type=float, default=5.0, help='Ignore time growth below this many ms')
+    parser.add_argument('--min-kib', type=float, default=1024.0, help='Ignore memory growth below this many KiB')
+    args = parser.parse_args()
+
+    if sys.platform == 'linux' and 'MALLOC_MMAP_THRESHOLD_' not in os.environ:
+        os.environ['MALLOC_MMAP_THRESHOLD_'] = str(MMAP_THRESHOLD)
+        os.execv(sys.executable, [sys.executable, *sys.argv])
+
+    import PIL
+
+    from esb import create_app
+    from esb.services import qr_service
+
+    app = create_app('testing')
+    app.config.update(QR_CACHE_MEMORY_MB=0, QR_CACHE_DISK_MB=0)
+    sizes = args.sizes.split(',') if args.sizes else [p.key for p in qr_service.QR_SIZE_PRESETS]
+    devices = args.devices.split(',') if args.devices else [d.key for d in qr_service.QR_DEVICE_PRESETS]
+    modes = args.modes.split(',') if args.modes else list(MODES)
+    for chosen, known in ((sizes, qr_service.QR_PRESETS_BY_KEY), (devices, qr_service.QR_DEVICES_BY_KEY),
+                          (modes, MODES)):
+        unknown = sorted(set(chosen) - set(known))
+        if unknown:
+            parser.error(f'unknown preset or mode: {", ".join(unknown)}')
+
+    equipment = Equipment(1234, EQUIPMENT_NAME)
+    results = {}
+    print(f'{"size":>11} {"device":>11} {"mode":>17} {"ms":>9} {"peak_kib":>9} {"png_kib":>8}')
+    with app.app_context(), tempfile.TemporaryDirectory() as workdir:
+        template = load_template(app, qr_service, workdir) if any(m.startswith('template') for m in modes) else None
+        for size_key in sizes:
+            preset = qr_service.QR_PRESETS_BY_KEY[size_key]
+            for device_key in devices:
+                dpi = qr_service.QR_DEVICES_BY_KEY[device_key].dpi
+                for mode in modes:
+                    case = f'{size_key}/{device_key}/{mode}'
+                    options = dict(MODES[mode])
+                    if options.pop('template', False):
+                        options['template'] = template
+
+                    def render(preset=preset, dpi=dpi, options=options):
+                        return qr_service.render_qr_png(
+                            equipment, preset, dpi=dpi, base_url=BASE_URL,
+                            wifi_ssid='Makerspace', wifi_password='correct horse battery',
+                            warn=False, **options,
+                        )
+
+                    try:
+                        ms, peak_kib, mem, png_bytes = measure(render, args.repeat)
+                    except ValueError as e:
+                        results[case] = {'skipped': str(e)}
+                        print(f'{size_key:>11} {device_key:>11} {mode:>17} {"skipped":>9}')
+                        continue
+                    results[case] = {'ms': round(ms, 3), 'peak_kib': round(peak_kib, 1), 'mem': mem,
+                                     'png_kib': round(png_bytes / 1024, 1)}
+                    print(f'{size_key:>11} {device_key:>11} {mode:>17} {ms:>9.1f} {peak_kib:>9.0f} '
+                          f'{png_bytes / 1024:>8.0f}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'created': datetime.now(UTC).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'pillow': PIL.__version__,
+                'machine': platform.machine(),
+                'repeat': args.repeat,
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.threshold, args.min_ms, args.min_kib)
+        if regressions:
+            print(f'\n{len(regressions)} regression(s) over {args.threshold:.0%} against {args.baseline} '
+                  f'(Pillow {baseline.get("pillow")} -> {PIL.__version__}):')
+            for line in regressions:
+                print(f'  {line}')
+            return 1
+        print(f'\nNo regressions over {args.threshold:.0%} against {args.baseline}.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Measure QR label text fitting for long equipment names at high dpi.
+
+For each label size, fits a set of long, distinct equipment names (and their
+URLs) into the label's text rows at the chosen dpi and reports the mean time
+per label of:
+
+- ``fit_cold``: qr_service._fit_text() with its memo and glyph-advance caches
+  emptied before every name, i.e. the first render of each label;
+- ``fit_warm``: the same fits again, served from the memo;
+- ``template``: _draw_text_in_bbox()'s fitting for the name in a template
+  box one fifth of the label tall (cold, as ``fit_cold``);
+- ``render``: a full _render_qr_png() with name and URL (no render cache).
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_qr_text_fit.py [--dpi 1200] [--names 40]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+PRESETS = ('sticker_2', 'sticker_4', 'avery_5160', 'avery_5163')
+BASE_URL = 'https://esb.example.org'
+REPEATS = 3
+
+
+class Equipment:
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+
+
+def long_names(count):
+    words = ('Industrial', 'Variable-Speed', 'Benchtop', 'Oscillating', 'Spindle', 'Sander',
+             'Combination', 'Jointer', 'Planer', 'with', 'Helical', 'Cutterhead', 'Mk', 'IV')
+    return [
+        ' '.join(words[(i + j) % len(words)] for j in range(8 + i % 6)) + f' #{i:03d}'
+        for i in range(count)
+    ]
+
+
+def clear_caches(qr_service):
+    for name in ('_fit_text_size', '_fit_text_in_box', '_glyph_advances'):
+        memo = getattr(qr_service, name, None)
+        if memo is not None:
+            memo.cache_clear()
+
+
+def best_ms(fn, per):
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best / per
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--dpi', type=int, default=1200, help='Printer resolution')
+    parser.add_argument('--names', type=int, default=40, help='Number of distinct names')
+    args = parser.parse_args()
+
+    from esb import create_app
+    from esb.services import qr_service
+
+    app = create_app('testing')
+    names = long_names(args.names)
+    equipment = [Equipment(i + 1, name) for i, name in enumerate(names)]
+    print(f'{"preset":>11} {"fit_cold":>9} {"fit_warm":>9} {"template":>9} {"render":>9}  (ms per label)')
+    with app.app_context():
+        font_path = os.path.join(app.static_folder, 'fonts', 'DejaVuSans-Bold.ttf')  # noqa: PTH118
+        for key in PRESETS:
+            preset = qr_service.QR_PRESETS_BY_KEY[key]
+            canvas_w, canvas_h = qr_service._px(preset.width_in, args.dpi), qr_service._px(preset.height_in, args.dpi)
+            # The plain layout's text rows: 15% of the height, 90% of the width.
+            row_h, row_w = int(canvas_h * 0.15), int(canvas_w * 0.9)
+
+            def fit_all(clear, row_w=row_w, row_h=row_h):
+                for eq in equipment:
+                    if clear:
+                        clear_caches(qr_service)
+                    for text in (eq.name, f'{BASE_URL}/public/equipment/{eq.id}'):
+                        qr_service._fit_text(
+                            text, max_width_px=row_w, max_height_px=row_h, font_path=font_path, dpi=args.dpi,
+                        )
+
+            def fit_template(row_w=row_w, canvas_h=canvas_h):
+                from PIL import Image
+
+                canvas = Image.new('RGB', (1, 1))
+                for name in names:
+                    clear_caches(qr_service)
+                    qr_service._draw_text_in_bbox(
+                        canvas, name, (0, 0, row_w, canvas_h // 5), font_path, dpi=args.dpi,
+                    )
+
+            def render_all(preset=preset):
+                for eq in equipment[:5]:
+                    qr_service._render_qr_png(
+                        eq, preset, dpi=args.dpi, include_name=True, include_url=True,
+                        base_url=BASE_URL, warn=False,
+                    )
+
+            fit_all(clear=True)  # load fonts outside the timings
+            cold = best_ms(lambda: fit_all(clear=True), len(names))
+            fit_all(clear=False)
+            warm = best_ms(lambda: fit_all(clear=False), len(names))
+            template = best_ms(fit_template, len(names))
+            render = best_ms(render_all, 5)
+            print(f'{key:>11} {cold:>9.2f} {warm:>9.3f} {template:>9.2f} {render:>9.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""Measure static status page size and compression.
+
+Seeds a temporary SQLite database with a makerspace-sized inventory (areas,
+equipment, open repairs), renders the static page with the real template,
+and reports the bytes a client downloads for each Content-Encoding along
+with the time to compress. Repeats at several inventory sizes so growth with
+areas and open repairs is visible.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_static_page.py [--scales 5,15,40]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+DB_PATH = Path('/tmp/esb_bench_static_page.db')
+EQUIPMENT_PER_AREA = 12
+# Fraction of equipment with an open repair record.
+OPEN_REPAIR_RATIO = 0.25
+
+
+def seed(db, area_count):
+    from esb.models.area import Area
+    from esb.models.equipment import Equipment
+    from esb.models.repair_record import REPAIR_SEVERITIES, RepairRecord
+
+    db.drop_all()
+    db.create_all()
+    for a in range(area_count):
+        area = Area(name=f'Area {a:02d}', slack_channel=f'#area-{a:02d}', sort_order=a)
+        db.session.add(area)
+        db.session.flush()
+        for e in range(EQUIPMENT_PER_AREA):
+            equipment = Equipment(
+                name=f'Machine {a:02d}-{e:02d}', manufacturer='Acme', model=f'M{e}',
+                area_id=area.id,
+            )
+            db.session.add(equipment)
+            db.session.flush()
+            if (a * EQUIPMENT_PER_AREA + e) % round(1 / OPEN_REPAIR_RATIO) == 0:
+                db.session.add(RepairRecord(
+                    equipment_id=equipment.id, status='New',
+                    severity=REPAIR_SEVERITIES[e % len(REPAIR_SEVERITIES)],
+                    description=f'Reported fault on machine {e}: belt slipping under load',
+                ))
+    db.session.commit()
+
+
+def measure(html):
+    from esb.services.static_page_service import compress
+
+    body = html.encode('utf-8')
+    rows = [('none', len(body), 0.0)]
+    for encoding in ('gzip', 'br'):
+        started = time.perf_counter()
+        size = len(compress(body, encoding))
+        rows.append((encoding, size, (time.perf_counter() - started) * 1000))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scales', default='5,15,40', help='Comma-separated area counts')
+    args = parser.parse_args()
+
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+
+    from esb import create_app
+    from esb.extensions import db
+    from esb.services import static_page_service
+
+    app = create_app('development')
+    print(f'{"areas":>5} {"equipment":>9} {"encoding":>8} {"bytes":>9} {"ratio":>6} {"compress_ms":>11}')
+    with app.app_context():
+        for area_count in (int(s) for s in args.scales.split(',')):
+            seed(db, area_count)
+            html = static_page_service.generate()
+            rows = measure(html)
+            raw = rows[0][1]
+            for encoding, size, ms in rows:
+                print(
+                    f'{area_count:>5} {area_count * EQUIPMENT_PER_AREA:>9} {encoding:>8} '
+                    f'{size:>9} {size / raw:>6.1%} {ms:>11.1f}'
+                )
+        db.session.remove()
+        db.engine.dispose()
+    DB_PATH.unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+"""Measure static status page data loading and render cost.
+
+Seeds a temporary SQLite database at several inventory sizes and reports,
+for each, the time and peak Python memory (tracemalloc) of:
+
+- ``dashboard``: status_service.get_area_status_dashboard(), the ORM path
+  the static page used to read;
+- ``snapshot``: status_service.get_status_snapshot(), the column-only path
+  it reads now;
+- ``generate``: static_page_service.generate(), snapshot plus render.
+
+Each measurement starts from an empty session, as in the worker.
+
+Usage::
+
+    PYTHONPATH=. python scripts/bench_static_render.py [--sizes 50,500,5000]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+DB_PATH = Path('/tmp/esb_bench_static_render.db')
+EQUIPMENT_PER_AREA = 25
+# Every Nth equipment item has an open repair record.
+OPEN_REPAIR_EVERY = 4
+REPEATS = 3
+
+
+def seed(db, equipment_count):
+    from esb.models.area import Area
+    from esb.models.equipment import Equipment
+    from esb.models.repair_record import REPAIR_SEVERITIES, RepairRecord
+
+    db.drop_all()
+    db.create_all()
+    area_count = -(-equipment_count // EQUIPMENT_PER_AREA)
+    areas = [Area(name=f'Area {a:03d}', slack_channel=f'#area-{a:03d}', sort_order=a) for a in range(area_count)]
+    db.session.add_all(areas)
+    db.session.flush()
+    equipment = [
+        Equipment(name=f'Machine {e:05d}', manufacturer='Acme', model=f'M{e % 40}',
+                  area_id=areas[e // EQUIPMENT_PER_AREA].id)
+        for e in range(equipment_count)
+    ]
+    db.session.add_all(equipment)
+    db.session.flush()
+    db.session.add_all(
+        RepairRecord(
+            equipment_id=item.id, status='New',
+            severity=REPAIR_SEVERITIES[i % len(REPAIR_SEVERITIES)],
+            description=f'Reported fault on {item.name}: belt slipping under load',
+        )
+        for i, item in enumerate(equipment) if i % OPEN_REPAIR_EVERY == 0
+    )
+    db.session.commit()
+    db.session.remove()
+
+
+def measure(db, fn):
+    """Return (best wall ms over REPEATS runs, peak traced KiB of one run).
+
+    Memory is traced in a separate run: tracemalloc slows allocation-heavy
+    code unevenly and would skew the timings.
+    """
+    best = float('inf')
+    for _ in range(REPEATS):
+        db.session.remove()
+        started = time.perf_counter()
+        fn()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    db.session.remove()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', default='50,500,5000', help='Comma-separated equipment counts')
+    args = parser.parse_args()
+
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+
+    from esb import create_app
+    from esb.extensions import db
+    from esb.services import static_page_service, status_service
+
+    app = create_app('development')
+    paths = {
+        'dashboard': status_service.get_area_status_dashboard,
+        'snapshot': status_service.get_status_snapshot,
+        'generate': static_page_service.generate,
+    }
+    print(f'{"equipment":>9} {"path":>9} {"ms":>9} {"peak_kib":>9}')
+    with app.app_context():
+        for size in (int(s) for s in args.sizes.split(',')):
+            seed(db, size)
+            static_page_service.generate()  # compile the templates outside the timings
+            for name, fn in paths.items():
+                ms, kib = measure(db, fn)
+                print(f'{size:>9} {name:>9} {ms:>9.1f} {kib:>9.0f}')
+        db.session.remove()
+        db.engine.dispose()
+    DB_PATH.unlink(missing_ok=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
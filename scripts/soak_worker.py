@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""Soak-test the notification worker's memory use.
+
+Runs the real ``run_worker_loop()`` against a temporary SQLite database and a
+stub Slack client until it has delivered ``--deliveries`` notifications
+(100,000 by default), keeping the queue topped up so every poll returns a
+full batch. Resident memory, GC-tracked objects and the session's identity
+map are sampled as it goes; the script prints the samples and exits non-zero
+if RSS after warm-up grows by more than ``--max-growth-mb``.
+
+Usage::
+
+    PYTHONPATH=. python scripts/soak_worker.py [--deliveries N]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+DB_PATH = Path('/tmp/esb_soak_worker.db')
+HEARTBEAT_PATH = Path('/tmp/esb_soak_worker_heartbeat')
+CHANNELS = ('#woodshop', '#metalshop', '#laser', '#3d-printing', '#textiles')
+
+# Fraction of the run treated as warm-up (imports, caches, SQLite page cache)
+# before the RSS baseline is taken.
+WARMUP_FRACTION = 0.1
+
+
+class StubWebClient:
+    """Stands in for slack_sdk.WebClient: accepts every call, keeps nothing."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def chat_postMessage(self, **kwargs):
+        return {'ok': True}
+
+    def users_lookupByEmail(self, **kwargs):
+        return {'ok': True, 'user': {'id': 'U000SOAK'}}
+
+
+def _payload(i):
+    return {
+        'event_type': 'new_report',
+        'equipment_name': f'Machine {i % 50}',
+        'area_name': 'Soak',
+        'severity': 'Degraded',
+        'description': 'Soak test report ' + 'x' * (i % 200),
+        'reporter_name': 'Soak',
+        'has_safety_risk': False,
+    }
+
+
+def run_soak(total, batch_size, sample_every):
+    """Deliver ``total`` notifications through the worker loop.
+
+    Returns:
+        List of (delivered, rss_bytes, gc_objects, identity_map_size) samples.
+    """
+    if DB_PATH.exists():
+        DB_PATH.unlink()
+    os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+    os.environ['WORKER_HEARTBEAT_PATH'] = str(HEARTBEAT_PATH)
+    os.environ['SLACK_BOT_TOKEN'] = 'xoxb-soak'
+    os.environ.pop('WORKER_WAKEUP_SOCKET', None)
+
+    from unittest.mock import patch
+
+    from sqlalchemy import delete, func, insert, select
+
+    from esb import create_app
+    from esb.extensions import db
+    from esb.models.pending_notification import PendingNotification
+    from esb.services import notification_service
+    from esb.services.worker_metrics import current_rss_bytes
+    from esb.utils.rate_limit import RateLimiter
+
+    app = create_app('development')
+    logging.getLogger('esb').setLevel(logging.WARNING)
+    logging.getLogger('esb.mutations').disabled = True
+
+    queued = 0
+    delivered = 0
+    samples = []
+    next_sample = 0
+    get_pending = notification_service.get_pending_notifications
+
+    def top_up_and_poll(batch_size=batch_size):
+        nonlocal queued, delivered, next_sample
+        # The previous cycle's session was released, so this is what leaked
+        # across cycles (expected: 0).
+        identity_map_size = len(db.session.identity_map)
+        delivered += db.session.execute(
+            delete(PendingNotification).where(PendingNotification.status == 'delivered')
+        ).rowcount
+        pending = db.session.execute(
+            select(func.count()).select_from(PendingNotification)
+        ).scalar_one()
+        want = min(2 * batch_size - pending, total - queued)
+        if want > 0:
+            db.session.execute(insert(PendingNotification), [
+                {
+                    'notification_type': 'slack_message',
+                    'target': CHANNELS[i % len(CHANNELS)],
+                    'payload': _payload(i),
+                    'status': 'pending',
+                }
+                for i in range(queued, queued + want)
+            ])
+            queued += want
+        db.session.commit()
+
+        if delivered >= next_sample:
+            samples.append((delivered, current_rss_bytes(), len(gc.get_objects()), identity_map_size))
+            next_sample += sample_every
+        if delivered >= total:
+            signal.raise_signal(signal.SIGTERM)
+            return []
+        return get_pending(batch_size)
+
+    with app.app_context():
+        db.create_all()
+        # No pacing: the stub answers instantly, and real limits would make a
+        # 100k run take days.
+        app.extensions['esb_slack_rate_limiter'] = RateLimiter({})
+        with patch('slack_sdk.WebClient', StubWebClient), \
+                patch.object(notification_service, 'get_pending_notifications', top_up_and_poll):
+            notification_service.run_worker_loop(poll_interval=1)
+        db.session.remove()
+        db.engine.dispose()
+
+    DB_PATH.unlink(missing_ok=True)
+    HEARTBEAT_PATH.unlink(missing_ok=True)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--deliveries', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--sample-every', type=int, default=5_000)
+    parser.add_argument('--max-growth-mb', type=float, default=16.0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    samples = run_soak(args.deliveries, args.batch_size, args.sample_every)
+    elapsed = time.perf_counter() - started
+
+    print(f'{"delivered":>10} {"rss_mb":>8} {"gc_objects":>11} {"session":>8}')
+    for delivered, rss, objects, session_size in samples:
+        rss_mb = f'{rss / 2**20:.1f}' if rss is not None else 'n/a'
+        print(f'{delivered:>10} {rss_mb:>8} {objects:>11} {session_size:>8}')
+    print(f'{samples[-1][0]} deliveries in {elapsed:.1f}s ({samples[-1][0] / elapsed:.0f}/s)')
+
+    baseline = next(
+        (s for s in samples if s[0] >= args.deliveries * WARMUP_FRACTION), samples[0],
+    )
+    final = samples[-1]
+    if baseline[1] is None or final[1] is None:
+        print('RSS not measurable on this platform (no /proc); skipping growth check')
+        return 0
+    growth_mb = (final[1] - baseline[1]) / 2**20
+    print(f'RSS growth after warm-up: {growth_mb:+.1f} MB (limit {args.max_growth_mb} MB)')
+    if growth_mb > args.max_growth_mb or any(s[3] for s in samples):
+        print('FAIL: worker memory is not flat')
+        return 1
+    print('OK: worker memory is flat')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
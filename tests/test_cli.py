@@ -110,3 +110,124 @@ class TestWorkerCli:
 
         assert result.exit_code == 0
         mock_loop.assert_called_once_with(poll_interval=10)
+
+    def test_worker_run_async(self, app):
+        """flask worker run --async starts the asyncio worker."""
+        runner = app.test_cli_runner()
+        with patch('esb.services.async_worker.run_async_worker') as mock_run, \
+             patch('esb.services.notification_service.run_worker_loop') as mock_loop:
+            result = runner.invoke(args=['worker', 'run', '--async', '--concurrency', '20'])
+
+        assert result.exit_code == 0
+        assert 'Starting async notification worker' in result.output
+        mock_run.assert_called_once_with(poll_interval=30, concurrency=20)
+        mock_loop.assert_not_called()
+
+    def test_worker_run_async_missing_dependency(self, app):
+        """A missing aiohttp is reported as a CLI error, not a traceback."""
+        runner = app.test_cli_runner()
+        with patch('esb.services.async_worker.run_async_worker',
+                   side_effect=RuntimeError('The async worker requires aiohttp')):
+            result = runner.invoke(args=['worker', 'run', '--async'])
+
+        assert result.exit_code == 1
+        assert 'requires aiohttp' in result.output
+
+
+class TestWorkerFailedCli:
+    """Tests for the `flask worker failed` dead-letter commands."""
+
+    def _failed(self, target='#woodshop', error='channel_not_found'):
+        from esb.models.pending_notification import PendingNotification
+
+        n = PendingNotification(
+            notification_type='slack_message', target=target, status='failed',
+            retry_count=10, error_message=error,
+        )
+        _db.session.add(n)
+        _db.session.commit()
+        return n.id
+
+    def test_list(self, app):
+        self._failed(error='channel_not_found\ntraceback...')
+        self._failed(target='#metal')
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['worker', 'failed', 'list', '--target', '#woodshop'])
+
+        assert result.exit_code == 0
+        assert '#woodshop' in result.output
+        assert '#metal' not in result.output
+        assert 'traceback' not in result.output
+        assert '1 failed notification(s) match; showing 1.' in result.output
+
+    def test_requeue(self, app):
+        from esb.models.pending_notification import PendingNotification
+
+        notification_id = self._failed()
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['worker', 'failed', 'requeue', '--error', 'channel'])
+
+        assert result.exit_code == 0
+        assert 'Requeued 1 notification(s).' in result.output
+        _db.session.expire_all()
+        assert _db.session.get(PendingNotification, notification_id).status == 'pending'
+
+    def test_requeue_nothing_matches(self, app):
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['worker', 'failed', 'requeue', '--since', '2026-01-01'])
+
+        assert result.exit_code == 0
+        assert 'No failed notifications match.' in result.output
+
+    def test_purge_requires_confirmation(self, app):
+        from esb.models.pending_notification import PendingNotification
+
+        notification_id = self._failed()
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['worker', 'failed', 'purge'], input='n\n')
+
+        assert result.exit_code == 1
+        assert _db.session.get(PendingNotification, notification_id) is not None
+
+    def test_purge_with_yes(self, app):
+        from esb.models.pending_notification import PendingNotification
+
+        self._failed()
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['worker', 'failed', 'purge', '--yes'])
+
+        assert result.exit_code == 0
+        assert 'Purged 1 notification(s).' in result.output
+        assert _db.session.execute(_db.select(PendingNotification)).first() is None
+
+
+class TestUploadsCli:
+    """Tests for the `flask uploads variants` command."""
+
+    def test_variants_queues_photos_without_variants(self, app):
+        from esb.models.document import Document
+        from esb.models.pending_notification import PendingNotification
+
+        for stored, variants in (('a.jpg', None), ('b.jpg', {'widths': [320]}), ('c.pdf', None)):
+            _db.session.add(Document(
+                original_filename=stored, stored_filename=stored, content_type='image/jpeg', size_bytes=1,
+                parent_type='equipment_photo', parent_id=1, uploaded_by='staff', variants=variants,
+            ))
+        _db.session.commit()
+        runner = app.test_cli_runner()
+
+        result = runner.invoke(args=['uploads', 'variants'])
+
+        assert result.exit_code == 0
+        assert 'Queued 1 image variant job(s)' in result.output
+        job = _db.session.execute(_db.select(PendingNotification)).scalars().one()
+        assert job.target == 'a.jpg'
+
+        result = runner.invoke(args=['uploads', 'variants', '--rebuild'])
+
+        assert 'Queued 2 image variant job(s)' in result.output
@@ -28,6 +28,19 @@ class TestPendingNotification:
         assert saved.delivered_at is None
         assert saved.error_message is None
 
+    def test_default_priority_normal(self, app):
+        """Priority defaults to the normal lane."""
+        from esb.models.pending_notification import PRIORITY_NORMAL
+
+        notification = PendingNotification(
+            notification_type='slack_message',
+            target='#test',
+        )
+        _db.session.add(notification)
+        _db.session.commit()
+
+        assert notification.priority == PRIORITY_NORMAL
+
     def test_default_status_pending(self, app):
         """Status defaults to 'pending'."""
         notification = PendingNotification(
@@ -0,0 +1,29 @@
+"""Tests for SingleFlightLock model."""
+
+import pytest
+
+from esb.extensions import db as _db
+from esb.models.single_flight_lock import SingleFlightLock
+
+
+class TestSingleFlightLock:
+    """Tests for the SingleFlightLock model."""
+
+    def test_defaults(self, app):
+        lock = SingleFlightLock(name='static_page')
+        _db.session.add(lock)
+        _db.session.commit()
+
+        assert lock.holder is None
+        assert lock.expires_at is None
+        assert lock.generation == 0
+        assert lock.completed_generation == 0
+        assert lock.updated_at is not None
+
+    def test_name_is_unique(self, app):
+        _db.session.add(SingleFlightLock(name='static_page'))
+        _db.session.commit()
+
+        _db.session.add(SingleFlightLock(name='static_page'))
+        with pytest.raises(Exception):
+            _db.session.commit()
@@ -0,0 +1,245 @@
+"""Tests for the asyncio notification worker."""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from esb.extensions import db as _db
+from esb.models.app_config import AppConfig
+from esb.models.pending_notification import PendingNotification
+from esb.models.user import User
+from esb.services import notification_service
+from esb.services.async_worker import AsyncNotificationWorker
+from tests.conftest import _create_user
+
+
+def _create_notification(notification_type='slack_message', target='#woodshop', payload=None):
+    notification = PendingNotification(
+        notification_type=notification_type,
+        target=target,
+        payload=payload if payload is not None else {'event_type': 'new_report'},
+    )
+    _db.session.add(notification)
+    _db.session.commit()
+    return notification.id
+
+
+def _status(notification_id):
+    _db.session.expire_all()
+    return _db.session.get(PendingNotification, notification_id)
+
+
+def _slack_error(code, status_code=200, retry_after=None):
+    from slack_sdk.errors import SlackApiError
+
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = {'Retry-After': retry_after} if retry_after else {}
+    response.data = {'ok': False, 'error': code}
+    return SlackApiError(message=code, response=response)
+
+
+class _FakeAsyncClient:
+    """Records calls; ``errors`` maps channel -> exception to raise."""
+
+    def __init__(self, errors=None, lookup=None):
+        self.posts = []
+        self.lookups = []
+        self.errors = errors or {}
+        self.lookup = lookup
+        self.max_in_flight = 0
+        self._in_flight = 0
+
+    async def chat_postMessage(self, channel, text, blocks=None):
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        await asyncio.sleep(0.01)
+        self._in_flight -= 1
+        if channel in self.errors:
+            raise self.errors[channel]
+        self.posts.append((channel, text))
+        return {'ok': True}
+
+    async def users_lookupByEmail(self, email):
+        self.lookups.append(email)
+        if isinstance(self.lookup, Exception):
+            raise self.lookup
+        return {'user': {'id': self.lookup}}
+
+
+@pytest.fixture
+def make_worker(app, tmp_path):
+    app.config['WORKER_HEARTBEAT_PATH'] = str(tmp_path / 'hb')
+    workers = []
+
+    def _make(client, concurrency=10):
+        worker = AsyncNotificationWorker(app, client, concurrency)
+        workers.append(worker)
+        return worker
+
+    yield _make
+    for worker in workers:
+        worker.close()
+
+
+class TestRunOnce:
+    def test_delivers_batch_concurrently(self, app, make_worker):
+        ids = [_create_notification(target=f'#area{i}') for i in range(5)]
+        client = _FakeAsyncClient()
+
+        claimed = asyncio.run(make_worker(client).run_once())
+
+        assert claimed == 5
+        assert client.max_in_flight > 1
+        for notification_id in ids:
+            assert _status(notification_id).status == 'delivered'
+        assert sorted(channel for channel, _ in client.posts) == [f'#area{i}' for i in range(5)]
+
+    def test_crosspost_rows_delivered_independently(self, app, make_worker):
+        from esb.services.notification_service import queue_notification
+
+        parent = queue_notification('slack_message', '#woodshop', {'event_type': 'new_report'})
+        client = _FakeAsyncClient(errors={'#oops': _slack_error('channel_not_found')})
+
+        asyncio.run(make_worker(client).run_once())
+
+        assert client.posts == [('#woodshop', client.posts[0][1])]
+        assert _status(parent.id).status == 'delivered'
+        child = _db.session.execute(
+            _db.select(PendingNotification).filter_by(parent_id=parent.id)
+        ).scalar_one()
+        assert child.status == 'pending'
+        assert child.retry_count == 1
+
+    def test_concurrency_limit(self, app, make_worker):
+        for i in range(6):
+            _create_notification(target=f'#area{i}')
+        client = _FakeAsyncClient()
+
+        asyncio.run(make_worker(client, concurrency=2).run_once())
+
+        assert client.max_in_flight <= 2
+
+    def test_busy_lane_does_not_hold_other_channels(self, app, make_worker, monkeypatch):
+        """A burst to one channel waits for tokens without taking concurrency slots.
+
+        Only the rows that cannot get a token within the wait window are
+        deferred, each to a later turn on the lane.
+        """
+        from esb.utils.rate_limit import RateLimiter
+
+        monkeypatch.setattr(notification_service, 'CHANNEL_MAX_TOKEN_WAIT', 0.25)
+        app.extensions['esb_slack_rate_limiter'] = RateLimiter({'chat.postMessage': (20.0, 2)})
+        busy = [_create_notification(target='#oops') for _ in range(20)]
+        other = [_create_notification(target=f'#area{i}') for i in range(2)]
+        client = _FakeAsyncClient()
+
+        asyncio.run(make_worker(client, concurrency=2).run_once())
+
+        channels = [channel for channel, _ in client.posts]
+        assert all(_status(i).status == 'delivered' for i in other)
+        # The other channels went out before the busy lane's third token.
+        assert max(channels.index(f'#area{i}') for i in range(2)) < [
+            n for n, channel in enumerate(channels) if channel == '#oops'
+        ][2]
+        delivered = [i for i in busy if _status(i).status == 'delivered']
+        deferred = [_status(i) for i in busy if i not in delivered]
+        assert 3 <= len(delivered) <= 10
+        assert len(delivered) == channels.count('#oops')
+        assert all(n.status == 'pending' and n.retry_count == 0 for n in deferred)
+        retry_times = [n.next_retry_at for n in deferred]
+        assert retry_times == sorted(retry_times)
+        assert len(set(retry_times)) == len(retry_times)
+
+    def test_slack_error_marks_failed(self, app, make_worker):
+        notification_id = _create_notification()
+        client = _FakeAsyncClient(errors={'#woodshop': _slack_error('channel_not_found')})
+
+        asyncio.run(make_worker(client).run_once())
+
+        notification = _status(notification_id)
+        assert notification.status == 'pending'
+        assert notification.retry_count == 1
+        assert 'channel_not_found' in notification.error_message
+
+    def test_429_defers_without_retry(self, app, make_worker):
+        notification_id = _create_notification()
+        client = _FakeAsyncClient(errors={'#woodshop': _slack_error('ratelimited', 429, '30')})
+
+        asyncio.run(make_worker(client).run_once())
+
+        notification = _status(notification_id)
+        assert notification.status == 'pending'
+        assert notification.retry_count == 0
+        assert notification.next_retry_at is not None
+        with app.app_context():
+            limiter = notification_service._get_rate_limiter()
+        assert limiter.try_acquire('chat.postMessage:#woodshop') > 25
+
+    def test_missing_token_fails_slack_jobs(self, app, make_worker):
+        notification_id = _create_notification()
+
+        asyncio.run(make_worker(None).run_once())
+
+        assert 'SLACK_BOT_TOKEN' in _status(notification_id).error_message
+
+    def test_non_slack_jobs_use_sync_handler(self, app, make_worker):
+        from unittest.mock import patch
+
+        notification_id = _create_notification(
+            notification_type='static_page_push', target='local', payload={},
+        )
+        with patch('esb.services.static_page_service.generate_and_push') as mock_push:
+            asyncio.run(make_worker(_FakeAsyncClient()).run_once())
+
+        mock_push.assert_called_once()
+        assert _status(notification_id).status == 'delivered'
+
+    def test_assignee_mention_resolved_and_cached(self, app, make_worker):
+        user = _create_user('technician', username='alice')
+        _create_notification(payload={
+            'event_type': 'assignee_changed',
+            'assignee_username': 'alice',
+            'assignee_email': 'alice@example.com',
+            'assignee_has_slack': True,
+        })
+        client = _FakeAsyncClient(lookup='U123')
+
+        asyncio.run(make_worker(client).run_once())
+
+        assert client.lookups == ['alice@example.com']
+        assert '<@U123>' in client.posts[0][1]
+        _db.session.expire_all()
+        assert _db.session.get(User, user.id).slack_user_id == 'U123'
+
+    def test_records_metrics(self, app, make_worker):
+        from esb.services.worker_metrics import get_worker_metrics
+
+        _create_notification()
+
+        asyncio.run(make_worker(_FakeAsyncClient()).run_once())
+
+        snapshot = get_worker_metrics().snapshot()
+        assert snapshot['outcomes'] == {'slack_message': {'delivered': 1}}
+        assert snapshot['latency']['slack_message']['count'] == 1
+
+
+class TestRun:
+    def test_stop_ends_loop_after_iteration(self, app, make_worker):
+        notification_id = _create_notification()
+        worker = make_worker(_FakeAsyncClient())
+
+        async def _run_then_stop():
+            task = asyncio.create_task(worker.run())
+            while _status(notification_id).status != 'delivered':
+                await asyncio.sleep(0.01)
+            worker.stop()
+            await asyncio.wait_for(task, timeout=5)
+
+        asyncio.run(_run_then_stop())
+
+        _db.session.expire_all()
+        assert _db.session.execute(
+            _db.select(AppConfig).filter_by(key='worker_last_iteration_at')
+        ).scalar_one_or_none() is not None
@@ -0,0 +1,151 @@
+"""Tests for responsive image variants."""
+
+import io
+
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from esb.extensions import db as _db
+from esb.models.pending_notification import PendingNotification
+from esb.services import image_variant_service, notification_service, upload_service
+
+
+def _jpeg(width, height, exif_orientation=None):
+    buf = io.BytesIO()
+    exif = Image.Exif()
+    if exif_orientation:
+        exif[0x0112] = exif_orientation
+    exif[0x010F] = 'PhoneMaker'
+    Image.new('RGB', (width, height), 'red').save(buf, 'JPEG', exif=exif)
+    return buf.getvalue()
+
+
+def _upload(content, filename='photo.jpg', content_type='image/jpeg', parent_type='equipment_photo'):
+    return upload_service.save_upload(
+        file=FileStorage(stream=io.BytesIO(content), filename=filename, content_type=content_type),
+        parent_type=parent_type,
+        parent_id=7,
+        uploaded_by='staffuser',
+    )
+
+
+def _job():
+    return _db.session.execute(
+        _db.select(PendingNotification).filter_by(notification_type='image_variants')
+    ).scalars().one()
+
+
+class TestQueueVariants:
+    def test_save_upload_queues_photo(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+
+        doc = _upload(_jpeg(100, 80))
+
+        job = _job()
+        assert job.payload == {'document_id': doc.id}
+        assert job.priority == notification_service.PRIORITY_LOW
+
+    def test_documents_are_not_queued(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+
+        _upload(b'%PDF-1.4', filename='manual.pdf', content_type='application/pdf', parent_type='equipment_doc')
+
+        assert _db.session.execute(_db.select(PendingNotification)).first() is None
+
+    def test_queue_missing_skips_built_unless_rebuilding(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        built = _upload(_jpeg(100, 80))
+        _upload(_jpeg(100, 80))
+        built.variants = {'widths': [100]}
+        _db.session.execute(_db.delete(PendingNotification))
+        _db.session.commit()
+
+        assert image_variant_service.queue_missing_variants() == 1
+        assert image_variant_service.queue_missing_variants(rebuild=True) == 2
+
+
+class TestBuildVariants:
+    def test_builds_webp_and_jpeg_below_original_width(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        doc = _upload(_jpeg(1000, 500))
+
+        widths = image_variant_service.build_variants(_job())
+
+        assert widths == [320, 640]
+        assert doc.variants == {'widths': [320, 640]}
+        directory = tmp_path / 'equipment' / '7' / 'photos'
+        stem = doc.stored_filename.rsplit('.', 1)[0]
+        with Image.open(directory / 'variants' / f'{stem}-640.jpg') as jpg:
+            assert jpg.format == 'JPEG'
+            assert jpg.size == (640, 320)
+            assert not jpg.getexif()
+        with Image.open(directory / 'variants' / f'{stem}-320.webp') as webp:
+            assert webp.format == 'WEBP'
+            assert webp.size == (320, 160)
+        assert not list((directory / 'variants').glob('*.tmp'))
+
+    def test_applies_exif_orientation(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        doc = _upload(_jpeg(800, 400, exif_orientation=6))
+
+        widths = image_variant_service.build_variants(_job())
+
+        assert widths == [320]
+        path = tmp_path / 'equipment' / '7' / 'photos' / doc.variant_filename(320, 'jpeg')
+        with Image.open(path) as jpg:
+            assert jpg.size == (320, 640)
+
+    def test_small_image_gets_one_full_width_variant(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        buf = io.BytesIO()
+        Image.new('RGBA', (120, 90), (0, 0, 255, 0)).save(buf, 'PNG')
+        doc = _upload(buf.getvalue(), filename='icon.png', content_type='image/png')
+
+        assert image_variant_service.build_variants(_job()) == [120]
+        path = tmp_path / 'equipment' / '7' / 'photos' / doc.variant_filename(120, 'jpeg')
+        with Image.open(path) as jpg:
+            assert jpg.getpixel((0, 0)) == (255, 255, 255)
+
+    def test_undecodable_file_records_no_variants(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        doc = _upload(b'not really a jpeg')
+
+        assert image_variant_service.build_variants(_job()) == []
+        assert doc.variants == {'widths': []}
+
+    def test_video_without_ffmpeg_records_no_variants(self, app, tmp_path, monkeypatch):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        monkeypatch.setattr(image_variant_service.shutil, 'which', lambda name: None)
+        doc = _upload(b'\x00\x00\x00\x18ftypmp42', filename='clip.mp4', content_type='video/mp4')
+
+        assert image_variant_service.build_variants(_job()) == []
+        assert doc.variant_widths == []
+
+    def test_deleted_document_is_skipped(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        doc = _upload(_jpeg(100, 80))
+        job = _job()
+        upload_service.delete_upload(doc.id, 'staffuser')
+
+        assert image_variant_service.build_variants(job) == []
+
+    def test_worker_processes_job(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        doc = _upload(_jpeg(700, 700))
+
+        notification_service.process_notification(_job())
+
+        assert doc.variant_widths == [320, 640]
+
+
+class TestDeleteVariants:
+    def test_delete_upload_removes_variants(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        doc = _upload(_jpeg(700, 700))
+        image_variant_service.build_variants(_job())
+        variants = tmp_path / 'equipment' / '7' / 'photos' / 'variants'
+        assert len(list(variants.iterdir())) == 4
+
+        upload_service.delete_upload(doc.id, 'staffuser')
+
+        assert list(variants.iterdir()) == []
@@ -0,0 +1,117 @@
+"""Tests for the single-flight lock service."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from esb.extensions import db as _db
+from esb.models.single_flight_lock import SingleFlightLock
+from esb.services import lock_service
+from esb.utils.exceptions import LockTimeout
+
+
+def _lock_row(name='job'):
+    _db.session.expire_all()
+    return _db.session.execute(
+        _db.select(SingleFlightLock).filter_by(name=name)
+    ).scalar_one()
+
+
+def _hold(name='job', generation=1, completed=0, expires_in=60):
+    """Simulate another process holding the lock."""
+    lock_service._ensure_row(name)
+    row = _lock_row(name)
+    row.holder = 'other'
+    row.generation = generation
+    row.completed_generation = completed
+    row.expires_at = datetime.now(UTC) + timedelta(seconds=expires_in)
+    _db.session.commit()
+
+
+def _finish_other_run(name='job', started_generation=None):
+    """Return a sleep side-effect that completes the other holder's run.
+
+    With ``started_generation``, a second run (started after the waiter's
+    request) is recorded as the one that completed.
+    """
+    def finish(_):
+        row = _lock_row(name)
+        if started_generation is not None:
+            row.generation = started_generation
+        row.completed_generation = row.generation
+        row.holder = None
+        row.expires_at = None
+        _db.session.commit()
+    return finish
+
+
+class TestRunSingleFlight:
+    def test_runs_when_free_and_records_generation(self, app):
+        fn = MagicMock()
+
+        assert lock_service.run_single_flight('job', fn) is True
+
+        fn.assert_called_once_with()
+        row = _lock_row()
+        assert row.holder is None
+        assert row.generation == 1
+        assert row.completed_generation == 1
+
+    def test_failed_run_releases_without_completing(self, app):
+        fn = MagicMock(side_effect=RuntimeError('upload failed'))
+
+        with pytest.raises(RuntimeError):
+            lock_service.run_single_flight('job', fn)
+
+        row = _lock_row()
+        assert row.holder is None
+        assert row.completed_generation == 0
+
+    def test_waiter_reruns_when_inflight_run_predates_request(self, app):
+        """The run in flight may have read state from before our change."""
+        _hold(generation=1)
+        fn = MagicMock()
+
+        with patch.object(lock_service.time, 'sleep', side_effect=_finish_other_run()):
+            assert lock_service.run_single_flight('job', fn) is True
+
+        fn.assert_called_once()
+        assert _lock_row().completed_generation == 2
+
+    def test_waiter_shares_run_started_after_request(self, app):
+        _hold(generation=1)
+        fn = MagicMock()
+
+        with patch.object(lock_service.time, 'sleep', side_effect=_finish_other_run(started_generation=2)):
+            assert lock_service.run_single_flight('job', fn) is False
+
+        fn.assert_not_called()
+
+    def test_takes_over_expired_lease(self, app):
+        _hold(expires_in=-5)
+        fn = MagicMock()
+
+        assert lock_service.run_single_flight('job', fn) is True
+
+        fn.assert_called_once()
+        assert _lock_row().generation == 2
+
+    def test_stale_holder_release_does_not_clobber_new_holder(self, app):
+        _hold()
+        lock_service._release('job', 'someone-else', 5)
+
+        row = _lock_row()
+        assert row.holder == 'other'
+        assert row.completed_generation == 0
+
+    def test_times_out_while_held(self, app):
+        _hold()
+        fn = MagicMock()
+
+        with patch.object(lock_service.time, 'sleep'), \
+             patch.object(lock_service.time, 'monotonic', side_effect=[0.0, 0.0, 10.0]):
+            with pytest.raises(LockTimeout):
+                lock_service.run_single_flight('job', fn, wait_timeout=5)
+
+        fn.assert_not_called()
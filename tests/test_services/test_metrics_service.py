@@ -238,3 +238,129 @@ class TestWorkerStatusCollector:
         body, _ = metrics_service.render_metrics()
         text = body.decode()
         assert 'esb_socket_mode_connected 0.0' in text
+
+
+class TestSlackRateLimitCollector:
+    def test_omitted_without_state_row(self, app):
+        body, _ = metrics_service.render_metrics()
+        assert b'esb_slack_rate_limit' not in body
+
+    def test_emits_lane_metrics(self, app):
+        import json
+        state = {
+            'chat.postMessage:#woodshop': {
+                'tokens': 0.5, 'capacity': 3, 'paused_until': 1700000000.0,
+                'rate_limited_total': 4,
+            },
+            'files.upload': {
+                'tokens': None, 'capacity': None, 'paused_until': 1700000005.0,
+                'rate_limited_total': 1,
+            },
+        }
+        _make_app_config('slack_rate_limit_state', json.dumps(state))
+
+        text = metrics_service.render_metrics()[0].decode()
+
+        assert ('esb_slack_rate_limit_paused_until_timestamp_seconds'
+                '{lane="chat.postMessage:#woodshop"} 1.7e+09') in text
+        assert 'esb_slack_rate_limit_tokens{lane="chat.postMessage:#woodshop"} 0.5' in text
+        assert 'esb_slack_rate_limit_tokens{lane="files.upload"}' not in text
+        assert 'esb_slack_rate_limited_total{lane="chat.postMessage:#woodshop"} 4.0' in text
+
+    def test_malformed_state_omits_metrics(self, app):
+        _make_app_config('slack_rate_limit_state', 'not json')
+
+        body, _ = metrics_service.render_metrics()
+
+        assert b'esb_slack_rate_limit' not in body
+        assert b'esb_pending_notifications_count' in body
+
+
+class TestWorkerDeliveryCollector:
+    def test_omitted_without_state_row(self, app):
+        body, _ = metrics_service.render_metrics()
+        assert b'esb_notification_delivery' not in body
+        assert b'esb_slack_api_errors' not in body
+
+    def test_emits_histograms_and_counters(self, app):
+        import json
+
+        from esb.services.worker_metrics import WorkerMetrics
+
+        stats = WorkerMetrics()
+        stats.record_attempt('slack_message', 'delivered', 0.3)
+        stats.record_attempt('slack_message', 'failed', 2.0)
+        stats.record_latency(
+            'slack_message',
+            datetime(2026, 1, 1, 12, 0, 0, tzinfo=UTC),
+            datetime(2026, 1, 1, 12, 0, 4, tzinfo=UTC),
+        )
+        stats.slack_errors['channel_not_found'] = 2
+        stats.record_pruned('delivered', 7)
+        _make_app_config('worker_delivery_metrics', json.dumps(stats.snapshot()))
+
+        text = metrics_service.render_metrics()[0].decode()
+
+        assert 'esb_notification_delivery_latency_seconds_bucket{le="2",type="slack_message"} 0.0' in text
+        assert 'esb_notification_delivery_latency_seconds_bucket{le="5",type="slack_message"} 1.0' in text
+        assert 'esb_notification_delivery_latency_seconds_sum{type="slack_message"} 4.0' in text
+        assert 'esb_notification_delivery_duration_seconds_count{type="slack_message"} 2.0' in text
+        assert 'esb_notification_deliveries_total{outcome="delivered",type="slack_message"} 1.0' in text
+        assert 'esb_notification_deliveries_total{outcome="failed",type="slack_message"} 1.0' in text
+        assert 'esb_slack_api_errors_total{error="channel_not_found"} 2.0' in text
+        assert 'esb_notifications_pruned_total{status="delivered"} 7.0' in text
+
+    def test_emits_process_gauges(self, app):
+        import json
+
+        from esb.services.worker_metrics import WorkerMetrics
+
+        stats = WorkerMetrics()
+        stats.process = {'rss_bytes': 52428800, 'gc_objects': 120000, 'session_objects': 0}
+        _make_app_config('worker_delivery_metrics', json.dumps(stats.snapshot()))
+
+        text = metrics_service.render_metrics()[0].decode()
+
+        assert 'esb_worker_resident_memory_bytes 5.24288e+07' in text
+        assert 'esb_worker_gc_objects 120000.0' in text
+        assert 'esb_worker_session_objects 0.0' in text
+
+    def test_emits_static_push_series_per_destination(self, app):
+        import json
+
+        from esb.services.worker_metrics import WorkerMetrics
+
+        stats = WorkerMetrics()
+        stats.record_static_push('s3', 'bucket/index.html', ok=True)
+        stats.record_static_push('local', '/srv/status', ok=False)
+        _make_app_config('worker_delivery_metrics', json.dumps(stats.snapshot()))
+
+        text = metrics_service.render_metrics()[0].decode()
+
+        assert ('esb_static_page_pushes_total{method="s3",outcome="ok",target="bucket/index.html"} 1.0'
+                in text)
+        assert 'esb_static_page_pushes_total{method="local",outcome="failed",target="/srv/status"} 1.0' in text
+        assert 'esb_static_page_last_success_timestamp_seconds{method="s3",target="bucket/index.html"}' in text
+        assert 'esb_static_page_last_success_timestamp_seconds{method="local"' not in text
+
+    def test_unmeasured_process_gauge_omitted(self, app):
+        import json
+
+        from esb.services.worker_metrics import WorkerMetrics
+
+        stats = WorkerMetrics()
+        stats.process = {'rss_bytes': None, 'gc_objects': 10, 'session_objects': 3}
+        _make_app_config('worker_delivery_metrics', json.dumps(stats.snapshot()))
+
+        text = metrics_service.render_metrics()[0].decode()
+
+        assert 'esb_worker_resident_memory_bytes' not in text
+        assert 'esb_worker_gc_objects 10.0' in text
+
+    def test_malformed_state_omits_metrics(self, app):
+        _make_app_config('worker_delivery_metrics', '{"latency": []}')
+
+        body, _ = metrics_service.render_metrics()
+
+        assert b'esb_notification_delivery' not in body
+        assert b'esb_pending_notifications_count' in body
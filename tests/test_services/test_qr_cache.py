@@ -0,0 +1,261 @@
+"""Tests for the QR render cache."""
+
+import json
+import os
+import shutil
+from unittest.mock import patch
+
+import pytest
+
+from esb.services import qr_service
+from esb.services.qr_cache import QRRenderCache
+
+BASE_URL = 'http://esb.test:5000'
+
+# tests/ directory — the committed template fixtures live there.
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestMemoryTier:
+    def test_round_trip(self, tmp_path):
+        cache = QRRenderCache(memory_bytes=100, disk_dir=str(tmp_path), disk_bytes=0)
+        cache.put('a', b'png-a')
+
+        assert cache.get('a') == b'png-a'
+        assert cache.get('b') is None
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = QRRenderCache(memory_bytes=10, disk_dir=str(tmp_path), disk_bytes=0)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+        cache.get('a')  # a is now more recent than b
+        cache.put('c', b'cccc')
+
+        assert cache.get('a') == b'aaaa'
+        assert cache.get('b') is None
+        assert cache.get('c') == b'cccc'
+
+    def test_oversized_entry_not_kept(self, tmp_path):
+        cache = QRRenderCache(memory_bytes=4, disk_dir=str(tmp_path), disk_bytes=0)
+        cache.put('a', b'too large')
+
+        assert cache.get('a') is None
+
+
+class TestDiskTier:
+    def test_survives_a_new_cache_instance(self, tmp_path):
+        QRRenderCache(memory_bytes=0, disk_dir=str(tmp_path), disk_bytes=1000).put('k', b'png')
+
+        fresh = QRRenderCache(memory_bytes=100, disk_dir=str(tmp_path), disk_bytes=1000)
+        assert fresh.get('k') == b'png'
+        assert (tmp_path / 'k.png').read_bytes() == b'png'
+
+    def test_not_persisted_when_asked(self, tmp_path):
+        cache = QRRenderCache(memory_bytes=100, disk_dir=str(tmp_path), disk_bytes=1000)
+        cache.put('k', b'png', persist=False)
+
+        assert cache.get('k') == b'png'
+        assert not (tmp_path / 'k.png').exists()
+
+    def test_evicts_least_recently_used_files(self, tmp_path):
+        cache = QRRenderCache(memory_bytes=0, disk_dir=str(tmp_path), disk_bytes=250)
+        for i, key in enumerate(('old', 'used', 'new')):
+            cache.put(key, b'x' * 80)
+            os.utime(tmp_path / f'{key}.png', (1000 + i, 1000 + i))
+        cache.get('used')  # refreshes its mtime to now
+
+        cache.put('newest', b'x' * 80)
+
+        # Over the cap, files go oldest-first until the directory is at 80%.
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['newest.png', 'used.png']
+
+    def test_directory_created_owner_only(self, tmp_path):
+        cache = QRRenderCache(memory_bytes=0, disk_dir=str(tmp_path / 'cache'), disk_bytes=1000)
+
+        cache.put('k', b'png')
+
+        assert (tmp_path / 'cache').stat().st_mode & 0o777 == 0o700
+
+    def test_default_directory_is_under_upload_path(self, app, tmp_path):
+        from esb.services.qr_cache import get_qr_cache
+
+        app.config.update(UPLOAD_PATH=str(tmp_path), QR_CACHE_DIR='')
+
+        assert get_qr_cache().disk_dir == str(tmp_path / 'qr-cache')
+
+    def test_write_error_is_a_miss(self, tmp_path, caplog):
+        blocker = tmp_path / 'file'
+        blocker.write_bytes(b'')
+        cache = QRRenderCache(memory_bytes=0, disk_dir=str(blocker / 'cache'), disk_bytes=1000)
+
+        cache.put('k', b'png')
+
+        assert cache.get('k') is None
+        assert 'QR cache write failed' in caplog.text
+
+
+class TestRenderQrPngCaching:
+    @pytest.fixture
+    def cache_dir(self, app, tmp_path):
+        app.config['QR_CACHE_MEMORY_MB'] = 8
+        app.config['QR_CACHE_DISK_MB'] = 8
+        app.config['QR_CACHE_DIR'] = str(tmp_path / 'qr-cache')
+        return tmp_path / 'qr-cache'
+
+    def _render(self, equipment, **kwargs):
+        kwargs.setdefault('dpi', 150)
+        return qr_service.render_qr_png(
+            equipment, qr_service.QR_PRESETS_BY_KEY['sticker_1'], base_url=BASE_URL, **kwargs,
+        )
+
+    def test_repeat_render_served_from_cache(self, app, cache_dir, make_equipment):
+        eq = make_equipment(name='Lathe')
+
+        with patch.object(qr_service, '_render_qr_png', wraps=qr_service._render_qr_png) as render:
+            first = self._render(eq, include_name=True)
+            second = self._render(eq, include_name=True)
+
+        assert first == second
+        render.assert_called_once()
+        assert len(list(cache_dir.glob('*.png'))) == 1
+
+    def test_reprint_after_restart_is_a_disk_read(self, app, cache_dir, make_equipment):
+        eq = make_equipment(name='Lathe')
+        first = self._render(eq)
+        app.extensions.pop('esb_qr_cache')  # as in a new process
+
+        with patch.object(qr_service, '_render_qr_png') as render:
+            assert self._render(eq) == first
+        render.assert_not_called()
+
+    @pytest.mark.parametrize('change', [
+        {'include_name': True},
+        {'include_url': True},
+        {'dpi': 300},
+        {'wifi_info': 'header'},
+    ])
+    def test_each_option_changes_the_key(self, app, cache_dir, make_equipment, change):
+        eq = make_equipment(name='Lathe')
+        self._render(eq)
+
+        with patch.object(qr_service, '_render_qr_png', return_value=b'other') as render:
+            self._render(eq, **change)
+        render.assert_called_once()
+
+    def test_renamed_equipment_rerenders(self, app, cache_dir, make_equipment):
+        from esb.extensions import db
+
+        eq = make_equipment(name='Lathe')
+        self._render(eq, include_name=True)
+        eq.name = 'Big Lathe'
+        db.session.commit()
+
+        with patch.object(qr_service, '_render_qr_png', return_value=b'renamed') as render:
+            assert self._render(eq, include_name=True) == b'renamed'
+        render.assert_called_once()
+
+    def test_replaced_template_artwork_rerenders(self, app, cache_dir, make_equipment, tmp_path):
+        shutil.copy(os.path.join(TESTS_DIR, 'qr_code_template.png'), tmp_path / 'template.png')
+        config_path = tmp_path / 'template.json'
+        config_path.write_text(json.dumps({
+            'image': 'template.png', 'qr_bbox': [509, 949, 1011, 1451], 'name_bbox': [240, 540, 1259, 925],
+        }))
+        template = qr_service.load_template_config(str(config_path))
+        eq = make_equipment(name='Lathe')
+        self._render(eq, template=template)
+        stat = os.stat(tmp_path / 'template.png')
+        os.utime(tmp_path / 'template.png', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch.object(qr_service, '_render_qr_png', return_value=b'new art') as render:
+            assert self._render(eq, template=template) == b'new art'
+        render.assert_called_once()
+
+    def test_password_render_kept_off_disk(self, app, cache_dir, make_equipment):
+        eq = make_equipment(name='Lathe')
+
+        with patch.object(qr_service, '_render_qr_png', return_value=b'png') as render:
+            self._render(eq, dpi=300, wifi_info='password', wifi_ssid='Makers', wifi_password='hunter2')
+            self._render(eq, dpi=300, wifi_info='password', wifi_ssid='Makers', wifi_password='hunter2')
+
+        render.assert_called_once()
+        assert not cache_dir.exists() or not list(cache_dir.glob('*.png'))
+
+    def test_render_errors_are_not_cached(self, app, cache_dir, make_equipment):
+        eq = make_equipment(name='Lathe')
+
+        with pytest.raises(ValueError):
+            self._render(eq, dpi=0)
+        with patch.object(qr_service, '_render_qr_png', side_effect=ValueError('again')) as render:
+            with pytest.raises(ValueError):
+                self._render(eq, dpi=0)
+        render.assert_called_once()
+        assert not cache_dir.exists()
+
+
+class TestTemplateArtCache:
+    @pytest.fixture
+    def art(self, monkeypatch):
+        art = qr_service._TemplateArtCache(max_bytes=64 * 1024 * 1024)
+        monkeypatch.setattr(qr_service, '_template_art', art)
+        return art
+
+    @pytest.fixture
+    def template(self, tmp_path):
+        shutil.copy(os.path.join(TESTS_DIR, 'qr_code_template.png'), tmp_path / 'template.png')
+        config_path = tmp_path / 'template.json'
+        config_path.write_text(json.dumps({
+            'image': 'template.png', 'qr_bbox': [509, 949, 1011, 1451], 'name_bbox': [240, 540, 1259, 925],
+        }))
+        return qr_service.load_template_config(str(config_path))
+
+    def _render(self, equipment, template, dpi=150):
+        return qr_service._render_qr_png(
+            equipment, qr_service.QR_PRESETS_BY_KEY['sticker_2'], dpi=dpi, include_name=False,
+            include_url=False, base_url=BASE_URL, wifi_info='none', wifi_ssid=None,
+            wifi_password=None, template=template,
+        )
+
+    def test_artwork_decoded_and_scaled_once_per_size(self, app, art, template, make_equipment):
+        eq = make_equipment(name='Lathe')
+
+        with patch.object(qr_service, '_open_template_rgb', wraps=qr_service._open_template_rgb) as opened:
+            first = self._render(eq, template)
+            assert self._render(eq, template) == first
+            self._render(eq, template, dpi=300)
+
+        opened.assert_called_once()
+        assert [size for _, size in art._scaled] == [(250, 300), (500, 600)]
+
+    def test_replaced_artwork_is_reloaded(self, app, art, template, make_equipment):
+        eq = make_equipment(name='Lathe')
+        self._render(eq, template)
+        stat = os.stat(template.image_path)
+        os.utime(template.image_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch.object(qr_service, '_open_template_rgb', wraps=qr_service._open_template_rgb) as opened:
+            self._render(eq, template)
+
+        opened.assert_called_once()
+        assert len(art._scaled) == 1  # the stale variant was dropped
+
+    def test_scaled_variants_bounded_by_bytes(self, app, art, template, make_equipment):
+        art.max_bytes = 250 * 300 * 3 + 500 * 600 * 3
+        eq = make_equipment(name='Lathe')
+        for dpi in (150, 300, 150, 200):
+            self._render(eq, template, dpi=dpi)
+
+        # 200 dpi pushed out the least recently used size (300 dpi).
+        assert [size for _, size in art._scaled] == [(250, 300), (333, 400)]
+
+        self._render(eq, template, dpi=600)  # larger than the whole budget: not kept
+        assert [size for _, size in art._scaled] == [(250, 300), (333, 400)]
+
+    def test_dimension_change_still_rejected(self, app, art, template, make_equipment):
+        import dataclasses
+
+        eq = make_equipment(name='Lathe')
+        self._render(eq, template)
+        stale = dataclasses.replace(template, image_w=1000, image_h=1200)
+
+        with pytest.raises(RuntimeError, match='changed size on disk'):
+            self._render(eq, stale)
@@ -0,0 +1,181 @@
+"""Tests for the QR render process pool."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from esb.services import metrics_service, qr_render_pool, qr_service
+from esb.utils.exceptions import RenderPoolBusy
+
+BASE_URL = 'http://esb.test:5000'
+
+
+def _pool(**kwargs):
+    options = {'workers': 1, 'queue_size': 1, 'timeout': 5.0}
+    options.update(kwargs)
+    return qr_render_pool.QRRenderPool(**options)
+
+
+def _threaded(pool, monkeypatch, render):
+    """Run the pool's renders on a thread in this process, through ``render``."""
+    executor = ThreadPoolExecutor(max_workers=pool.workers)
+    monkeypatch.setattr(pool, '_get_executor', lambda: executor)
+    monkeypatch.setattr(qr_render_pool, '_render_in_process', render)
+    return executor
+
+
+def _settled(pool):
+    """Wait for done-callbacks, which may run just after the caller's result."""
+    deadline = time.monotonic() + 5
+    while pool.in_flight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pool.stats()
+
+
+class TestQRRenderPool:
+    def test_renders_in_a_process(self, app, make_equipment):
+        eq = make_equipment('Table Saw')
+        preset = qr_service.QR_PRESETS_BY_KEY['sticker_2']
+        options = {'dpi': 150, 'include_name': True, 'include_url': False, 'base_url': BASE_URL}
+        pool = _pool()
+        try:
+            png = pool.render(eq, preset, **options)
+        finally:
+            pool.shutdown()
+
+        assert png == qr_service._render_qr_png(eq, preset, **options)
+        stats = _settled(pool)
+        assert stats['outcomes'] == {'ok': 1}
+        assert stats['in_flight'] == 0
+        assert stats['duration']['count'] == 1
+
+    def test_full_pool_rejects_without_waiting(self, monkeypatch):
+        pool = _pool()
+        _threaded(pool, monkeypatch, lambda *a: pytest.fail('render submitted'))
+        pool.in_flight = pool.capacity
+
+        with pytest.raises(RenderPoolBusy) as excinfo:
+            pool.render(qr_render_pool._Equipment(1, 'Lathe'), None)
+
+        assert excinfo.value.retry_after == qr_render_pool.RETRY_AFTER_SECONDS
+        assert pool.stats()['outcomes'] == {'rejected': 1}
+
+    def test_timeout_keeps_slot_and_delivers_result_later(self, monkeypatch):
+        release = threading.Event()
+        delivered = []
+
+        def slow_render(equipment, preset, options):
+            release.wait(5)
+            return b'png', 0.2
+
+        pool = _pool(timeout=0.05)
+        _threaded(pool, monkeypatch, slow_render)
+
+        with pytest.raises(RenderPoolBusy):
+            pool.render(qr_render_pool._Equipment(1, 'Lathe'), None, on_result=delivered.append)
+        assert pool.stats()['in_flight'] == 1
+
+        release.set()
+        stats = _settled(pool)
+        assert delivered == [b'png']
+        assert stats['outcomes'] == {'timeout': 1, 'ok': 1}
+
+    def test_layout_error_propagates_and_counts_invalid(self, monkeypatch):
+        def bad_render(equipment, preset, options):
+            raise ValueError('URL is too long')
+
+        pool = _pool()
+        _threaded(pool, monkeypatch, bad_render)
+
+        with pytest.raises(ValueError, match='too long'):
+            pool.render(qr_render_pool._Equipment(1, 'Lathe'), None)
+        assert _settled(pool)['outcomes'] == {'invalid': 1}
+
+
+class TestGetRenderPool:
+    def test_none_outside_a_request(self, app):
+        app.config['QR_RENDER_WORKERS'] = 2
+
+        assert qr_render_pool.get_render_pool() is None
+
+    def test_none_when_disabled(self, app):
+        with app.test_request_context():
+            assert qr_render_pool.get_render_pool() is None
+
+    def test_one_pool_per_app(self, app):
+        app.config.update(QR_RENDER_WORKERS=2, QR_RENDER_QUEUE_SIZE=3)
+        with app.test_request_context():
+            pool = qr_render_pool.get_render_pool()
+            assert qr_render_pool.get_render_pool() is pool
+        assert pool.capacity == 5
+        assert app.extensions['esb_qr_render_pool'] is pool
+
+
+class TestRenderProcessConfig:
+    def test_only_render_cache_settings(self, app, tmp_path):
+        app.config.update(UPLOAD_PATH=str(tmp_path), QR_CACHE_DIR='', SECRET_KEY='not-for-renders')
+
+        config = qr_render_pool.render_process_config()
+
+        assert config['UPLOAD_PATH'] == str(tmp_path)
+        assert config['QR_CACHE_DIR'] == ''
+        assert set(config) == {'UPLOAD_PATH'} | {k for k in app.config if k.startswith('QR_CACHE_')}
+
+
+class TestRenderQrPngWithPool:
+    def test_pool_result_is_cached(self, app, make_equipment, monkeypatch, tmp_path):
+        app.config.update(QR_RENDER_WORKERS=1, QR_CACHE_MEMORY_MB=8, QR_CACHE_DIR=str(tmp_path))
+        eq = make_equipment('Table Saw')
+        preset = qr_service.QR_PRESETS_BY_KEY['sticker_2']
+        with app.test_request_context():
+            pool = qr_render_pool.get_render_pool()
+            _threaded(pool, monkeypatch, lambda *a: (b'pooled', 0.1))
+
+            assert qr_service.render_qr_png(eq, preset, dpi=150, base_url=BASE_URL) == b'pooled'
+            _settled(pool)
+            monkeypatch.setattr(qr_render_pool, '_render_in_process', lambda *a: pytest.fail('re-rendered'))
+            assert qr_service.render_qr_png(eq, preset, dpi=150, base_url=BASE_URL) == b'pooled'
+
+    def test_saturated_pool_is_503_with_retry_after(
+        self, app, staff_client, make_equipment, configured_base_url, monkeypatch, tmp_path,
+    ):
+        app.config.update(QR_RENDER_WORKERS=1, QR_CACHE_DIR=str(tmp_path))
+        eq = make_equipment('Table Saw', 'SawStop', 'PCS')
+        with app.test_request_context():
+            pool = qr_render_pool.get_render_pool()
+        _threaded(pool, monkeypatch, lambda *a: pytest.fail('render submitted'))
+        pool.in_flight = pool.capacity
+
+        resp = staff_client.post(
+            f'/equipment/{eq.id}/qr',
+            data={'size': 'sticker_2', 'wifi_info': 'none', 'submit': 'Download QR Code'},
+        )
+
+        assert resp.status_code == 503
+        assert resp.headers['Retry-After'] == str(qr_render_pool.RETRY_AFTER_SECONDS)
+        assert b'busy' in resp.data
+
+
+class TestRenderPoolMetrics:
+    def test_omitted_without_a_pool(self, app):
+        body, _ = metrics_service.render_metrics()
+        assert b'esb_qr_render' not in body
+
+    def test_emits_queue_depth_and_render_time(self, app):
+        pool = _pool(workers=2, queue_size=4)
+        pool.in_flight = 3
+        pool.outcomes = {'ok': 2, 'rejected': 1}
+        pool.duration.observe(0.3)
+        pool.duration.observe(0.03)
+        app.extensions['esb_qr_render_pool'] = pool
+
+        text = metrics_service.render_metrics()[0].decode()
+
+        assert 'esb_qr_render_queue_depth 1.0' in text
+        assert 'esb_qr_render_in_flight 3.0' in text
+        assert 'esb_qr_render_capacity 6.0' in text
+        assert 'esb_qr_render_duration_seconds_bucket{le="0.05"} 1.0' in text
+        assert 'esb_qr_render_duration_seconds_count 2.0' in text
+        assert 'esb_qr_renders_total{outcome="rejected"} 1.0' in text
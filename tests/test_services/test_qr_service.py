@@ -390,6 +390,58 @@ class TestFitText:
         # Truncated to ellipsis at the lowered floor; font.size honors the 203 dpi floor.
         assert font.size == int(8 * 203 / 72 + 0.5)
 
+    @staticmethod
+    def _width(text, font):
+        left, _, right, _ = ImageDraw.Draw(Image.new('RGB', (1, 1))).textbbox((0, 0), text, font=font)
+        return right - left
+
+    def test_picks_largest_fitting_size(self, app):
+        from esb.services.qr_service import _load_font
+        text = 'Oscillating Spindle Sander #12'
+        font, rendered = _fit_text(
+            text, max_width_px=900, max_height_px=400,
+            font_path=self._font_path(app), dpi=300,
+        )
+        assert rendered == text
+        assert self._width(text, font) <= 900
+        assert self._width(text, _load_font(self._font_path(app), font.size + 1)) > 900
+
+    def test_wifi_password_fit_not_memoized(self, app, make_equipment):
+        from esb.services import qr_service
+
+        eq = make_equipment(name='Lathe')
+        preset = qr_service.QR_PRESETS_BY_KEY['sticker_2']
+        qr_service._fit_text_size.cache_clear()
+        for password in ('hunter2', 'correct horse battery'):
+            qr_service.render_qr_png(
+                eq, preset, dpi=150, base_url='http://esb.test:5000', wifi_info='password',
+                wifi_ssid='Makerspace', wifi_password=password,
+            )
+            # The header and network rows only; never a password row.
+            assert qr_service._fit_text_size.cache_info().currsize == 2
+
+    def test_ellipsis_keeps_longest_prefix(self, app):
+        text = 'Combination Jointer Planer with Helical Cutterhead'
+        font, rendered = _fit_text(
+            text, max_width_px=300, max_height_px=100,
+            font_path=self._font_path(app), dpi=300,
+        )
+        prefix = rendered[:-1]
+        assert rendered.endswith('…')
+        assert self._width(rendered, font) <= 300
+        assert self._width(text[:len(prefix) + 1] + '…', font) > 300
+
+    def test_fits_are_memoized(self, app, monkeypatch):
+        from esb.services import qr_service
+        kwargs = dict(max_width_px=417, max_height_px=91, font_path=self._font_path(app), dpi=600)
+        first = _fit_text('Bandsaw (memo)', **kwargs)
+
+        def fail(*args, **kwargs):
+            raise AssertionError('a memoized fit must not measure text')
+
+        monkeypatch.setattr(qr_service, '_measure', fail)
+        assert _fit_text('Bandsaw (memo)', **kwargs) == first
+
 
 class TestRenderQRPngWifi:
     """Tests for WiFi header rendering in QR PNGs."""
@@ -0,0 +1,182 @@
+"""Tests for batch QR label sheets."""
+
+from pathlib import Path
+
+import pytest
+from PIL import PdfParser
+
+from esb.models.pending_notification import PendingNotification
+from esb.services import notification_service, qr_sheet_service
+from esb.utils.exceptions import ValidationError
+
+
+@pytest.fixture
+def sheet_app(app, tmp_path, configured_base_url):
+    app.config['UPLOAD_PATH'] = str(tmp_path / 'uploads')
+    return app
+
+
+@pytest.fixture
+def make_items(make_area, make_equipment):
+    """Create ``names`` as equipment in one shared area."""
+    def _make(*names):
+        area = make_area(name='Shop')
+        return [make_equipment(name=name, area=area) for name in names]
+    return _make
+
+
+def _queue(equipment, layout='avery_5163', device='laser_300', **kwargs):
+    kwargs.setdefault('include_name', True)
+    kwargs.setdefault('include_url', False)
+    kwargs.setdefault('wifi_info', 'none')
+    return qr_sheet_service.queue_sheet(
+        [e.id for e in equipment], layout, device, username='staffuser', **kwargs,
+    )
+
+
+def _pdf_pages(path):
+    pdf = PdfParser.PdfParser(path)
+    try:
+        return len(pdf.pages)
+    finally:
+        pdf.close()
+
+
+class TestLayouts:
+    @pytest.mark.parametrize('layout', qr_sheet_service.SHEET_LAYOUTS, ids=lambda layout: layout.key)
+    def test_grid_fits_on_the_page(self, layout):
+        right = layout.left_in + (layout.columns - 1) * layout.pitch_x_in + layout.label_w_in
+        bottom = layout.top_in + (layout.rows - 1) * layout.pitch_y_in + layout.label_h_in
+        assert right <= layout.page_w_in
+        assert bottom <= layout.page_h_in
+        assert layout.pitch_x_in >= layout.label_w_in
+        assert layout.pitch_y_in >= layout.label_h_in
+
+    def test_avery_counts(self):
+        assert qr_sheet_service.SHEET_LAYOUTS_BY_KEY['avery_5160'].per_page == 30
+        assert qr_sheet_service.SHEET_LAYOUTS_BY_KEY['avery_5163'].per_page == 10
+
+
+class TestQueueSheet:
+    def test_queues_a_job_without_wifi_secrets(self, sheet_app, make_equipment, capture):
+        eq = make_equipment(name='Lathe')
+
+        job = _queue([eq, eq], wifi_info='password')
+
+        assert job.notification_type == 'qr_sheet'
+        assert job.status == 'pending'
+        assert job.payload['equipment_ids'] == [eq.id]
+        assert job.payload['total'] == 1
+        assert job.payload['done'] == 0
+        assert 'wifi_password' not in job.payload
+        events = [r.getMessage() for r in capture.records]
+        assert any('qr_sheet.queued' in e for e in events)
+
+    @pytest.mark.parametrize('kwargs, message', [
+        ({'layout': 'bogus'}, 'Unknown sheet layout'),
+        ({'device': 'bogus'}, 'Unknown printer'),
+        ({'wifi_info': 'bogus'}, 'Unknown WiFi option'),
+        ({'device': 'laser_1200'}, 'too large to render'),
+    ])
+    def test_rejects_bad_options(self, sheet_app, make_equipment, kwargs, message):
+        eq = make_equipment(name='Lathe')
+
+        with pytest.raises(ValidationError, match=message):
+            _queue([eq], **kwargs)
+
+    def test_rejects_empty_selection(self, sheet_app):
+        with pytest.raises(ValidationError, match='at least one'):
+            _queue([])
+
+    def test_rejects_oversized_batch(self, sheet_app, monkeypatch, make_items):
+        monkeypatch.setattr(qr_sheet_service, 'MAX_SHEET_LABELS', 1)
+        with pytest.raises(ValidationError, match='at most 1'):
+            _queue(make_items('A', 'B'))
+
+
+class TestBuildSheet:
+    def test_worker_builds_multi_page_pdf_with_progress(self, sheet_app, make_items, capture):
+        items = make_items(*(f'Machine {i:02d}' for i in range(12)))
+        job = _queue(items, layout='avery_5163', device='thermal_203')
+
+        notification_service.process_notification(job)
+
+        path = qr_sheet_service.sheet_path(job.id)
+        assert _pdf_pages(path) == 2  # 10 per page
+        assert job.payload['done'] == 12
+        events = [r.getMessage() for r in capture.records]
+        assert any('qr_sheet.generated' in e and '"pages": 2' in e for e in events)
+
+    def test_labels_land_in_the_grid(self, sheet_app, make_items, monkeypatch):
+        layout = qr_sheet_service.SHEET_LAYOUTS_BY_KEY['avery_5163']
+        pages = []
+        monkeypatch.setattr(
+            qr_sheet_service, '_append_page', lambda path, page, dpi, first: pages.append(page.copy()),
+        )
+        monkeypatch.setattr(qr_sheet_service.os, 'replace', lambda src, dst: None)
+        job = _queue(make_items('A', 'B'), device='thermal_203')
+
+        qr_sheet_service.build_sheet(job)
+
+        (page,) = pages
+        assert page.size == (1726, 2233)  # 8.5"×11" at 203 dpi
+        dpi = 203
+        second = (round((layout.left_in + layout.pitch_x_in) * dpi), round(layout.top_in * dpi))
+        label_w, label_h = round(layout.label_w_in * dpi), round(layout.label_h_in * dpi)
+        # The second label's cell holds black QR modules; the third cell is empty.
+        cell = page.crop((second[0], second[1], second[0] + label_w, second[1] + label_h))
+        assert cell.convert('L').getextrema()[0] == 0
+        third = page.crop((round(layout.left_in * dpi), round((layout.top_in + layout.pitch_y_in) * dpi),
+                           round(layout.left_in * dpi) + label_w,
+                           round((layout.top_in + layout.pitch_y_in) * dpi) + label_h))
+        assert third.convert('L').getextrema() == (255, 255)
+
+    def test_archived_equipment_skipped(self, sheet_app, make_items):
+        from esb.extensions import db
+
+        keep, gone = make_items('Keep', 'Gone')
+        job = _queue([keep, gone])
+        gone.is_archived = True
+        db.session.commit()
+
+        qr_sheet_service.build_sheet(job)
+
+        assert job.payload['done'] == 1
+
+    def test_failed_build_leaves_no_partial_file(self, sheet_app, make_equipment, monkeypatch):
+        job = _queue([make_equipment(name='A')])
+
+        def broken(*args, **kwargs):
+            raise OSError('disk full')
+
+        monkeypatch.setattr(qr_sheet_service.qr_service, 'render_qr_png', broken)
+        with pytest.raises(OSError):
+            qr_sheet_service.build_sheet(job)
+
+        assert list(Path(qr_sheet_service.sheet_dir()).iterdir()) == []
+
+    def test_invalid_base_url_is_retryable(self, sheet_app, make_equipment):
+        job = _queue([make_equipment(name='A')])
+        sheet_app.config['ESB_BASE_URL'] = ''
+
+        with pytest.raises(RuntimeError):
+            qr_sheet_service.build_sheet(job)
+
+    def test_renders_on_a_process_pool(self, sheet_app, make_items):
+        sheet_app.config['QR_SHEET_WORKERS'] = 2
+        items = make_items('Machine 0', 'Machine 1', 'Machine 2')
+        job = _queue(items, layout='grid_2', device='thermal_203')
+
+        qr_sheet_service.build_sheet(job)
+
+        assert _pdf_pages(qr_sheet_service.sheet_path(job.id)) == 1
+        assert job.payload['done'] == 3
+
+    def test_job_is_a_pending_notification(self, sheet_app, make_equipment):
+        job = _queue([make_equipment(name='A')])
+
+        assert qr_sheet_service.get_sheet_job(job.id) is job
+        other = notification_service.queue_notification('static_page_push', 'local')
+        assert isinstance(other, PendingNotification)
+        with pytest.raises(ValidationError):
+            qr_sheet_service.get_sheet_job(other.id)
@@ -0,0 +1,128 @@
+"""Tests for SVG and PDF QR output."""
+
+import base64
+import io
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+from PIL import Image, ImageDraw, PdfParser
+
+from esb.services import qr_service, qr_vector
+
+BASE_URL = 'http://esb.test:5000'
+SVG_NS = '{http://www.w3.org/2000/svg}'
+
+
+def _render(equipment, fmt, preset_key='sticker_2', **kwargs):
+    preset = qr_service.QR_PRESETS_BY_KEY[preset_key]
+    return qr_service.render_qr_vector(equipment, preset, fmt=fmt, base_url=BASE_URL, **kwargs)
+
+
+def _paint(surface):
+    """Rasterize a surface's rectangle-only ops (for comparing against Pillow)."""
+    canvas = Image.new('L', (surface.width, surface.height), 255)
+    draw = ImageDraw.Draw(canvas)
+    for op in surface._ops:
+        _kind, color, _crisp, subpaths = op
+        for subpath in subpaths:
+            xs = [cmd[1] for cmd in subpath if cmd[0] != 'Z']
+            ys = [cmd[2] for cmd in subpath if cmd[0] != 'Z']
+            draw.rectangle((min(xs), min(ys), max(xs) - 1, max(ys) - 1), fill=0 if color == '#000000' else 255)
+    return canvas
+
+
+class TestVectorSurface:
+    def test_qr_modules_match_raster(self):
+        qr, native = qr_service._build_qr(f'{BASE_URL}/public/equipment/1')
+        surface = qr_vector.VectorSurface(native * 3 + 10, native * 3 + 10)
+
+        surface.draw_qr(qr, 5, 5, 3)
+
+        raster = Image.new('L', (surface.width, surface.height), 255)
+        raster.paste(qr_service._qr_to_image(qr, native * 3).convert('L'), (5, 5))
+        assert _paint(surface).tobytes() == raster.tobytes()
+
+    def test_dark_runs_are_merged(self):
+        qr, native = qr_service._build_qr(f'{BASE_URL}/public/equipment/1')
+        surface = qr_vector.VectorSurface(native, native)
+
+        surface.draw_qr(qr, 0, 0, 1)
+
+        black = surface._ops[-1]
+        dark_modules = sum(sum(row) for row in qr.get_matrix())
+        assert black[1] == '#000000'
+        assert len(black[3]) < dark_modules
+
+    def test_text_is_drawn_as_outlines(self, app):
+        font = qr_service._load_font(
+            f'{app.static_folder}/fonts/DejaVuSans-Bold.ttf', 40,
+        )
+        surface = qr_vector.VectorSurface(400, 100)
+
+        surface.draw_text((10, 10), 'Lathe', font)
+
+        _kind, color, crisp, subpaths = surface._ops[0]
+        assert color == '#000000' and not crisp
+        xs = [v for sp in subpaths for cmd in sp if cmd[0] != 'Z' for v in cmd[1::2]]
+        # The run spans Pillow's measured advance for the same text.
+        assert min(xs) >= 10
+        assert max(xs) <= 10 + font.getlength('Lathe') + 1
+
+    def test_missing_fonttools_raises_runtime_error(self, app, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'fontTools.ttLib', None)
+        qr_vector._ttfont.cache_clear()
+        font = qr_service._load_font(f'{app.static_folder}/fonts/DejaVuSans-Bold.ttf', 20)
+        try:
+            with pytest.raises(RuntimeError, match='pip install fonttools'):
+                qr_vector.VectorSurface(100, 40).draw_text((0, 0), 'x', font)
+        finally:
+            qr_vector._ttfont.cache_clear()
+
+
+class TestRenderQRVector:
+    def test_svg_has_physical_size_and_no_text_elements(self, app, make_equipment):
+        eq = make_equipment('Table Saw')
+
+        svg = _render(eq, 'svg', preset_key='avery_5160', include_name=True, include_url=True)
+
+        root = ET.fromstring(svg)
+        assert root.get('width') == '2.625in'
+        assert root.get('height') == '1in'
+        layout_w = qr_service._px(2.625, qr_service.VECTOR_LAYOUT_DPI)
+        assert root.get('viewBox') == f'0 0 {layout_w} 600'
+        assert root.findall(f'{SVG_NS}text') == []
+        assert len(root.findall(f'{SVG_NS}path')) >= 2
+
+    def test_pdf_is_well_formed(self, app, make_equipment):
+        eq = make_equipment('Table Saw')
+
+        pdf_bytes = _render(eq, 'pdf', include_name=True, wifi_info='password',
+                            wifi_ssid='Shop', wifi_password='secret')
+
+        pdf = PdfParser.PdfParser(buf=pdf_bytes)
+        (page_ref,) = pdf.pages
+        assert list(pdf.read_indirect(page_ref)[b'MediaBox']) == [0, 0, 144, 144]
+
+    def test_output_is_deterministic(self, app, make_equipment):
+        eq = make_equipment('Table Saw')
+
+        assert _render(eq, 'pdf', include_name=True) == _render(eq, 'pdf', include_name=True)
+
+    def test_template_artwork_embedded_once(self, app, make_equipment, qr_template_config):
+        eq = make_equipment('Table Saw')
+
+        pdf_bytes = _render(eq, 'pdf', include_name=True, include_url=True, template=qr_template_config)
+
+        assert pdf_bytes.count(b'/Subtype /Image') == 1
+        assert b'/Width %d /Height %d' % (qr_template_config.image_w, qr_template_config.image_h) in pdf_bytes
+        svg = _render(eq, 'svg', template=qr_template_config)
+        image = ET.fromstring(svg).find(f'{SVG_NS}image')
+        data = image.get('href').split(',', 1)[1]
+        assert Image.open(io.BytesIO(base64.b64decode(data))).size == (
+            qr_template_config.image_w, qr_template_config.image_h,
+        )
+
+    def test_unknown_format_rejected(self, app, make_equipment):
+        with pytest.raises(ValueError, match='Unknown vector format'):
+            _render(make_equipment('Table Saw'), 'eps')
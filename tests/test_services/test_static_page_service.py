@@ -1,5 +1,6 @@
 """Tests for the static page service."""
 
+import gzip
 import json
 import os
 import re
@@ -587,6 +588,35 @@ class TestGenerate:
         assert pos_b < pos_c < pos_a
 
 
+class TestTemplateCache:
+    """generate() compiles its template once per app."""
+
+    def test_template_loaded_once(self, app, make_area, make_equipment):
+        make_equipment(name='SawStop', area=make_area(name='Woodshop'))
+        app.jinja_env.auto_reload = False
+
+        with patch.object(app.jinja_env, 'get_template', wraps=app.jinja_env.get_template) as get_template:
+            first = static_page_service.generate()
+            second = static_page_service.generate()
+
+        # Includes and the base template are loaded through get_template too.
+        names = [c.args[0] for c in get_template.call_args_list]
+        assert names.count('public/static_page.html') == 1
+        assert 'SawStop' in first and 'SawStop' in second
+
+    def test_does_not_query_through_orm_instances(self, app, make_area, make_equipment, make_repair_record):
+        from esb.extensions import db as _db
+
+        make_repair_record(equipment=make_equipment(name='SawStop', area=make_area(name='Woodshop')),
+                           severity='Down', description='Blade guard cracked')
+        _db.session.expunge_all()
+
+        html = static_page_service.generate()
+
+        assert 'Blade guard cracked' in html
+        assert len(_db.session.identity_map) == 0
+
+
 class TestPushLocal:
     """Tests for push() with method='local'."""
 
@@ -611,6 +641,42 @@ class TestPushLocal:
 
         assert os.path.exists(os.path.join(target, 'index.html'))
 
+    def test_writes_precompressed_sidecars(self, app, tmp_path):
+        """push() with method='local' writes .gz and .br copies for nginx *_static."""
+        import brotli
+
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+
+        static_page_service.push('<html>test</html>')
+
+        assert gzip.decompress((tmp_path / 'index.html.gz').read_bytes()) == b'<html>test</html>'
+        assert brotli.decompress((tmp_path / 'index.html.br').read_bytes()) == b'<html>test</html>'
+        assert not list(tmp_path.glob('*.tmp'))
+
+    def test_encoding_none_removes_stale_sidecars(self, app, tmp_path):
+        """With compression disabled, old sidecars are removed so nginx cannot serve them."""
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+        static_page_service.push('<html>old</html>')
+
+        app.config['STATIC_PAGE_CONTENT_ENCODING'] = 'none'
+        static_page_service.push('<html>new</html>')
+
+        assert (tmp_path / 'index.html').read_text() == '<html>new</html>'
+        assert not (tmp_path / 'index.html.gz').exists()
+        assert not (tmp_path / 'index.html.br').exists()
+
+    def test_skips_br_sidecar_without_brotli(self, app, tmp_path):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+
+        with patch.dict('sys.modules', {'brotli': None}):
+            static_page_service.push('<html>test</html>')
+
+        assert (tmp_path / 'index.html.gz').exists()
+        assert not (tmp_path / 'index.html.br').exists()
+
     def test_os_error_raises_runtime_error(self, app):
         """push() with method='local' raises RuntimeError when OS write fails."""
         app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
@@ -640,11 +706,44 @@ class TestPushS3:
             mock_s3.put_object.assert_called_once_with(
                 Bucket='my-bucket',
                 Key='status/index.html',
-                Body=b'<html>test</html>',
+                Body=gzip.compress(b'<html>test</html>', compresslevel=9, mtime=0),
                 ContentType='text/html; charset=utf-8',
                 CacheControl='no-cache, no-store, must-revalidate',
+                ContentEncoding='gzip',
             )
 
+    def test_uploads_plain_html_when_encoding_none(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket/index.html'
+        app.config['STATIC_PAGE_CONTENT_ENCODING'] = 'none'
+
+        import boto3
+        mock_s3 = MagicMock()
+
+        with patch.object(boto3, 'client', return_value=mock_s3):
+            static_page_service.push('<html>test</html>')
+
+        call_kwargs = mock_s3.put_object.call_args[1]
+        assert call_kwargs['Body'] == b'<html>test</html>'
+        assert 'ContentEncoding' not in call_kwargs
+
+    def test_uploads_brotli_when_configured(self, app):
+        import brotli
+
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket/index.html'
+        app.config['STATIC_PAGE_CONTENT_ENCODING'] = 'br'
+
+        import boto3
+        mock_s3 = MagicMock()
+
+        with patch.object(boto3, 'client', return_value=mock_s3):
+            static_page_service.push('<html>test</html>')
+
+        call_kwargs = mock_s3.put_object.call_args[1]
+        assert call_kwargs['ContentEncoding'] == 'br'
+        assert brotli.decompress(call_kwargs['Body']) == b'<html>test</html>'
+
     def test_handles_client_error(self, app):
         """push() with method='s3' handles ClientError by raising RuntimeError."""
         app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
@@ -888,8 +987,10 @@ class TestPushGCS:
             mock_client.bucket.assert_called_once_with('my-bucket')
             mock_bucket.blob.assert_called_once_with('status/index.html')
             assert mock_blob.cache_control == 'no-cache, no-store, must-revalidate'
+            assert mock_blob.content_encoding == 'gzip'
             mock_blob.upload_from_string.assert_called_once_with(
-                '<html>test</html>', content_type='text/html; charset=utf-8'
+                gzip.compress(b'<html>test</html>', compresslevel=9, mtime=0),
+                content_type='text/html; charset=utf-8',
             )
 
     def test_handles_google_api_error(self, app):
@@ -978,6 +1079,156 @@ class TestPushGCS:
                 static_page_service.push('<html>test</html>')
 
 
+class TestStorageClients:
+    """Cloud clients are created once per process and reused across pushes."""
+
+    @pytest.fixture
+    def aws(self, monkeypatch):
+        from moto import mock_aws
+
+        monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+        monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+        monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+        with mock_aws():
+            import boto3
+            boto3.client('s3').create_bucket(Bucket='status-bucket')
+            yield boto3
+
+    def test_s3_client_created_once_across_pushes(self, app, aws):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'status-bucket/index.html'
+
+        with patch.object(aws, 'client', wraps=aws.client) as client:
+            static_page_service.push('<html>one</html>')
+            static_page_service.push('<html>two</html>')
+
+        client.assert_called_once_with('s3')
+        obj = aws.client('s3').get_object(Bucket='status-bucket', Key='index.html')
+        assert obj['ContentEncoding'] == 'gzip'
+        assert gzip.decompress(obj['Body'].read()) == b'<html>two</html>'
+
+    def test_site_push_reuses_s3_client(self, app, aws):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'status-bucket/site'
+        files = [static_page_service.SiteFile('index.html', b'<html/>', 'text/html', 'd1')]
+
+        with patch.object(aws, 'client', wraps=aws.client) as client:
+            static_page_service.push_site(files)
+            files = [static_page_service.SiteFile('index.html', b'<html>2</html>', 'text/html', 'd2')]
+            static_page_service.push_site(files)
+
+        client.assert_called_once_with('s3')
+        keys = {o['Key'] for o in aws.client('s3').list_objects_v2(Bucket='status-bucket')['Contents']}
+        assert keys == {'site/index.html', 'site/esb-manifest.json'}
+
+    def test_cloudfront_client_cached_separately(self, app, aws):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'status-bucket/index.html'
+        app.config['CLOUDFRONT_DISTRIBUTION_ID'] = 'E123'
+        mock_cf = MagicMock()
+        mock_cf.create_invalidation.return_value = {'Invalidation': {'Id': 'I1'}}
+        app.extensions['esb_storage_clients'] = {'cloudfront': mock_cf}
+
+        static_page_service.push('<html/>')
+        static_page_service.push('<html/>')
+
+        assert mock_cf.create_invalidation.call_count == 2
+        assert set(app.extensions['esb_storage_clients']) == {'s3', 'cloudfront'}
+
+    def test_gcs_client_created_once_across_pushes(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'gcs'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket/index.html'
+
+        from google.cloud import storage
+
+        with patch.object(storage, 'Client', return_value=MagicMock()) as mock_cls:
+            static_page_service.push('<html>one</html>')
+            static_page_service.push('<html>two</html>')
+
+        mock_cls.assert_called_once_with()
+
+
+class TestMultipleDestinations:
+    """Tests for comma-separated STATIC_PAGE_PUSH_METHOD / STATIC_PAGE_PUSH_TARGET."""
+
+    def _configure(self, app, *pairs):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = ','.join(method for method, _ in pairs)
+        app.config['STATIC_PAGE_PUSH_TARGET'] = ','.join(target for _, target in pairs)
+
+    def test_pushes_every_destination(self, app, tmp_path, capture):
+        self._configure(app, ('local', str(tmp_path / 'a')), ('s3', 'my-bucket/index.html'))
+        mock_s3 = MagicMock()
+        app.extensions['esb_storage_clients'] = {'s3': mock_s3}
+
+        static_page_service.push('<html>test</html>')
+
+        assert (tmp_path / 'a' / 'index.html').read_text() == '<html>test</html>'
+        mock_s3.put_object.assert_called_once()
+        methods = sorted(json.loads(r.message)['data']['method'] for r in capture.records)
+        assert methods == ['local', 's3']
+
+    def test_one_failure_does_not_stop_the_others(self, app, tmp_path, capture):
+        self._configure(app, ('local', str(tmp_path / 'ok')), ('s3', 'my-bucket/index.html'))
+        mock_s3 = MagicMock()
+        mock_s3.put_object.side_effect = OSError('connection reset')
+        app.extensions['esb_storage_clients'] = {'s3': mock_s3}
+
+        with pytest.raises(RuntimeError, match=r'failed for 1 of 2 destinations: s3 my-bucket/index.html'):
+            static_page_service.push('<html>test</html>')
+
+        assert (tmp_path / 'ok' / 'index.html').exists()
+        events = {json.loads(r.message)['event']: json.loads(r.message)['data'] for r in capture.records}
+        assert events['static_page.pushed']['method'] == 'local'
+        assert events['static_page.push_failed']['method'] == 's3'
+        assert 'connection reset' in events['static_page.push_failed']['error']
+
+    def test_records_outcome_per_destination(self, app, tmp_path):
+        from esb.services import worker_metrics
+
+        self._configure(app, ('local', str(tmp_path)), ('local', '/proc/esb-not-writable'))
+
+        with pytest.raises(RuntimeError):
+            static_page_service.push('<html>test</html>')
+
+        entries = {e['target']: e for e in worker_metrics.get_worker_metrics().snapshot()['static_pushes']}
+        assert entries[str(tmp_path)]['ok'] == 1
+        assert entries[str(tmp_path)]['last_success'] is not None
+        assert entries['/proc/esb-not-writable']['failed'] == 1
+
+    def test_compresses_once_for_several_remote_destinations(self, app):
+        self._configure(app, ('s3', 'a/index.html'), ('gcs', 'b/index.html'))
+        app.extensions['esb_storage_clients'] = {'s3': MagicMock(), 'gcs': MagicMock()}
+
+        with patch.object(static_page_service, 'compress', wraps=static_page_service.compress) as mock_compress:
+            static_page_service.push('<html>test</html>')
+
+        mock_compress.assert_called_once()
+
+    def test_site_mode_keeps_a_manifest_per_destination(self, app, tmp_path):
+        self._configure(app, ('local', str(tmp_path / 'a')), ('local', str(tmp_path / 'b')))
+        files = [static_page_service.SiteFile('index.html', b'<html/>', 'text/html', 'd1')]
+
+        static_page_service.push_site(files)
+
+        for name in ('a', 'b'):
+            manifest = json.loads((tmp_path / name / 'esb-manifest.json').read_text())
+            assert manifest['files'] == {'index.html': 'd1'}
+
+    def test_mismatched_target_count_raises(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local,s3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = '/tmp/status'
+
+        with pytest.raises(RuntimeError, match='one target per STATIC_PAGE_PUSH_METHOD'):
+            static_page_service.push('<html>test</html>')
+
+    def test_unknown_method_in_list_raises(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local, ftp'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = '/tmp/a,/tmp/b'
+
+        with pytest.raises(RuntimeError, match="Unknown STATIC_PAGE_PUSH_METHOD: 'ftp'"):
+            static_page_service.push('<html>test</html>')
+
+
 class TestPushErrors:
     """Tests for push() error handling."""
 
@@ -989,6 +1240,23 @@ class TestPushErrors:
         with pytest.raises(RuntimeError, match='STATIC_PAGE_PUSH_TARGET is not configured'):
             static_page_service.push('<html>test</html>')
 
+    def test_unknown_encoding_raises_runtime_error(self, app, tmp_path):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+        app.config['STATIC_PAGE_CONTENT_ENCODING'] = 'zstd'
+
+        with pytest.raises(RuntimeError, match='Unknown STATIC_PAGE_CONTENT_ENCODING'):
+            static_page_service.push('<html>test</html>')
+
+    def test_br_without_brotli_raises_runtime_error(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket/index.html'
+        app.config['STATIC_PAGE_CONTENT_ENCODING'] = 'br'
+
+        with patch.dict('sys.modules', {'brotli': None}):
+            with pytest.raises(RuntimeError, match='brotli is required'):
+                static_page_service.push('<html>test</html>')
+
     def test_unknown_method_raises_runtime_error(self, app):
         """push() with unknown method raises RuntimeError."""
         app.config['STATIC_PAGE_PUSH_METHOD'] = 'ftp'
@@ -1032,6 +1300,11 @@ class TestPushMutationLogging:
         log_data = json.loads(capture.records[0].message)
         assert log_data['event'] == 'static_page.pushed'
         assert log_data['data']['method'] == 'gcs'
+        assert log_data['data']['encoding'] == 'gzip'
+        assert log_data['data']['bytes'] == len(b'<html>test</html>')
+        assert log_data['data']['uploaded_bytes'] == len(
+            gzip.compress(b'<html>test</html>', compresslevel=9, mtime=0)
+        )
 
 
 class TestGenerateAndPush:
@@ -1045,3 +1318,240 @@ class TestGenerateAndPush:
 
             mock_gen.assert_called_once()
             mock_push.assert_called_once_with('<html>mock</html>')
+
+    def test_returns_true_when_rendered(self, app):
+        with patch.object(static_page_service, 'generate', return_value='<html/>'), \
+             patch.object(static_page_service, 'push'):
+            assert static_page_service.generate_and_push() is True
+
+    def test_runs_under_static_page_lock(self, app):
+        """generate_and_push() is serialized by the static_page single-flight lock."""
+        with patch('esb.services.lock_service.run_single_flight', return_value=False) as mock_run, \
+             patch.object(static_page_service, 'generate') as mock_gen:
+            assert static_page_service.generate_and_push() is False
+
+        assert mock_run.call_args.args[0] == 'static_page'
+        assert mock_run.call_args.kwargs['lease_seconds'] == static_page_service.STATIC_PAGE_LOCK_LEASE
+        mock_gen.assert_not_called()
+
+
+class TestGenerateSite:
+    """Tests for generate_site()."""
+
+    def test_produces_index_area_pages_and_feed(self, app, make_area, make_equipment, make_repair_record):
+        wood = make_area(name='Wood Shop', slack_channel='#wood')
+        metal = make_area(name='Metal Shop', slack_channel='#metal', sort_order=1)
+        saw = make_equipment(name='SawStop', area=wood)
+        make_equipment(name='Lathe', area=metal)
+        make_repair_record(equipment=saw, severity='Down', description='Blade brake fired')
+
+        files = {f.key: f for f in static_page_service.generate_site()}
+
+        assert list(files) == ['index.html', 'areas/wood-shop.html', 'areas/metal-shop.html', 'status.json']
+        index = files['index.html'].body.decode()
+        assert 'href="areas/wood-shop.html"' in index
+        assert 'SawStop' not in index
+        wood_page = files['areas/wood-shop.html'].body.decode()
+        assert 'SawStop' in wood_page and 'Blade brake fired' in wood_page
+        assert 'Lathe' not in wood_page
+        feed = json.loads(files['status.json'].body)
+        assert feed['areas'][0]['name'] == 'Wood Shop'
+        assert feed['areas'][0]['page'] == 'areas/wood-shop.html'
+        saw_entry = feed['areas'][0]['equipment'][0]
+        assert saw_entry['color'] == 'red'
+        assert saw_entry['open_repairs'][0]['description'] == 'Blade brake fired'
+        assert files['status.json'].content_type == 'application/json'
+
+    def test_digest_ignores_timestamp(self, app, make_area, make_equipment):
+        make_equipment(name='SawStop', area=make_area(name='Wood Shop'))
+
+        with patch.object(static_page_service, '_compute_generated_at',
+                          return_value=('2026-01-01 10:00:00 EST', 2026)):
+            first = static_page_service.generate_site()
+        with patch.object(static_page_service, '_compute_generated_at',
+                          return_value=('2026-01-01 11:00:00 EST', 2026)):
+            second = static_page_service.generate_site()
+
+        assert [f.digest for f in first] == [f.digest for f in second]
+        assert b'2026-01-01 11:00:00 EST' in second[1].body
+
+    def test_duplicate_slugs_get_area_id_suffix(self, app, make_area):
+        make_area(name='Shop!', slack_channel='#a')
+        second = make_area(name='Shop?', slack_channel='#b', sort_order=1)
+
+        keys = [f.key for f in static_page_service.generate_site()]
+
+        assert 'areas/shop.html' in keys
+        assert f'areas/shop-{second.id}.html' in keys
+
+
+class TestPushSite:
+    """Tests for push_site() incremental uploads."""
+
+    @staticmethod
+    def _site(*pairs):
+        return [
+            static_page_service.SiteFile(key, body.encode(), 'text/html; charset=utf-8', f'd-{body}')
+            for key, body in pairs
+        ]
+
+    def test_local_uploads_only_changed_files(self, app, tmp_path, capture):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+
+        static_page_service.push_site(self._site(
+            ('index.html', 'i1'), ('areas/a.html', 'a1'), ('areas/b.html', 'b1')))
+        (tmp_path / 'areas' / 'b.html').write_text('untouched marker')
+        static_page_service.push_site(self._site(
+            ('index.html', 'i1'), ('areas/a.html', 'a2'), ('areas/b.html', 'b1')))
+
+        assert (tmp_path / 'areas' / 'a.html').read_text() == 'a2'
+        assert (tmp_path / 'areas' / 'b.html').read_text() == 'untouched marker'
+        assert (tmp_path / 'areas' / 'a.html.gz').exists()
+        manifest = json.loads((tmp_path / static_page_service.SITE_MANIFEST_KEY).read_text())
+        assert manifest['files']['areas/a.html'] == 'd-a2'
+        log_data = json.loads(capture.records[-1].message)['data']
+        assert log_data['mode'] == 'site'
+        assert log_data['uploaded'] == ['areas/a.html']
+        assert log_data['unchanged'] == 2
+
+    def test_local_deletes_files_no_longer_generated(self, app, tmp_path):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+
+        static_page_service.push_site(self._site(('index.html', 'i1'), ('areas/gone.html', 'g')))
+        static_page_service.push_site(self._site(('index.html', 'i2')))
+
+        assert not (tmp_path / 'areas' / 'gone.html').exists()
+        assert not (tmp_path / 'areas' / 'gone.html.gz').exists()
+
+    def test_unreadable_manifest_uploads_everything(self, app, tmp_path, capture):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+        (tmp_path / static_page_service.SITE_MANIFEST_KEY).write_text('not json')
+
+        static_page_service.push_site(self._site(('index.html', 'i1')))
+
+        assert json.loads(capture.records[-1].message)['data']['uploaded'] == ['index.html']
+
+    def test_s3_invalidates_only_changed_keys(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket/status'
+        app.config['CLOUDFRONT_DISTRIBUTION_ID'] = 'EDFDVBD6EXAMPLE'
+
+        import boto3
+        mock_s3 = MagicMock()
+        manifest = {'files': {'index.html': 'd-i1', 'areas/a.html': 'd-a1', 'areas/old.html': 'd-o'}}
+        mock_s3.get_object.return_value = {'Body': MagicMock(read=lambda: json.dumps(manifest).encode())}
+        mock_cf = MagicMock()
+        mock_cf.create_invalidation.return_value = {'Invalidation': {'Id': 'I1'}}
+
+        with patch.object(boto3, 'client', side_effect=lambda name: {'s3': mock_s3, 'cloudfront': mock_cf}[name]):
+            static_page_service.push_site(self._site(('index.html', 'i1'), ('areas/a.html', 'a2')))
+
+        put_keys = [c.kwargs['Key'] for c in mock_s3.put_object.call_args_list]
+        assert put_keys == ['status/areas/a.html', 'status/esb-manifest.json']
+        assert mock_s3.put_object.call_args_list[0].kwargs['ContentEncoding'] == 'gzip'
+        assert 'ContentEncoding' not in mock_s3.put_object.call_args_list[1].kwargs
+        mock_s3.delete_object.assert_called_once_with(Bucket='my-bucket', Key='status/areas/old.html')
+        paths = mock_cf.create_invalidation.call_args.kwargs['InvalidationBatch']['Paths']
+        assert paths == {'Quantity': 2, 'Items': ['/status/areas/a.html', '/status/areas/old.html']}
+
+    def test_s3_missing_manifest_uploads_everything(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket'
+        app.config['CLOUDFRONT_DISTRIBUTION_ID'] = 'EDFDVBD6EXAMPLE'
+
+        import boto3
+        from botocore.exceptions import ClientError
+
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = ClientError(
+            {'Error': {'Code': 'NoSuchKey', 'Message': 'missing'}}, 'GetObject')
+        mock_cf = MagicMock()
+        mock_cf.create_invalidation.return_value = {'Invalidation': {'Id': 'I1'}}
+
+        with patch.object(boto3, 'client', side_effect=lambda name: {'s3': mock_s3, 'cloudfront': mock_cf}[name]):
+            static_page_service.push_site(self._site(('index.html', 'i1'), ('status.json', 's')))
+
+        assert [c.kwargs['Key'] for c in mock_s3.put_object.call_args_list] == [
+            'index.html', 'status.json', 'esb-manifest.json',
+        ]
+        items = mock_cf.create_invalidation.call_args.kwargs['InvalidationBatch']['Paths']['Items']
+        assert items == ['/index.html', '/status.json', '/']
+
+    def test_s3_manifest_access_denied_raises(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 's3'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket'
+
+        import boto3
+        from botocore.exceptions import ClientError
+
+        mock_s3 = MagicMock()
+        mock_s3.get_object.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDenied', 'Message': 'denied'}}, 'GetObject')
+
+        with patch.object(boto3, 'client', return_value=mock_s3):
+            with pytest.raises(RuntimeError, match='S3 manifest read failed'):
+                static_page_service.push_site(self._site(('index.html', 'i1')))
+
+    def test_gcs_uploads_changed_files(self, app):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'gcs'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = 'my-bucket/site/'
+
+        from google.api_core.exceptions import NotFound
+        from google.cloud import storage
+
+        mock_bucket = MagicMock()
+        blobs = {}
+
+        def blob(name):
+            b = blobs.setdefault(name, MagicMock(name=name))
+            if name.endswith('esb-manifest.json'):
+                b.download_as_bytes.side_effect = NotFound('missing')
+            return b
+
+        mock_bucket.blob.side_effect = blob
+        mock_client = MagicMock()
+        mock_client.bucket.return_value = mock_bucket
+
+        with patch.object(storage, 'Client', return_value=mock_client):
+            static_page_service.push_site(self._site(('index.html', 'i1')))
+
+        mock_client.bucket.assert_called_once_with('my-bucket')
+        blobs['site/index.html'].upload_from_string.assert_called_once()
+        assert blobs['site/index.html'].content_encoding == 'gzip'
+        blobs['site/esb-manifest.json'].upload_from_string.assert_called_once()
+
+    def test_generate_and_push_site_mode(self, app, tmp_path, make_area, make_equipment):
+        app.config['STATIC_PAGE_MODE'] = 'site'
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+        make_equipment(name='SawStop', area=make_area(name='Wood Shop'))
+
+        static_page_service.generate_and_push()
+
+        assert (tmp_path / 'index.html').exists()
+        assert 'SawStop' in (tmp_path / 'areas' / 'wood-shop.html').read_text()
+        assert json.loads((tmp_path / 'status.json').read_text())['areas'][0]['name'] == 'Wood Shop'
+
+    def test_equipment_change_uploads_one_area_page_and_feed(
+        self, app, tmp_path, capture, make_area, make_equipment, make_repair_record,
+    ):
+        app.config['STATIC_PAGE_PUSH_METHOD'] = 'local'
+        app.config['STATIC_PAGE_PUSH_TARGET'] = str(tmp_path)
+        saw = make_equipment(name='SawStop', area=make_area(name='Wood Shop'))
+        make_equipment(name='Lathe', area=make_area(name='Metal Shop', slack_channel='#metal'))
+        static_page_service.push_site(static_page_service.generate_site())
+
+        make_repair_record(equipment=saw, severity='Down')
+        static_page_service.push_site(static_page_service.generate_site())
+
+        log_data = json.loads(capture.records[-1].message)['data']
+        assert log_data['uploaded'] == ['areas/wood-shop.html', 'status.json']
+
+    def test_unknown_mode_raises(self, app):
+        app.config['STATIC_PAGE_MODE'] = 'multi'
+
+        with pytest.raises(RuntimeError, match='Unknown STATIC_PAGE_MODE'):
+            static_page_service.generate_and_push()
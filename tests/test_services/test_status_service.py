@@ -751,3 +751,82 @@ class TestDashboardEagerLoad:
         )
         assert result['assignee_name'] == 'solo'
         assert n_user_selects == 0
+
+
+class TestGetStatusSnapshot:
+    """Tests for get_status_snapshot()."""
+
+    def test_matches_area_status_dashboard(self, app, make_area, make_equipment, make_repair_record):
+        from tests.conftest import _create_user
+
+        tech = _create_user('technician', username='erin')
+        shop = make_area(name='Shop', sort_order=2)
+        lab = make_area(name='Lab', slack_channel='#lab', sort_order=1)
+        lathe = make_equipment(name='Lathe', area=shop)
+        make_equipment(name='Mill', area=shop)
+        make_equipment(name='Scope', area=lab)
+        make_repair_record(equipment=lathe, status='New', severity='Degraded', description='Noisy')
+        make_repair_record(
+            equipment=lathe, status='Assigned', severity='Down', description='Broken', assignee_id=tech.id,
+        )
+
+        snapshot = status_service.get_status_snapshot()
+        dashboard = status_service.get_area_status_dashboard()
+
+        assert [a.name for a in snapshot] == [d['area'].name for d in dashboard] == ['Lab', 'Shop']
+        for area, expected in zip(snapshot, dashboard):
+            assert area.id == expected['area'].id
+            for item, expected_item in zip(area.equipment, expected['equipment'], strict=True):
+                assert item.name == expected_item['equipment'].name
+                assert (item.color, item.label, item.severity, item.eta) == (
+                    expected_item['status']['color'], expected_item['status']['label'],
+                    expected_item['status']['severity'], expected_item['status']['eta'],
+                )
+                assert [r.description for r in item.open_records] == [
+                    r.description for r in expected_item['open_records']
+                ]
+        lathe_item = snapshot[1].equipment[0]
+        assert [r.severity for r in lathe_item.open_records] == ['Down', 'Degraded']
+        assert lathe_item.open_records[0].assignee_name == 'erin'
+
+    def test_loads_no_orm_instances(self, app, make_area, make_equipment, make_repair_record):
+        from esb.extensions import db as _db
+
+        area = make_area(name='Shop')
+        make_repair_record(equipment=make_equipment(name='Lathe', area=area), severity='Down')
+        _db.session.expunge_all()
+
+        snapshot = status_service.get_status_snapshot()
+
+        assert len(_db.session.identity_map) == 0
+        assert snapshot[0].equipment[0].color == 'red'
+
+    def test_values_are_immutable(self, app, make_area, make_equipment):
+        import dataclasses
+
+        make_equipment(name='Lathe', area=make_area(name='Shop'))
+
+        snapshot = status_service.get_status_snapshot()
+
+        assert isinstance(snapshot, tuple)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot[0].equipment[0].color = 'red'
+
+    def test_excludes_archived_areas_equipment_and_closed_records(
+        self, app, make_area, make_equipment, make_repair_record,
+    ):
+        from esb.extensions import db as _db
+
+        make_area(name='Old', slack_channel='#old').is_archived = True
+        _db.session.commit()
+        area = make_area(name='Shop')
+        make_equipment(name='Retired', area=area, is_archived=True)
+        lathe = make_equipment(name='Lathe', area=area)
+        make_repair_record(equipment=lathe, status='Resolved', severity='Down')
+
+        snapshot = status_service.get_status_snapshot()
+
+        assert [a.name for a in snapshot] == ['Shop']
+        assert [e.name for e in snapshot[0].equipment] == ['Lathe']
+        assert snapshot[0].equipment[0].color == 'green'
+        assert snapshot[0].equipment[0].open_records == ()
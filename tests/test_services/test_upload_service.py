@@ -1,5 +1,6 @@
 """Tests for upload service."""
 
+import hashlib
 import io
 import json
 import os
@@ -272,6 +273,120 @@ class TestDeleteUpload:
         assert _db.session.get(Document, doc_id) is None
 
 
+class TestContentAddressedStorage:
+    """Tests for hashing, deduplication and blob reference counting."""
+
+    def _save(self, content=b'manual content', parent_id=1, filename='manual.pdf'):
+        from werkzeug.datastructures import FileStorage
+        return upload_service.save_upload(
+            file=FileStorage(stream=io.BytesIO(content), filename=filename),
+            parent_type='equipment_doc',
+            parent_id=parent_id,
+            uploaded_by='staffuser',
+        )
+
+    def _path(self, tmp_path, doc):
+        return tmp_path / 'equipment' / str(doc.parent_id) / 'docs' / doc.stored_filename
+
+    def _blobs(self, tmp_path):
+        return sorted(p for p in (tmp_path / 'blobs').rglob('*') if p.is_file())
+
+    def test_sha256_recorded_and_file_linked_to_blob(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+
+        doc = self._save()
+
+        digest = hashlib.sha256(b'manual content').hexdigest()
+        assert doc.sha256 == digest
+        blob = tmp_path / 'blobs' / digest[:2] / digest
+        assert self._blobs(tmp_path) == [blob]
+        assert os.path.samefile(self._path(tmp_path, doc), blob)
+
+    def test_identical_content_stored_once(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+
+        docs = [self._save(parent_id=parent_id) for parent_id in (1, 2, 3)]
+
+        assert len({doc.stored_filename for doc in docs}) == 3
+        (blob,) = self._blobs(tmp_path)
+        assert blob.stat().st_nlink == 4
+        assert all(self._path(tmp_path, doc).read_bytes() == b'manual content' for doc in docs)
+
+    def test_blob_deleted_with_last_document(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        first, second = self._save(parent_id=1), self._save(parent_id=2)
+
+        upload_service.delete_upload(first.id, 'staffuser')
+        assert len(self._blobs(tmp_path)) == 1
+        assert self._path(tmp_path, second).read_bytes() == b'manual content'
+
+        upload_service.delete_upload(second.id, 'staffuser')
+        assert self._blobs(tmp_path) == []
+
+    def test_oversized_stream_leaves_no_files(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        app.config['UPLOAD_MAX_SIZE_MB'] = 1
+
+        with pytest.raises(ValidationError, match='exceeds maximum size'):
+            self._save(content=b'x' * (3 * 1024 * 1024))
+
+        assert [p for p in tmp_path.rglob('*') if p.is_file()] == []
+        assert _db.session.execute(_db.select(Document)).first() is None
+
+    def test_request_upload_spooled_in_upload_path(self, app, tmp_path):
+        from flask import request
+
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        data = {'file': (io.BytesIO(b'%PDF from the browser'), 'manual.pdf')}
+        with app.test_request_context('/', method='POST', data=data):
+            upload = request.files['file']
+            assert isinstance(upload.stream, upload_service.HashingFile)
+            assert os.path.dirname(upload.stream.name) == str(tmp_path / 'blobs' / '.incoming')
+
+            doc = upload_service.save_upload(upload, 'equipment_doc', 1, 'staffuser')
+
+        assert doc.sha256 == hashlib.sha256(b'%PDF from the browser').hexdigest()
+        assert self._path(tmp_path, doc).read_bytes() == b'%PDF from the browser'
+        # The spool was linked into place, not copied, and is gone with the request.
+        assert self._path(tmp_path, doc).stat().st_nlink == 2
+        assert list((tmp_path / 'blobs' / '.incoming').iterdir()) == []
+
+    def test_copies_when_hard_links_unsupported(self, app, tmp_path, monkeypatch, caplog):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+
+        def no_links(src, dst):
+            raise PermissionError(1, 'Operation not permitted')
+
+        monkeypatch.setattr(upload_service.os, 'link', no_links)
+
+        doc = self._save()
+
+        assert self._path(tmp_path, doc).read_bytes() == b'manual content'
+        assert 'storing a copy' in caplog.text
+
+
+class TestSweepIncoming:
+    """Tests for sweep_incoming()."""
+
+    def test_removes_only_stale_spool_files(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        incoming = tmp_path / 'blobs' / '.incoming'
+        incoming.mkdir(parents=True)
+        stale = incoming / 'tmpstale'
+        stale.write_bytes(b'partial upload')
+        os.utime(stale, (1000, 1000))
+        (incoming / 'tmpactive').write_bytes(b'upload in progress')
+
+        assert upload_service.sweep_incoming() == 1
+
+        assert sorted(p.name for p in incoming.iterdir()) == ['tmpactive']
+
+    def test_missing_directory_is_a_no_op(self, app, tmp_path):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+
+        assert upload_service.sweep_incoming() == 0
+
+
 class TestGetDocuments:
     """Tests for get_documents function."""
 
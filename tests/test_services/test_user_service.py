@@ -560,3 +560,95 @@ class TestSlackDelivery:
         )
         assert slack_delivered is False
         assert user is not None  # User still created
+
+
+class TestSlackUserIdCache:
+    """Tests for the cached Slack member ID helpers."""
+
+    def test_resolve_looks_up_and_caches(self, app, tech_user):
+        """A cache miss calls users.lookupByEmail and stores the ID with a timestamp."""
+        from esb.services.user_service import resolve_slack_user_id
+
+        mock_client = MagicMock()
+        mock_client.users_lookupByEmail.return_value = {'user': {'id': 'U777'}}
+
+        assert resolve_slack_user_id(mock_client, tech_user) == 'U777'
+        mock_client.users_lookupByEmail.assert_called_once_with(email=tech_user.email)
+        _db.session.expire_all()
+        refetched = _db.session.get(User, tech_user.id)
+        assert refetched.slack_user_id == 'U777'
+        assert refetched.slack_user_id_resolved_at is not None
+
+    def test_resolve_uses_fresh_cache(self, app, tech_user):
+        """A fresh cached ID is returned without any Slack API call."""
+        from datetime import UTC, datetime
+
+        from esb.services.user_service import resolve_slack_user_id
+
+        tech_user.slack_user_id = 'U555'
+        tech_user.slack_user_id_resolved_at = datetime.now(UTC)
+        _db.session.commit()
+        mock_client = MagicMock()
+
+        assert resolve_slack_user_id(mock_client, tech_user) == 'U555'
+        mock_client.users_lookupByEmail.assert_not_called()
+
+    def test_resolve_refreshes_expired_cache(self, app, tech_user):
+        """An ID older than SLACK_USER_ID_TTL is re-resolved."""
+        from datetime import UTC, datetime, timedelta
+
+        from esb.services.user_service import SLACK_USER_ID_TTL, resolve_slack_user_id
+
+        tech_user.slack_user_id = 'UOLD'
+        tech_user.slack_user_id_resolved_at = (
+            datetime.now(UTC) - SLACK_USER_ID_TTL - timedelta(minutes=1)
+        )
+        _db.session.commit()
+        mock_client = MagicMock()
+        mock_client.users_lookupByEmail.return_value = {'user': {'id': 'UNEW'}}
+
+        assert resolve_slack_user_id(mock_client, tech_user) == 'UNEW'
+        assert tech_user.slack_user_id == 'UNEW'
+
+    def test_users_not_found_clears_cache(self, app, tech_user):
+        """users_not_found from Slack drops the stale cached ID and re-raises."""
+        from datetime import UTC, datetime, timedelta
+
+        from slack_sdk.errors import SlackApiError
+
+        from esb.services.user_service import SLACK_USER_ID_TTL, resolve_slack_user_id
+
+        tech_user.slack_user_id = 'UGONE'
+        tech_user.slack_user_id_resolved_at = datetime.now(UTC) - SLACK_USER_ID_TTL - timedelta(days=1)
+        _db.session.commit()
+        mock_client = MagicMock()
+        mock_response = MagicMock()
+        mock_response.data = {'ok': False, 'error': 'users_not_found'}
+        mock_client.users_lookupByEmail.side_effect = SlackApiError(
+            message='users_not_found', response=mock_response,
+        )
+
+        with pytest.raises(SlackApiError):
+            resolve_slack_user_id(mock_client, tech_user)
+        assert tech_user.slack_user_id is None
+        assert tech_user.slack_user_id_resolved_at is None
+
+    def test_cache_moves_id_between_users(self, app, tech_user, staff_user):
+        """Caching an ID on one user clears it from any other user holding it."""
+        from esb.services.user_service import cache_slack_user_id
+
+        cache_slack_user_id(staff_user, 'U123')
+        cache_slack_user_id(tech_user, 'U123')
+
+        assert tech_user.slack_user_id == 'U123'
+        assert staff_user.slack_user_id is None
+
+    def test_update_slack_handle_invalidates_cache(self, app, tech_user):
+        """Changing the Slack handle clears the cached member ID."""
+        from esb.services.user_service import cache_slack_user_id, update_slack_handle
+
+        cache_slack_user_id(tech_user, 'U123')
+        user = update_slack_handle(tech_user.id, '@different', 'staffuser')
+
+        assert user.slack_user_id is None
+        assert user.slack_user_id_resolved_at is None
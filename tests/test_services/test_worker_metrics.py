@@ -0,0 +1,137 @@
+"""Tests for the worker delivery metrics accumulator."""
+
+import json
+from datetime import UTC, datetime
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.exc import OperationalError
+
+from esb.extensions import db as _db
+from esb.models.app_config import AppConfig
+from esb.services import worker_metrics
+from esb.services.worker_metrics import (
+    WORKER_METRICS_KEY,
+    WorkerMetrics,
+    get_worker_metrics,
+    publish_worker_metrics,
+    slack_error_code,
+)
+
+
+def _slack_error(code):
+    from slack_sdk.errors import SlackApiError
+
+    response = MagicMock()
+    response.data = {'ok': False, 'error': code}
+    return SlackApiError(message=code, response=response)
+
+
+class TestWorkerMetrics:
+    def test_latency_buckets_are_cumulative(self):
+        stats = WorkerMetrics()
+        created = datetime(2026, 1, 1, 12, 0, 0)  # naive, as SQLite returns
+        stats.record_latency('slack_message', created, datetime(2026, 1, 1, 12, 0, 1, tzinfo=UTC))
+        stats.record_latency('slack_message', created, datetime(2026, 1, 1, 12, 2, 0, tzinfo=UTC))
+
+        hist = stats.snapshot()['latency']['slack_message']
+
+        assert hist['count'] == 2
+        assert hist['sum'] == 121.0
+        buckets = dict(hist['buckets'])
+        assert buckets['0.5'] == 0
+        assert buckets['1'] == 1
+        assert buckets['120'] == 2
+        assert buckets['+Inf'] == 2
+
+    def test_record_attempt_counts_outcomes(self):
+        stats = WorkerMetrics()
+        stats.record_attempt('slack_message', 'delivered', 0.2)
+        stats.record_attempt('slack_message', 'delivered', 0.4)
+        stats.record_attempt('static_page_push', 'failed', 45.0)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot['outcomes'] == {
+            'slack_message': {'delivered': 2},
+            'static_page_push': {'failed': 1},
+        }
+        assert snapshot['duration']['static_page_push']['buckets'][-1] == ['+Inf', 1]
+        assert stats.dirty is True
+
+    def test_slack_error_counted_by_code(self):
+        stats = WorkerMetrics()
+        stats.record_slack_error(_slack_error('channel_not_found'))
+        stats.record_slack_error(RuntimeError('not a Slack error'))
+
+        assert stats.slack_errors == {'channel_not_found': 1}
+
+    def test_slack_error_code_follows_cause(self):
+        try:
+            try:
+                raise _slack_error('ratelimited')
+            except Exception as e:
+                raise RuntimeError('wrapped') from e
+        except RuntimeError as wrapped:
+            assert slack_error_code(wrapped) == 'ratelimited'
+
+    def test_sample_process_is_throttled(self):
+        stats = WorkerMetrics()
+        with patch.object(worker_metrics, 'clock', side_effect=[100.0, 130.0, 161.0]), \
+                patch.object(worker_metrics, 'current_rss_bytes', side_effect=[1000, 3000]):
+            stats.sample_process(5)
+            stats.sample_process(6)  # within PROCESS_STATS_INTERVAL: skipped
+            assert stats.process['rss_bytes'] == 1000
+            assert stats.process['session_objects'] == 5
+            stats.sample_process(7)
+
+        assert stats.process['rss_bytes'] == 3000
+        assert stats.process['session_objects'] == 7
+        assert stats.process['gc_objects'] > 0
+        assert stats.snapshot()['process'] == stats.process
+
+    def test_record_static_push_tracks_each_destination(self):
+        stats = WorkerMetrics()
+        stats.record_static_push('local', '/srv/status', ok=True)
+        stats.record_static_push('s3', 'bucket/index.html', ok=False)
+        stats.record_static_push('local', '/srv/status', ok=True)
+
+        by_method = {entry['method']: entry for entry in stats.snapshot()['static_pushes']}
+        assert by_method['local']['ok'] == 2
+        assert by_method['local']['last_success'] is not None
+        assert by_method['s3'] == {
+            'method': 's3', 'target': 'bucket/index.html', 'ok': 0, 'failed': 1, 'last_success': None,
+        }
+        assert stats.dirty
+
+    def test_current_rss_bytes_none_without_proc(self):
+        with patch('builtins.open', side_effect=FileNotFoundError):
+            assert worker_metrics.current_rss_bytes() is None
+
+
+class TestPublishWorkerMetrics:
+    def test_noop_when_clean(self, app):
+        publish_worker_metrics()
+        assert _db.session.get(AppConfig, WORKER_METRICS_KEY) is None
+
+    def test_writes_snapshot_and_clears_dirty(self, app):
+        stats = get_worker_metrics()
+        stats.record_attempt('slack_message', 'delivered', 0.1)
+
+        publish_worker_metrics()
+
+        row = _db.session.execute(
+            _db.select(AppConfig).where(AppConfig.key == WORKER_METRICS_KEY)
+        ).scalar_one()
+        assert json.loads(row.value)['outcomes'] == {'slack_message': {'delivered': 1}}
+        assert stats.dirty is False
+
+    def test_db_error_keeps_dirty(self, app, caplog):
+        stats = get_worker_metrics()
+        stats.record_attempt('slack_message', 'delivered', 0.1)
+
+        with patch.object(worker_metrics.db.session, 'execute',
+                          side_effect=OperationalError('SELECT', {}, Exception('down'))):
+            publish_worker_metrics()
+
+        assert stats.dirty is True
+        assert 'Failed to publish worker state' in caplog.text
@@ -433,6 +433,59 @@ class TestResolveEsbUser:
         assert user is None
 
 
+    def test_caches_slack_user_id_on_match(self):
+        """_resolve_esb_user() stores the Slack ID on the matched ESB user."""
+        from esb.slack.handlers import _resolve_esb_user
+
+        client = MagicMock()
+        client.users_info.return_value = {
+            'user': {'profile': {'email': self.staff_user.email}},
+        }
+
+        _resolve_esb_user(client, 'U12345')
+
+        assert self.staff_user.slack_user_id == 'U12345'
+        assert self.staff_user.slack_user_id_resolved_at is not None
+
+    def test_uses_cached_slack_user_id(self):
+        """_resolve_esb_user() skips users.info when the cached ID is fresh."""
+        from datetime import UTC, datetime
+
+        from esb.slack.handlers import _resolve_esb_user
+
+        self.staff_user.slack_user_id = 'U12345'
+        self.staff_user.slack_user_id_resolved_at = datetime.now(UTC)
+        self.db.session.commit()
+        client = MagicMock()
+
+        user = _resolve_esb_user(client, 'U12345')
+
+        assert user.id == self.staff_user.id
+        client.users_info.assert_not_called()
+
+    def test_stale_cached_slack_user_id_is_refreshed(self):
+        """_resolve_esb_user() falls back to users.info once the cache has expired."""
+        from datetime import UTC, datetime, timedelta
+
+        from esb.services.user_service import SLACK_USER_ID_TTL
+        from esb.slack.handlers import _resolve_esb_user
+
+        self.staff_user.slack_user_id = 'U12345'
+        self.staff_user.slack_user_id_resolved_at = (
+            datetime.now(UTC) - SLACK_USER_ID_TTL - timedelta(minutes=1)
+        )
+        self.db.session.commit()
+        client = MagicMock()
+        client.users_info.return_value = {
+            'user': {'profile': {'email': self.staff_user.email}},
+        }
+
+        user = _resolve_esb_user(client, 'U12345')
+
+        assert user.id == self.staff_user.id
+        client.users_info.assert_called_once_with(user='U12345')
+
+
 class TestEsbStatusCommand:
     """Tests for /esb-status command handler."""
 
@@ -3,6 +3,7 @@
 from esb.utils.exceptions import (
     ESBError,
     EquipmentNotFound,
+    RateLimited,
     RepairRecordNotFound,
     UnauthorizedAction,
     ValidationError,
@@ -69,3 +70,16 @@ class TestValidationError:
     def test_caught_by_esb_error(self):
         with __import__('pytest').raises(ESBError):
             raise ValidationError('invalid input')
+
+
+class TestRateLimited:
+    """Tests for RateLimited exception."""
+
+    def test_inherits_from_esb_error(self):
+        assert issubclass(RateLimited, ESBError)
+
+    def test_carries_lane_and_retry_after(self):
+        err = RateLimited('chat.postMessage:#oops', 12.5)
+        assert err.lane == 'chat.postMessage:#oops'
+        assert err.retry_after == 12.5
+        assert 'chat.postMessage:#oops' in str(err)
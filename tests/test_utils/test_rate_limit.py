@@ -0,0 +1,159 @@
+"""Tests for the token-bucket rate limiter."""
+
+import json
+
+from esb.utils.rate_limit import RateLimiter
+
+
+class _FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _limiter(limits=None):
+    clock = _FakeClock()
+    limiter = RateLimiter(limits or {'chat.postMessage': (1.0, 2)}, clock=clock, sleep=clock.sleep)
+    return limiter, clock
+
+
+class TestLane:
+    def test_scoped_lane(self):
+        assert RateLimiter.lane('chat.postMessage', '#woodshop') == 'chat.postMessage:#woodshop'
+
+    def test_unscoped_lane(self):
+        assert RateLimiter.lane('users.lookupByEmail') == 'users.lookupByEmail'
+
+
+class TestTryAcquire:
+    def test_burst_then_wait(self):
+        """A full bucket allows `capacity` calls, then reports the refill wait."""
+        limiter, _ = _limiter()
+        lane = RateLimiter.lane('chat.postMessage', '#a')
+
+        assert limiter.try_acquire(lane) == 0.0
+        assert limiter.try_acquire(lane) == 0.0
+        assert limiter.try_acquire(lane) == 1.0
+
+    def test_refills_over_time(self):
+        limiter, clock = _limiter()
+        lane = RateLimiter.lane('chat.postMessage', '#a')
+        limiter.try_acquire(lane)
+        limiter.try_acquire(lane)
+
+        clock.now += 1.0
+
+        assert limiter.try_acquire(lane) == 0.0
+
+    def test_lanes_are_independent(self):
+        """Exhausting one channel's lane does not throttle another channel."""
+        limiter, _ = _limiter()
+        for _ in range(2):
+            limiter.try_acquire('chat.postMessage:#a')
+
+        assert limiter.try_acquire('chat.postMessage:#b') == 0.0
+
+    def test_unconfigured_method_is_unlimited(self):
+        limiter, _ = _limiter()
+        assert all(limiter.try_acquire('files.upload') == 0.0 for _ in range(50))
+
+
+class TestAcquire:
+    def test_sleeps_for_short_wait(self):
+        limiter, clock = _limiter()
+        lane = 'chat.postMessage:#a'
+        limiter.try_acquire(lane)
+        limiter.try_acquire(lane)
+
+        assert limiter.acquire(lane, max_wait=5) == 0.0
+        assert clock.now == 1001.0
+
+    def test_gives_up_past_max_wait(self):
+        limiter, clock = _limiter()
+        lane = 'chat.postMessage:#a'
+        limiter.pause(lane, 30)
+
+        assert limiter.acquire(lane, max_wait=5) == 30.0
+        assert clock.now == 1000.0
+
+
+class TestPause:
+    def test_pause_blocks_until_retry_after(self):
+        limiter, clock = _limiter()
+        lane = 'chat.postMessage:#a'
+
+        limiter.pause(lane, 10)
+
+        assert limiter.try_acquire(lane) == 10.0
+        clock.now += 10
+        assert limiter.try_acquire(lane) == 0.0
+
+    def test_pause_unlimited_lane(self):
+        """A 429 on an otherwise unlimited method still pauses its lane."""
+        limiter, clock = _limiter()
+
+        limiter.pause('files.upload', 5)
+
+        assert limiter.try_acquire('files.upload') == 5.0
+        clock.now += 5
+        assert limiter.try_acquire('files.upload') == 0.0
+
+    def test_token_interval(self):
+        limiter, _ = _limiter({'chat.postMessage': (2.0, 3)})
+        assert limiter.token_interval('chat.postMessage:#a') == 0.5
+        assert limiter.token_interval('files.upload') == 0.0
+
+    def test_pause_marks_dirty(self):
+        limiter, _ = _limiter()
+        assert limiter.dirty is False
+        limiter.pause('chat.postMessage:#a', 1)
+        assert limiter.dirty is True
+
+    def test_taking_a_token_marks_dirty(self):
+        limiter, _ = _limiter()
+        limiter.try_acquire('chat.postMessage:#a')
+        assert limiter.dirty is True
+
+    def test_stays_dirty_until_a_snapshot_shows_full_buckets(self):
+        limiter, clock = _limiter()
+        limiter.try_acquire('chat.postMessage:#a')
+
+        assert limiter.snapshot()['chat.postMessage:#a']['tokens'] == 1
+        limiter.dirty = False
+        assert limiter.dirty is True
+
+        clock.now += 1
+        assert limiter.snapshot()['chat.postMessage:#a']['tokens'] == 2
+        limiter.dirty = False
+        assert limiter.dirty is False
+
+
+class TestSnapshot:
+    def test_every_used_lane_included(self):
+        limiter, _ = _limiter()
+        limiter.try_acquire('chat.postMessage:#a')
+        limiter.pause('chat.postMessage:#b', 20)
+
+        state = limiter.snapshot()
+
+        assert sorted(state) == ['chat.postMessage:#a', 'chat.postMessage:#b']
+        assert state['chat.postMessage:#a']['tokens'] == 1
+        assert state['chat.postMessage:#a']['rate_limited_total'] == 0
+        assert state['chat.postMessage:#b']['rate_limited_total'] == 1
+        assert state['chat.postMessage:#b']['capacity'] == 2
+
+    def test_snapshot_is_json_serializable_for_unlimited_lane(self):
+        limiter, _ = _limiter()
+        limiter.pause('files.upload', 5)
+
+        state = json.loads(json.dumps(limiter.snapshot()))
+
+        assert state['files.upload']['tokens'] is None
+        assert state['files.upload']['capacity'] is None
@@ -1787,6 +1787,46 @@ class TestEquipmentQR:
         assert b'device=laser_300' in resp.data
         assert b'device=bogus' not in resp.data
 
+    def test_post_qr_download_svg(self, staff_client, make_equipment, configured_base_url):
+        eq = make_equipment('Table Saw #1!', 'SawStop', 'PCS')
+        resp = staff_client.post(
+            f'/equipment/{eq.id}/qr',
+            data={'size': 'sticker_2', 'device': 'laser_1200', 'wifi_info': 'none',
+                  'include_name': 'y', 'output_format': 'svg', 'submit': 'Download QR Code'},
+        )
+        assert resp.status_code == 200
+        assert resp.content_type.startswith('image/svg+xml')
+        assert resp.data.startswith(b'<?xml')
+        assert b'width="2in" height="2in"' in resp.data
+        # Vector files are printer-independent, so the device is not in the name.
+        assert f'qr-{eq.id}-Table-Saw-1.svg' in resp.headers.get('Content-Disposition', '')
+
+    def test_post_qr_download_pdf(self, staff_client, make_equipment, configured_base_url):
+        eq = make_equipment('X', 'Y', 'Z')
+        resp = staff_client.post(
+            f'/equipment/{eq.id}/qr',
+            data={'size': 'avery_5163', 'wifi_info': 'none', 'output_format': 'pdf',
+                  'submit': 'Download QR Code'},
+        )
+        assert resp.status_code == 200
+        assert resp.content_type == 'application/pdf'
+        assert resp.data.startswith(b'%PDF-')
+        assert b'/MediaBox [0 0 288 144]' in resp.data
+        assert f'qr-{eq.id}-X.pdf' in resp.headers.get('Content-Disposition', '')
+
+    def test_post_qr_download_unknown_format_rejected(
+        self, staff_client, make_equipment, configured_base_url,
+    ):
+        eq = make_equipment('X', 'Y', 'Z')
+        resp = staff_client.post(
+            f'/equipment/{eq.id}/qr',
+            data={'size': 'sticker_2', 'wifi_info': 'none', 'output_format': 'eps',
+                  'submit': 'Download QR Code'},
+        )
+        assert resp.status_code == 200
+        assert b'name="output_format"' in resp.data
+        assert not resp.content_type.startswith('image/')
+
     def test_qr_preview_includes_device_param(
         self, staff_client, make_equipment, configured_base_url,
     ):
@@ -1807,12 +1847,68 @@ class TestEquipmentQR:
     ):
         from PIL import Image
         eq = make_equipment('X', 'Y', 'Z')
-        resp = staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_4')
+        resp = staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_4&zoom=1')
         assert resp.status_code == 200
         img = Image.open(io.BytesIO(resp.data))
         assert img.size == (1200, 1200)  # defaults to 300 dpi
         assert tuple(round(v) for v in img.info['dpi']) == (300, 300)
 
+    def test_get_qr_preview_renders_at_screen_dpi(
+        self, staff_client, make_equipment, configured_base_url,
+    ):
+        from PIL import Image
+        eq = make_equipment('X', 'Y', 'Z')
+        resp = staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_4&device=laser_600')
+        assert resp.status_code == 200
+        img = Image.open(io.BytesIO(resp.data))
+        assert img.size == (600, 600)  # qr_service.PREVIEW_DPI, same proportions
+        assert tuple(round(v) for v in img.info['dpi']) == (150, 150)
+
+    def test_get_qr_preview_zoom_renders_at_printer_dpi(
+        self, staff_client, make_equipment, configured_base_url,
+    ):
+        from PIL import Image
+        eq = make_equipment('X', 'Y', 'Z')
+        resp = staff_client.get(
+            f'/equipment/{eq.id}/qr/preview?size=sticker_4&device=thermal_203&zoom=1'
+        )
+        assert resp.status_code == 200
+        assert Image.open(io.BytesIO(resp.data)).size == (812, 812)
+
+    def test_get_qr_preview_never_exceeds_printer_dpi(
+        self, staff_client, make_equipment, configured_base_url, monkeypatch,
+    ):
+        from esb.services import qr_service
+        eq = make_equipment('X', 'Y', 'Z')
+        calls = []
+        monkeypatch.setattr(
+            qr_service, 'render_qr_png', lambda *a, **kw: calls.append(kw['dpi']) or b'png',
+        )
+        resp = staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_1&device=thermal_203')
+        assert resp.status_code == 200
+        assert calls == [150]
+        monkeypatch.setattr(qr_service, 'PREVIEW_DPI', 300)
+        staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_1&device=thermal_203')
+        assert calls == [150, 203]  # never upscaled past the printer
+
+    def test_get_qr_preview_falls_back_to_printer_dpi(
+        self, staff_client, make_equipment, configured_base_url, monkeypatch,
+    ):
+        from esb.services import qr_service
+        eq = make_equipment('X', 'Y', 'Z')
+        calls = []
+
+        def fake_render(*args, **kwargs):
+            calls.append(kwargs['dpi'])
+            if kwargs['dpi'] < 300:
+                raise ValueError('QR modules too small at this resolution')
+            return b'png'
+
+        monkeypatch.setattr(qr_service, 'render_qr_png', fake_render)
+        resp = staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_1&device=laser_300')
+        assert resp.status_code == 200
+        assert calls == [150, 300]
+
     def test_post_qr_download_oversized_flashes_danger(
         self, staff_client, make_equipment, configured_base_url,
     ):
@@ -2107,6 +2203,19 @@ class TestEquipmentQRTemplate:
 
     # --- Preview (GET) ---
 
+    def test_post_download_svg_embeds_artwork(
+        self, staff_client, make_equipment, configured_base_url, qr_template_config,
+    ):
+        eq = make_equipment('Table Saw', 'SawStop', 'PCS')
+        resp = staff_client.post(
+            f'/equipment/{eq.id}/qr',
+            data={'size': 'sticker_2', 'wifi_info': 'none', 'include_name': 'y',
+                  'output_format': 'svg', 'submit': 'Download QR Code'},
+        )
+        assert resp.status_code == 200
+        assert resp.content_type.startswith('image/svg+xml')
+        assert b'href="data:image/png;base64,' in resp.data
+
     def test_preview_returns_png(
         self, staff_client, make_equipment, configured_base_url, qr_template_config,
     ):
@@ -2202,3 +2311,101 @@ class TestEquipmentQRTemplate:
         eq = make_equipment('X', 'Y', 'Z')
         resp = staff_client.get(f'/equipment/{eq.id}/qr/preview?size=sticker_2')
         assert resp.status_code == 500
+
+
+class TestQRSheet:
+    """Batch QR label sheet pages."""
+
+    def test_form_renders_with_area_preselected(
+        self, staff_client, make_area, configured_base_url,
+    ):
+        area = make_area(name='Woodshop')
+        resp = staff_client.get(f'/equipment/qr/sheet?area_id={area.id}')
+        assert resp.status_code == 200
+        assert b'Avery 5160' in resp.data
+        assert f'<option selected value="{area.id}">'.encode() in resp.data
+
+    def test_list_links_to_sheet_for_area(self, staff_client, make_area, configured_base_url):
+        area = make_area(name='Woodshop')
+        resp = staff_client.get(f'/equipment/?area_id={area.id}')
+        assert f'/equipment/qr/sheet?area_id={area.id}'.encode() in resp.data
+
+    def test_post_queues_area_and_redirects_to_status(
+        self, staff_client, make_area, make_equipment, configured_base_url, app, tmp_path,
+    ):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        from esb.services import qr_sheet_service
+        woodshop, metal = make_area(name='Woodshop'), make_area(name='Metal', slack_channel='#metal')
+        saw = make_equipment('Saw', 'A', 'B', area=woodshop)
+        make_equipment('Mill', 'A', 'B', area=metal)
+
+        resp = staff_client.post('/equipment/qr/sheet', data={
+            'area': woodshop.id, 'layout': 'avery_5160', 'device': 'laser_300',
+            'wifi_info': 'none', 'include_name': 'y', 'submit': 'Generate Sheet',
+        })
+
+        assert resp.status_code == 302
+        job_id = int(resp.headers['Location'].rsplit('/', 1)[1])
+        job = qr_sheet_service.get_sheet_job(job_id)
+        assert job.payload['equipment_ids'] == [saw.id]
+        assert job.payload['requested_by'] == 'staffuser'
+
+    def test_selected_equipment_overrides_area(
+        self, staff_client, make_area, make_equipment, configured_base_url, app, tmp_path,
+    ):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        from esb.services import qr_sheet_service
+        area = make_area(name='Woodshop')
+        make_equipment('Saw', 'A', 'B', area=area)
+        lathe = make_equipment('Lathe', 'A', 'B', area=area)
+
+        resp = staff_client.post('/equipment/qr/sheet', data={
+            'area': 0, 'equipment': [lathe.id], 'layout': 'grid_2', 'device': 'laser_300',
+            'wifi_info': 'none', 'submit': 'Generate Sheet',
+        })
+
+        job_id = int(resp.headers['Location'].rsplit('/', 1)[1])
+        assert qr_sheet_service.get_sheet_job(job_id).payload['equipment_ids'] == [lathe.id]
+
+    def test_empty_area_flashes_error(self, staff_client, make_area, configured_base_url):
+        area = make_area(name='Empty')
+        resp = staff_client.post('/equipment/qr/sheet', data={
+            'area': area.id, 'layout': 'avery_5160', 'device': 'laser_300',
+            'wifi_info': 'none', 'submit': 'Generate Sheet',
+        })
+        assert resp.status_code == 200
+        assert b'Select at least one piece of equipment' in resp.data
+
+    def test_status_pending_then_download(
+        self, staff_client, make_equipment, configured_base_url, app, tmp_path,
+    ):
+        app.config['UPLOAD_PATH'] = str(tmp_path)
+        from esb.services import notification_service, qr_sheet_service
+        eq = make_equipment('Saw', 'A', 'B')
+        job = qr_sheet_service.queue_sheet(
+            [eq.id], 'avery_5163', 'thermal_203',
+            include_name=True, include_url=False, wifi_info='none', username='staffuser',
+        )
+
+        resp = staff_client.get(f'/equipment/qr/sheets/{job.id}')
+        assert b'0 of 1 labels rendered' in resp.data
+        assert b'http-equiv="refresh"' in resp.data
+        assert staff_client.get(f'/equipment/qr/sheets/{job.id}/download').status_code == 404
+
+        notification_service.process_notification(job)
+        notification_service.mark_delivered(job.id)
+
+        resp = staff_client.get(f'/equipment/qr/sheets/{job.id}')
+        assert b'Download PDF' in resp.data
+        assert b'http-equiv="refresh"' not in resp.data
+        resp = staff_client.get(f'/equipment/qr/sheets/{job.id}/download')
+        assert resp.status_code == 200
+        assert resp.mimetype == 'application/pdf'
+        assert resp.data.startswith(b'%PDF')
+
+    def test_unknown_job_404(self, staff_client):
+        assert staff_client.get('/equipment/qr/sheets/999').status_code == 404
+
+    def test_requires_base_url(self, staff_client):
+        resp = staff_client.get('/equipment/qr/sheet')
+        assert resp.status_code == 302
@@ -1271,6 +1271,25 @@ class TestEquipmentInfoView:
         html = response.data.decode()
         assert 'front.jpg' in html
 
+    def test_photos_offer_variants_lazily(self, client, db, make_area, make_equipment):
+        """Photos with built variants are served as a lazy-loaded srcset."""
+        from esb.models.document import Document
+
+        equip = make_equipment(name='Drill', area=make_area(name='Shop'))
+        db.session.add(Document(
+            original_filename='front.jpg', stored_filename='photo123.jpg', content_type='image/jpeg',
+            size_bytes=5000, parent_type='equipment_photo', parent_id=equip.id, uploaded_by='testuser',
+            variants={'widths': [320, 640]},
+        ))
+        db.session.commit()
+
+        html = client.get(f'/public/equipment/{equip.id}/info').data.decode()
+
+        prefix = f'/public/uploads/equipment/{equip.id}/photos/variants/photo123'
+        assert f'srcset="{prefix}-320.webp 320w, {prefix}-640.webp 640w"' in html
+        assert f'src="{prefix}-640.jpg"' in html
+        assert 'loading="lazy"' in html
+
     def test_shows_external_links_with_target_blank(
         self, client, db, make_area, make_equipment,
     ):
@@ -665,6 +665,29 @@ class TestAddNote:
         assert b'img-thumbnail' in resp.data
         assert b'test_photo.jpg' in resp.data
 
+    def test_detail_shows_photo_variants_and_video_poster(self, app, staff_client, make_repair_record):
+        """Timeline thumbnails use built variants; videos get a poster frame."""
+        record = make_repair_record()
+        for stored in ('abc123.jpg', 'clip.mp4'):
+            doc = Document(
+                parent_type='repair_photo', parent_id=record.id, original_filename=stored,
+                stored_filename=stored, content_type='image/jpeg', size_bytes=100,
+                uploaded_by='staffuser', variants={'widths': [320]},
+            )
+            _db.session.add(doc)
+            _db.session.flush()
+            _db.session.add(RepairTimelineEntry(
+                repair_record_id=record.id, entry_type='photo', content=str(doc.id), author_name='staffuser',
+            ))
+        _db.session.commit()
+
+        html = staff_client.get(f'/repairs/{record.id}').data.decode()
+
+        assert f'srcset="/repairs/{record.id}/files/variants/abc123-320.webp 320w"' in html
+        assert 'loading="lazy"' in html
+        assert f'poster="/repairs/{record.id}/files/variants/clip-320.jpg"' in html
+        assert 'preload="none"' in html
+
 
 class TestUploadPhoto:
     """Tests for POST /repairs/<id>/photos."""